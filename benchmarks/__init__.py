@@ -0,0 +1,3 @@
+"""
+성능 벤치마크 - 실제 Ollama/Qdrant 없이 로컬 대체물(가짜 임베딩 서버, 메모리 Qdrant)로 실행
+"""
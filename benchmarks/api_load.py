@@ -0,0 +1,135 @@
+"""
+API 부하 시험 - 실행 중인 API 서버에 동시 요청을 보내 처리량(RPS)과 지연 시간 분포를 측정
+가짜 Ollama 서버와 함께 쓰면 모델 속도와 분리된 API 자체의 처리 한계를 확인할 수 있습니다.
+
+    python -m benchmarks.fake_ollama --port 11500 --tokens-per-sec 0 &
+    OLLAMA_HOST=http://127.0.0.1:11500 python -m src.main &
+    python -m benchmarks.api_load --endpoint /api/v1/qa --concurrency 16 --duration 30
+"""
+
+import argparse
+import json
+import threading
+import time
+from typing import Dict, Any, List
+
+import numpy as np
+import requests
+
+DEFAULT_QUESTIONS = (
+    "연차 휴가는 며칠인가요?",
+    "출장비 정산 절차를 알려주세요",
+    "재택근무 신청 방법은?",
+    "보안 교육은 언제 받아야 하나요?",
+)
+
+
+def run_load(base_url: str, endpoint: str, payloads: List[Dict[str, Any]], concurrency: int = 8,
+             duration: float = 30.0, timeout: float = 120.0) -> Dict[str, Any]:
+    """
+    duration 동안 concurrency개 스레드로 요청을 반복해서 보냅니다.
+
+    Args:
+        base_url: API 서버 주소
+        endpoint: 요청 경로 (POST)
+        payloads: 순서대로 돌아가며 보낼 요청 본문
+        concurrency: 동시 요청 수
+        duration: 측정 시간 (초)
+        timeout: 요청 타임아웃 (초)
+
+    Returns:
+        requests, errors, rps, latency_ms(p50/p95/p99/max), status_codes, server_timing(단계별 평균 ms)
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    stage_totals: Dict[str, float] = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        session = requests.Session()
+        n = index
+        while time.perf_counter() < deadline:
+            payload = payloads[n % len(payloads)]
+            n += concurrency
+            start = time.perf_counter()
+            try:
+                response = session.post(f"{base_url}{endpoint}", json=payload, timeout=timeout)
+                status = str(response.status_code)
+                # QA/검색 API는 처리 실패도 200과 error 필드로 응답
+                if response.ok and isinstance(response.json(), dict) and response.json().get("error"):
+                    status = "200-error"
+                timing = response.headers.get("Server-Timing", "")
+            except requests.RequestException as e:
+                status, timing = type(e).__name__, ""
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+                for part in filter(None, (p.strip() for p in timing.split(","))):
+                    name, _, dur = part.partition(";dur=")
+                    try:
+                        stage_totals[name] = stage_totals.get(name, 0.0) + float(dur)
+                    except ValueError:
+                        continue
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = len(latencies)
+    ok = statuses.get("200", 0)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (0, 0, 0)
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "duration": round(elapsed, 3),
+        "requests": total,
+        "errors": total - ok,
+        "rps": round(ok / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "max": round(max(latencies), 3) if latencies else 0.0
+        },
+        "status_codes": statuses,
+        "server_timing": {name: round(value / total, 3) for name, value in stage_totals.items()} if total else {}
+    }
+
+
+def main():
+    """API 부하 시험 명령"""
+    parser = argparse.ArgumentParser(description="API 처리량/지연 시간 부하 시험")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="API 서버 주소")
+    parser.add_argument("--endpoint", default="/api/v1/qa", help="POST 경로 (/api/v1/qa, /api/v1/search 등)")
+    parser.add_argument("--collection", default=None, help="검색할 컬렉션")
+    parser.add_argument("--payloads", default=None, help="요청 본문 목록 (JSON Lines), 없으면 기본 질문 사용")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간 (초)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    if args.payloads:
+        with open(args.payloads, encoding="utf-8") as f:
+            payloads = [json.loads(line) for line in f if line.strip()]
+    else:
+        key = "question" if args.endpoint.rstrip("/").endswith("/qa") else "query"
+        payloads = [{key: q} for q in DEFAULT_QUESTIONS]
+        if args.collection:
+            for payload in payloads:
+                payload["collection_name"] = args.collection
+
+    result = run_load(args.base_url, args.endpoint, payloads, args.concurrency, args.duration)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+가짜 Ollama 서버 - 모델 없이 API 처리량/부하를 측정하기 위한 결정적 대체 서버
+/api/embeddings, /api/embed, /api/generate(스트리밍/비스트리밍), /api/tags, /api/ps를 제공합니다.
+
+- 임베딩: 단어별 해시 벡터의 합을 정규화 (같은 텍스트는 항상 같은 벡터, 단어가 겹치면 유사도 상승)
+- 생성: 프롬프트 해시로 정해지는 답변, 토큰 속도(tokens/s)에 맞춰 지연하고 Ollama와 같은 시간 통계 반환
+- 지연 분포(fixed/uniform/normal/lognormal), 실패(HTTP 500)와 응답 지연(hang) 주입
+
+    python -m benchmarks.fake_ollama --port 11434 --latency lognormal:20,0.5 --tokens-per-sec 40 --error-rate 0.01
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List
+
+import numpy as np
+
+from src.config import config
+
+DEFAULT_DIMENSION = 768
+_TOKEN_PATTERN = re.compile(r"[\w가-힣]+")
+
+
+@lru_cache(maxsize=100000)
+def _token_vector(token: str, dimension: int) -> np.ndarray:
+    seed = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+    return np.random.default_rng(seed).standard_normal(dimension).astype(np.float32)
+
+
+def hash_embedding(text: str, dimension: int = DEFAULT_DIMENSION) -> List[float]:
+    """
+    텍스트의 결정적 임베딩 벡터를 만듭니다.
+
+    Args:
+        text: 임베딩할 텍스트
+        dimension: 벡터 차원
+
+    Returns:
+        길이 1로 정규화된 벡터
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower()) or [text]
+    vector = np.zeros(dimension, dtype=np.float32)
+    for token in tokens:
+        vector += _token_vector(token, dimension)
+    norm = float(np.linalg.norm(vector))
+    return (vector / norm if norm else vector).tolist()
+
+
+def hash_answer(prompt: str, tokens: int) -> List[str]:
+    """프롬프트에 포함된 단어로 만든 결정적 답변 토큰 목록"""
+    words = _TOKEN_PATTERN.findall(prompt) or ["답변"]
+    seed = int.from_bytes(hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).digest(), "big")
+    rng = random.Random(seed)
+    return [rng.choice(words) + " " for _ in range(tokens)]
+
+
+class LatencyDistribution:
+    """
+    지연 시간 분포 (ms)
+
+    'fixed:20', 'uniform:5,50', 'normal:20,5'(평균, 표준편차), 'lognormal:20,0.5'(중앙값, sigma)
+    """
+
+    def __init__(self, spec: str = "fixed:0", seed: int = 0):
+        kind, _, params = str(spec).partition(":")
+        if not params and kind.replace(".", "", 1).isdigit():
+            kind, params = "fixed", kind
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p.strip()] or [0.0]
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"알 수 없는 지연 분포: {spec}")
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """지연 시간 하나를 뽑습니다. (ms, 0 이상)"""
+        p = self.params
+        with self._lock:
+            if self.kind == "uniform":
+                value = self._random.uniform(p[0], p[1] if len(p) > 1 else p[0])
+            elif self.kind == "normal":
+                value = self._random.gauss(p[0], p[1] if len(p) > 1 else 0.0)
+            elif self.kind == "lognormal":
+                value = p[0] * self._random.lognormvariate(0.0, p[1] if len(p) > 1 else 0.0)
+            else:
+                value = p[0]
+        return max(0.0, value)
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{','.join(f'{p:g}' for p in self.params)}"
+
+
+class FakeOllamaServer:
+    """가짜 Ollama 서버 (별도 스레드 또는 단독 프로세스로 실행)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, dimension: int = DEFAULT_DIMENSION,
+                 latency: str = "fixed:0", per_item_ms: float = 0.0,
+                 prompt_tokens_per_sec: float = 2000.0, tokens_per_sec: float = 50.0, answer_tokens: int = 64,
+                 load_ms: float = 0.0, error_rate: float = 0.0, hang_rate: float = 0.0, hang_seconds: float = 30.0,
+                 seed: int = 0):
+        """
+        FakeOllamaServer 초기화
+
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            dimension: 임베딩 차원
+            latency: 요청당 기본 지연 분포 (예: 'fixed:5', 'lognormal:20,0.5')
+            per_item_ms: 임베딩 텍스트 1개당 추가 지연 (ms), 모델 계산 시간을 흉내냄
+            prompt_tokens_per_sec: 생성 요청의 프롬프트 처리 속도
+            tokens_per_sec: 생성 속도 (0이면 지연 없음)
+            answer_tokens: 생성할 최대 토큰 수 (요청의 num_predict/max_tokens가 더 작으면 그 값)
+            load_ms: 처음 사용하는 모델의 로드 시간 (ms)
+            error_rate: HTTP 500을 반환할 확률
+            hang_rate: hang_seconds 동안 응답하지 않을 확률 (클라이언트 타임아웃 시험용)
+            hang_seconds: 응답 지연 시간 (초)
+            seed: 지연/실패 주입 난수 seed
+        """
+        self.dimension = dimension
+        self.latency = LatencyDistribution(latency, seed)
+        self.per_item_ms = per_item_ms
+        self.prompt_tokens_per_sec = prompt_tokens_per_sec
+        self.tokens_per_sec = tokens_per_sec
+        self.answer_tokens = answer_tokens
+        self.load_ms = load_ms
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self._random = random.Random(seed + 1)
+        self._lock = threading.Lock()
+        self.loaded_models: Dict[str, float] = {}
+        self.stats: Dict[str, int] = {"requests": 0, "items": 0, "errors_injected": 0, "hangs_injected": 0}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        return self.stats["requests"]
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def _inject_failure(self) -> bool:
+        """실패/응답 지연을 주입합니다. HTTP 500을 반환해야 하면 True"""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.error_rate:
+            self._count("errors_injected")
+            return True
+        if roll < self.error_rate + self.hang_rate:
+            self._count("hangs_injected")
+            time.sleep(self.hang_seconds)
+        return False
+
+    def _load_model(self, model: str) -> float:
+        """처음 쓰는 모델이면 로드 시간만큼 지연하고 로드 시간(초)을 반환합니다."""
+        with self._lock:
+            first = model not in self.loaded_models
+            self.loaded_models[model] = time.time()
+        if first and self.load_ms:
+            time.sleep(self.load_ms / 1000)
+            return self.load_ms / 1000
+        return 0.0
+
+    def _delay(self, items: int) -> None:
+        delay = (self.latency.sample() + self.per_item_ms * items) / 1000
+        if delay > 0:
+            time.sleep(delay)
+        self._count("requests")
+        self._count("items", items)
+
+    def _generate(self, body: Dict[str, Any]):
+        """
+        생성 토큰을 하나씩 내보내는 제너레이터. 마지막 항목은 Ollama와 같은 시간 통계를 담은 최종 응답입니다.
+        """
+        started = time.perf_counter_ns()
+        model = body.get("model", config.OLLAMA_LLM_MODEL)
+        prompt = body.get("prompt", "")
+        options = body.get("options") or {}
+        load_seconds = self._load_model(model)
+        self._delay(1)
+
+        prompt_tokens = len(_TOKEN_PATTERN.findall(prompt)) + len(body.get("context") or [])
+        prompt_eval_started = time.perf_counter_ns()
+        if self.prompt_tokens_per_sec:
+            time.sleep(prompt_tokens / self.prompt_tokens_per_sec)
+        prompt_eval_ns = time.perf_counter_ns() - prompt_eval_started
+
+        limit = options.get("num_predict") or options.get("max_tokens") or self.answer_tokens
+        tokens = hash_answer(prompt, max(1, min(int(limit), self.answer_tokens)))
+        eval_started = time.perf_counter_ns()
+        for token in tokens:
+            if self.tokens_per_sec:
+                time.sleep(1 / self.tokens_per_sec)
+            yield {"model": model, "response": token, "done": False}
+        eval_ns = time.perf_counter_ns() - eval_started
+
+        context = list(body.get("context") or []) + \
+            [int(hashlib.blake2b(t.encode("utf-8"), digest_size=2).hexdigest(), 16) for t in tokens]
+        yield {
+            "model": model,
+            "response": "",
+            "done": True,
+            "context": context,
+            "total_duration": time.perf_counter_ns() - started,
+            "load_duration": int(load_seconds * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": prompt_eval_ns,
+            "eval_count": len(tokens),
+            "eval_duration": eval_ns
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, events) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for event in events:
+                    line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+                    self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    names = sorted({config.OLLAMA_EMBEDDING_MODEL, config.OLLAMA_LLM_MODEL, *server.loaded_models})
+                    self._send_json(200, {"models": [{"name": name, "model": name, "size": 0} for name in names]})
+                elif self.path == "/api/ps":
+                    self._send_json(200, {"models": [
+                        {"name": name, "model": name, "size_vram": 0,
+                         "expires_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(used + 300))}
+                        for name, used in list(server.loaded_models.items())
+                    ]})
+                elif self.path == "/fake/stats":
+                    self._send_json(200, dict(server.stats))
+                else:
+                    self._send_json(404, {"error": f"unknown path {self.path}"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": "invalid json"})
+                    return
+                if self.path not in ("/api/embeddings", "/api/embed", "/api/generate"):
+                    self._send_json(404, {"error": f"unknown path {self.path}"})
+                    return
+                if server._inject_failure():
+                    self._send_json(500, {"error": "injected failure"})
+                    return
+                model = body.get("model", config.OLLAMA_EMBEDDING_MODEL)
+                if self.path == "/api/embeddings":
+                    server._load_model(model)
+                    server._delay(1)
+                    self._send_json(200, {"embedding": hash_embedding(body.get("prompt", ""), server.dimension)})
+                elif self.path == "/api/embed":
+                    inputs = body.get("input", [])
+                    if isinstance(inputs, str):
+                        inputs = [inputs]
+                    server._load_model(model)
+                    server._delay(len(inputs))
+                    self._send_json(200, {
+                        "model": model,
+                        "embeddings": [hash_embedding(text, server.dimension) for text in inputs]
+                    })
+                elif body.get("stream", True):
+                    self._send_stream(server._generate(body))
+                else:
+                    events = list(server._generate(body))
+                    final = events[-1]
+                    final["response"] = "".join(e["response"] for e in events[:-1]).strip()
+                    self._send_json(200, final)
+
+        return Handler
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    """가짜 Ollama 서버 실행 명령"""
+    parser = argparse.ArgumentParser(description="부하/성능 시험용 가짜 Ollama 서버")
+    parser.add_argument("--host", default="127.0.0.1", help="바인딩 주소")
+    parser.add_argument("--port", type=int, default=11434, help="포트")
+    parser.add_argument("--dimension", type=int, default=DEFAULT_DIMENSION, help="임베딩 차원")
+    parser.add_argument("--latency", default="fixed:0", help="요청당 지연 분포 (fixed:5, uniform:5,50, normal:20,5, lognormal:20,0.5)")
+    parser.add_argument("--per-item-ms", type=float, default=0.0, help="임베딩 텍스트당 지연 (ms)")
+    parser.add_argument("--prompt-tokens-per-sec", type=float, default=2000.0, help="프롬프트 처리 속도")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0, help="생성 속도 (0=지연 없음)")
+    parser.add_argument("--answer-tokens", type=int, default=64, help="생성 토큰 수 상한")
+    parser.add_argument("--load-ms", type=float, default=0.0, help="모델 첫 로드 시간 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTP 500 주입 확률")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="응답 지연 주입 확률")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="응답 지연 시간 (초)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 seed")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(
+        host=args.host, port=args.port, dimension=args.dimension, latency=args.latency,
+        per_item_ms=args.per_item_ms, prompt_tokens_per_sec=args.prompt_tokens_per_sec,
+        tokens_per_sec=args.tokens_per_sec, answer_tokens=args.answer_tokens, load_ms=args.load_ms,
+        error_rate=args.error_rate, hang_rate=args.hang_rate, hang_seconds=args.hang_seconds, seed=args.seed
+    )
+    print(f"가짜 Ollama 서버: {server.url} (지연 {server.latency}, {args.tokens_per_sec} tokens/s, "
+          f"실패 {args.error_rate:.1%}, 응답 지연 {args.hang_rate:.1%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+적재 벤치마크 - 합성 문서로 get_processor → TextChunker → EmbeddingService → QdrantManager.store_vectors
+전 과정을 실행하고 형식별/단계별 처리량과 최대 메모리(RSS)를 측정합니다.
+임베딩은 가짜 Ollama 서버(지연 시간 조절 가능), 저장은 프로세스 내 메모리 Qdrant를 사용합니다.
+
+    python -m benchmarks.ingest_benchmark --profile small --save-baseline
+    python -m benchmarks.ingest_benchmark --profile small          # 기준값과 비교 (처리량 20% 이상 감소 시 종료 코드 1)
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from typing import Dict, Any, List
+
+from loguru import logger
+from qdrant_client import QdrantClient
+
+from src.config import config
+from src.ingestion import ingest_file
+from src.text_chunker import TextChunker
+from src.embedding_service import EmbeddingService
+from src.qdrant_manager import QdrantManager
+from src.tracing import start_trace
+from benchmarks.fake_ollama import FakeOllamaServer, DEFAULT_DIMENSION
+from benchmarks.synthetic import generate_dataset
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+STAGES = ("parse", "chunk", "embed", "store")
+# 기준값 비교 대상 처리량 지표 (클수록 좋음)
+THROUGHPUT_METRICS = ("files_per_sec", "parse_mb_per_sec", "embed_chunks_per_sec", "store_points_per_sec")
+
+
+def peak_rss_mb() -> float:
+    """프로세스 최대 RSS (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _stage_seconds(trace) -> Dict[str, float]:
+    seconds = {stage: 0.0 for stage in STAGES}
+    for timing in trace.timings():
+        if timing["name"] in seconds:
+            seconds[timing["name"]] += timing["duration_ms"] / 1000
+    return seconds
+
+
+def _summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ok = [r for r in runs if not r.get("error")]
+    seconds = {stage: sum(r["stages"][stage] for r in runs) for stage in STAGES}
+    total = sum(r["seconds"] for r in ok)
+    megabytes = sum(r["bytes"] for r in ok) / (1024 * 1024)
+    chunks = sum(r["chunks"] for r in ok)
+
+    def rate(amount, elapsed):
+        return round(amount / elapsed, 3) if elapsed > 0 else None
+
+    summary = {
+        "files": len(runs),
+        "errors": len(runs) - len(ok),
+        "megabytes": round(megabytes, 3),
+        "chunks": chunks,
+        "stage_seconds": {stage: round(value, 4) for stage, value in seconds.items()},
+        "files_per_sec": rate(len(ok), total),
+        "parse_mb_per_sec": rate(megabytes, seconds["parse"]),
+        "embed_chunks_per_sec": rate(chunks, seconds["embed"]),
+        "store_points_per_sec": rate(chunks, seconds["store"]),
+        "peak_rss_mb": peak_rss_mb()
+    }
+    errors = sorted({r["error"] for r in runs if r.get("error")})
+    if errors:
+        summary["error_messages"] = errors
+    return summary
+
+
+def run_benchmark(profile: str = "small", files_per_type: int = 1, formats=("pdf", "xlsx", "pptx", "png"),
+                  repeat: int = 1, data_dir: str = None, dimension: int = DEFAULT_DIMENSION,
+                  embed_latency: str = "fixed:0", embed_per_item_ms: float = 0.0,
+                  embedding_backend: str = "ollama") -> Dict[str, Any]:
+    """
+    적재 벤치마크를 실행합니다.
+
+    Args:
+        profile: 합성 문서 크기 프로필 (small, medium, large)
+        files_per_type: 형식별 파일 수
+        formats: 측정할 형식
+        repeat: 파일별 반복 횟수
+        data_dir: 합성 문서 저장 디렉토리 (재사용)
+        dimension: 가짜 임베딩 차원
+        embed_latency: 임베딩 요청당 지연 분포 (예: 'fixed:5', 'lognormal:20,0.5')
+        embed_per_item_ms: 임베딩 텍스트 1개당 지연 (ms)
+        embedding_backend: 임베딩 백엔드 (ollama: 가짜 Ollama 서버, onnx: EMBEDDING_ONNX_* 설정의 로컬 모델)
+
+    Returns:
+        settings, formats(형식별 요약), peak_rss_mb를 담은 결과 딕셔너리
+    """
+    data_dir = data_dir or os.path.join(BENCHMARK_DIR, ".data")
+    files = generate_dataset(data_dir, profile=profile, files_per_type=files_per_type, formats=formats)
+    # 같은 파일을 반복 적재하므로 중복 제거는 끔
+    config.CONTENT_DEDUP_ENABLED = False
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    with FakeOllamaServer(dimension=dimension, latency=embed_latency, per_item_ms=embed_per_item_ms) as server:
+        if embedding_backend == "ollama":
+            embedding_service = EmbeddingService(base_url=server.url, backend="ollama")
+        else:
+            embedding_service = EmbeddingService(backend=embedding_backend)
+        qdrant_manager = QdrantManager(collection_name="benchmark", client=QdrantClient(location=":memory:"))
+        text_chunker = TextChunker()
+        for item in files:
+            fmt = item["format"]
+            for i in range(repeat):
+                run = {"bytes": os.path.getsize(item["path"]), "chunks": 0}
+                start = time.perf_counter()
+                with start_trace("ingest", file_type=fmt) as trace:
+                    try:
+                        result = ingest_file(
+                            item["path"], os.path.basename(item["path"]),
+                            collection_name=f"benchmark_{fmt}",
+                            document_id=f"{os.path.basename(item['path'])}_{i}",
+                            text_chunker=text_chunker,
+                            embedding_service=embedding_service,
+                            qdrant_manager=qdrant_manager
+                        )
+                        run["chunks"] = result["chunks_count"]
+                    except Exception as e:
+                        run["error"] = f"{type(e).__name__}: {e}"
+                run["seconds"] = time.perf_counter() - start
+                run["stages"] = _stage_seconds(trace)
+                results.setdefault(fmt, []).append(run)
+        requests_served = server.requests
+
+    return {
+        "settings": {
+            "profile": profile,
+            "files_per_type": files_per_type,
+            "repeat": repeat,
+            "dimension": dimension,
+            "embed_latency": str(embed_latency),
+            "embed_per_item_ms": embed_per_item_ms,
+            "embedding_backend": embedding_backend,
+            "embedding_model": embedding_service.model_name,
+            "embedding_batch_size": config.EMBEDDING_BATCH_SIZE,
+            "chunk_size": config.CHUNK_SIZE,
+            "chunk_overlap": config.CHUNK_OVERLAP
+        },
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "embedding_requests": requests_served,
+        "formats": {fmt: _summarize(runs) for fmt, runs in results.items()},
+        "peak_rss_mb": peak_rss_mb(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+
+def compare_to_baseline(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    기준값 대비 처리량이 tolerance 비율 이상 떨어진 지표를 찾습니다.
+
+    Returns:
+        회귀 설명 문자열 리스트 (없으면 빈 리스트)
+    """
+    regressions = []
+    for fmt, current in result["formats"].items():
+        base = baseline.get("formats", {}).get(fmt)
+        if not base:
+            continue
+        for metric in THROUGHPUT_METRICS:
+            old, new = base.get(metric), current.get(metric)
+            if old and new is not None and new < old * (1 - tolerance):
+                regressions.append(f"{fmt}.{metric}: {old} -> {new} ({(new - old) / old:+.1%})")
+    return regressions
+
+
+def _print_table(result: Dict[str, Any]) -> None:
+    header = f"{'format':<6} {'files':>5} {'err':>4} {'chunks':>7} " + \
+             " ".join(f"{stage + '_s':>9}" for stage in STAGES) + \
+             f" {'files/s':>8} {'MB/s':>8} {'emb/s':>9} {'store/s':>9} {'rss_mb':>7}"
+    print(header)
+    for fmt, s in result["formats"].items():
+        print(f"{fmt:<6} {s['files']:>5} {s['errors']:>4} {s['chunks']:>7} " +
+              " ".join(f"{s['stage_seconds'][stage]:>9.3f}" for stage in STAGES) +
+              f" {s['files_per_sec'] or 0:>8} {s['parse_mb_per_sec'] or 0:>8} "
+              f"{s['embed_chunks_per_sec'] or 0:>9} {s['store_points_per_sec'] or 0:>9} {s['peak_rss_mb']:>7}")
+
+
+def main():
+    """적재 벤치마크 명령"""
+    parser = argparse.ArgumentParser(description="적재 파이프라인 벤치마크 (가짜 임베딩 서버 + 메모리 Qdrant)")
+    parser.add_argument("--profile", default="small", choices=("small", "medium", "large"), help="합성 문서 크기")
+    parser.add_argument("--files-per-type", type=int, default=1, help="형식별 파일 수")
+    parser.add_argument("--formats", default="pdf,xlsx,pptx,png", help="측정할 형식 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3, help="파일별 반복 횟수")
+    parser.add_argument("--data-dir", default=None, help="합성 문서 디렉토리 (기본: benchmarks/.data)")
+    parser.add_argument("--dimension", type=int, default=DEFAULT_DIMENSION, help="가짜 임베딩 차원")
+    parser.add_argument("--embed-latency", default="fixed:0", help="임베딩 요청당 지연 분포 (fixed:5, lognormal:20,0.5 등)")
+    parser.add_argument("--embed-per-item-ms", type=float, default=0.0, help="임베딩 텍스트당 지연 (ms)")
+    parser.add_argument("--embedding-backend", default="ollama", help="임베딩 백엔드 (ollama=가짜 서버, onnx=로컬 모델)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=None, help="기준값 JSON (기본: benchmarks/baselines/ingest_<profile>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 처리량 감소 비율")
+    parser.add_argument("--verbose", action="store_true", help="적재 로그 출력")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+
+    result = run_benchmark(
+        profile=args.profile,
+        files_per_type=args.files_per_type,
+        formats=tuple(f.strip() for f in args.formats.split(",") if f.strip()),
+        repeat=args.repeat,
+        data_dir=args.data_dir,
+        dimension=args.dimension,
+        embed_latency=args.embed_latency,
+        embed_per_item_ms=args.embed_per_item_ms,
+        embedding_backend=args.embedding_backend
+    )
+    _print_table(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    baseline_path = args.baseline or os.path.join(BENCHMARK_DIR, "baselines", f"ingest_{args.profile}.json")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {baseline_path}")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(result, baseline, args.tolerance)
+        if regressions:
+            print("처리량 회귀:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"기준값 대비 회귀 없음 (허용 감소 {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
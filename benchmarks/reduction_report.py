@@ -0,0 +1,248 @@
+"""
+차원 축소 평가 - 축소 방식별(없음, Matryoshka 절단, PCA) recall 손실과 메모리/검색 지연 이득을 비교
+원본 벡터를 한 번 만든 뒤 축소 방식마다 메모리 Qdrant 컬렉션을 새로 채우고(QdrantManager.store_vectors 경로),
+같은 질문을 search_vectors(쿼리 축소 포함)로 검색합니다.
+
+- recall_at_k: 정답 청크 기준 recall (질문 세트의 expected)
+- overlap_at_k: 축소하지 않은 벡터의 정확한 top-k와 겹치는 비율 (축소로 잃은 이웃)
+
+    python -m benchmarks.reduction_report --reductions none,mrl:128,mrl:64,pca:128,pca:64
+    python -m benchmarks.reduction_report --dataset labelled.jsonl --collection 인사팀 \\
+        --qdrant-host localhost --ollama-url http://localhost:11434 --reductions none,mrl:256,pca:256
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from qdrant_client import QdrantClient
+
+from src.config import config
+from src.embedding_service import EmbeddingService
+from src.qdrant_manager import QdrantManager, BODY_VECTOR
+from src.similarity import as_matrix, cosine_similarity
+from src.vector_reduction import BaseVectorReducer, TruncationReducer, PCAReducer
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.retrieval_eval import build_synthetic_corpus, chunk_key, load_dataset
+
+
+def load_points(qdrant_manager: QdrantManager) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """컬렉션의 모든 포인트 벡터와 페이로드를 읽습니다."""
+    if not qdrant_manager.client:
+        qdrant_manager.connect()
+    vectors, payloads = [], []
+    offset = None
+    while True:
+        batch, offset = qdrant_manager.client.scroll(
+            collection_name=qdrant_manager.collection_name,
+            limit=1000,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        for point in batch:
+            vectors.append(point.vector[BODY_VECTOR] if isinstance(point.vector, dict) else point.vector)
+            payloads.append(point.payload or {})
+        if offset is None:
+            break
+    return as_matrix(vectors), payloads
+
+
+def make_reducer(spec: str, vectors: np.ndarray, source_model: str = "") -> Optional[BaseVectorReducer]:
+    """
+    'none', 'mrl:<차원>', 'pca:<차원>' 형식의 축소 방식을 만듭니다. (PCA는 vectors로 학습 후 저장)
+    """
+    kind, _, value = spec.partition(":")
+    if kind == "none":
+        return None
+    if kind == "mrl":
+        return TruncationReducer(int(value))
+    if kind == "pca":
+        reducer = PCAReducer.fit(vectors, int(value), source_model=source_model)
+        reducer.save()
+        return reducer
+    raise ValueError(f"알 수 없는 축소 방식: {spec}")
+
+
+def build_collection(qdrant_manager: QdrantManager, vectors: np.ndarray, payloads: List[Dict[str, Any]],
+                     embedding_model: str, reducer: Optional[BaseVectorReducer]) -> float:
+    """
+    원본 벡터를 축소 설정으로 새 컬렉션에 저장합니다. (적재 경로와 같은 store_vectors 사용)
+
+    Returns:
+        저장 시간 (초)
+    """
+    config.VECTOR_REDUCTION = reducer.tag if reducer else ""
+    documents: Dict[str, List[Dict[str, Any]]] = {}
+    for vector, payload in zip(vectors, payloads):
+        documents.setdefault(payload.get("document_id", ""), []).append({
+            "text": payload.get("text", ""),
+            "chunk_index": payload.get("chunk_index", 0),
+            "page_number": payload.get("page_number", 0),
+            "token_count": payload.get("token_count"),
+            "embedding": vector,
+            "embedding_model": embedding_model
+        })
+    start = time.perf_counter()
+    for document_id, chunks in documents.items():
+        if not qdrant_manager.store_vectors(chunks, document_id):
+            raise RuntimeError(f"축소 컬렉션 저장 실패: {qdrant_manager.collection_name}/{document_id}")
+    return time.perf_counter() - start
+
+
+def evaluate(qdrant_manager: QdrantManager, queries: np.ndarray, dataset: List[Dict[str, Any]],
+             exact_top: List[set], limit: int) -> Dict[str, Any]:
+    """축소 컬렉션에서 질문 세트를 검색해 recall/overlap/지연 시간을 계산합니다."""
+    recalls, overlaps, latencies = [], [], []
+    for query, item, exact in zip(queries, dataset, exact_top):
+        start = time.perf_counter()
+        results = qdrant_manager.search_vectors(query, limit=limit)
+        latencies.append((time.perf_counter() - start) * 1000)
+        keys = {chunk_key(r["payload"]) for r in results}
+        expected = set(item["expected"])
+        recalls.append(len(expected & keys) / len(expected) if expected else 0.0)
+        overlaps.append(len(exact & keys) / len(exact) if exact else 0.0)
+    p50, p95 = np.percentile(latencies, [50, 95]) if latencies else (0, 0)
+    return {
+        "recall_at_k": round(float(np.mean(recalls)), 4) if recalls else 0.0,
+        "overlap_at_k": round(float(np.mean(overlaps)), 4) if overlaps else 0.0,
+        "latency_ms": {"p50": round(float(p50), 3), "p95": round(float(p95), 3)}
+    }
+
+
+def run_report(vectors: np.ndarray, payloads: List[Dict[str, Any]], queries: np.ndarray,
+               dataset: List[Dict[str, Any]], reductions: List[str], limit: int = 5,
+               embedding_model: str = "") -> List[Dict[str, Any]]:
+    """
+    축소 방식별로 컬렉션을 만들고 평가합니다.
+
+    Args:
+        vectors: (N, 원본 차원) 저장 벡터
+        payloads: 포인트 페이로드 (document_id, chunk_index 필요)
+        queries: (질문 수, 원본 차원) 쿼리 벡터
+        dataset: 정답 표시 질문 세트
+        reductions: 축소 방식 목록 ('none', 'mrl:128', 'pca:128' 등)
+        limit: k
+        embedding_model: 원본 임베딩 모델명
+
+    Returns:
+        축소 방식별 결과 리스트 (recall 손실은 'none' 대비)
+    """
+    keys = [chunk_key(p) for p in payloads]
+    exact_top = []
+    for query in queries:
+        scores = cosine_similarity(query, vectors)
+        exact_top.append({keys[i] for i in np.argsort(-scores)[:limit]})
+
+    client = QdrantClient(location=":memory:")
+    full_bytes = vectors.shape[0] * vectors.shape[1] * 4
+    rows = []
+    for spec in reductions:
+        start = time.perf_counter()
+        reducer = make_reducer(spec, vectors, embedding_model)
+        fit_seconds = time.perf_counter() - start
+        dimension = reducer.output_dim if reducer else vectors.shape[1]
+        manager = QdrantManager(collection_name=f"reduction_{spec.replace(':', '_')}", client=client)
+        store_seconds = build_collection(manager, vectors, payloads, embedding_model, reducer)
+        row = {
+            "reduction": spec,
+            "tag": reducer.tag if reducer else "",
+            "dimension": dimension,
+            "vectors_mb": round(vectors.shape[0] * dimension * 4 / (1024 * 1024), 3),
+            "memory_ratio": round(vectors.shape[0] * dimension * 4 / full_bytes, 4) if full_bytes else 0.0,
+            "fit_seconds": round(fit_seconds, 3),
+            "store_seconds": round(store_seconds, 3),
+            **evaluate(manager, queries, dataset, exact_top, limit)
+        }
+        if isinstance(reducer, PCAReducer):
+            row["explained_variance"] = reducer.explained_variance
+        rows.append(row)
+
+    baseline = next((r for r in rows if r["reduction"] == "none"), None)
+    for row in rows:
+        if baseline:
+            row["recall_loss"] = round(baseline["recall_at_k"] - row["recall_at_k"], 4)
+            if baseline["latency_ms"]["p50"]:
+                row["latency_ratio"] = round(row["latency_ms"]["p50"] / baseline["latency_ms"]["p50"], 3)
+    return rows
+
+
+def _print_table(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'reduction':<10} {'dim':>5} {'mb':>8} {'mem':>6} {'recall@k':>9} {'loss':>7} {'overlap':>8} "
+          f"{'p50_ms':>8} {'p95_ms':>8} {'lat':>6}")
+    for r in rows:
+        print(f"{r['reduction']:<10} {r['dimension']:>5} {r['vectors_mb']:>8} {r['memory_ratio']:>6} "
+              f"{r['recall_at_k']:>9} {r.get('recall_loss', '-'):>7} {r['overlap_at_k']:>8} "
+              f"{r['latency_ms']['p50']:>8} {r['latency_ms']['p95']:>8} {r.get('latency_ratio', '-'):>6}")
+
+
+def main():
+    """차원 축소 평가 명령"""
+    parser = argparse.ArgumentParser(description="벡터 차원 축소 recall 손실 / 메모리·지연 이득 평가")
+    parser.add_argument("--reductions", default="none,mrl:128,mrl:64,pca:128,pca:64",
+                        help="축소 방식 목록 (none, mrl:<차원>, pca:<차원>)")
+    parser.add_argument("--limit", type=int, default=5, help="k (검색 결과 수)")
+    parser.add_argument("--dataset", default=None, help="정답 표시 질문 세트 (JSON Lines), 없으면 합성 코퍼스 사용")
+    parser.add_argument("--collection", default="reduction_source", help="원본(축소하지 않은) 벡터 컬렉션")
+    parser.add_argument("--qdrant-host", default=None, help="원본 컬렉션이 있는 Qdrant 서버 (없으면 메모리 Qdrant)")
+    parser.add_argument("--ollama-url", default=None, help="실제 Ollama 서버 (없으면 가짜 임베딩 서버)")
+    parser.add_argument("--documents", type=int, default=100, help="합성 문서 수")
+    parser.add_argument("--questions", type=int, default=200, help="합성 질문 수")
+    parser.add_argument("--dimension", type=int, default=256, help="가짜 임베딩 차원")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--verbose", action="store_true", help="적재/검색 로그 출력")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="ERROR")
+
+    # 평가용 PCA 파일은 임시 디렉토리에, 원본 컬렉션은 축소 없이
+    original = (config.VECTOR_REDUCTION, config.VECTOR_REDUCTION_DIR)
+    config.VECTOR_REDUCTION = ""
+    config.VECTOR_REDUCTION_DIR = tempfile.mkdtemp(prefix="reducers_")
+
+    server = None
+    try:
+        if args.ollama_url:
+            embedding_service = EmbeddingService(base_url=args.ollama_url)
+        else:
+            server = FakeOllamaServer(dimension=args.dimension).start()
+            embedding_service = EmbeddingService(base_url=server.url)
+        client = QdrantClient(host=args.qdrant_host, port=config.QDRANT_PORT) if args.qdrant_host \
+            else QdrantClient(location=":memory:")
+        source = QdrantManager(collection_name=args.collection, client=client)
+
+        if args.dataset:
+            dataset = load_dataset(args.dataset)
+        else:
+            dataset = build_synthetic_corpus(source, embedding_service,
+                                             documents=args.documents, questions=args.questions)
+        if source.get_vector_reduction():
+            raise SystemExit(f"이미 축소된 컬렉션은 원본으로 쓸 수 없습니다: {args.collection}")
+
+        vectors, payloads = load_points(source)
+        queries = embedding_service.embed_texts([item["question"] for item in dataset])
+        reductions = [r.strip() for r in args.reductions.split(",") if r.strip()]
+        rows = run_report(vectors, payloads, queries, dataset, reductions, args.limit,
+                          embedding_service.model_name)
+    finally:
+        if server:
+            server.stop()
+        config.VECTOR_REDUCTION, config.VECTOR_REDUCTION_DIR = original
+
+    print(f"벡터 {len(payloads)}개, 원본 {vectors.shape[1]}차원, 질문 {len(dataset)}개, k={args.limit}")
+    _print_table(rows)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"vectors": len(payloads), "dimension": int(vectors.shape[1]), "queries": len(dataset),
+                       "limit": args.limit, "results": rows}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+검색 품질/지연 평가 - 정답 청크가 표시된 질문 세트로 recall@k, MRR, p50/p95/p99 지연 시간을 측정
+SearchService.search, MMR 검색, search_hybrid, QAService.retrieve(QA 검색 + 정확 매칭 필터) 경로를
+여러 설정(limit, score_threshold, hnsw_ef, QA 후보 배수)으로 비교합니다.
+
+기본은 오프라인 실행입니다: 합성 코퍼스를 가짜 임베딩 서버로 임베딩하여 메모리 Qdrant에 넣고 평가합니다.
+
+    python -m benchmarks.retrieval_eval
+    python -m benchmarks.retrieval_eval --sweep --limits 3,5,10 --thresholds 0,0.2 --fetch-multipliers 1,3,5
+    python -m benchmarks.retrieval_eval --dataset labelled.jsonl --collection 인사팀 --qdrant-host localhost
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from loguru import logger
+from qdrant_client import QdrantClient
+
+from src.config import config
+from src.embedding_service import EmbeddingService
+from src.qdrant_manager import QdrantManager
+from src.search_service import SearchService
+from src.qa_service import QAService
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.synthetic import SyntheticText
+
+METHODS = ("search", "mmr", "hybrid", "qa_retrieve")
+
+
+def chunk_key(result: Dict[str, Any]) -> str:
+    """검색 결과/정답 청크의 식별자 ('document_id#chunk_index')"""
+    return f"{result.get('document_id')}#{result.get('chunk_index')}"
+
+
+def load_dataset(path: str) -> List[Dict[str, Any]]:
+    """
+    정답 표시 질문 세트를 읽습니다. (JSON Lines)
+
+    각 줄: {"question": "...", "expected": ["문서ID#청크번호", ...], "keyword": "선택", "document_id": "선택"}
+    """
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                items.append(json.loads(line))
+    return items
+
+
+def build_synthetic_corpus(qdrant_manager: QdrantManager, embedding_service: EmbeddingService,
+                           documents: int = 100, chunks_per_document: int = 8, questions: int = 200,
+                           code_ratio: float = 0.2, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    합성 코퍼스를 적재하고 정답이 표시된 질문 세트를 만듭니다.
+
+    일반 질문은 정답 청크의 단어 일부와 무관한 단어를 섞어 만들고, code_ratio 비율의 청크에는
+    고유 코드(예: AB1234C)를 넣어 QA 정확 매칭 필터를 거치는 질문도 만듭니다.
+
+    Returns:
+        question, expected, keyword를 담은 질문 리스트
+    """
+    text = SyntheticText(seed)
+    rng = random.Random(seed)
+    corpus = []
+    for d in range(documents):
+        document_id = f"doc{d:04d}"
+        chunks = []
+        for c in range(chunks_per_document):
+            body = text.paragraph(rng.randint(30, 60))
+            code = None
+            if rng.random() < code_ratio:
+                code = f"{rng.choice('ABCDEFGH')}{rng.choice('KLMNPQRS')}{rng.randint(1000, 99999)}{rng.choice('XYZ')}"
+                body = f"코드: {code}. {body}"
+            chunks.append({"text": body, "chunk_index": c, "metadata": {"code": code} if code else {}})
+            corpus.append({"document_id": document_id, "chunk_index": c, "text": body, "code": code})
+        embedded = embedding_service.embed_chunks(chunks)
+        if not qdrant_manager.store_vectors(embedded, document_id):
+            raise RuntimeError(f"합성 코퍼스 저장 실패: {document_id}")
+
+    items = []
+    for target in rng.sample(corpus, min(questions, len(corpus))):
+        words = target["text"].replace(".", "").split()
+        sample = rng.sample(words, min(6, len(words))) + text.words(2)
+        rng.shuffle(sample)
+        question = " ".join(sample)
+        item = {"question": question, "expected": [chunk_key(target)]}
+        if target["code"]:
+            item["question"] = f"{target['code']} {question}"
+            item["keyword"] = target["code"]
+        items.append(item)
+    return items
+
+
+def _run_query(method: str, item: Dict[str, Any], settings: Dict[str, Any],
+               search_service: SearchService, qa_service: QAService) -> List[Dict[str, Any]]:
+    limit = settings["limit"]
+    common = {"score_threshold": settings["score_threshold"], "hnsw_ef": settings["hnsw_ef"],
+              "document_id": item.get("document_id")}
+    if method == "search":
+        return search_service.search(item["question"], limit=limit, **common)
+    if method == "mmr":
+        return search_service.search(item["question"], limit=limit, use_mmr=True, **common)
+    if method == "hybrid":
+        return search_service.search_hybrid(item["question"], keyword=item.get("keyword"), limit=limit, **common)
+    if method == "qa_retrieve":
+        retrieved = qa_service.retrieve(item["question"], max_results=limit,
+                                        fetch_multiplier=settings["fetch_multiplier"], **common)
+        return retrieved["filtered_results"][:limit]
+    raise ValueError(f"알 수 없는 평가 방식: {method}")
+
+
+def evaluate(method: str, dataset: List[Dict[str, Any]], settings: Dict[str, Any],
+             search_service: SearchService, qa_service: QAService) -> Dict[str, Any]:
+    """
+    한 가지 방식/설정으로 질문 세트를 실행하고 지표를 계산합니다.
+
+    Returns:
+        recall_at_k, mrr, hit_rate, latency_ms(p50/p95/p99/mean)를 담은 딕셔너리
+    """
+    recalls, reciprocal_ranks, latencies = [], [], []
+    for item in dataset:
+        expected = set(item["expected"])
+        start = time.perf_counter()
+        results = _run_query(method, item, settings, search_service, qa_service)
+        latencies.append((time.perf_counter() - start) * 1000)
+        keys = [chunk_key(r) for r in results]
+        recalls.append(len(expected & set(keys)) / len(expected) if expected else 0.0)
+        rank = next((i for i, key in enumerate(keys, 1) if key in expected), None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (0, 0, 0)
+    return {
+        "method": method,
+        **settings,
+        "queries": len(dataset),
+        "recall_at_k": round(float(np.mean(recalls)), 4) if recalls else 0.0,
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4) if reciprocal_ranks else 0.0,
+        "hit_rate": round(float(np.mean([r > 0 for r in reciprocal_ranks])), 4) if reciprocal_ranks else 0.0,
+        "latency_ms": {
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "mean": round(float(np.mean(latencies)), 3) if latencies else 0.0
+        }
+    }
+
+
+def sweep_settings(limits: List[int], thresholds: List[float], hnsw_efs: List[Optional[int]],
+                   fetch_multipliers: List[int]) -> List[Dict[str, Any]]:
+    """파라미터 조합 목록을 만듭니다."""
+    return [
+        {"limit": limit, "score_threshold": threshold, "hnsw_ef": ef, "fetch_multiplier": multiplier}
+        for limit, threshold, ef, multiplier in itertools.product(limits, thresholds, hnsw_efs, fetch_multipliers)
+    ]
+
+
+def _print_table(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'method':<12} {'k':>3} {'thr':>5} {'ef':>5} {'mult':>4} {'recall@k':>9} {'mrr':>7} "
+          f"{'hit':>6} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8}")
+    for r in rows:
+        lat = r["latency_ms"]
+        print(f"{r['method']:<12} {r['limit']:>3} {r['score_threshold']:>5} {str(r['hnsw_ef'] or '-'):>5} "
+              f"{r['fetch_multiplier']:>4} {r['recall_at_k']:>9} {r['mrr']:>7} {r['hit_rate']:>6} "
+              f"{lat['p50']:>8} {lat['p95']:>8} {lat['p99']:>8}")
+
+
+def _parse_list(value: str, cast) -> list:
+    return [None if v.strip().lower() in ("", "none", "default") else cast(v) for v in value.split(",")]
+
+
+def main():
+    """검색 평가 명령"""
+    parser = argparse.ArgumentParser(description="검색 recall/MRR/지연 시간 평가")
+    parser.add_argument("--dataset", default=None, help="정답 표시 질문 세트 (JSON Lines), 없으면 합성 코퍼스 사용")
+    parser.add_argument("--collection", default="retrieval_eval", help="평가할 컬렉션")
+    parser.add_argument("--qdrant-host", default=None, help="실제 Qdrant 서버 (없으면 메모리 Qdrant, hnsw_ef는 서버에서만 의미 있음)")
+    parser.add_argument("--ollama-url", default=None, help="실제 Ollama 서버 (없으면 가짜 임베딩 서버)")
+    parser.add_argument("--methods", default=",".join(METHODS), help=f"평가 방식 ({', '.join(METHODS)})")
+    parser.add_argument("--sweep", action="store_true", help="파라미터 조합 전체를 평가")
+    parser.add_argument("--limits", default="5", help="k (검색 결과 수) 목록")
+    parser.add_argument("--thresholds", default="0", help="score_threshold 목록")
+    parser.add_argument("--hnsw-ef", default="none", help="hnsw_ef 목록 (none=컬렉션 기본값)")
+    parser.add_argument("--fetch-multipliers", default=str(config.QA_FETCH_MULTIPLIER), help="QA 후보 배수 목록")
+    parser.add_argument("--documents", type=int, default=100, help="합성 문서 수")
+    parser.add_argument("--questions", type=int, default=200, help="합성 질문 수")
+    parser.add_argument("--dimension", type=int, default=256, help="가짜 임베딩 차원")
+    parser.add_argument("--save-dataset", default=None, help="합성 질문 세트 저장 경로")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--verbose", action="store_true", help="검색 로그 출력")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.remove()
+        # score_threshold 스윕 시 '검색 결과 없음' 경고가 많으므로 오류만 출력
+        logger.add(sys.stderr, level="ERROR")
+
+    server = None
+    if args.ollama_url:
+        embedding_service = EmbeddingService(base_url=args.ollama_url, backend="ollama")
+    else:
+        server = FakeOllamaServer(dimension=args.dimension).start()
+        embedding_service = EmbeddingService(base_url=server.url, backend="ollama")
+    client = QdrantClient(host=args.qdrant_host, port=config.QDRANT_PORT) if args.qdrant_host \
+        else QdrantClient(location=":memory:")
+    qdrant_manager = QdrantManager(collection_name=args.collection, client=client)
+    search_service = SearchService(qdrant_manager, embedding_service)
+    qa_service = QAService(search_service=search_service, embedding_service=embedding_service)
+
+    try:
+        if args.dataset:
+            dataset = load_dataset(args.dataset)
+        else:
+            dataset = build_synthetic_corpus(qdrant_manager, embedding_service,
+                                             documents=args.documents, questions=args.questions)
+            if args.save_dataset:
+                with open(args.save_dataset, "w", encoding="utf-8") as f:
+                    for item in dataset:
+                        f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+        if args.sweep:
+            settings_list = sweep_settings(
+                _parse_list(args.limits, int), _parse_list(args.thresholds, float),
+                _parse_list(args.hnsw_ef, int), _parse_list(args.fetch_multipliers, int)
+            )
+        else:
+            settings_list = sweep_settings(
+                _parse_list(args.limits, int)[:1], _parse_list(args.thresholds, float)[:1],
+                _parse_list(args.hnsw_ef, int)[:1], _parse_list(args.fetch_multipliers, int)[:1]
+            )
+        methods = [m.strip() for m in args.methods.split(",") if m.strip()]
+        rows = []
+        for settings in settings_list:
+            for method in methods:
+                # QA 후보 배수는 qa_retrieve에만 영향
+                if method != "qa_retrieve" and settings["fetch_multiplier"] != settings_list[0]["fetch_multiplier"]:
+                    continue
+                rows.append(evaluate(method, dataset, settings, search_service, qa_service))
+    finally:
+        if server:
+            server.stop()
+
+    _print_table(rows)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"queries": len(dataset), "results": rows}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+시작(cold-start) 벤치마크 - 새 파이썬 프로세스에서 진입 모듈을 import하는 시간을 `-X importtime`으로 측정
+반복마다 새 인터프리터를 띄우므로 디스크 캐시 외의 상태는 공유하지 않습니다.
+
+- import_ms: 진입 모듈의 누적 import 시간 (importtime cumulative, 중앙값)
+- wall_ms: 인터프리터 시작부터 종료까지의 벽시계 시간 (중앙값)
+- packages: 최상위 패키지별 자체(self) import 시간 합계 상위 N개 (중첩 import를 중복 집계하지 않음)
+- heavy_loaded: import 시점에 불러오면 안 되는 무거운 패키지(OCR, langchain, qdrant_client 등) 중 실제로 로드된 것
+
+    python -m benchmarks.startup_benchmark --save-baseline
+    python -m benchmarks.startup_benchmark                 # 기준값과 비교 (import 시간 20% 이상 증가 시 종료 코드 1)
+    python -m benchmarks.startup_benchmark --modules src.api.routes --repeat 10 --top 20
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Any, List
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+
+DEFAULT_MODULES = ("src.api.routes", "src.main", "src.ingest_worker")
+# 처음 요청/적재 시점까지 미뤄야 하는 패키지 (진입 모듈 import에 포함되면 heavy_loaded로 보고)
+HEAVY_PACKAGES = ("cv2", "PIL", "easyocr", "pytesseract", "torch", "langchain", "langchain_text_splitters",
+                  "qdrant_client", "grpc", "onnxruntime", "tokenizers", "docx", "pptx", "openpyxl", "pdfplumber")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    `-X importtime` 출력을 파싱합니다. (로그 등 다른 줄은 무시)
+
+    Returns:
+        import 기록 리스트 (module, self_us, cumulative_us, depth)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2
+            })
+    return entries
+
+
+def measure_once(module: str) -> Dict[str, Any]:
+    """
+    새 프로세스에서 모듈을 한 번 import하고 시간을 측정합니다.
+
+    Args:
+        module: import할 모듈 이름
+
+    Returns:
+        측정 결과 (wall_ms, import_ms, 패키지별 self 시간, 로드된 모듈 목록)
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT_DIR + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    env.setdefault("LOG_LEVEL", "ERROR")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{completed.stderr[-2000:]}")
+
+    entries = parse_importtime(completed.stderr)
+    target = [e for e in entries if e["module"] == module]
+    packages: Dict[str, int] = {}
+    for entry in entries:
+        root = entry["module"].split(".")[0]
+        packages[root] = packages.get(root, 0) + entry["self_us"]
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": max(e["cumulative_us"] for e in target) / 1000 if target else 0.0,
+        "packages": packages,
+        "modules": {e["module"] for e in entries}
+    }
+
+
+def run_benchmark(modules: List[str], repeat: int = 5, top: int = 10) -> Dict[str, Any]:
+    """
+    모듈별로 repeat번 새 프로세스를 띄워 import 시간을 측정합니다.
+
+    Args:
+        modules: 진입 모듈 목록
+        repeat: 모듈별 반복 횟수 (중앙값 사용)
+        top: 보고할 패키지 수
+
+    Returns:
+        모듈별 결과 (import_ms, wall_ms 중앙값/최소값, 상위 패키지, 로드된 무거운 패키지)
+    """
+    result = {"python": sys.version.split()[0], "repeat": repeat, "modules": {},
+              "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    for module in modules:
+        runs = [measure_once(module) for _ in range(repeat)]
+        packages: Dict[str, List[int]] = {}
+        for run in runs:
+            for name, self_us in run["packages"].items():
+                packages.setdefault(name, []).append(self_us)
+        ranked = sorted(((name, statistics.median(values) / 1000) for name, values in packages.items()),
+                        key=lambda item: item[1], reverse=True)[:top]
+        loaded = set.union(*(run["modules"] for run in runs))
+        result["modules"][module] = {
+            "import_ms": round(statistics.median(r["import_ms"] for r in runs), 1),
+            "import_ms_min": round(min(r["import_ms"] for r in runs), 1),
+            "wall_ms": round(statistics.median(r["wall_ms"] for r in runs), 1),
+            "packages": [{"package": name, "self_ms": round(ms, 1)} for name, ms in ranked],
+            "heavy_loaded": [name for name in HEAVY_PACKAGES if name in loaded]
+        }
+    return result
+
+
+def compare_to_baseline(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    기준값 대비 import 시간이 tolerance 비율 이상 늘었거나 새로 로드된 무거운 패키지를 찾습니다.
+
+    Returns:
+        회귀 설명 문자열 리스트 (없으면 빈 리스트)
+    """
+    regressions = []
+    for module, current in result["modules"].items():
+        base = baseline.get("modules", {}).get(module)
+        if not base:
+            continue
+        old, new = base.get("import_ms"), current["import_ms"]
+        if old and new > old * (1 + tolerance):
+            regressions.append(f"{module}.import_ms: {old} -> {new} ({(new - old) / old:+.1%})")
+        added = sorted(set(current["heavy_loaded"]) - set(base.get("heavy_loaded", [])))
+        if added:
+            regressions.append(f"{module}.heavy_loaded: {', '.join(added)} 새로 로드")
+    return regressions
+
+
+def _print_table(result: Dict[str, Any]) -> None:
+    print(f"{'module':<20} {'import_ms':>10} {'min_ms':>8} {'wall_ms':>8}  heavy_loaded")
+    for module, r in result["modules"].items():
+        print(f"{module:<20} {r['import_ms']:>10} {r['import_ms_min']:>8} {r['wall_ms']:>8}  "
+              f"{', '.join(r['heavy_loaded']) or '-'}")
+    for module, r in result["modules"].items():
+        print(f"\n[{module}] 패키지별 import 시간 (self 합계, ms)")
+        for item in r["packages"]:
+            print(f"  {item['package']:<28} {item['self_ms']:>8}")
+
+
+def main():
+    """시작 벤치마크 명령"""
+    parser = argparse.ArgumentParser(description="진입 모듈 cold-start import 시간 측정 (-X importtime)")
+    parser.add_argument("--modules", default=",".join(DEFAULT_MODULES), help="측정할 모듈 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=5, help="모듈별 반복 횟수 (새 프로세스)")
+    parser.add_argument("--top", type=int, default=10, help="보고할 패키지 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=None, help="기준값 JSON (기본: benchmarks/baselines/startup.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 import 시간 증가 비율")
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        modules=[m.strip() for m in args.modules.split(",") if m.strip()],
+        repeat=args.repeat,
+        top=args.top
+    )
+    _print_table(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    baseline_path = args.baseline or os.path.join(BENCHMARK_DIR, "baselines", "startup.json")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {baseline_path}")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(result, baseline, args.tolerance)
+        if regressions:
+            print("시작 시간 회귀:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"기준값 대비 회귀 없음 (허용 증가 {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+합성 문서 생성 - 벤치마크용 PDF/XLSX/PPTX/이미지를 정해진 크기로 결정적으로 생성
+같은 seed와 크기로 만들면 항상 같은 내용이 되어 실행 간 결과를 비교할 수 있습니다.
+XLSX/PPTX는 openpyxl/python-pptx가 있어야 생성됩니다. (없으면 건너뜀)
+"""
+
+import os
+import random
+from typing import Dict, Any, List
+from loguru import logger
+
+_SYLLABLES = ("ka", "ne", "ro", "mi", "su", "ta", "po", "li", "an", "de", "jo", "un", "se", "ha", "bi", "go")
+
+
+class SyntheticText:
+    """seed로 고정된 가짜 단어/문단 생성기"""
+
+    def __init__(self, seed: int = 0, vocabulary_size: int = 2000):
+        self.random = random.Random(seed)
+        self.vocabulary = sorted({
+            "".join(self.random.choice(_SYLLABLES) for _ in range(self.random.randint(2, 4)))
+            for _ in range(vocabulary_size)
+        })
+
+    def words(self, count: int) -> List[str]:
+        return [self.random.choice(self.vocabulary) for _ in range(count)]
+
+    def sentence(self, count: int = 12) -> str:
+        return " ".join(self.words(count)).capitalize() + "."
+
+    def paragraph(self, words: int) -> str:
+        sentences = []
+        while words > 0:
+            n = min(words, self.random.randint(8, 16))
+            sentences.append(self.sentence(n))
+            words -= n
+        return " ".join(sentences)
+
+
+def make_pdf(path: str, pages: int, words_per_page: int = 400, seed: int = 0) -> str:
+    """텍스트 PDF를 생성합니다. (reportlab)"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    text = SyntheticText(seed)
+    pdf = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    for page in range(pages):
+        y = height - 50
+        pdf.setFont("Helvetica", 10)
+        pdf.drawString(50, y, f"Section {page + 1}")
+        y -= 20
+        words = text.words(words_per_page)
+        for start in range(0, len(words), 12):
+            if y < 50:
+                break
+            pdf.drawString(50, y, " ".join(words[start:start + 12]))
+            y -= 14
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def make_xlsx(path: str, rows: int, seed: int = 0) -> str:
+    """질문/답변 형식의 엑셀 파일을 생성합니다. (openpyxl)"""
+    import openpyxl
+
+    text = SyntheticText(seed)
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.title = "FAQ"
+    sheet.append(["번호", "질문", "답변", "담당자"])
+    for i in range(1, rows + 1):
+        sheet.append([i, text.sentence(10), text.paragraph(40), text.words(1)[0]])
+    wb.save(path)
+    return path
+
+
+def make_pptx(path: str, slides: int, words_per_slide: int = 80, seed: int = 0) -> str:
+    """제목+본문 슬라이드로 된 PPTX를 생성합니다. (python-pptx)"""
+    from pptx import Presentation
+
+    text = SyntheticText(seed)
+    prs = Presentation()
+    layout = prs.slide_layouts[1]
+    for i in range(slides):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {i + 1} {text.sentence(4)}"
+        slide.placeholders[1].text = text.paragraph(words_per_slide)
+    prs.save(path)
+    return path
+
+
+def make_image(path: str, width: int = 1200, height: int = 1600, lines: int = 40, seed: int = 0) -> str:
+    """텍스트가 그려진 스캔 문서 이미지를 생성합니다. (Pillow)"""
+    from PIL import Image, ImageDraw
+
+    text = SyntheticText(seed)
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    line_height = max(12, (height - 80) // max(lines, 1))
+    for i in range(lines):
+        draw.text((40, 40 + i * line_height), text.sentence(10), fill="black")
+    image.save(path)
+    return path
+
+
+# 크기 프로필: 형식별 (생성 함수, 크기 인자)
+SIZE_PROFILES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "small": {"pdf": {"pages": 5}, "xlsx": {"rows": 50}, "pptx": {"slides": 5}, "png": {"lines": 20}},
+    "medium": {"pdf": {"pages": 50}, "xlsx": {"rows": 500}, "pptx": {"slides": 30}, "png": {"lines": 40}},
+    "large": {"pdf": {"pages": 300}, "xlsx": {"rows": 5000}, "pptx": {"slides": 150}, "png": {"lines": 80}},
+}
+
+_MAKERS = {"pdf": make_pdf, "xlsx": make_xlsx, "pptx": make_pptx, "png": make_image}
+
+
+def generate_dataset(out_dir: str, profile: str = "small", files_per_type: int = 1,
+                     formats=("pdf", "xlsx", "pptx", "png"), seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    형식별 합성 문서를 생성합니다. 이미 있는 파일은 다시 만들지 않습니다.
+
+    Args:
+        out_dir: 저장할 디렉토리
+        profile: 크기 프로필 (small, medium, large)
+        files_per_type: 형식별 파일 수
+        formats: 생성할 형식
+        seed: 내용 생성 seed
+
+    Returns:
+        path, format, size_args를 담은 리스트 (생성 라이브러리가 없는 형식은 제외)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    files = []
+    for fmt in formats:
+        size_args = SIZE_PROFILES[profile][fmt]
+        for i in range(files_per_type):
+            path = os.path.join(out_dir, f"{profile}_{i:03d}.{fmt}")
+            if not os.path.exists(path):
+                try:
+                    _MAKERS[fmt](path, seed=seed + i, **size_args)
+                except ImportError as e:
+                    logger.warning(f"[합성 문서] {fmt} 생성 라이브러리가 없어 건너뜁니다: {e}")
+                    break
+            files.append({"path": path, "format": fmt, "size_args": size_args})
+    return files
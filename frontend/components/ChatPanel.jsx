@@ -29,6 +29,19 @@ function flattenChildren(children) {
 
 
 
+// 부서(팀) 대화방별 서버 대화 세션 ID (서버가 대화 이력을 기억하므로 history 전송 불필요)
+function getSessionId(collectionName, renew = false) {
+  const key = `chat_session_${collectionName}`;
+  let sessionId = renew ? null : localStorage.getItem(key);
+  if (!sessionId) {
+    sessionId = (window.crypto && window.crypto.randomUUID)
+      ? window.crypto.randomUUID()
+      : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    localStorage.setItem(key, sessionId);
+  }
+  return sessionId;
+}
+
 const ChatPanel = forwardRef(function ChatPanel({ collectionName, messages, loading, setMessages, setLoading, ragOnly, onAnswerToOtherDept }, ref) {
   const [input, setInput] = useState('');
   const [error, setError] = useState(null);
@@ -37,8 +50,12 @@ const ChatPanel = forwardRef(function ChatPanel({ collectionName, messages, load
 
   // 외부에서 messages를 비우는 함수 제공
   useImperativeHandle(ref, () => ({
-    clearMessages: () => setMessages([])
-  }), [setMessages]);
+    clearMessages: () => {
+      setMessages([]);
+      // 대화를 비우면 새 서버 세션으로 시작
+      if (collectionName) getSessionId(collectionName, true);
+    }
+  }), [setMessages, collectionName]);
 
   useEffect(() => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -73,7 +90,7 @@ const ChatPanel = forwardRef(function ChatPanel({ collectionName, messages, load
         body: JSON.stringify({
           question: input,
           collection_name: collectionName,
-          history: messages,
+          session_id: getSessionId(collectionName),
           rag_only: ragOnly,
         }),
         signal: controller.signal,
@@ -1,4 +1,4 @@
-import React, { useRef, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import DocumentsModal from './DocumentsModal.mui';
 import { useMutation } from 'react-query';
 
@@ -14,20 +14,107 @@ async function uploadFile({ file, collectionName }) {
   return res.json();
 }
 
+const FINISHED_STATUSES = ['done', 'error', 'cancelled'];
+const POLL_INTERVAL_MS = 2000;
+const MAX_POLL_FAILURES = 5;
+
+// 서버가 푸시하는 적재 진행 이벤트(SSE) 구독
+// 스트림이 끊기거나(프록시 타임아웃, 서버 재시작) 종료 상태 없이 끝나면 진행상태 조회(폴링)로 전환
+function subscribeProgress(taskId, onProgress, onFailure) {
+  let closed = false;
+  let finished = false;
+  let polling = false;
+  let failures = 0;
+  let timer = null;
+
+  const report = (status) => {
+    if (FINISHED_STATUSES.includes(status.status)) finished = true;
+    onProgress(status);
+  };
+
+  const poll = async () => {
+    if (closed || finished) return;
+    try {
+      const res = await fetch(`/api/v1/upload-progress/${taskId}`);
+      if (!res.ok) throw new Error(`진행상태 조회 실패 (${res.status})`);
+      const status = await res.json();
+      if (status.status === 'unknown') {
+        failures += 1;
+      } else {
+        failures = 0;
+        report(status);
+      }
+    } catch (e) {
+      failures += 1;
+    }
+    if (closed || finished) return;
+    if (failures >= MAX_POLL_FAILURES) {
+      onFailure('진행상태를 확인할 수 없습니다. 잠시 후 업로드 파일 목록을 확인해 주세요.');
+      return;
+    }
+    timer = setTimeout(poll, POLL_INTERVAL_MS);
+  };
+
+  const source = new EventSource(`/api/v1/upload-progress/${taskId}/events`);
+  const fallBackToPolling = () => {
+    source.close();
+    if (closed || finished || polling) return;
+    polling = true;
+    poll();
+  };
+  source.addEventListener('progress', (e) => report(JSON.parse(e.data)));
+  source.addEventListener('end', fallBackToPolling);
+  source.onerror = fallBackToPolling;
+  return () => {
+    closed = true;
+    source.close();
+    clearTimeout(timer);
+  };
+}
+
+function formatProgress(progress) {
+  if (!progress) return '처리 중...';
+  const eta = progress.detail && progress.detail.eta_seconds;
+  return `${progress.progress}%${eta ? ` · 약 ${Math.ceil(eta)}초 남음` : ''}`;
+}
+
 export default function FileUpload({ collectionName, onSuccess, disabled, small }) {
   const inputRef = useRef();
   const [uploading, setUploading] = useState(false);
   const [done, setDone] = useState(false);
   const [error, setError] = useState(null);
   const [modalOpen, setModalOpen] = useState(false);
+  const [progress, setProgress] = useState(null);
+  const unsubscribeRef = useRef(null);
+
+  useEffect(() => () => unsubscribeRef.current && unsubscribeRef.current(), []);
+
+  const handleProgress = (status) => {
+    setProgress(status);
+    if (status.status === 'done') {
+      setUploading(false);
+      setProgress(null);
+      setDone(true);
+      onSuccess && onSuccess('파일 업로드가 완료되었습니다');
+      setTimeout(() => setDone(false), 1500);
+    } else if (status.status === 'error' || status.status === 'cancelled') {
+      setUploading(false);
+      setProgress(null);
+      setError(status.message || '파일 처리 실패');
+    }
+  };
+
+  const handleProgressFailure = (message) => {
+    setUploading(false);
+    setProgress(null);
+    setError(message);
+  };
 
   const mutation = useMutation(uploadFile, {
     onSuccess: (data) => {
       if (data && data.document_id) {
-        setUploading(false);
-        setDone(true);
-        onSuccess && onSuccess('파일 업로드가 완료되었습니다');
-        setTimeout(() => setDone(false), 1500);
+        // 벡터 적재 완료까지 서버 푸시로 진행상태 표시
+        unsubscribeRef.current = subscribeProgress(data.document_id, handleProgress, handleProgressFailure);
       } else {
         setUploading(false);
         setError('업로드 응답 오류');
@@ -40,10 +127,6 @@ export default function FileUpload({ collectionName, onSuccess, disabled, small
     },
   });
 
-  // 진행상태 폴링 제거: 업로드 성공만 체크
-
-  // 진행률 폴링 및 바 제거: 단순 완료 알림만 표시
-
   const handleFileChange = (e) => {
     const file = e.target.files[0];
     if (!file) return;
@@ -81,7 +164,7 @@ export default function FileUpload({ collectionName, onSuccess, disabled, small
         <span style={{ fontSize: small ? 15 : 18, marginRight: 4 }}>📎</span>
         {uploading ? (
           <>
-            <span>업로드 중...</span>
+            <span>{progress ? formatProgress(progress) : '업로드 중...'}</span>
             <span className="spinner" style={{ marginLeft: 8, width: 16, height: 16, border: '2px solid #fff', borderTop: '2px solid #1976d2', borderRadius: '50%', display: 'inline-block', animation: 'spin 1s linear infinite', verticalAlign: 'middle' }} />
           </>
         ) : done ? '업로드 완료' : '파일 업로드'}
@@ -42,6 +42,12 @@ class SearchRequest(BaseModel):
     score_threshold: float = Field(0.0, description="점수 임계값")
     document_id: Optional[str] = Field(None, description="특정 문서 ID")
     page_number: Optional[int] = Field(None, description="특정 페이지 번호")
+    use_mmr: bool = Field(False, description="MMR로 중복 결과를 줄이고 다양한 결과 선택")
+    mmr_lambda: Optional[float] = Field(None, ge=0.0, le=1.0, description="MMR 관련성 가중치 (0~1, 없으면 서버 설정값)")
+    collection_names: Optional[List[str]] = Field(None, description="동시에 검색할 컬렉션(부서) 목록")
+    all_collections: bool = Field(False, description="전체 컬렉션을 동시에 검색")
+    vector_name: Optional[str] = Field(None, pattern="^(body|title|fused)$",
+                                       description="이름 있는 벡터 컬렉션의 검색 대상 (body, title, fused / 없으면 서버 설정값)")
 
 class SearchResult(BaseModel):
     """검색 결과 모델"""
@@ -52,6 +58,8 @@ class SearchResult(BaseModel):
     page_number: int = Field(..., description="페이지 번호")
     chunk_index: int = Field(..., description="청크 인덱스")
     metadata: Dict[str, Any] = Field(..., description="메타데이터")
+    collection_name: Optional[str] = Field(None, description="결과가 속한 컬렉션 (다중 컬렉션 검색 시)")
+    raw_score: Optional[float] = Field(None, description="정규화 전 원점수 (다중 컬렉션 검색 시)")
 
 class SearchResponse(BaseModel):
     """검색 응답 모델"""
@@ -60,6 +68,26 @@ class SearchResponse(BaseModel):
     total_results: int = Field(..., description="총 결과 수")
     processing_time: float = Field(..., description="처리 시간 (초)")
 
+class BatchSearchQuery(BaseModel):
+    """배치 검색의 개별 쿼리 모델"""
+    query: str = Field(..., description="검색 쿼리")
+    limit: int = Field(10, description="반환할 결과 수")
+    score_threshold: float = Field(0.0, description="점수 임계값")
+    document_id: Optional[str] = Field(None, description="특정 문서 ID")
+    page_number: Optional[int] = Field(None, description="특정 페이지 번호")
+    vector_name: Optional[str] = Field(None, pattern="^(body|title|fused)$",
+                                       description="이름 있는 벡터 컬렉션의 검색 대상 (body, title, fused)")
+
+class BatchSearchRequest(BaseModel):
+    """배치 검색 요청 모델"""
+    queries: List[BatchSearchQuery] = Field(..., min_length=1, description="검색 쿼리 목록")
+
+class BatchSearchResponse(BaseModel):
+    """배치 검색 응답 모델"""
+    results: List[SearchResponse] = Field(..., description="쿼리별 검색 결과 (요청 순서)")
+    total_queries: int = Field(..., description="총 쿼리 수")
+    processing_time: float = Field(..., description="전체 처리 시간 (초)")
+
 class DocumentInfo(BaseModel):
     """문서 정보 모델"""
     document_id: str = Field(..., description="문서 ID")
@@ -122,6 +150,7 @@ class HealthCheckResponse(BaseModel):
     qdrant_status: str = Field(..., description="Qdrant 상태")
     ollama_status: str = Field(..., description="Ollama 상태")
     timestamp: datetime = Field(..., description="체크 시간")
+    details: Optional[Dict[str, Any]] = Field(None, description="의존 서비스별 상세 상태 및 지연 시간 히스토그램")
 
 class QARequest(BaseModel):
     """Q&A 요청 모델"""
@@ -132,6 +161,9 @@ class QARequest(BaseModel):
     document_id: str = Field(default=None, description="검색할 문서의 document_id (선택)")
     collection_name: str = Field(default=None, description="검색할 Qdrant 컬렉션명 (선택)")
     history: list = Field(default=None, description="이전 Q&A 대화 이력 (예: [{\"role\": \"user\", \"content\": ...}, {\"role\": \"assistant\", ...}])")
+    use_mmr: bool = Field(default=False, description="MMR로 중복 컨텍스트를 줄이고 다양한 청크 선택")
+    session_id: Optional[str] = Field(default=None, description="대화 세션 ID (서버가 대화 이력을 기억하므로 history 생략 가능)")
+    include_timings: bool = Field(default=False, description="단계별 소요 시간(timings) 포함 여부 (디버그용)")
 
 class QAResponse(BaseModel):
     """Q&A 응답 모델"""
@@ -140,6 +172,10 @@ class QAResponse(BaseModel):
     sources: List[Dict[str, Any]] = Field(default=[], description="참조 소스")
     search_results: List[Dict[str, Any]] = Field(default=[], description="검색 결과")
     context_count: int = Field(default=0, description="사용된 컨텍스트 수")
+    context_stats: Optional[Dict[str, Any]] = Field(None, description="컨텍스트 패킹 통계 (토큰 절감량 등)")
+    generation_stats: Optional[Dict[str, Any]] = Field(None, description="LLM 프롬프트 처리/생성 시간 통계")
+    timings: Optional[List[Dict[str, Any]]] = Field(None, description="단계별 소요 시간 (include_timings 요청 시)")
+    session_id: Optional[str] = Field(None, description="대화 세션 ID")
     processing_time: Optional[float] = Field(None, description="처리 시간")
     stats: Optional[Dict[str, Any]] = Field(None, description="통계 정보")
     documents: Optional[List[Dict[str, Any]]] = Field(None, description="문서 정보")
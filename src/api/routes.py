@@ -1,25 +1,34 @@
-from .upload_progress import ProgressTracker, get_progress
+from .upload_progress import get_progress, FINISHED_STATUSES
+import asyncio
+import json
 import os
 import time
 import uuid
 from typing import List
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, BackgroundTasks
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, Response
 from loguru import logger
 
 from .models import (
     PDFUploadResponse, SearchRequest, SearchResponse, 
     DocumentsResponse, CollectionInfo, DeleteDocumentResponse,
     ErrorResponse, HealthCheckResponse, QARequest, QAResponse,
-    FeedbackRequest, FeedbackResponse
+    FeedbackRequest, FeedbackResponse,
+    BatchSearchRequest, BatchSearchResponse
 )
-from ..pdf_processor import PDFProcessor, get_processor
-from ..text_chunker import TextChunker
-from ..embedding_service import EmbeddingService
-from ..qdrant_manager import QdrantManager
-from ..search_service import SearchService
 from ..config import config
-from src.qa_service import QAService
+from src.conversation_memory import conversation_memory
+from src.model_residency import model_residency
+from src.health_monitor import get_health_monitor
+from src.job_queue import get_job_queue, subscribe_job_updates, unsubscribe_job_updates, INGEST_TASK
+from src.content_registry import get_content_registry
+from src.metrics import (
+    METRICS_AVAILABLE, CONTENT_TYPE_LATEST, QUEUE_DEPTH, DEPENDENCY_UP,
+    register_gauge_refresher, render_latest
+)
+from src.upload_storage import save_upload, parse_size, make_document_id, UploadTooLarge
+from src.tracing import current_trace
+from src.services import create_qa_service, get_qdrant_manager, get_search_service
 
 
 # 라우터 생성
@@ -33,7 +42,7 @@ async def download_document(document_id: str):
     """
     try:
         # Qdrant에서 document_id로 메타데이터 조회
-        meta = qdrant_manager.get_document_metadata(document_id)
+        meta = get_qdrant_manager().get_document_metadata(document_id)
         if not meta or 'file_path' not in meta:
             raise HTTPException(status_code=404, detail="파일 경로 정보가 없습니다.")
         file_path = meta['file_path']
@@ -50,49 +59,50 @@ async def download_document(document_id: str):
 async def upload_progress(task_id: str):
     return get_progress(task_id)
 
-@router.post("/qa/feedback", response_model=FeedbackResponse, summary="Q&A 답변 피드백/수정 요청")
-async def submit_feedback(request: FeedbackRequest):
-    """Q&A 답변에 대한 사용자 피드백/수정 요청을 처리합니다."""
-    try:
-        feedback_id = str(uuid.uuid4())
-        # 실제 운영에서는 DB나 파일 등에 저장 필요. 여기서는 로그로만 기록
-        logger.info(f"[피드백] ID: {feedback_id}\n질문: {request.question}\n답변: {request.answer}\n유형: {request.feedback_type}\n상세: {request.feedback_detail}\n사용자: {request.user_id}")
-        return FeedbackResponse(
-            status="success",
-            message="피드백이 정상적으로 접수되었습니다.",
-            feedback_id=feedback_id
-        )
-    except Exception as e:
-        logger.error(f"피드백 처리 중 오류: {e}")
-        return FeedbackResponse(
-            status="error",
-            message="피드백 처리 중 오류가 발생했습니다.",
-            feedback_id=None
-        )
-import os
-import time
-import uuid
-from typing import List
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, BackgroundTasks
-from fastapi.responses import JSONResponse
-from loguru import logger
-
+# 진행상태 푸시 (Server-Sent Events): 상태가 바뀔 때만 이벤트 전송, 종료 상태에서 스트림 종료
+# 같은 프로세스의 워커가 상태를 바꾸면 작업 큐 알림으로 바로 깨어나고, 별도 프로세스 워커의 변경은
+# PROGRESS_STREAM_INTERVAL마다 다시 확인
+@router.get("/upload-progress/{task_id}/events")
+async def upload_progress_events(task_id: str):
+    async def event_stream():
+        updated = subscribe_job_updates()
+        try:
+            last = None
+            last_sent = time.time()
+            unknown_since = None
+            while True:
+                # 조회 전에 clear해야 조회 중에 온 알림을 놓치지 않음
+                updated.clear()
+                status = await asyncio.to_thread(get_progress, task_id)
+                if status != last:
+                    last = status
+                    last_sent = time.time()
+                    yield f"event: progress\ndata: {json.dumps(status, ensure_ascii=False)}\n\n"
+                elif time.time() - last_sent > 15:
+                    # 프록시가 연결을 끊지 않도록 주기적으로 주석 전송
+                    last_sent = time.time()
+                    yield ": keep-alive\n\n"
+                if status["status"] in FINISHED_STATUSES:
+                    break
+                if status["status"] == "unknown":
+                    unknown_since = unknown_since or time.time()
+                    if time.time() - unknown_since > 10:
+                        break
+                else:
+                    unknown_since = None
+                try:
+                    await asyncio.wait_for(updated.wait(), timeout=config.PROGRESS_STREAM_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+            yield "event: end\ndata: {}\n\n"
+        finally:
+            unsubscribe_job_updates(updated)
 
-from .models import (
-    PDFUploadResponse, SearchRequest, SearchResponse, 
-    DocumentsResponse, CollectionInfo, DeleteDocumentResponse,
-    ErrorResponse, HealthCheckResponse, QARequest, QAResponse
-)
-from ..pdf_processor import PDFProcessor, get_processor
-from ..text_chunker import TextChunker
-from ..embedding_service import EmbeddingService
-from ..qdrant_manager import QdrantManager
-from ..search_service import SearchService
-from ..config import config
-from src.qa_service import QAService
-
-# 라우터 생성
-router = APIRouter()
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("/qa/feedback", response_model=FeedbackResponse, summary="Q&A 답변 피드백/수정 요청")
 async def submit_feedback(request: FeedbackRequest):
@@ -114,105 +124,37 @@ async def submit_feedback(request: FeedbackRequest):
             feedback_id=None
         )
 
-# 서비스 인스턴스들
-pdf_processor = PDFProcessor()
 @router.post("/upload-file", response_model=PDFUploadResponse)
 async def upload_file(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     document_id: str = Form(None),
     collection_name: str = Form(None)
 ):
     """
-    다양한 파일(docx, xlsx, pptx, pdf 등)을 업로드하고 처리합니다. (비동기 백그라운드 처리)
+    다양한 파일(docx, xlsx, pptx, pdf 등)을 업로드하고 적재 작업 큐에 등록합니다. (워커가 비동기 처리)
     """
     start_time = time.time()
     try:
-        os.makedirs(config.UPLOAD_DIR, exist_ok=True)
-        file_path = os.path.join(config.UPLOAD_DIR, f"{uuid.uuid4()}_{file.filename}")
-        content = await file.read()
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
         name, ext = os.path.splitext(file.filename)
         if not ext:
             raise HTTPException(status_code=400, detail="파일 확장자가 없는 파일은 지원하지 않습니다.")
-        # 백그라운드 작업 등록
-        task_id = str(uuid.uuid4())
-        tracker = ProgressTracker(task_id)
-        tracker.set_progress(10, "파일 업로드 완료, 처리 대기 중")
-        def process_file_task():
-            try:
-                tracker.set_progress(20, "텍스트/청크 추출 중...")
-                processor = get_processor(file_path)
-                if ext.lower() == '.xlsx':
-                    # 엑셀은 extract_chunks로 질문/답변 분리 청크 추출
-                    chunks = processor.extract_chunks(file_path, department=collection_name)
-                    tracker.set_progress(40, f"엑셀 청크 {len(chunks)}개 추출 완료, 임베딩 중...")
-                    if not chunks:
-                        tracker.set_error("엑셀 청크 추출 실패")
-                        logger.error(f"[백그라운드] 엑셀 청크 추출 실패: {file.filename}")
-                        return
-                else:
-                    # 그 외 파일은 기존 방식
-                    extracted = processor.extract_text(file_path)
-                    if isinstance(extracted, dict):
-                        text = extracted.get('text', '')
-                        if ext.lower() == '.pdf':
-                            metadata = extracted.get('metadata', {})
-                            metadata['title'] = file.filename
-                            metadata['file_type'] = ext.lower()
-                        else:
-                            metadata = {
-                                'title': file.filename,
-                                'file_type': ext.lower(),
-                            }
-                    else:
-                        text = extracted
-                        metadata = {
-                            'title': file.filename,
-                            'file_type': ext.lower(),
-                        }
-                    logger.info(f"[OCR 추출 결과] 파일명: {file.filename}\n{text}")
-                    if not text or not isinstance(text, str) or not text.strip():
-                        tracker.set_error("텍스트 추출 실패")
-                        logger.error(f"[백그라운드] 텍스트 추출 실패: {file.filename}")
-                        return
-                    chunks = text_chunker.chunk_text(text)
-                    tracker.set_progress(40, f"청크 {len(chunks)}개 생성 완료, 임베딩 중...")
-                    if not chunks:
-                        tracker.set_error("청크 생성 실패")
-                        logger.error(f"[백그라운드] 청크 생성 실패: {file.filename}")
-                        return
-                embedded_chunks = embedding_service.embed_chunks(chunks)
-                tracker.set_progress(80, "임베딩 완료, 벡터 DB 적재 중...")
-                if not embedded_chunks:
-                    tracker.set_error("임베딩 생성 실패")
-                    logger.error(f"[백그라운드] 임베딩 생성 실패: {file.filename}")
-                    return
-                # 엑셀은 이미 청크별 메타데이터 포함, 그 외는 일괄 메타데이터 부여
-                if ext.lower() != '.xlsx':
-                    for chunk in embedded_chunks:
-                        chunk['metadata'] = metadata
-                if document_id:
-                    doc_id = document_id
-                else:
-                    # 년월일시분초(예: 250817173232) 포맷으로 today 생성
-                    today = time.strftime('%y%m%d%H%M%S')
-                    dept = collection_name if collection_name else 'unknown'
-                    base_filename = os.path.basename(file.filename)
-                    doc_id = f"{today}_{dept}_{base_filename}"
-                qdrant_mgr = QdrantManager(collection_name=collection_name) if collection_name else QdrantManager()
-                success = qdrant_mgr.store_vectors(embedded_chunks, doc_id)
-                if not success:
-                    tracker.set_error("벡터 저장 실패")
-                    logger.error(f"[백그라운드] 벡터 저장 실패: {file.filename}")
-                    return
-                tracker.set_progress(100, "업로드 및 벡터 적재 완료")
-                logger.info(f"[백그라운드] 파일 처리 완료: {file.filename}")
-            except Exception as e:
-                tracker.set_error(f"파일 처리 중 오류: {e}")
-                logger.error(f"[백그라운드] 파일 처리 중 오류: {e}")
-        background_tasks.add_task(process_file_task)
+        os.makedirs(config.UPLOAD_DIR, exist_ok=True)
+        file_path = os.path.join(config.UPLOAD_DIR, f"{uuid.uuid4()}_{file.filename}")
+        # 메모리에 전부 올리지 않고 청크 단위로 저장하면서 해시 계산/크기 제한 검사
+        try:
+            saved = await save_upload(file, file_path, max_bytes=parse_size(config.MAX_FILE_SIZE))
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        # 작업 큐에 등록 (작업 ID가 진행상태 조회용 task_id)
+        # document_id를 등록 시점에 정해 두어 재시도/재리스 때 이전 시도의 포인트를 지우고 같은 ID로 다시 적재
+        task_id = get_job_queue().enqueue(INGEST_TASK, {
+            "file_path": file_path,
+            "filename": file.filename,
+            "collection_name": collection_name,
+            "document_id": document_id or make_document_id(collection_name, file.filename),
+            "file_size": saved["size"],
+            "content_hash": saved["sha256"]
+        })
         processing_time = time.time() - start_time
         return PDFUploadResponse(
             document_id=task_id,
@@ -220,15 +162,72 @@ async def upload_file(
             message="파일 업로드 완료, 벡터 DB 적재까지 진행상태를 추적합니다.",
             chunks_count=0,
             processing_time=processing_time,
-            metadata={"filename": file.filename, "file_type": ext.lower()}
+            metadata={
+                "filename": file.filename,
+                "file_type": ext.lower(),
+                "file_size": saved["size"],
+                "content_hash": saved["sha256"]
+            }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"파일 업로드 중 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-text_chunker = TextChunker()
-embedding_service = EmbeddingService()
-qdrant_manager = QdrantManager()
-search_service = SearchService(qdrant_manager, embedding_service)
+
+def _refresh_metric_gauges():
+    """큐 길이와 의존 서비스 상태를 스크레이프 시점 값으로 갱신"""
+    job_stats = get_job_queue().stats()
+    QUEUE_DEPTH.labels(queue="ingest_jobs").set(job_stats["queue_depth"])
+    QUEUE_DEPTH.labels(queue="ingest_jobs_running").set(job_stats["running"])
+    QUEUE_DEPTH.labels(queue="conversation_summary").set(conversation_memory.pending_summaries())
+    for name, dep in get_health_monitor().snapshot().items():
+        DEPENDENCY_UP.labels(dependency=name).set(1 if dep["status"] == "healthy" else 0)
+
+register_gauge_refresher("api", _refresh_metric_gauges)
+
+@router.get("/metrics", summary="Prometheus 지표", include_in_schema=False)
+async def metrics():
+    """임베딩/Qdrant/LLM/적재 단계별 지연 시간과 큐 길이, 캐시 적중 지표 (Prometheus 텍스트 형식)"""
+    if not METRICS_AVAILABLE:
+        return Response("prometheus_client가 설치되어 있지 않습니다\n", status_code=503, media_type="text/plain")
+    return Response(render_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+@router.get("/dedup/stats", summary="업로드 중복 제거 통계")
+async def get_dedup_stats():
+    """등록된 콘텐츠 해시 수와 중복 제거로 절약한 임베딩 호출 수를 조회합니다."""
+    try:
+        return get_content_registry().stats()
+    except Exception as e:
+        logger.error(f"중복 제거 통계 조회 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/jobs/stats", summary="적재 작업 큐 지표")
+async def get_job_stats():
+    """대기/실행/완료/실패 작업 수와 가장 오래된 대기 작업의 대기 시간을 조회합니다."""
+    try:
+        return get_job_queue().stats()
+    except Exception as e:
+        logger.error(f"작업 큐 지표 조회 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/jobs/{job_id}", summary="적재 작업 조회")
+async def get_job(job_id: str):
+    """적재 작업의 상태, 진행률, 시도 횟수, 결과를 조회합니다."""
+    job = get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job
+
+@router.post("/jobs/{job_id}/cancel", summary="적재 작업 취소")
+async def cancel_job(job_id: str):
+    """대기 중인 작업은 즉시, 실행 중인 작업은 다음 단계 전에 취소됩니다."""
+    job_queue = get_job_queue()
+    if not job_queue.get(job_id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    if not job_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail="이미 종료된 작업입니다")
+    return {"job_id": job_id, "status": job_queue.get(job_id)["status"], "cancel_requested": True}
 
 
 @router.post("/search", response_model=SearchResponse)
@@ -239,13 +238,28 @@ async def search_documents(request: SearchRequest):
     start_time = time.time()
     
     try:
-        results = search_service.search(
-            query=request.query,
-            limit=request.limit,
-            score_threshold=request.score_threshold,
-            document_id=request.document_id,
-            page_number=request.page_number
-        )
+        if request.collection_names or request.all_collections:
+            # 여러 부서 컬렉션 동시 검색 (all_collections면 전체)
+            results = get_search_service().search_collections(
+                query=request.query,
+                collection_names=None if request.all_collections else request.collection_names,
+                limit=request.limit,
+                score_threshold=request.score_threshold,
+                document_id=request.document_id,
+                page_number=request.page_number,
+                vector_name=request.vector_name
+            )
+        else:
+            results = get_search_service().search(
+                query=request.query,
+                limit=request.limit,
+                score_threshold=request.score_threshold,
+                document_id=request.document_id,
+                page_number=request.page_number,
+                use_mmr=request.use_mmr,
+                mmr_lambda=request.mmr_lambda,
+                vector_name=request.vector_name
+            )
         
         processing_time = time.time() - start_time
         
@@ -260,6 +274,37 @@ async def search_documents(request: SearchRequest):
         logger.error(f"검색 중 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_documents_batch(request: BatchSearchRequest):
+    """
+    여러 검색을 한 번에 수행합니다. (배치 임베딩 + Qdrant search_batch)
+    """
+    start_time = time.time()
+    
+    try:
+        queries = [q.model_dump() for q in request.queries]
+        batch_results = get_search_service().search_many(queries)
+        
+        processing_time = time.time() - start_time
+        
+        return BatchSearchResponse(
+            results=[
+                SearchResponse(
+                    query=q.query,
+                    results=results,
+                    total_results=len(results),
+                    processing_time=processing_time
+                )
+                for q, results in zip(request.queries, batch_results)
+            ],
+            total_queries=len(request.queries),
+            processing_time=processing_time
+        )
+        
+    except Exception as e:
+        logger.error(f"배치 검색 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 from fastapi import Query
 
 @router.get("/documents", response_model=DocumentsResponse)
@@ -273,13 +318,13 @@ async def get_documents(collection_name: str = Query(None, description="부서
         # 전체 컬렉션 조회
         if not collection_name:
             # Qdrant 연결이 안 되어 있으면 연결
+            qdrant_manager = get_qdrant_manager()
             if not qdrant_manager.client:
                 qdrant_manager.connect()
             all_collections = qdrant_manager.client.get_collections().collections
             for col in all_collections:
-                mgr = QdrantManager(collection_name=col.name)
-                if not mgr.client:
-                    mgr.connect()
+                # 컬렉션마다 새로 연결하지 않고 기존 클라이언트 공유
+                mgr = qdrant_manager.for_collection(col.name)
                 doc_ids = mgr.get_documents()
                 for doc_id in doc_ids:
                     meta = mgr.get_document_metadata(doc_id)
@@ -304,7 +349,7 @@ async def get_documents(collection_name: str = Query(None, description="부서
                         'collection_name': col.name
                     })
         else:
-            mgr = QdrantManager(collection_name=collection_name)
+            mgr = get_qdrant_manager().for_collection(collection_name)
             doc_ids = mgr.get_documents()
             for doc_id in doc_ids:
                 meta = mgr.get_document_metadata(doc_id)
@@ -342,7 +387,7 @@ async def get_collection_info():
     Qdrant 컬렉션 정보를 반환합니다.
     """
     try:
-        infos = search_service.qdrant_manager.get_all_collections_info()
+        infos = get_search_service().qdrant_manager.get_all_collections_info()
         if not infos:
             raise HTTPException(status_code=404, detail="컬렉션 정보를 찾을 수 없습니다")
         return infos
@@ -350,6 +395,17 @@ async def get_collection_info():
         logger.error(f"컬렉션 정보 조회 중 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.delete("/collections/{collection_name}")
+async def delete_collection(collection_name: str):
+    """
+    컬렉션(부서)을 삭제합니다. (스키마 캐시도 함께 무효화)
+    """
+    mgr = get_qdrant_manager().for_collection(collection_name)
+    if not mgr.delete_collection():
+        raise HTTPException(status_code=500, detail="컬렉션 삭제 실패")
+    get_content_registry().forget_collection(collection_name)
+    return {"collection_name": collection_name, "status": "deleted"}
+
 from fastapi import Query
 
 # collection_name 쿼리 파라미터를 추가하여 컬렉션별로 문서 삭제
@@ -360,8 +416,9 @@ async def delete_document(document_id: str, collection_name: str = Query(None, d
     """
     try:
         # 1. Qdrant 데이터 삭제
+        deleted_from = collection_name
         if collection_name:
-            mgr = QdrantManager(collection_name=collection_name)
+            mgr = get_qdrant_manager().for_collection(collection_name)
             success = mgr.delete_document(document_id)
             # 2. 파일 삭제 (collection_name이 명확할 때만)
             meta = mgr.get_document_metadata(document_id)
@@ -370,21 +427,26 @@ async def delete_document(document_id: str, collection_name: str = Query(None, d
             found = False
             deleted_chunks = 0
             meta = None
+            qdrant_manager = get_qdrant_manager()
             if not qdrant_manager.client:
                 qdrant_manager.connect()
             all_collections = qdrant_manager.client.get_collections().collections
             for col in all_collections:
-                mgr = QdrantManager(collection_name=col.name)
-                if not mgr.client:
-                    mgr.connect()
+                mgr = qdrant_manager.for_collection(col.name)
+                # 포인트가 없는 컬렉션도 delete_document는 성공을 반환하므로 먼저 확인
+                if mgr.count_document_points(document_id) == 0:
+                    continue
                 success = mgr.delete_document(document_id)
                 if success:
                     found = True
+                    deleted_from = col.name
                     # 파일 삭제를 위해 메타데이터 조회
                     meta = mgr.get_document_metadata(document_id)
                     break
             if not found:
                 raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다")
+        # 중복 제거 레지스트리에서도 제거 (같은 내용을 다시 올리면 새로 적재, 실제로 삭제한 컬렉션만)
+        get_content_registry().forget(document_id, deleted_from)
         # 2. 파일 삭제 (메타데이터에 file_path가 있으면)
         file_deleted = False
         if meta and isinstance(meta, dict):
@@ -401,6 +463,8 @@ async def delete_document(document_id: str, collection_name: str = Query(None, d
             message=f"문서 삭제 완료 (파일 삭제: {'성공' if file_deleted else '실패/없음'})",
             deleted_chunks=0  # 실제로는 삭제된 청크 수를 계산해야 함
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"문서 삭제 중 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -408,23 +472,22 @@ async def delete_document(document_id: str, collection_name: str = Query(None, d
 @router.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     """
-    서비스 상태를 확인합니다.
+    서비스 상태를 확인합니다. (백그라운드 점검 결과 캐시를 반환)
     """
     try:
-        # Qdrant 연결 확인
-        qdrant_status = "healthy" if qdrant_manager.connect() else "unhealthy"
-        
-        # Ollama 연결 확인
-        ollama_status = "healthy" if embedding_service.validate_model() else "unhealthy"
+        health_monitor = get_health_monitor()
+        qdrant_status = health_monitor.get_status("qdrant")
+        ollama_status = health_monitor.get_status("ollama")
         
         # 전체 상태 결정
-        overall_status = "healthy" if qdrant_status == "healthy" and ollama_status == "healthy" else "unhealthy"
+        overall_status = "healthy" if health_monitor.is_ready() else "unhealthy"
         
         return HealthCheckResponse(
             status=overall_status,
             qdrant_status=qdrant_status,
             ollama_status=ollama_status,
-            timestamp=time.time()
+            timestamp=health_monitor.last_checked() or time.time(),
+            details=health_monitor.snapshot()
         )
         
     except Exception as e:
@@ -436,19 +499,39 @@ async def health_check():
             timestamp=time.time()
         )
 
+@router.get("/ready")
+async def readiness_check():
+    """
+    트래픽을 받을 준비가 되었는지 확인합니다. (모든 의존 서비스 정상 시 200, 아니면 503)
+    """
+    health_monitor = get_health_monitor()
+    ready = health_monitor.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "qdrant_status": health_monitor.get_status("qdrant"),
+            "ollama_status": health_monitor.get_status("ollama"),
+            "last_checked": health_monitor.last_checked()
+        }
+    )
+
 @router.post("/qa", response_model=QAResponse, summary="Q&A 질문")
 async def ask_question(request: QARequest):
     """Q&A 질문 처리"""
     try:
         start_time = time.time()
-        qa_service = QAService()
+        qa_service = create_qa_service()
         if request.include_metadata:
             result = qa_service.ask_with_metadata(
                 question=request.question,
                 collection_name=request.collection_name,
                 max_results=request.max_results,
                 max_tokens=request.max_tokens,
-                document_id=request.document_id
+                document_id=request.document_id,
+                history=request.history,
+                use_mmr=request.use_mmr,
+                session_id=request.session_id
             )
         else:
             result = qa_service.ask_question(
@@ -457,10 +540,15 @@ async def ask_question(request: QARequest):
                 max_results=request.max_results,
                 max_tokens=request.max_tokens,
                 document_id=request.document_id,
-                history=request.history
+                history=request.history,
+                use_mmr=request.use_mmr,
+                session_id=request.session_id
             )
         processing_time = time.time() - start_time
         result["processing_time"] = processing_time
+        trace = current_trace()
+        if request.include_timings and trace:
+            result["timings"] = trace.timings()
         return QAResponse(**result)
     except Exception as e:
         logger.error(f"Q&A 처리 중 오류: {e}")
@@ -470,22 +558,45 @@ async def ask_question(request: QARequest):
             error=str(e)
         )
 
+@router.get("/qa/sessions/{session_id}", summary="대화 세션 메모리 조회")
+async def get_conversation_session(session_id: str):
+    """서버에 저장된 대화 요약과 최근 턴을 조회합니다."""
+    memory = conversation_memory.get_history(session_id)
+    return {
+        "session_id": session_id,
+        "summary": memory["summary"],
+        "turns": memory["turns"]
+    }
+
+@router.delete("/qa/sessions/{session_id}", summary="대화 세션 메모리 삭제")
+async def delete_conversation_session(session_id: str):
+    """서버에 저장된 대화 메모리와 LLM context를 삭제합니다."""
+    conversation_memory.clear(session_id)
+    from src.qa_service import QAService
+    QAService.reset_session(session_id)
+    return {"session_id": session_id, "status": "deleted"}
+
 @router.get("/qa/models", summary="사용 가능한 LLM 모델 목록")
 async def get_available_models():
     """사용 가능한 LLM 모델 목록 조회"""
     try:
-        qa_service = QAService()
+        qa_service = create_qa_service()
         models = qa_service.get_available_models()
         return {"models": models}
     except Exception as e:
         logger.error(f"모델 목록 조회 중 오류: {e}")
         return {"models": [], "error": str(e)}
 
+@router.get("/models/residency", summary="Ollama 모델 상주 상태")
+async def get_model_residency():
+    """임베딩/LLM 모델의 로드 상태와 최근 로드/언로드 이벤트를 조회합니다."""
+    return model_residency.status()
+
 @router.get("/qa/test", summary="Q&A 서비스 테스트")
 async def test_qa_service():
     """Q&A 서비스 연결 테스트"""
     try:
-        qa_service = QAService()
+        qa_service = create_qa_service()
         is_connected = qa_service.test_llm_connection()
         return {
             "status": "connected" if is_connected else "disconnected",
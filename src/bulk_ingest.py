@@ -0,0 +1,257 @@
+"""
+대량 적재 - 디렉토리 트리의 문서를 병렬로 추출/임베딩/저장
+처리 시작/결과를 매니페스트(JSON Lines)에 기록하여 중단된 실행을 이어서 진행할 수 있습니다.
+다시 처리하는 파일은 이전 시도(중단/실패/변경 전 버전)의 document_id 포인트를 먼저 삭제합니다.
+
+    python -m src.bulk_ingest /mnt/shared/정책 --collection 인사팀 --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+from loguru import logger
+
+from src.config import config
+from src.pdf_processor import SUPPORTED_EXTENSIONS
+from src.ingestion import ingest_file, remove_document_points
+from src.text_chunker import TextChunker
+from src.embedding_service import EmbeddingService
+from src.qdrant_manager import QdrantManager
+
+
+class IngestManifest:
+    """파일별 처리 결과를 JSON Lines로 기록하는 매니페스트"""
+
+    def __init__(self, path: str):
+        """
+        IngestManifest 초기화
+
+        Args:
+            path: 매니페스트 파일 경로 (있으면 이전 기록을 읽어옴)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 중단 시점에 잘린 마지막 줄은 무시
+                        continue
+                    self.entries[entry["path"]] = entry
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def is_done(self, path: str, size: int, mtime: float) -> bool:
+        """같은 크기/수정 시각의 파일을 이미 성공적으로 처리했는지 여부"""
+        entry = self.entries.get(path)
+        return bool(entry and entry.get("status") == "done"
+                    and entry.get("size") == size and entry.get("mtime") == mtime)
+
+    def previous_document_id(self, path: str) -> Optional[str]:
+        """
+        이전 실행에서 이 파일로 저장한 document_id (시작만 기록되고 중단된 경우 포함)
+        중복 제거로 다른 파일의 기존 문서를 그대로 재사용한 경우는 그 파일의 문서이므로 None
+        """
+        entry = self.entries.get(path)
+        if not entry or entry.get("deduplicated") == "existing":
+            return None
+        return entry.get("document_id")
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        """처리 결과 한 건을 추가 기록합니다. (같은 경로는 마지막 기록이 유효)"""
+        with self._lock:
+            self.entries[entry["path"]] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def discover_files(root: str, extensions=SUPPORTED_EXTENSIONS) -> List[str]:
+    """
+    디렉토리 트리에서 처리 가능한 파일을 찾습니다.
+
+    Args:
+        root: 시작 디렉토리
+        extensions: 처리할 확장자 목록
+
+    Returns:
+        정렬된 파일 경로 리스트
+    """
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        # 숨김 디렉토리(.git 등)는 건너뜀
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            if name.startswith(".") or name.startswith("~$"):
+                continue
+            if os.path.splitext(name)[1].lower() in extensions:
+                files.append(os.path.join(dirpath, name))
+    return sorted(files)
+
+
+class BulkIngestor:
+    """디렉토리 단위 대량 적재 클래스"""
+
+    def __init__(self, root: str, collection_name: str = None, concurrency: int = 4,
+                 manifest_path: str = None, report_interval: float = 10.0, qdrant_manager: QdrantManager = None):
+        """
+        BulkIngestor 초기화
+
+        Args:
+            root: 적재할 디렉토리
+            collection_name: 저장할 컬렉션(부서) 이름
+            concurrency: 동시에 처리할 파일 수
+            manifest_path: 매니페스트 파일 경로 (기본: <root>/.ingest_manifest.jsonl)
+            report_interval: 처리 속도 로그 주기 (초)
+            qdrant_manager: Qdrant 매니저 (없으면 설정의 서버에 연결)
+        """
+        self.root = os.path.abspath(root)
+        self.collection_name = collection_name
+        self.concurrency = max(1, concurrency)
+        self.manifest = IngestManifest(manifest_path or os.path.join(self.root, ".ingest_manifest.jsonl"))
+        self.report_interval = report_interval
+        self.text_chunker = TextChunker()
+        self.embedding_service = EmbeddingService()
+        qdrant_manager = qdrant_manager or QdrantManager()
+        self.qdrant_manager = qdrant_manager.for_collection(collection_name) if collection_name else qdrant_manager
+        self._lock = threading.Lock()
+        self.stats = {"files_done": 0, "files_failed": 0, "files_skipped": 0, "chunks": 0}
+
+    def _document_id(self, rel_path: str) -> str:
+        # 하위 폴더에 같은 파일명이 있어도 겹치지 않도록 상대 경로로 ID 생성
+        today = time.strftime('%y%m%d%H%M%S')
+        dept = self.collection_name if self.collection_name else 'unknown'
+        return f"{today}_{dept}_{rel_path.replace(os.sep, '_')}"
+
+    def _process(self, path: str, size: int, mtime: float) -> Dict[str, Any]:
+        rel_path = os.path.relpath(path, self.root)
+        start = time.time()
+        document_id = self._document_id(rel_path)
+        entry = {"path": rel_path, "size": size, "mtime": mtime, "document_id": document_id}
+        # document_id에 적재 시각이 들어가므로, 이전 시도(중단/실패/변경 전 버전)의 포인트를 먼저 지우지 않으면
+        # 중단 전에 일부 저장된 포인트가 중복으로 남음
+        previous_id = self.manifest.previous_document_id(rel_path)
+        if previous_id and not remove_document_points(self.qdrant_manager, previous_id):
+            # 다음 실행에서 다시 삭제하도록 이전 document_id를 유지
+            entry.update(document_id=previous_id, status="error", error=f"이전 적재 포인트 삭제 실패: {previous_id}",
+                         finished_at=time.time())
+            logger.error(f"[대량 적재] 이전 적재 포인트 삭제 실패: {rel_path} ({previous_id})")
+            self.manifest.record(entry)
+            return entry
+        try:
+            # 저장 도중 중단되어도 다음 실행에서 지울 수 있도록 document_id를 먼저 기록
+            self.manifest.record({**entry, "status": "started", "started_at": start})
+            result = ingest_file(
+                path,
+                os.path.basename(path),
+                collection_name=self.collection_name,
+                document_id=document_id,
+                text_chunker=self.text_chunker,
+                embedding_service=self.embedding_service,
+                qdrant_manager=self.qdrant_manager
+            )
+            entry.update(status="done", document_id=result["document_id"], chunks=result["chunks_count"])
+            if result.get("deduplicated"):
+                entry["deduplicated"] = result["deduplicated"]
+        except Exception as e:
+            entry.update(status="error", error=str(e))
+            logger.error(f"[대량 적재] 파일 처리 실패: {rel_path} - {e}")
+        entry["elapsed"] = round(time.time() - start, 3)
+        entry["finished_at"] = time.time()
+        self.manifest.record(entry)
+        return entry
+
+    def _report(self, started: float, total: int) -> Dict[str, Any]:
+        elapsed = max(time.time() - started, 1e-9)
+        with self._lock:
+            stats = dict(self.stats)
+        processed = stats["files_done"] + stats["files_failed"]
+        stats.update(
+            total_files=total,
+            elapsed=round(elapsed, 3),
+            files_per_sec=round(processed / elapsed, 3),
+            chunks_per_sec=round(stats["chunks"] / elapsed, 3)
+        )
+        return stats
+
+    def run(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        디렉토리를 적재합니다. 매니페스트에 완료로 기록된 파일은 건너뜁니다.
+
+        Args:
+            limit: 처리할 최대 파일 수 (시험 실행용)
+
+        Returns:
+            처리/실패/건너뜀 파일 수, 청크 수, files_per_sec, chunks_per_sec 등 통계
+        """
+        files = discover_files(self.root)
+        pending = []
+        for path in files:
+            stat = os.stat(path)
+            if self.manifest.is_done(os.path.relpath(path, self.root), stat.st_size, stat.st_mtime):
+                self.stats["files_skipped"] += 1
+                continue
+            pending.append((path, stat.st_size, stat.st_mtime))
+        if limit:
+            pending = pending[:limit]
+        logger.info(f"[대량 적재] 대상 {len(files)}개, 처리 {len(pending)}개, "
+                    f"이전 실행 완료로 건너뜀 {self.stats['files_skipped']}개 (동시 처리 {self.concurrency})")
+
+        started = time.time()
+        last_report = started
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self._process, *item) for item in pending]
+            for future in as_completed(futures):
+                entry = future.result()
+                with self._lock:
+                    if entry["status"] == "done":
+                        self.stats["files_done"] += 1
+                        self.stats["chunks"] += entry.get("chunks", 0)
+                    else:
+                        self.stats["files_failed"] += 1
+                if time.time() - last_report >= self.report_interval:
+                    last_report = time.time()
+                    stats = self._report(started, len(pending))
+                    logger.info(f"[대량 적재] 진행 {stats['files_done'] + stats['files_failed']}/{len(pending)} "
+                                f"({stats['files_per_sec']} files/s, {stats['chunks_per_sec']} chunks/s)")
+
+        stats = self._report(started, len(pending))
+        logger.info(f"[대량 적재] 완료: 성공 {stats['files_done']}개, 실패 {stats['files_failed']}개, "
+                    f"청크 {stats['chunks']}개, {stats['files_per_sec']} files/s, {stats['chunks_per_sec']} chunks/s")
+        return stats
+
+
+def main():
+    """대량 적재 명령"""
+    parser = argparse.ArgumentParser(description="디렉토리 문서 대량 적재")
+    parser.add_argument("directory", help="적재할 디렉토리")
+    parser.add_argument("--collection", default=None, help=f"컬렉션(부서) 이름 (기본: {config.QDRANT_COLLECTION_NAME})")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 처리 파일 수")
+    parser.add_argument("--manifest", default=None, help="매니페스트 경로 (기본: <directory>/.ingest_manifest.jsonl)")
+    parser.add_argument("--limit", type=int, default=None, help="처리할 최대 파일 수")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="처리 속도 로그 주기 (초)")
+    args = parser.parse_args()
+
+    ingestor = BulkIngestor(
+        args.directory,
+        collection_name=args.collection,
+        concurrency=args.concurrency,
+        manifest_path=args.manifest,
+        report_interval=args.report_interval
+    )
+    stats = ingestor.run(limit=args.limit)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,11 +17,71 @@ class Config:
     OLLAMA_HOST: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "nomic-embed-text")
     OLLAMA_EMBEDDING_MODEL: str = os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text")
+    OLLAMA_LLM_MODEL: str = os.getenv("OLLAMA_LLM_MODEL", "gemma3:latest")
+    
+    # Ollama 모델 상주(keep-alive) 설정
+    OLLAMA_EMBED_KEEP_ALIVE: str = os.getenv("OLLAMA_EMBED_KEEP_ALIVE", "30m")
+    OLLAMA_LLM_KEEP_ALIVE: str = os.getenv("OLLAMA_LLM_KEEP_ALIVE", "30m")
+    MODEL_KEEPWARM_ENABLED: bool = os.getenv("MODEL_KEEPWARM_ENABLED", "True").lower() == "true"
+    MODEL_KEEPWARM_INTERVAL: int = int(os.getenv("MODEL_KEEPWARM_INTERVAL", "240"))
+    
+    # 임베딩 백엔드 설정 (ollama: HTTP 호출, onnx: 프로세스 내 ONNX Runtime CPU 추론)
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "ollama")
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    EMBEDDING_ONNX_MODEL_PATH: str = os.getenv("EMBEDDING_ONNX_MODEL_PATH", "models/embedding/model.onnx")
+    EMBEDDING_ONNX_TOKENIZER_PATH: str = os.getenv("EMBEDDING_ONNX_TOKENIZER_PATH", "models/embedding/tokenizer.json")
+    EMBEDDING_ONNX_MODEL_NAME: str = os.getenv("EMBEDDING_ONNX_MODEL_NAME", "")
+    EMBEDDING_ONNX_THREADS: int = int(os.getenv("EMBEDDING_ONNX_THREADS", "0"))
+    EMBEDDING_ONNX_MAX_LENGTH: int = int(os.getenv("EMBEDDING_ONNX_MAX_LENGTH", "512"))
+    EMBEDDING_ONNX_POOLING: str = os.getenv("EMBEDDING_ONNX_POOLING", "mean")
+    
+    # 헬스 체크 설정 (백그라운드 점검 주기, 초)
+    HEALTH_CHECK_INTERVAL: float = float(os.getenv("HEALTH_CHECK_INTERVAL", "10"))
     
     # 텍스트 청킹 설정
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "512"))
     CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "50"))
     
+    # LLM 컨텍스트 패킹 설정 (프롬프트에 넣을 참고 내용의 최대 토큰 수)
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2048"))
+    
+    # 대화 세션별 LLM context 재사용 캐시 크기 (세션 수), 사용되지 않은 세션을 제거할 시간 (초)
+    LLM_SESSION_CACHE_SIZE: int = int(os.getenv("LLM_SESSION_CACHE_SIZE", "256"))
+    LLM_SESSION_TTL_SECONDS: int = int(os.getenv("LLM_SESSION_TTL_SECONDS", "3600"))
+    # 재사용할 context 최대 토큰 수 (넘으면 앞부분 KEEP 토큰과 최근 토큰만 남겨 절반 길이로 줄임)
+    LLM_SESSION_CONTEXT_MAX_TOKENS: int = int(os.getenv("LLM_SESSION_CONTEXT_MAX_TOKENS", "8192"))
+    LLM_SESSION_CONTEXT_KEEP_TOKENS: int = int(os.getenv("LLM_SESSION_CONTEXT_KEEP_TOKENS", "512"))
+    
+    # 서버 측 대화 메모리 설정 (최근 턴 창 + 누적 요약)
+    CONVERSATION_WINDOW_TURNS: int = int(os.getenv("CONVERSATION_WINDOW_TURNS", "4"))
+    CONVERSATION_SUMMARY_MAX_CHARS: int = int(os.getenv("CONVERSATION_SUMMARY_MAX_CHARS", "1500"))
+    CONVERSATION_SUMMARY_MAX_DELAY: float = float(os.getenv("CONVERSATION_SUMMARY_MAX_DELAY", "30"))
+    CONVERSATION_TTL_SECONDS: int = int(os.getenv("CONVERSATION_TTL_SECONDS", "3600"))
+    CONVERSATION_MAX_SESSIONS: int = int(os.getenv("CONVERSATION_MAX_SESSIONS", "1000"))
+    
+    # 검색 다양화(MMR) 설정
+    MMR_LAMBDA: float = float(os.getenv("MMR_LAMBDA", "0.5"))
+    MMR_FETCH_MULTIPLIER: int = int(os.getenv("MMR_FETCH_MULTIPLIER", "4"))
+    
+    # 다중 컬렉션(부서) 동시 검색 설정
+    SEARCH_FANOUT_WORKERS: int = int(os.getenv("SEARCH_FANOUT_WORKERS", "8"))
+    
+    # 검색 정확도/속도 설정 (HNSW_EF=0이면 컬렉션 기본값, QA는 max_results x 배수만큼 후보를 받아 필터링)
+    QDRANT_SEARCH_HNSW_EF: int = int(os.getenv("QDRANT_SEARCH_HNSW_EF", "0"))
+    QA_FETCH_MULTIPLIER: int = int(os.getenv("QA_FETCH_MULTIPLIER", "3"))
+    
+    # 저장 벡터 차원 축소 설정 (새 컬렉션에 적용할 태그: ''=없음, mrl256=앞쪽 256차원, pca256-<해시>=학습된 PCA)
+    VECTOR_REDUCTION: str = os.getenv("VECTOR_REDUCTION", "")
+    VECTOR_REDUCTION_DIR: str = os.getenv("VECTOR_REDUCTION_DIR", "data/reducers")
+    
+    # 이름 있는 다중 벡터 설정 (새 컬렉션을 body/title 벡터로 생성, 기본 검색 대상: body, title, fused)
+    # fused는 두 벡터 검색을 한 번의 배치 요청으로 보내 RRF로 합침 (제목 가중치, 벡터별 후보 배수, RRF 상수)
+    NAMED_VECTORS_ENABLED: bool = os.getenv("NAMED_VECTORS_ENABLED", "False").lower() == "true"
+    SEARCH_VECTOR: str = os.getenv("SEARCH_VECTOR", "fused")
+    VECTOR_FUSION_TITLE_WEIGHT: float = float(os.getenv("VECTOR_FUSION_TITLE_WEIGHT", "1.0"))
+    VECTOR_FUSION_FETCH_MULTIPLIER: int = int(os.getenv("VECTOR_FUSION_FETCH_MULTIPLIER", "2"))
+    VECTOR_FUSION_RRF_K: int = int(os.getenv("VECTOR_FUSION_RRF_K", "60"))
+    
     # 애플리케이션 설정
     APP_HOST: str = os.getenv("APP_HOST", "0.0.0.0")
     APP_PORT: int = int(os.getenv("APP_PORT", "8000"))
@@ -30,11 +90,43 @@ class Config:
     # 로깅 설정
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: str = os.getenv("LOG_FILE", "logs/app.log")
+    LOG_ROTATION: str = os.getenv("LOG_ROTATION", "10 MB")
+    LOG_RETENTION: str = os.getenv("LOG_RETENTION", "7 days")
+    
+    # 로깅 부하 설정 (비동기 큐 sink, 범주별 INFO/DEBUG 기록 비율, 메시지/필드 최대 길이, 적재 JSON 로그 경로)
+    LOG_ENQUEUE: bool = os.getenv("LOG_ENQUEUE", "True").lower() == "true"
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "search=0.05,qa=0.2,embedding=0.05")
+    LOG_MAX_MESSAGE_CHARS: int = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "4000"))
+    LOG_MAX_FIELD_CHARS: int = int(os.getenv("LOG_MAX_FIELD_CHARS", "200"))
+    LOG_INGEST_FILE: str = os.getenv("LOG_INGEST_FILE", "logs/ingest.jsonl")
     
     # 파일 업로드 설정
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "data/uploads")
     MAX_FILE_SIZE: str = os.getenv("MAX_FILE_SIZE", "100MB")
     
+    # 적재 작업 큐 설정 (API는 등록만, 워커가 리스를 잡고 처리)
+    JOB_QUEUE_BACKEND: str = os.getenv("JOB_QUEUE_BACKEND", "sqlite")
+    JOB_QUEUE_PATH: str = os.getenv("JOB_QUEUE_PATH", "data/jobs.db")
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BACKOFF: float = float(os.getenv("JOB_RETRY_BACKOFF", "5"))
+    INGEST_INLINE_WORKER: bool = os.getenv("INGEST_INLINE_WORKER", "True").lower() == "true"
+    INGEST_WORKER_CONCURRENCY: int = int(os.getenv("INGEST_WORKER_CONCURRENCY", "1"))
+    INGEST_POLL_INTERVAL: float = float(os.getenv("INGEST_POLL_INTERVAL", "1"))
+    JOB_RETENTION_SECONDS: float = float(os.getenv("JOB_RETENTION_SECONDS", "604800"))
+    
+    # 업로드 중복 제거 설정 (같은 내용의 파일은 기존 임베딩 재사용)
+    CONTENT_DEDUP_ENABLED: bool = os.getenv("CONTENT_DEDUP_ENABLED", "True").lower() == "true"
+    CONTENT_REGISTRY_PATH: str = os.getenv("CONTENT_REGISTRY_PATH", "data/content_registry.db")
+    
+    # 적재 진행상태 설정 (세부 진행 기록 최소 간격, SSE가 알림 없이 작업 큐를 다시 확인하는 주기)
+    # 같은 프로세스의 워커는 변경 즉시 알림을 보내고, 별도 프로세스 워커의 변경만 이 주기로 확인됨
+    PROGRESS_MIN_UPDATE_INTERVAL: float = float(os.getenv("PROGRESS_MIN_UPDATE_INTERVAL", "0.5"))
+    PROGRESS_STREAM_INTERVAL: float = float(os.getenv("PROGRESS_STREAM_INTERVAL", "2"))
+    
+    # 요청 트레이싱 설정 (지정 시 OTLP/JSON 파일로 내보내기)
+    TRACE_EXPORT_PATH: str = os.getenv("TRACE_EXPORT_PATH", "")
+    
     @classmethod
     def get_qdrant_url(cls) -> str:
         """Qdrant URL 반환"""
@@ -0,0 +1,170 @@
+"""
+콘텐츠 해시 레지스트리 - 파일 내용(SHA-256)별로 이미 적재된 문서를 기록
+같은 파일이 다시 올라오거나 다른 부서 컬렉션에 올라오면 재임베딩 없이 기존 벡터를 재사용합니다.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from loguru import logger
+from src.config import config
+
+# 파일 해시 계산 시 한 번에 읽는 크기 (1MB)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """
+    파일 내용의 SHA-256 해시를 계산합니다.
+
+    Args:
+        file_path: 파일 경로
+
+    Returns:
+        16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ContentRegistry:
+    """SQLite 기반 콘텐츠 해시 → (컬렉션, 문서 ID) 레지스트리"""
+
+    def __init__(self, path: str = None):
+        """
+        ContentRegistry 초기화
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+        """
+        self.path = path or config.CONTENT_REGISTRY_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS content_documents (
+                content_hash TEXT NOT NULL,
+                embedding_model TEXT NOT NULL,
+                collection_name TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                chunks_count INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, embedding_model, collection_name)
+            );
+            CREATE INDEX IF NOT EXISTS idx_content_documents_doc ON content_documents (document_id);
+            CREATE TABLE IF NOT EXISTS dedup_counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def find(self, content_hash: str, embedding_model: str) -> List[Dict[str, Any]]:
+        """
+        같은 내용, 같은 임베딩 모델로 적재된 문서 목록을 반환합니다.
+
+        Args:
+            content_hash: 파일 내용 해시
+            embedding_model: 임베딩 모델 이름
+
+        Returns:
+            collection_name, document_id, chunks_count를 담은 리스트 (오래된 순)
+        """
+        rows = self._conn().execute(
+            "SELECT collection_name, document_id, chunks_count FROM content_documents "
+            "WHERE content_hash = ? AND embedding_model = ? ORDER BY created_at",
+            (content_hash, embedding_model)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def register(self, content_hash: str, embedding_model: str, collection_name: str,
+                 document_id: str, chunks_count: int) -> None:
+        """적재 완료된 문서를 등록합니다. (같은 컬렉션의 기존 기록은 교체)"""
+        self._conn().execute(
+            "INSERT OR REPLACE INTO content_documents "
+            "(content_hash, embedding_model, collection_name, document_id, chunks_count, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (content_hash, embedding_model, collection_name, document_id, chunks_count, time.time())
+        )
+
+    def forget(self, document_id: str, collection_name: str = None) -> int:
+        """
+        삭제된 문서의 기록을 제거합니다.
+
+        Args:
+            document_id: 문서 ID
+            collection_name: 컬렉션 이름 (없으면 모든 컬렉션)
+
+        Returns:
+            제거한 기록 수
+        """
+        if collection_name:
+            cursor = self._conn().execute(
+                "DELETE FROM content_documents WHERE document_id = ? AND collection_name = ?",
+                (document_id, collection_name)
+            )
+        else:
+            cursor = self._conn().execute("DELETE FROM content_documents WHERE document_id = ?", (document_id,))
+        return cursor.rowcount
+
+    def forget_collection(self, collection_name: str) -> int:
+        """삭제된 컬렉션의 기록을 모두 제거합니다."""
+        cursor = self._conn().execute(
+            "DELETE FROM content_documents WHERE collection_name = ?", (collection_name,)
+        )
+        return cursor.rowcount
+
+    def record_saved(self, embedding_calls: int) -> None:
+        """중복 제거로 생략한 임베딩 호출 수를 누적합니다."""
+        conn = self._conn()
+        for name, value in (("dedup_hits", 1), ("embedding_calls_saved", embedding_calls)):
+            conn.execute(
+                "INSERT INTO dedup_counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, value)
+            )
+        logger.info(f"[중복 제거] 임베딩 호출 {embedding_calls}회 절약")
+
+    def stats(self) -> Dict[str, Any]:
+        """등록된 해시/문서 수와 누적 절약 통계"""
+        conn = self._conn()
+        counters = {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM dedup_counters")}
+        row = conn.execute(
+            "SELECT COUNT(DISTINCT content_hash) AS hashes, COUNT(*) AS documents FROM content_documents"
+        ).fetchone()
+        return {
+            "hashes": row["hashes"],
+            "documents": row["documents"],
+            "dedup_hits": counters.get("dedup_hits", 0),
+            "embedding_calls_saved": counters.get("embedding_calls_saved", 0)
+        }
+
+
+_instance: Optional[ContentRegistry] = None
+_instance_lock = threading.Lock()
+
+
+def get_content_registry() -> ContentRegistry:
+    """프로세스 전역 콘텐츠 해시 레지스트리를 반환합니다."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ContentRegistry()
+    return _instance
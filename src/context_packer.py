@@ -0,0 +1,180 @@
+"""
+컨텍스트 패커 - LLM 프롬프트에 넣을 검색 청크를 토큰 예산 안에서 압축/선택
+"""
+
+import math
+import re
+from typing import List, Dict, Any
+from loguru import logger
+from .config import config
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+|\S")
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수를 추정합니다.
+
+    토크나이저 없이 빠르게 계산하기 위한 근사치로, 영문/숫자 연속 구간은
+    4글자당 1토큰, 한글 등 그 외 문자는 글자당 1토큰으로 계산합니다.
+
+    Args:
+        text: 토큰 수를 셀 텍스트
+
+    Returns:
+        추정 토큰 수
+    """
+    if not text:
+        return 0
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        piece = match.group(0)
+        tokens += math.ceil(len(piece) / 4) if piece.isascii() and piece.isalnum() else 1
+    return tokens
+
+
+def _merge_overlap(left: str, right: str, max_overlap: int) -> str:
+    """앞 청크의 끝과 뒤 청크의 시작이 겹치는 부분을 한 번만 남기고 이어 붙입니다."""
+    limit = min(len(left), len(right), max_overlap)
+    for size in range(limit, 0, -1):
+        if left.endswith(right[:size]):
+            return left + right[size:]
+    return left + "\n" + right
+
+
+class ContextPacker:
+    """검색 결과를 토큰 예산에 맞게 병합/중복 제거/선택하는 클래스"""
+
+    def __init__(self, token_budget: int = None, max_overlap: int = None):
+        """
+        ContextPacker 초기화
+
+        Args:
+            token_budget: 컨텍스트에 사용할 최대 토큰 수
+            max_overlap: 인접 청크 간 중복으로 간주할 최대 글자 수
+        """
+        self.token_budget = token_budget or config.CONTEXT_TOKEN_BUDGET
+        self.max_overlap = max_overlap or config.CHUNK_OVERLAP * 2
+
+    @staticmethod
+    def _token_count(result: Dict[str, Any]) -> int:
+        """저장된 토큰 수가 있으면 사용하고, 없으면 추정합니다."""
+        token_count = result.get("token_count")
+        if isinstance(token_count, int) and token_count > 0:
+            return token_count
+        return estimate_tokens(result.get("text", ""))
+
+    def _merge_adjacent(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        같은 문서에서 chunk_index가 연속된 청크를 하나의 블록으로 병합합니다.
+
+        Args:
+            results: 관련도 순 검색 결과 리스트
+
+        Returns:
+            블록 리스트 (text, score, rank, 병합된 원본 결과 results 포함)
+        """
+        by_document: Dict[Any, List[tuple]] = {}
+        for rank, result in enumerate(results):
+            by_document.setdefault(result.get("document_id"), []).append((rank, result))
+
+        blocks = []
+        for items in by_document.values():
+            items.sort(key=lambda item: item[1].get("chunk_index", 0))
+            current = None
+            for rank, result in items:
+                text = result.get("text", "")
+                index = result.get("chunk_index", 0)
+                score = result.get("score", 0.0)
+                if current and index == current["last_index"] + 1:
+                    current["text"] = _merge_overlap(current["text"], text, self.max_overlap)
+                    current["last_index"] = index
+                    current["score"] = max(current["score"], score)
+                    current["rank"] = min(current["rank"], rank)
+                    current["results"].append(result)
+                else:
+                    current = {"text": text, "last_index": index, "score": score, "rank": rank, "results": [result]}
+                    blocks.append(current)
+        return blocks
+
+    @staticmethod
+    def _drop_redundant_sentences(blocks: List[Dict[str, Any]]) -> None:
+        """
+        앞선(더 관련도 높은) 블록에 이미 나온 문장을 뒤 블록에서 제거합니다.
+        표 행(|...|)과 아주 짧은 문장은 구조 유지를 위해 그대로 둡니다.
+        """
+        seen = set()
+        for block in blocks:
+            kept = []
+            for sentence in _SENTENCE_PATTERN.split(block["text"]):
+                stripped = sentence.strip()
+                if not stripped:
+                    continue
+                key = " ".join(stripped.split())
+                if stripped.startswith("|") or len(key) < 10:
+                    kept.append(stripped)
+                    continue
+                if key in seen:
+                    continue
+                seen.add(key)
+                kept.append(stripped)
+            block["text"] = "\n".join(kept)
+
+    def pack(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        검색 결과를 토큰 예산 안에서 프롬프트용 컨텍스트로 압축합니다.
+
+        Args:
+            results: 관련도 순 검색 결과 리스트
+
+        Returns:
+            texts(컨텍스트 텍스트 리스트), results(texts에 포함된 원본 결과, 출처 표기용)와
+            토큰 통계를 담은 딕셔너리
+        """
+        tokens_before = sum(self._token_count(r) for r in results if r.get("text"))
+
+        blocks = self._merge_adjacent([r for r in results if r.get("text")])
+        blocks.sort(key=lambda b: (-b["score"], b["rank"]))
+        self._drop_redundant_sentences(blocks)
+
+        texts = []
+        packed_results = []
+        tokens_after = 0
+        dropped = 0
+        for block in blocks:
+            if not block["text"]:
+                continue
+            tokens = estimate_tokens(block["text"])
+            if tokens_after + tokens > self.token_budget:
+                dropped += 1
+                continue
+            texts.append(block["text"])
+            packed_results.extend(block["results"])
+            tokens_after += tokens
+
+        # 가장 관련도 높은 블록 하나도 예산을 넘으면 잘라서라도 포함
+        if not texts and blocks and blocks[0]["text"]:
+            truncated = []
+            for line in blocks[0]["text"].split("\n"):
+                line_tokens = estimate_tokens(line)
+                if tokens_after + line_tokens > self.token_budget:
+                    break
+                truncated.append(line)
+                tokens_after += line_tokens
+            if truncated:
+                texts.append("\n".join(truncated))
+                packed_results.extend(blocks[0]["results"])
+                dropped -= 1
+
+        stats = {
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": max(tokens_before - tokens_after, 0),
+            "token_budget": self.token_budget,
+            "chunks_in": len(results),
+            "blocks_out": len(texts),
+            "blocks_dropped": max(dropped, 0)
+        }
+        logger.info(f"컨텍스트 패킹: {tokens_before} -> {tokens_after} 토큰 (절감 {stats['tokens_saved']})")
+        return {"texts": texts, "results": packed_results, "stats": stats}
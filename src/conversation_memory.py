@@ -0,0 +1,227 @@
+"""
+대화 메모리 - 세션 ID별 최근 대화 창 + 누적 요약 관리
+오래된 턴은 사용자 요청이 없을 때 백그라운드에서 LLM으로 요약하여 프롬프트 크기를 일정하게 유지합니다.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional
+import requests
+from loguru import logger
+from src.config import config
+
+
+class ConversationSession:
+    """세션별 대화 상태"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.summary = ""
+        self.turns: deque = deque()
+        self.pending: List[Dict[str, str]] = []  # 요약 대기 중인 오래된 턴
+        self.updated_at = time.time()
+        self.lock = threading.Lock()
+
+
+class ConversationMemory:
+    """세션 ID별 대화 메모리 클래스"""
+
+    def __init__(self, window_turns: int = None, summary_max_chars: int = None,
+                 ttl_seconds: int = None, max_sessions: int = None):
+        """
+        ConversationMemory 초기화
+
+        Args:
+            window_turns: 원문 그대로 유지할 최근 턴 수
+            summary_max_chars: 누적 요약의 최대 글자 수
+            ttl_seconds: 사용되지 않은 세션을 제거할 시간 (초)
+            max_sessions: 유지할 최대 세션 수
+        """
+        self.window_turns = window_turns or config.CONVERSATION_WINDOW_TURNS
+        self.summary_max_chars = summary_max_chars or config.CONVERSATION_SUMMARY_MAX_CHARS
+        self.ttl_seconds = ttl_seconds or config.CONVERSATION_TTL_SECONDS
+        self.max_sessions = max_sessions or config.CONVERSATION_MAX_SESSIONS
+        self.ollama_host = config.OLLAMA_HOST
+        self.llm_model = config.OLLAMA_LLM_MODEL
+
+        self._sessions: Dict[str, ConversationSession] = {}
+        self._sessions_lock = threading.Lock()
+        self._jobs: "queue.Queue[str]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+        # 사용자 요청 처리 중에는 요약 작업이 LLM을 점유하지 않도록 대기
+        self._foreground = 0
+        self._idle = threading.Condition()
+
+    # ---- 세션 조회/정리 ----
+    def _get_session(self, session_id: str, create: bool = False) -> Optional[ConversationSession]:
+        with self._sessions_lock:
+            self._evict_expired()
+            session = self._sessions.get(session_id)
+            if session is None and create:
+                session = ConversationSession(session_id)
+                self._sessions[session_id] = session
+                if len(self._sessions) > self.max_sessions:
+                    oldest = min(self._sessions.values(), key=lambda s: s.updated_at)
+                    self._sessions.pop(oldest.session_id, None)
+            return session
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        expired = [sid for sid, s in self._sessions.items() if now - s.updated_at > self.ttl_seconds]
+        for sid in expired:
+            self._sessions.pop(sid, None)
+
+    def has_session(self, session_id: str) -> bool:
+        """세션에 기억된 대화가 있는지 여부"""
+        session = self._get_session(session_id)
+        return bool(session and (session.turns or session.summary or session.pending))
+
+    def get_history(self, session_id: str) -> Dict[str, Any]:
+        """
+        프롬프트에 사용할 대화 메모리를 반환합니다.
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            summary(누적 요약)와 turns(최근 턴 리스트)를 담은 딕셔너리
+        """
+        session = self._get_session(session_id)
+        if not session:
+            return {"summary": "", "turns": []}
+        with session.lock:
+            # 아직 요약되지 않은 오래된 턴은 짧게 잘라 요약 뒤에 붙임
+            summary = session.summary
+            if session.pending:
+                pending_text = " ".join(f"Q: {t['question']} A: {t['answer']}" for t in session.pending)
+                summary = (summary + "\n" + pending_text).strip()[-self.summary_max_chars:]
+            return {"summary": summary, "turns": list(session.turns)}
+
+    def add_turn(self, session_id: str, question: str, answer: str) -> bool:
+        """
+        대화 턴을 추가합니다. 최근 창을 넘친 턴은 요약 대기열로 넘깁니다.
+
+        Args:
+            session_id: 세션 ID
+            question: 사용자 질문
+            answer: LLM 답변 (출처 목록 제외)
+
+        Returns:
+            오래된 턴이 요약 대상으로 넘어갔는지 여부
+        """
+        session = self._get_session(session_id, create=True)
+        with session.lock:
+            session.turns.append({"question": question, "answer": answer})
+            session.updated_at = time.time()
+            compacted = False
+            while len(session.turns) > self.window_turns:
+                session.pending.append(session.turns.popleft())
+                compacted = True
+        if compacted:
+            self._ensure_worker()
+            self._jobs.put(session_id)
+        return compacted
+
+    def clear(self, session_id: str) -> None:
+        """세션의 대화 메모리를 삭제합니다."""
+        with self._sessions_lock:
+            self._sessions.pop(session_id, None)
+
+    def pending_summaries(self) -> int:
+        """요약 대기 중인 세션 작업 수"""
+        return self._jobs.qsize()
+
+    # ---- 사용자 요청 우선 처리 ----
+    def foreground(self):
+        """사용자 요청 처리 구간을 표시하는 컨텍스트 매니저 (이 동안 요약 작업 대기)"""
+        memory = self
+
+        class _Foreground:
+            def __enter__(self_inner):
+                with memory._idle:
+                    memory._foreground += 1
+
+            def __exit__(self_inner, *exc):
+                with memory._idle:
+                    memory._foreground -= 1
+                    memory._idle.notify_all()
+                return False
+
+        return _Foreground()
+
+    def _wait_until_idle(self) -> None:
+        with self._idle:
+            self._idle.wait_for(lambda: self._foreground == 0,
+                                timeout=config.CONVERSATION_SUMMARY_MAX_DELAY)
+
+    # ---- 백그라운드 요약 ----
+    def _ensure_worker(self) -> None:
+        if self._worker and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run_worker, name="conversation-summarizer", daemon=True)
+        self._worker.start()
+
+    def _run_worker(self) -> None:
+        while True:
+            session_id = self._jobs.get()
+            try:
+                self._wait_until_idle()
+                self._compact(session_id)
+            except Exception as e:
+                logger.error(f"대화 요약 중 오류: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def _compact(self, session_id: str) -> None:
+        """요약 대기 중인 턴을 기존 요약과 합쳐 새 요약으로 만듭니다."""
+        session = self._get_session(session_id)
+        if not session:
+            return
+        with session.lock:
+            pending = list(session.pending)
+            previous = session.summary
+        if not pending:
+            return
+
+        summary = self._summarize(previous, pending)
+        with session.lock:
+            session.summary = summary
+            # 요약하는 동안 새로 넘어온 턴은 다음 작업에서 처리
+            session.pending = session.pending[len(pending):]
+        logger.info(f"대화 요약 완료: session={session_id}, {len(pending)}개 턴 -> {len(summary)}자")
+
+    def _summarize(self, previous: str, turns: List[Dict[str, str]]) -> str:
+        """LLM으로 요약하고, 실패 시 최근 내용 위주로 잘라서 반환합니다."""
+        dialogue = "\n".join(f"질문: {t['question']}\n답변: {t['answer']}" for t in turns)
+        prompt = (
+            f"다음은 이전 대화 요약과 이어지는 대화입니다. 이후 질문에 답할 때 필요한 사실과 맥락만 "
+            f"{self.summary_max_chars}자 이내의 한국어로 요약해 주세요.\n\n"
+            f"[이전 요약]\n{previous or '없음'}\n\n[대화]\n{dialogue}\n\n[요약]"
+        )
+        try:
+            response = requests.post(
+                f"{self.ollama_host}/api/generate",
+                json={
+                    "model": self.llm_model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "keep_alive": config.OLLAMA_LLM_KEEP_ALIVE,
+                    "options": {"temperature": 0.2, "num_predict": 512}
+                },
+                timeout=120
+            )
+            response.raise_for_status()
+            summary = response.json().get("response", "").strip()
+            if summary:
+                return summary[:self.summary_max_chars]
+        except Exception as e:
+            logger.warning(f"LLM 대화 요약 실패, 단순 축약으로 대체: {e}")
+        fallback = (previous + "\n" + " ".join(f"Q: {t['question']} A: {t['answer']}" for t in turns)).strip()
+        return fallback[-self.summary_max_chars:]
+
+
+# 전역 대화 메모리 인스턴스
+conversation_memory = ConversationMemory()
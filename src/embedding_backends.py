@@ -0,0 +1,265 @@
+"""
+임베딩 백엔드 - 텍스트 배치를 (n, 차원) float32 NumPy 배열로 변환하는 구현체 모음
+- ollama: Ollama HTTP API 호출 (기본값)
+- onnx: 프로세스 내 ONNX Runtime CPU 추론 (네트워크/JSON 직렬화 없이 배치 행렬 연산)
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+from loguru import logger
+
+from src.config import config
+from src.similarity import l2_normalize
+from src.schema_registry import schema_registry
+from src.metrics import (
+    EMBEDDING_REQUEST_SECONDS, EMBEDDING_BATCH_SIZE, EMBEDDING_ERRORS, observe_seconds
+)
+
+
+def _empty(dimension: int = 0) -> np.ndarray:
+    return np.zeros((0, dimension), dtype=np.float32)
+
+
+class BaseEmbeddingBackend:
+    """임베딩 백엔드 인터페이스"""
+
+    # EmbeddingService/스키마 캐시에서 사용하는 모델명과 위치(차원 캐시 키)
+    model_name: str = ""
+    base_url: str = ""
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """비어 있지 않은 텍스트 리스트를 입력 순서대로 (len(texts), 차원) float32 배열로 임베딩합니다."""
+        raise NotImplementedError
+
+    def embed_one(self, text: str) -> np.ndarray:
+        """단일 텍스트를 1차원 float32 벡터로 임베딩합니다."""
+        return self.embed([text])[0]
+
+    def empty(self) -> np.ndarray:
+        """빈 입력의 결과 배열 (차원을 이미 알면 (0, 차원), 모르면 (0, 0))"""
+        return _empty(schema_registry.get_dimension(self.base_url, self.model_name) or 0)
+
+
+class OllamaEmbeddingBackend(BaseEmbeddingBackend):
+    """Ollama HTTP API(/api/embed, /api/embeddings)를 사용하는 임베딩 백엔드"""
+
+    def __init__(self, model_name: str = None, base_url: str = None):
+        """
+        OllamaEmbeddingBackend 초기화
+
+        Args:
+            model_name: Ollama 임베딩 모델명
+            base_url: Ollama 서버 URL
+        """
+        self.model_name = model_name or config.OLLAMA_EMBEDDING_MODEL
+        self.base_url = base_url or config.get_ollama_url()
+        self.embedding_url = f"{self.base_url}/api/embeddings"
+        self.batch_embedding_url = f"{self.base_url}/api/embed"
+        # 구버전 Ollama(배치 API 미지원) 확인 후에는 바로 개별 요청 사용
+        self._batch_supported = True
+
+    def embed_one(self, text: str) -> np.ndarray:
+        payload = {
+            "model": self.model_name,
+            "prompt": text,
+            "keep_alive": config.OLLAMA_EMBED_KEEP_ALIVE
+        }
+        EMBEDDING_BATCH_SIZE.labels(endpoint="embeddings").observe(1)
+        with observe_seconds(EMBEDDING_REQUEST_SECONDS, EMBEDDING_ERRORS, endpoint="embeddings"):
+            response = requests.post(self.embedding_url, json=payload, timeout=30)
+            response.raise_for_status()
+        return np.asarray(response.json().get('embedding', []), dtype=np.float32)
+
+    def _embed_each(self, texts: List[str]) -> np.ndarray:
+        """배치 API 없이 텍스트별 요청으로 임베딩합니다. (구버전 Ollama)"""
+        if not texts:
+            return self.empty()
+        return np.stack([self.embed_one(text) for text in texts])
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return self.empty()
+        if not self._batch_supported:
+            return self._embed_each(texts)
+
+        payload = {
+            "model": self.model_name,
+            "input": list(texts),
+            "keep_alive": config.OLLAMA_EMBED_KEEP_ALIVE
+        }
+        with observe_seconds(EMBEDDING_REQUEST_SECONDS, EMBEDDING_ERRORS, endpoint="embed"):
+            response = requests.post(self.batch_embedding_url, json=payload, timeout=60)
+        if response.status_code == 404:
+            logger.info("배치 임베딩 API 미지원, 개별 요청으로 대체합니다")
+            self._batch_supported = False
+            return self._embed_each(texts)
+        response.raise_for_status()
+        EMBEDDING_BATCH_SIZE.labels(endpoint="embed").observe(len(texts))
+
+        result = response.json().get('embeddings', [])
+        if len(result) != len(texts):
+            raise ValueError(f"배치 임베딩 개수 불일치: {len(result)} != {len(texts)}")
+        return np.asarray(result, dtype=np.float32)
+
+
+class OnnxEmbeddingBackend(BaseEmbeddingBackend):
+    """
+    ONNX Runtime으로 프로세스 내에서 임베딩하는 백엔드 (CPU)
+
+    HuggingFace 형식으로 내보낸 인코더 모델(model.onnx)과 tokenizers의 tokenizer.json을 사용합니다.
+    출력이 (배치, 토큰, 차원)이면 pooling(mean/cls)으로 문장 벡터를 만들고, (배치, 차원)이면 그대로 사용합니다.
+    InferenceSession.run은 스레드 안전하므로 여러 적재 워커/요청이 하나의 세션을 공유합니다.
+    """
+
+    def __init__(self, model_path: str = None, tokenizer_path: str = None, model_name: str = None,
+                 threads: int = None, max_length: int = None, pooling: str = None, batch_size: int = None):
+        """
+        OnnxEmbeddingBackend 초기화 (모델과 토크나이저를 바로 로드)
+
+        Args:
+            model_path: ONNX 모델 파일 경로
+            tokenizer_path: tokenizer.json 경로
+            model_name: 컬렉션/중복 제거 기록에 남길 모델명 (기본: 모델 디렉토리 이름)
+            threads: 연산자 내부 스레드 수 (0이면 ONNX Runtime 기본값 = 물리 코어 수)
+            max_length: 최대 토큰 수 (초과분은 잘라냄)
+            pooling: 토큰 출력 풀링 방식 (mean, cls)
+            batch_size: 한 번의 추론에 넣을 최대 텍스트 수
+        """
+        # onnxruntime/tokenizers는 ONNX 백엔드를 만들 때만 import (기본 ollama 백엔드의 시작 시간에 포함하지 않음)
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError:
+            raise ImportError(
+                "ONNX 임베딩 백엔드에는 onnxruntime, tokenizers 패키지가 필요합니다. "
+                "'pip install onnxruntime tokenizers'로 설치하세요."
+            )
+        self.model_path = model_path or config.EMBEDDING_ONNX_MODEL_PATH
+        self.tokenizer_path = tokenizer_path or config.EMBEDDING_ONNX_TOKENIZER_PATH
+        self.model_name = model_name or config.EMBEDDING_ONNX_MODEL_NAME or \
+            f"onnx:{os.path.basename(os.path.dirname(os.path.abspath(self.model_path)))}"
+        self.base_url = f"onnx://{os.path.abspath(self.model_path)}"
+        self.max_length = max_length or config.EMBEDDING_ONNX_MAX_LENGTH
+        self.pooling = (pooling or config.EMBEDDING_ONNX_POOLING).lower()
+        self.batch_size = max(1, batch_size or config.EMBEDDING_BATCH_SIZE)
+        if self.pooling not in ("mean", "cls"):
+            raise ValueError(f"지원하지 않는 pooling 방식입니다: {self.pooling}")
+
+        threads = config.EMBEDDING_ONNX_THREADS if threads is None else threads
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(self.tokenizer_path)
+        padding = self.tokenizer.padding
+        self.pad_id = padding["pad_id"] if padding else 0
+        # 패딩은 배치별 최대 길이에 맞춰 직접 처리
+        self.tokenizer.no_padding()
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+
+        logger.info(f"ONNX 임베딩 모델 로드: {self.model_path} ({self.model_name}, pooling={self.pooling}, "
+                    f"threads={threads or 'auto'})")
+
+    def _encode(self, texts: List[str]) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        encodings = self.tokenizer.encode_batch(texts)
+        length = max(len(e.ids) for e in encodings)
+        input_ids = np.full((len(texts), length), self.pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(texts), length), dtype=np.int64)
+        token_type_ids = np.zeros((len(texts), length), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            n = len(encoding.ids)
+            input_ids[row, :n] = encoding.ids
+            attention_mask[row, :n] = 1
+            token_type_ids[row, :n] = encoding.type_ids
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask, "token_type_ids": token_type_ids}
+        return {name: value for name, value in feeds.items() if name in self.input_names}, attention_mask
+
+    def _run(self, texts: List[str]) -> np.ndarray:
+        feeds, attention_mask = self._encode(texts)
+        output = self.session.run(None, feeds)[0]
+        if output.ndim == 3:
+            if self.pooling == "cls":
+                output = output[:, 0]
+            else:
+                mask = attention_mask[:, :, None].astype(np.float32)
+                output = (output * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return l2_normalize(output)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return self.empty()
+        # 길이가 비슷한 텍스트끼리 묶어 패딩 연산을 줄이고, 결과는 입력 순서로 되돌림
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        result: Optional[np.ndarray] = None
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            EMBEDDING_BATCH_SIZE.labels(endpoint="onnx").observe(len(batch))
+            with observe_seconds(EMBEDDING_REQUEST_SECONDS, EMBEDDING_ERRORS, endpoint="onnx"):
+                vectors = self._run([texts[i] for i in batch])
+            if result is None:
+                result = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            result[batch] = vectors
+        return result
+
+
+def _create_onnx_backend(model_name: Optional[str], base_url: Optional[str]) -> BaseEmbeddingBackend:
+    if base_url:
+        raise ValueError(f"ONNX 임베딩 백엔드는 base_url을 사용하지 않습니다 (모델 경로는 EMBEDDING_ONNX_MODEL_PATH): {base_url}")
+    return OnnxEmbeddingBackend(model_name=model_name)
+
+
+# ---- 백엔드 등록/생성 ----
+_backends: Dict[str, Callable[[Optional[str], Optional[str]], BaseEmbeddingBackend]] = {
+    "ollama": lambda model_name, base_url: OllamaEmbeddingBackend(model_name, base_url),
+    "onnx": _create_onnx_backend,
+}
+_instances: Dict[Tuple[str, Optional[str], Optional[str]], BaseEmbeddingBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def register_embedding_backend(name: str,
+                               factory: Callable[[Optional[str], Optional[str]], BaseEmbeddingBackend]) -> None:
+    """
+    임베딩 백엔드를 등록합니다. (예: 다른 추론 서버, GPU 런타임)
+
+    Args:
+        name: EMBEDDING_BACKEND 설정에 사용할 이름
+        factory: factory(model_name, base_url)로 BaseEmbeddingBackend 인스턴스를 만드는 함수
+    """
+    _backends[name] = factory
+
+
+def get_embedding_backend(name: str = None, model_name: str = None, base_url: str = None) -> BaseEmbeddingBackend:
+    """
+    설정(EMBEDDING_BACKEND)에 따른 임베딩 백엔드를 반환합니다.
+    모델 로드 비용이 큰 백엔드가 있으므로 같은 인자의 인스턴스는 프로세스 안에서 공유합니다.
+
+    Args:
+        name: 백엔드 이름 (기본: EMBEDDING_BACKEND)
+        model_name: 모델명 (기본: 백엔드별 설정값)
+        base_url: 서버 URL (HTTP 백엔드 전용, 프로세스 내 백엔드에 주면 ValueError)
+
+    Returns:
+        BaseEmbeddingBackend 인스턴스
+    """
+    name = name or config.EMBEDDING_BACKEND
+    key = (name, model_name, base_url)
+    backend = _instances.get(key)
+    if backend is None:
+        with _instances_lock:
+            backend = _instances.get(key)
+            if backend is None:
+                if name not in _backends:
+                    raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {name}")
+                backend = _backends[name](model_name, base_url)
+                _instances[key] = backend
+    return backend
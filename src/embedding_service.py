@@ -1,27 +1,42 @@
+import numpy as np
 import requests
-import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from loguru import logger
 from .config import config
+from .schema_registry import schema_registry
+from .metrics import record_cache
+from .tracing import traced
+from .embedding_backends import BaseEmbeddingBackend, OllamaEmbeddingBackend, get_embedding_backend
+from .similarity import cosine_similarity, VectorLike
+from .logging_setup import get_logger
+
+# 쿼리마다 찍히는 임베딩 로그는 LOG_SAMPLE_RATES의 embedding 비율만 기록
+embedding_log = get_logger("embedding")
 
 class EmbeddingService:
-    """Ollama를 사용한 임베딩 서비스 클래스"""
+    """임베딩 서비스 클래스 (Ollama HTTP 또는 프로세스 내 ONNX 백엔드)"""
     
-    def __init__(self, model_name: str = None, base_url: str = None):
+    def __init__(self, model_name: str = None, base_url: str = None,
+                 backend: Union[str, BaseEmbeddingBackend] = None):
         """
         EmbeddingService 초기화
         
         Args:
             model_name: 사용할 임베딩 모델명
             base_url: Ollama 서버 URL
+            backend: 백엔드 이름(ollama, onnx) 또는 인스턴스 (기본: EMBEDDING_BACKEND)
         """
-        self.model_name = model_name or config.OLLAMA_EMBEDDING_MODEL
-        self.base_url = base_url or config.get_ollama_url()
-        self.embedding_url = f"{self.base_url}/api/embeddings"
+        if isinstance(backend, BaseEmbeddingBackend):
+            self.backend = backend
+        else:
+            self.backend = get_embedding_backend(backend, model_name, base_url)
+        self.model_name = self.backend.model_name
+        self.base_url = self.backend.base_url
         
         logger.info(f"임베딩 서비스 초기화: {self.model_name} at {self.base_url}")
     
-    def embed_text(self, text: str) -> List[float]:
+    @traced("embedding")
+    def embed_text(self, text: str) -> np.ndarray:
         """
         단일 텍스트를 벡터로 임베딩합니다.
         
@@ -29,25 +44,18 @@ class EmbeddingService:
             text: 임베딩할 텍스트
             
         Returns:
-            임베딩 벡터
+            임베딩 벡터 (1차원 float32 배열, 빈 텍스트는 크기 0)
         """
         if not text or not text.strip():
             logger.warning("빈 텍스트가 제공되었습니다")
-            return []
+            return np.empty(0, dtype=np.float32)
         
         try:
-            payload = {
-                "model": self.model_name,
-                "prompt": text.strip()
-            }
-            
-            response = requests.post(self.embedding_url, json=payload, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            embedding = result.get('embedding', [])
+            embedding = self.backend.embed_one(text.strip())
             
-            logger.debug(f"텍스트 임베딩 완료: {len(embedding)} 차원")
+            if embedding.size:
+                schema_registry.set_dimension(self.base_url, self.model_name, embedding.shape[0])
+            embedding_log.debug("텍스트 임베딩 완료: {} 차원", embedding.size)
             return embedding
             
         except requests.exceptions.RequestException as e:
@@ -57,12 +65,53 @@ class EmbeddingService:
             logger.error(f"임베딩 처리 중 오류: {e}")
             raise
     
-    def embed_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @traced("embedding")
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
         """
-        청크 리스트를 벡터로 임베딩합니다.
+        여러 텍스트를 한 번에 임베딩합니다. (Ollama /api/embed 또는 ONNX 배치 추론)
+        
+        배치 API를 지원하지 않는 구버전 Ollama에서는 텍스트별 요청으로 대체합니다.
+        
+        Args:
+            texts: 임베딩할 텍스트 리스트
+            
+        Returns:
+            입력 순서와 같은 (텍스트 수, 차원) float32 배열 (빈 텍스트 행은 0 벡터, 모두 비었으면 차원 0)
+        """
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not indices:
+            return np.zeros((len(texts), 0), dtype=np.float32)
+        
+        try:
+            vectors = self.backend.embed([texts[i].strip() for i in indices])
+            schema_registry.set_dimension(self.base_url, self.model_name, vectors.shape[1])
+            embedding_log.debug("배치 임베딩 완료: {}개", len(indices))
+            if len(indices) == len(texts):
+                return vectors
+            
+            embeddings = np.zeros((len(texts), vectors.shape[1]), dtype=np.float32)
+            embeddings[indices] = vectors
+            return embeddings
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"배치 임베딩 요청 중 오류: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"배치 임베딩 처리 중 오류: {e}")
+            raise
+    
+    def embed_chunks(self, chunks: List[Dict[str, Any]], progress_callback=None) -> List[Dict[str, Any]]:
+        """
+        청크 리스트를 EMBEDDING_BATCH_SIZE개씩 묶어 벡터로 임베딩합니다.
+        
+        각 청크의 embedding은 배치 결과 2차원 배열의 행(복사 없는 float32 view)입니다.
+        NAMED_VECTORS_ENABLED이면 청크의 section_title(배치 안에서 중복 제거)도 같은 요청으로 임베딩해
+        title_embedding에 넣습니다.
+        배치 임베딩이 실패하면 해당 배치만 청크별로 다시 시도하고(본문만), 그래도 실패한 청크는 건너뜁니다.
         
         Args:
             chunks: 청크 리스트
+            progress_callback: progress_callback(처리한 청크 수, 전체 청크 수) 진행 알림 함수
             
         Returns:
             임베딩이 추가된 청크 리스트
@@ -72,32 +121,56 @@ class EmbeddingService:
             return []
         
         embedded_chunks = []
+        batch_size = max(1, config.EMBEDDING_BATCH_SIZE)
         
-        for i, chunk in enumerate(chunks):
+        for start in range(0, len(chunks), batch_size):
+            batch = [(i, chunk) for i, chunk in enumerate(chunks[start:start + batch_size], start)
+                     if chunk.get('text', '').strip()]
+            titles = []
+            if config.NAMED_VECTORS_ENABLED:
+                titles = list(dict.fromkeys(
+                    chunk['section_title'].strip() for _, chunk in batch if (chunk.get('section_title') or '').strip()
+                ))
+            title_embeddings = {}
             try:
-                text = chunk.get('text', '')
-                if text.strip():
-                    embedding = self.embed_text(text)
-                    
-                    # 임베딩 결과를 청크에 추가
-                    embedded_chunk = chunk.copy()
-                    embedded_chunk['embedding'] = embedding
-                    embedded_chunk['embedding_dimension'] = len(embedding)
-                    
-                    embedded_chunks.append(embedded_chunk)
-                    
-                    if (i + 1) % 10 == 0:
-                        logger.info(f"임베딩 진행률: {i + 1}/{len(chunks)}")
-                        
+                embeddings = self.embed_texts([chunk['text'] for _, chunk in batch] + titles)
+                title_embeddings = dict(zip(titles, embeddings[len(batch):]))
+                embeddings = embeddings[:len(batch)]
             except Exception as e:
-                logger.error(f"청크 {i} 임베딩 중 오류: {e}")
-                # 오류가 발생한 청크는 건너뛰고 계속 진행
-                continue
+                logger.warning(f"배치 임베딩 실패, 청크별로 다시 시도합니다: {e}")
+                embeddings = []
+                for i, chunk in batch:
+                    try:
+                        embeddings.append(self.embed_text(chunk['text']))
+                    except Exception as e:
+                        logger.error(f"청크 {i} 임베딩 중 오류: {e}")
+                        # 오류가 발생한 청크는 건너뛰고 계속 진행
+                        embeddings.append(np.empty(0, dtype=np.float32))
+            
+            for (i, chunk), embedding in zip(batch, embeddings):
+                if embedding.size == 0:
+                    continue
+                # 임베딩 결과를 청크에 추가 (얕은 복사: 텍스트/메타데이터는 원본 객체 공유)
+                embedded = {
+                    **chunk,
+                    'embedding': embedding,
+                    'embedding_dimension': embedding.shape[0],
+                    'embedding_model': self.model_name
+                }
+                title_embedding = title_embeddings.get((chunk.get('section_title') or '').strip())
+                if title_embedding is not None and title_embedding.any():
+                    embedded['title_embedding'] = title_embedding
+                embedded_chunks.append(embedded)
+            
+            done = min(start + batch_size, len(chunks))
+            embedding_log.info("임베딩 진행률: {}/{}", done, len(chunks))
+            if progress_callback:
+                progress_callback(done, len(chunks))
         
         logger.info(f"총 {len(embedded_chunks)}개의 청크 임베딩 완료")
         return embedded_chunks
     
-    def embed_batch(self, texts: List[str], batch_size: int = 10) -> List[List[float]]:
+    def embed_batch(self, texts: List[str], batch_size: int = 10) -> np.ndarray:
         """
         텍스트 배치를 벡터로 임베딩합니다.
         
@@ -106,45 +179,54 @@ class EmbeddingService:
             batch_size: 배치 크기
             
         Returns:
-            임베딩 벡터 리스트
+            (텍스트 수, 차원) float32 배열 (임베딩에 실패한 배치의 행은 0 벡터)
         """
-        embeddings = []
+        parts: List[Optional[np.ndarray]] = []
         
         for i in range(0, len(texts), batch_size):
             batch = texts[i:i + batch_size]
-            batch_embeddings = []
-            
-            for text in batch:
-                try:
-                    embedding = self.embed_text(text)
-                    batch_embeddings.append(embedding)
-                except Exception as e:
-                    logger.error(f"배치 임베딩 중 오류: {e}")
-                    # 오류 시 빈 벡터 추가
-                    batch_embeddings.append([])
             
-            embeddings.extend(batch_embeddings)
+            try:
+                parts.append(self.embed_texts(batch))
+            except Exception as e:
+                logger.error(f"배치 임베딩 중 오류: {e}")
+                # 오류 시 0 벡터로 채움
+                parts.append(None)
             
             logger.info(f"배치 임베딩 진행률: {min(i + batch_size, len(texts))}/{len(texts)}")
         
+        dimension = max((part.shape[1] for part in parts if part is not None), default=0)
+        embeddings = np.zeros((len(texts), dimension), dtype=np.float32)
+        for i, part in zip(range(0, len(texts), batch_size), parts):
+            if part is not None and part.shape[1] == dimension:
+                embeddings[i:i + len(part)] = part
         return embeddings
     
     def get_embedding_dimension(self) -> int:
         """
-        현재 모델의 임베딩 차원을 반환합니다.
+        현재 모델의 임베딩 차원을 반환합니다. (프로세스 단위로 캐시)
         
         Returns:
             임베딩 차원
+            
+        Raises:
+            차원을 확인할 수 없으면 예외를 그대로 전달합니다. (잘못된 크기의 컬렉션 생성 방지)
         """
+        dimension = schema_registry.get_dimension(self.base_url, self.model_name)
+        record_cache("embedding_dimension", bool(dimension))
+        if dimension:
+            return dimension
         try:
             # 테스트 텍스트로 임베딩 차원 확인
             test_text = "This is a test text for dimension check."
             embedding = self.embed_text(test_text)
-            return len(embedding)
+            if embedding.size == 0:
+                raise ValueError("빈 임베딩 반환")
+            schema_registry.set_dimension(self.base_url, self.model_name, embedding.shape[0])
+            return embedding.shape[0]
         except Exception as e:
             logger.error(f"임베딩 차원 확인 중 오류: {e}")
-            # 기본값 반환
-            return 1536
+            raise
     
     def validate_model(self) -> bool:
         """
@@ -158,7 +240,7 @@ class EmbeddingService:
             test_text = "Hello, world!"
             embedding = self.embed_text(test_text)
             
-            if embedding and len(embedding) > 0:
+            if embedding.size > 0:
                 logger.info(f"모델 검증 성공: {self.model_name}")
                 return True
             else:
@@ -176,6 +258,9 @@ class EmbeddingService:
         Returns:
             모델 정보 딕셔너리
         """
+        if not isinstance(self.backend, OllamaEmbeddingBackend):
+            return {'name': self.model_name, 'backend': type(self.backend).__name__, 'location': self.base_url}
+        
         try:
             response = requests.get(f"{self.base_url}/api/tags", timeout=10)
             response.raise_for_status()
@@ -197,7 +282,7 @@ class EmbeddingService:
             logger.error(f"모델 정보 조회 중 오류: {e}")
             return {'name': self.model_name, 'status': 'error'}
     
-    def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
+    def calculate_similarity(self, embedding1: VectorLike, embedding2: VectorLike) -> float:
         """
         두 임베딩 벡터 간의 코사인 유사도를 계산합니다.
         
@@ -206,9 +291,9 @@ class EmbeddingService:
             embedding2: 두 번째 임베딩 벡터
             
         Returns:
-            코사인 유사도 (0-1)
+            코사인 유사도 (-1~1)
         """
-        if not embedding1 or not embedding2:
+        if len(embedding1) == 0 or len(embedding2) == 0:
             return 0.0
         
         if len(embedding1) != len(embedding2):
@@ -216,26 +301,7 @@ class EmbeddingService:
             return 0.0
         
         try:
-            import numpy as np
-            
-            # numpy 배열로 변환
-            vec1 = np.array(embedding1)
-            vec2 = np.array(embedding2)
-            
-            # 코사인 유사도 계산
-            dot_product = np.dot(vec1, vec2)
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
-            
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-            
-            similarity = dot_product / (norm1 * norm2)
-            return float(similarity)
-            
-        except ImportError:
-            logger.error("numpy가 설치되지 않았습니다")
-            return 0.0
+            return float(cosine_similarity(embedding1, [embedding2])[0])
         except Exception as e:
             logger.error(f"유사도 계산 중 오류: {e}")
             return 0.0
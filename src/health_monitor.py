@@ -0,0 +1,182 @@
+"""
+헬스 모니터 - 백그라운드에서 의존 서비스(Qdrant, Ollama) 상태를 주기적으로 점검하고 캐시
+/health, /ready 요청은 실제 점검 없이 캐시된 결과만 반환합니다.
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, Any, Callable, Optional
+import requests
+from loguru import logger
+from src.config import config
+from src.qdrant_manager import QdrantManager
+
+# 지연 시간 히스토그램 버킷 상한 (밀리초)
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class DependencyStatus:
+    """의존 서비스 하나의 최근 상태와 지연 시간 히스토그램"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "unknown"
+        self.latency_ms: Optional[float] = None
+        self.last_checked: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latency_sum_ms = 0.0
+        self.count = 0
+
+    def observe(self, healthy: bool, latency_ms: float, error: str = None) -> None:
+        self.status = "healthy" if healthy else "unhealthy"
+        self.latency_ms = round(latency_ms, 3)
+        self.last_checked = time.time()
+        self.last_error = error
+        self.consecutive_failures = 0 if healthy else self.consecutive_failures + 1
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.latency_sum_ms += latency_ms
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        histogram = {}
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS + ["+Inf"], self.bucket_counts):
+            cumulative += count
+            histogram[f"le_{bound}"] = cumulative
+        return {
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_histogram_ms": histogram,
+            "latency_sum_ms": round(self.latency_sum_ms, 3),
+            "checks": self.count
+        }
+
+
+class HealthMonitor:
+    """의존 서비스 상태를 백그라운드에서 점검하고 캐시하는 클래스"""
+
+    def __init__(self, interval: float = None):
+        """
+        HealthMonitor 초기화
+
+        Args:
+            interval: 점검 주기 (초)
+        """
+        self.interval = interval or config.HEALTH_CHECK_INTERVAL
+        self.ollama_url = config.get_ollama_url()
+        self.embedding_model = config.OLLAMA_EMBEDDING_MODEL
+        # 점검마다 새 클라이언트를 만들지 않도록 하나의 연결을 재사용
+        self.qdrant_manager = QdrantManager()
+        self.dependencies: Dict[str, DependencyStatus] = {
+            "qdrant": DependencyStatus("qdrant"),
+            "ollama": DependencyStatus("ollama"),
+        }
+        self._checks: Dict[str, Callable[[], None]] = {
+            "qdrant": self._check_qdrant,
+            "ollama": self._check_ollama,
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _check_qdrant(self) -> None:
+        if not self.qdrant_manager.client:
+            if not self.qdrant_manager.connect():
+                raise ConnectionError("Qdrant 연결 실패")
+            return
+        try:
+            self.qdrant_manager.client.get_collections()
+        except Exception:
+            # 다음 점검에서 재연결
+            self.qdrant_manager.client = None
+            raise
+
+    def _check_ollama(self) -> None:
+        # 실제 임베딩 대신 가벼운 모델 목록 조회로 서버와 모델 존재 여부만 확인
+        response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
+        response.raise_for_status()
+        if config.EMBEDDING_BACKEND != "ollama":
+            # 임베딩은 프로세스 내에서 처리하므로 서버 응답만 확인
+            return
+        names = [m.get("name", "") for m in response.json().get("models", [])]
+        if not any(name == self.embedding_model or name.split(":")[0] == self.embedding_model for name in names):
+            raise LookupError(f"임베딩 모델 없음: {self.embedding_model}")
+
+    def check_now(self) -> None:
+        """모든 의존 서비스를 즉시 한 번 점검합니다."""
+        for name, check in self._checks.items():
+            start = time.perf_counter()
+            error = None
+            try:
+                check()
+                healthy = True
+            except Exception as e:
+                healthy = False
+                error = str(e)
+            latency_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.dependencies[name].observe(healthy, latency_ms, error)
+            if not healthy:
+                logger.warning(f"[헬스 체크] {name} 비정상: {error}")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.check_now()
+            except Exception as e:
+                logger.error(f"[헬스 체크] 점검 중 오류: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """백그라운드 점검 스레드를 시작합니다."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+        logger.info(f"[헬스 체크] 백그라운드 점검 시작 (주기 {self.interval}초)")
+
+    def stop(self) -> None:
+        """백그라운드 점검 스레드를 중지합니다."""
+        self._stop.set()
+
+    def get_status(self, name: str) -> str:
+        """캐시된 의존 서비스 상태 (healthy/unhealthy/unknown)"""
+        with self._lock:
+            return self.dependencies[name].status
+
+    def is_ready(self) -> bool:
+        """모든 의존 서비스가 정상인지 여부"""
+        with self._lock:
+            return all(dep.status == "healthy" for dep in self.dependencies.values())
+
+    def last_checked(self) -> Optional[float]:
+        """가장 최근 점검 시각"""
+        with self._lock:
+            times = [dep.last_checked for dep in self.dependencies.values() if dep.last_checked]
+            return max(times) if times else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """캐시된 전체 상태와 지연 시간 히스토그램을 반환합니다."""
+        with self._lock:
+            return {name: dep.to_dict() for name, dep in self.dependencies.items()}
+
+
+_instance: Optional[HealthMonitor] = None
+_instance_lock = threading.Lock()
+
+
+def get_health_monitor() -> HealthMonitor:
+    """프로세스 전역 헬스 모니터를 반환합니다. (처음 호출 시 생성, 보통 앱 시작 훅에서)"""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = HealthMonitor()
+    return _instance
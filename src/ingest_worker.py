@@ -0,0 +1,273 @@
+"""
+적재 워커 - 작업 큐에서 파일 적재 작업을 리스로 가져와 처리
+API 프로세스 안에서 스레드로 실행하거나, 별도 프로세스로 여러 개 실행할 수 있습니다.
+
+    python -m src.ingest_worker --concurrency 4
+"""
+
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from typing import Optional
+from loguru import logger
+
+from src.config import config
+from src.job_queue import BaseJobQueue, get_job_queue, INGEST_TASK
+from src.ingestion import ingest_file, remove_document_points, IngestionError, IngestionCancelled
+from src.text_chunker import TextChunker
+from src.embedding_service import EmbeddingService
+from src.qdrant_manager import QdrantManager
+from src.metrics import start_metrics_server
+from src.logging_setup import setup_logging, get_logger, clip, INGEST_CATEGORY
+
+ingest_log = get_logger(INGEST_CATEGORY)
+
+# 종료된 작업 정리 주기 (초)
+PURGE_INTERVAL = 600
+
+
+class JobProgressReporter:
+    """ingest_file의 tracker 인터페이스를 작업 큐 기록으로 연결하는 클래스"""
+
+    def __init__(self, job_queue: BaseJobQueue, job_id: str, worker_id: str, lease_seconds: float):
+        self.job_queue = job_queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lease_lost = False
+
+    def set_progress(self, value, message=None, detail=None):
+        # 진행을 기록할 때마다 리스도 함께 연장 (리스를 잃었으면 지금 소유한 워커의 진행상태를 덮어쓰지 않음)
+        if self.lease_lost or not self.job_queue.update_progress(self.job_id, value, message, detail,
+                                                                 worker_id=self.worker_id):
+            self.lease_lost = True
+            return
+        self.heartbeat()
+
+    def set_error(self, message):
+        if not self.lease_lost and not self.job_queue.update_progress(self.job_id, 0, message,
+                                                                      worker_id=self.worker_id):
+            self.lease_lost = True
+
+    def heartbeat(self) -> bool:
+        if not self.job_queue.heartbeat(self.job_id, self.worker_id, self.lease_seconds):
+            self.lease_lost = True
+        return not self.lease_lost
+
+    def is_cancelled(self) -> bool:
+        return self.lease_lost or self.job_queue.is_cancelled(self.job_id)
+
+
+class IngestWorker:
+    """작업 큐를 폴링하며 적재 작업을 처리하는 워커"""
+
+    def __init__(self, job_queue: BaseJobQueue = None, concurrency: int = None,
+                 poll_interval: float = None, lease_seconds: float = None, qdrant_manager: QdrantManager = None):
+        """
+        IngestWorker 초기화
+
+        Args:
+            job_queue: 작업 큐 (없으면 설정의 백엔드 사용)
+            concurrency: 동시에 처리할 작업 수 (스레드 수)
+            poll_interval: 대기 작업이 없을 때 폴링 간격 (초)
+            lease_seconds: 작업 리스 시간 (초)
+            qdrant_manager: Qdrant 매니저 (없으면 설정의 서버에 연결, 컬렉션별로 클라이언트 공유)
+        """
+        self.job_queue = job_queue or get_job_queue()
+        self.concurrency = concurrency or config.INGEST_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or config.INGEST_POLL_INTERVAL
+        self.lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.text_chunker = TextChunker()
+        self.embedding_service = EmbeddingService()
+        self.qdrant_manager = qdrant_manager or QdrantManager()
+        self._stop = threading.Event()
+        self._threads = []
+        self._last_purge = 0.0
+        self._purge_lock = threading.Lock()
+
+    def run_once(self) -> bool:
+        """
+        대기 중인 작업 하나를 처리합니다.
+
+        Returns:
+            처리한 작업이 있었는지 여부
+        """
+        job = self.job_queue.lease(self.worker_id, self.lease_seconds)
+        if not job:
+            return False
+        job_id = job["id"]
+        if job["task_type"] != INGEST_TASK:
+            self.job_queue.fail(job_id, f"알 수 없는 작업 유형: {job['task_type']}", retry=False,
+                                worker_id=self.worker_id)
+            return True
+
+        payload = job["payload"]
+        reporter = JobProgressReporter(self.job_queue, job_id, self.worker_id, self.lease_seconds)
+        ingest_log.info("[워커 {worker_id}] 작업 시작: {job_id} ({filename}, 시도 {attempts})", worker_id=self.worker_id,
+                        job_id=job_id, filename=payload.get('filename'), attempts=job['attempts'])
+
+        # 임베딩처럼 오래 걸리는 단계 중에도 리스가 만료되지 않도록 주기적으로 연장
+        done = threading.Event()
+
+        def keep_lease():
+            while not done.wait(self.lease_seconds / 3):
+                if not reporter.heartbeat():
+                    logger.warning(f"[워커 {self.worker_id}] 리스 상실: {job_id}")
+                    return
+
+        heartbeat_thread = threading.Thread(target=keep_lease, name=f"lease-{job_id[:8]}", daemon=True)
+        heartbeat_thread.start()
+        try:
+            self._remove_previous_attempt(job)
+            result = ingest_file(
+                payload["file_path"],
+                payload["filename"],
+                collection_name=payload.get("collection_name"),
+                document_id=payload.get("document_id"),
+                tracker=reporter,
+                text_chunker=self.text_chunker,
+                embedding_service=self.embedding_service,
+                qdrant_manager=self.qdrant_manager,
+                content_hash=payload.get("content_hash")
+            )
+            if not self.job_queue.complete(job_id, result, worker_id=self.worker_id):
+                self._log_lease_lost(job_id)
+                return True
+            ingest_log.info("[워커 {worker_id}] 작업 완료: {job_id}", worker_id=self.worker_id, job_id=job_id,
+                            document_id=result.get("document_id"), chunks_count=result.get("chunks_count"))
+            if result.get("deduplicated") == "existing":
+                self._discard_duplicate_upload(payload["file_path"])
+        except IngestionCancelled:
+            if not reporter.lease_lost:
+                self.job_queue.mark_cancelled(job_id, worker_id=self.worker_id)
+            ingest_log.info("[워커 {worker_id}] 작업 취소: {job_id}", worker_id=self.worker_id, job_id=job_id)
+        except IngestionError as e:
+            # 추출/청킹 실패 등은 재시도해도 같으므로 바로 실패 처리
+            if not self.job_queue.fail(job_id, str(e), retry=False, worker_id=self.worker_id):
+                self._log_lease_lost(job_id)
+                return True
+            ingest_log.warning("[워커 {worker_id}] 작업 실패: {job_id} ({error})", worker_id=self.worker_id,
+                               job_id=job_id, error=str(e))
+        except Exception as e:
+            if not self.job_queue.fail(job_id, f"파일 처리 중 오류: {e}", worker_id=self.worker_id):
+                self._log_lease_lost(job_id)
+                return True
+            ingest_log.error("[워커 {worker_id}] 작업 오류: {job_id} ({error})", worker_id=self.worker_id,
+                             job_id=job_id, error=clip(e))
+        finally:
+            done.set()
+        return True
+
+    def _remove_previous_attempt(self, job) -> None:
+        """
+        재시도/재리스된 작업이면 이전 시도가 일부 저장한 포인트를 지웁니다. (같은 document_id로 다시 적재)
+
+        Raises:
+            RuntimeError: 삭제에 실패했을 때 (작업은 재시도 대기로 돌아감)
+        """
+        payload = job["payload"]
+        document_id = payload.get("document_id")
+        if job["attempts"] <= 1 or not document_id:
+            return
+        collection_name = payload.get("collection_name")
+        target = self.qdrant_manager.for_collection(collection_name) if collection_name else self.qdrant_manager
+        if not remove_document_points(target, document_id):
+            raise RuntimeError(f"이전 시도 포인트 삭제 실패: {document_id}")
+        ingest_log.info("[워커 {worker_id}] 이전 시도 포인트 삭제: {job_id}", worker_id=self.worker_id,
+                        job_id=job["id"], document_id=document_id, attempts=job["attempts"])
+
+    @staticmethod
+    def _discard_duplicate_upload(file_path: str) -> None:
+        """같은 컬렉션의 기존 문서를 재사용했으면 새로 올린 파일은 쓰이지 않으므로 UPLOAD_DIR에서 지웁니다."""
+        upload_dir = os.path.abspath(config.UPLOAD_DIR)
+        if os.path.dirname(os.path.abspath(file_path)) != upload_dir:
+            return
+        try:
+            os.remove(file_path)
+        except OSError as e:
+            logger.warning(f"중복 업로드 파일 삭제 실패: {file_path} - {e}")
+
+    def _log_lease_lost(self, job_id: str) -> None:
+        """리스가 만료되어 다른 워커가 가져간 작업은 그 워커의 상태를 덮어쓰지 않고 결과를 버립니다."""
+        ingest_log.warning("[워커 {worker_id}] 리스 상실로 결과 폐기: {job_id}", worker_id=self.worker_id,
+                           job_id=job_id)
+
+    def _purge_finished(self) -> None:
+        """보관 기간(JOB_RETENTION_SECONDS)이 지난 종료 작업을 주기적으로 정리합니다."""
+        with self._purge_lock:
+            if time.time() - self._last_purge < PURGE_INTERVAL:
+                return
+            self._last_purge = time.time()
+        self.job_queue.purge_finished(config.JOB_RETENTION_SECONDS)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if not self.run_once():
+                    self._purge_finished()
+                    self._stop.wait(self.poll_interval)
+            except Exception as e:
+                logger.error(f"[워커 {self.worker_id}] 작업 처리 루프 오류: {e}")
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> None:
+        """워커 스레드를 시작합니다. (API 프로세스 내장 실행용)"""
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"ingest-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"적재 워커 시작: {self.worker_id} (동시 처리 {self.concurrency})")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """워커 스레드를 중지합니다. 진행 중인 작업은 끝까지 처리합니다."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_forever(self) -> None:
+        """중지 신호를 받을 때까지 작업을 처리합니다. (독립 프로세스 실행용)"""
+        self.start()
+        try:
+            while not self._stop.wait(1):
+                pass
+        finally:
+            self.stop()
+
+
+def main():
+    """적재 워커 독립 실행"""
+    parser = argparse.ArgumentParser(description="문서 적재 워커")
+    parser.add_argument("--concurrency", type=int, default=config.INGEST_WORKER_CONCURRENCY, help="동시 처리 작업 수")
+    parser.add_argument("--poll-interval", type=float, default=config.INGEST_POLL_INTERVAL, help="폴링 간격 (초)")
+    parser.add_argument("--lease-seconds", type=float, default=config.JOB_LEASE_SECONDS, help="작업 리스 시간 (초)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Prometheus 지표 포트 (지정 시 /metrics 노출)")
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+
+    worker = IngestWorker(
+        concurrency=args.concurrency,
+        poll_interval=args.poll_interval,
+        lease_seconds=args.lease_seconds
+    )
+    signal.signal(signal.SIGTERM, lambda *_: worker._stop.set())
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+파일 적재 파이프라인 - 텍스트/청크 추출 → 임베딩 → Qdrant 저장
+API 프로세스와 별도 워커(ingest_worker)가 같은 코드로 파일을 처리합니다.
+"""
+
+import os
+import time
+from typing import Dict, Any, Optional
+
+from src.config import config
+from src.pdf_processor import get_processor
+from src.text_chunker import TextChunker
+from src.embedding_service import EmbeddingService
+from src.qdrant_manager import QdrantManager
+from src.content_registry import get_content_registry, hash_file
+from src.upload_storage import make_document_id
+from src.metrics import INGEST_STAGE_SECONDS, INGEST_ITEMS, INGEST_FILES
+from src.tracing import span
+from src.logging_setup import get_logger, clip, INGEST_CATEGORY
+
+# 적재 로그는 LOG_INGEST_FILE에 JSON Lines로도 기록 (키워드 인자가 필드로 남음)
+ingest_log = get_logger(INGEST_CATEGORY)
+
+
+class IngestionError(Exception):
+    """적재 단계 실패 (재시도해도 같은 결과가 예상되는 오류)"""
+
+
+class IngestionCancelled(Exception):
+    """적재 작업이 사용자 요청으로 취소됨"""
+
+
+class _NullTracker:
+    """진행상태를 기록하지 않는 기본 트래커"""
+
+    def set_progress(self, value, message=None, detail=None):
+        pass
+
+    def set_error(self, message):
+        pass
+
+
+def _check_cancelled(tracker) -> None:
+    is_cancelled = getattr(tracker, "is_cancelled", None)
+    if is_cancelled and is_cancelled():
+        raise IngestionCancelled("작업이 취소되었습니다")
+
+
+class StageProgress:
+    """단계(페이지 파싱/임베딩/저장)별 세부 진행률과 남은 시간(ETA)을 tracker에 전달하는 클래스"""
+
+    def __init__(self, tracker, min_interval: float = None):
+        """
+        StageProgress 초기화
+
+        Args:
+            tracker: set_progress(value, message, detail)를 제공하는 진행상태 기록 객체
+            min_interval: 세부 진행을 기록하는 최소 간격 (초), 단계 완료는 항상 기록
+        """
+        self.tracker = tracker
+        self.min_interval = config.PROGRESS_MIN_UPDATE_INTERVAL if min_interval is None else min_interval
+        self.started_at = time.time()
+        self.stage = None
+        self.unit = None
+        self.label = None
+        self.start_pct = 0
+        self.end_pct = 0
+        self.stage_started_at = self.started_at
+        self._last_report = 0.0
+        self._recorded = False
+
+    def start(self, stage: str, start_pct: int, end_pct: int, unit: str, label: str) -> None:
+        """
+        새 단계를 시작합니다.
+
+        Args:
+            stage: 단계 이름 (parse, embed, store)
+            start_pct: 단계 시작 시 전체 진행률
+            end_pct: 단계 완료 시 전체 진행률
+            unit: 진행 단위 (pages, chunks, points)
+            label: 메시지에 표시할 단위 이름
+        """
+        self.stage = stage
+        self.start_pct = start_pct
+        self.end_pct = end_pct
+        self.unit = unit
+        self.label = label
+        self.stage_started_at = time.time()
+        self._last_report = 0.0
+        self._recorded = False
+
+    def update(self, done: int, total: int) -> None:
+        """단계 진행을 기록합니다. progress_callback으로 그대로 넘길 수 있습니다."""
+        now = time.time()
+        if done < total and now - self._last_report < self.min_interval:
+            return
+        self._last_report = now
+        elapsed = now - self.stage_started_at
+        if done >= total and not self._recorded:
+            # 단계 완료 시 소요 시간과 처리량 기록
+            self._recorded = True
+            INGEST_STAGE_SECONDS.labels(stage=self.stage).observe(elapsed)
+            INGEST_ITEMS.labels(stage=self.stage, unit=self.unit).inc(total)
+        eta = round(elapsed / done * (total - done), 1) if done and total else None
+        value = self.start_pct + int((self.end_pct - self.start_pct) * done / total) if total else self.start_pct
+        detail = {
+            "stage": self.stage,
+            "done": done,
+            "total": total,
+            "unit": self.unit,
+            "stage_elapsed": round(elapsed, 3),
+            "elapsed": round(now - self.started_at, 3),
+            "eta_seconds": eta
+        }
+        self.tracker.set_progress(value, f"{self.label} {done}/{total}", detail=detail)
+
+
+def remove_document_points(qdrant_manager: QdrantManager, document_id: str) -> bool:
+    """
+    이전 적재 시도에서 저장된 문서의 포인트를 삭제합니다. (재시도/재개 전에 중복 포인트 방지)
+
+    Args:
+        qdrant_manager: 대상 컬렉션의 QdrantManager
+        document_id: 삭제할 문서 ID
+
+    Returns:
+        삭제 성공 여부 (컬렉션 생성 전에 중단되어 컬렉션이 없으면 지울 것이 없으므로 True)
+    """
+    try:
+        if qdrant_manager.get_collection_schema() is None:
+            return True
+    except Exception as e:
+        ingest_log.error("[적재] 컬렉션 조회 실패: {error}", error=str(e))
+        return False
+    return qdrant_manager.delete_document(document_id)
+
+
+def _reuse_existing(content_hash: str, filename: str, collection_name: str, document_id: str,
+                    embedding_model: str, tracker, qdrant_manager: QdrantManager = None) -> Optional[Dict[str, Any]]:
+    """
+    같은 내용의 파일이 이미 적재되어 있으면 기존 벡터를 재사용합니다.
+    같은 컬렉션에 있으면 그 문서를 그대로 반환하고, 다른 컬렉션에만 있으면 포인트를 복사합니다.
+
+    Returns:
+        적재 결과 딕셔너리, 재사용할 문서가 없으면 None
+    """
+    registry = get_content_registry()
+    target_name = collection_name or config.QDRANT_COLLECTION_NAME
+    target = qdrant_manager.for_collection(target_name) if qdrant_manager else QdrantManager(collection_name=target_name)
+    entries = registry.find(content_hash, embedding_model)
+    # 같은 컬렉션의 기록을 먼저 확인
+    entries.sort(key=lambda e: e["collection_name"] != target_name)
+    for entry in entries:
+        source = target.for_collection(entry["collection_name"])
+        if entry["collection_name"] == target_name:
+            if source.count_document_points(entry["document_id"]) == 0:
+                # 이미 삭제된 문서의 기록
+                registry.forget(entry["document_id"], entry["collection_name"])
+                continue
+            registry.record_saved(entry["chunks_count"])
+            tracker.set_progress(100, "같은 내용의 문서가 이미 적재되어 있습니다")
+            ingest_log.info("[적재] 중복 파일, 기존 문서 재사용: {filename} -> {document_id}", filename=filename,
+                            document_id=entry["document_id"], collection=entry["collection_name"])
+            return {"document_id": entry["document_id"], "chunks_count": entry["chunks_count"],
+                    "deduplicated": "existing", "source_document_id": entry["document_id"],
+                    "source_collection": entry["collection_name"]}
+
+        tracker.set_progress(80, f"같은 내용의 문서를 {entry['collection_name']}에서 복사 중...")
+        new_document_id = document_id or make_document_id(collection_name, filename)
+        overrides = {"title": filename}
+        if collection_name:
+            overrides["department"] = collection_name
+        copied = target.copy_document(source, entry["document_id"], new_document_id, payload_overrides=overrides)
+        if not copied:
+            if source.count_document_points(entry["document_id"]) == 0:
+                registry.forget(entry["document_id"], entry["collection_name"])
+            continue
+        registry.register(content_hash, embedding_model, target_name, new_document_id, copied)
+        registry.record_saved(copied)
+        tracker.set_progress(100, "업로드 및 벡터 적재 완료 (기존 임베딩 재사용)")
+        ingest_log.info("[적재] 중복 파일, {source_collection}의 임베딩 복사: {filename} ({chunks_count}개 청크)",
+                        source_collection=entry["collection_name"], filename=filename, collection=target_name,
+                        document_id=new_document_id, chunks_count=copied)
+        return {"document_id": new_document_id, "chunks_count": copied, "deduplicated": "copied",
+                "source_document_id": entry["document_id"], "source_collection": entry["collection_name"]}
+    return None
+
+
+def ingest_file(file_path: str, filename: str, collection_name: str = None, document_id: str = None,
+                tracker=None, text_chunker: TextChunker = None,
+                embedding_service: EmbeddingService = None, content_hash: str = None,
+                qdrant_manager: QdrantManager = None) -> Dict[str, Any]:
+    """
+    파일 하나를 추출/청킹/임베딩하여 Qdrant에 저장합니다.
+
+    Args:
+        file_path: 저장된 파일 경로
+        filename: 원본 파일명
+        collection_name: 저장할 컬렉션(부서) 이름
+        document_id: 문서 ID (없으면 '년월일시분초_부서_파일명'으로 생성)
+        tracker: set_progress/set_error(선택적으로 is_cancelled)를 제공하는 진행상태 기록 객체
+        text_chunker: 텍스트 청커 인스턴스
+        embedding_service: 임베딩 서비스 인스턴스
+        content_hash: 파일 내용 SHA-256 해시 (없으면 계산), 중복 파일 판별에 사용
+        qdrant_manager: Qdrant 매니저 (주면 이 클라이언트 연결로 collection_name 컬렉션에 저장)
+
+    Returns:
+        document_id, chunks_count를 담은 딕셔너리 (중복 재사용 시 deduplicated, source_document_id 포함)
+
+    Raises:
+        IngestionError: 추출/청킹/임베딩/저장 실패
+        IngestionCancelled: 처리 도중 취소 요청
+    """
+    try:
+        result = _ingest_file(file_path, filename, collection_name, document_id, tracker,
+                              text_chunker, embedding_service, content_hash, qdrant_manager)
+    except IngestionCancelled:
+        INGEST_FILES.labels(result="cancelled").inc()
+        raise
+    except Exception:
+        INGEST_FILES.labels(result="error").inc()
+        raise
+    INGEST_FILES.labels(result="deduplicated" if result.get("deduplicated") else "ingested").inc()
+    return result
+
+
+def _ingest_file(file_path: str, filename: str, collection_name: str, document_id: str, tracker,
+                 text_chunker: TextChunker, embedding_service: EmbeddingService,
+                 content_hash: str, qdrant_manager: QdrantManager = None) -> Dict[str, Any]:
+    tracker = tracker or _NullTracker()
+    stages = StageProgress(tracker)
+    text_chunker = text_chunker or TextChunker()
+    embedding_service = embedding_service or EmbeddingService()
+    ext = os.path.splitext(filename)[1].lower()
+
+    if config.CONTENT_DEDUP_ENABLED:
+        content_hash = content_hash or hash_file(file_path)
+        reused = _reuse_existing(content_hash, filename, collection_name, document_id,
+                                 embedding_service.model_name, tracker, qdrant_manager)
+        if reused:
+            return reused
+
+    tracker.set_progress(20, "텍스트/청크 추출 중...")
+    processor = get_processor(file_path)
+    if ext == '.xlsx':
+        # 엑셀은 extract_chunks로 질문/답변 분리 청크 추출
+        with span("parse", file_type=ext):
+            chunks = processor.extract_chunks(file_path, department=collection_name)
+        if not chunks:
+            raise IngestionError("엑셀 청크 추출 실패")
+        tracker.set_progress(40, f"엑셀 청크 {len(chunks)}개 추출 완료, 임베딩 중...")
+        metadata = None
+    else:
+        # 그 외 파일은 기존 방식
+        stages.start("parse", 20, 35, "pages", "페이지 파싱")
+        with span("parse", file_type=ext):
+            extracted = processor.extract_text(file_path, progress_callback=stages.update)
+        if isinstance(extracted, dict):
+            text = extracted.get('text', '')
+            if ext == '.pdf':
+                metadata = extracted.get('metadata', {})
+                metadata['title'] = filename
+                metadata['file_type'] = ext
+            else:
+                metadata = {
+                    'title': filename,
+                    'file_type': ext,
+                }
+        else:
+            text = extracted
+            metadata = {
+                'title': filename,
+                'file_type': ext,
+            }
+        # 추출 텍스트 전체 대신 길이와 앞부분만 기록
+        ingest_log.debug("[적재] 텍스트 추출: {filename} ({chars}자) {preview}", filename=filename,
+                         chars=len(text) if isinstance(text, str) else 0, preview=clip(text or ""))
+        if not text or not isinstance(text, str) or not text.strip():
+            raise IngestionError("텍스트 추출 실패")
+        with span("chunk"):
+            chunks = text_chunker.chunk_text(text)
+            # 청크별 소제목(문서명 > 제목/슬라이드 제목): 이름 있는 벡터 컬렉션의 title 벡터용
+            processor.assign_section_titles(text, chunks, filename)
+        if not chunks:
+            raise IngestionError("청크 생성 실패")
+        tracker.set_progress(40, f"청크 {len(chunks)}개 생성 완료, 임베딩 중...")
+
+    _check_cancelled(tracker)
+    stages.start("embed", 40, 80, "chunks", "청크 임베딩")
+    with span("embed", chunks=len(chunks)):
+        embedded_chunks = embedding_service.embed_chunks(chunks, progress_callback=stages.update)
+    if not embedded_chunks:
+        raise IngestionError("임베딩 생성 실패")
+    tracker.set_progress(80, "임베딩 완료, 벡터 DB 적재 중...")
+
+    # 엑셀은 이미 청크별 메타데이터 포함, 그 외는 일괄 메타데이터 부여
+    if metadata is not None:
+        for chunk in embedded_chunks:
+            chunk['metadata'] = metadata
+    if not document_id:
+        document_id = make_document_id(collection_name, filename)
+
+    _check_cancelled(tracker)
+    if qdrant_manager:
+        qdrant_mgr = qdrant_manager.for_collection(collection_name) if collection_name else qdrant_manager
+    else:
+        qdrant_mgr = QdrantManager(collection_name=collection_name) if collection_name else QdrantManager()
+    # 100%는 완료 처리에 사용되므로 저장 단계는 99%까지만 보고
+    stages.start("store", 80, 99, "points", "포인트 저장")
+    with span("store", points=len(embedded_chunks)):
+        stored = qdrant_mgr.store_vectors(embedded_chunks, document_id, progress_callback=stages.update)
+    if not stored:
+        raise IngestionError("벡터 저장 실패")
+    if config.CONTENT_DEDUP_ENABLED:
+        get_content_registry().register(content_hash, embedding_service.model_name, qdrant_mgr.collection_name,
+                                        document_id, len(embedded_chunks))
+
+    tracker.set_progress(100, "업로드 및 벡터 적재 완료")
+    ingest_log.info("[적재] 파일 처리 완료: {filename} ({chunks_count}개 청크)", filename=filename,
+                    collection=qdrant_mgr.collection_name, document_id=document_id,
+                    chunks_count=len(embedded_chunks), elapsed=round(time.time() - stages.started_at, 3))
+    return {"document_id": document_id, "chunks_count": len(embedded_chunks)}
@@ -0,0 +1,405 @@
+"""
+적재 작업 큐 - 프로세스 재시작에도 유지되는 작업 저장소
+API는 작업을 등록만 하고, 하나 이상의 워커(ingest_worker)가 리스(lease)를 잡고 처리합니다.
+기본 백엔드는 SQLite이며 register_job_queue_backend로 다른 백엔드를 추가할 수 있습니다.
+같은 프로세스의 상태 변경은 subscribe_job_updates 구독자(SSE 진행상태 스트림)에게 바로 알립니다.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional, Callable, Tuple
+from loguru import logger
+from src.config import config
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (DONE, ERROR, CANCELLED)
+
+# 작업 유형 (API가 등록하고 ingest_worker가 처리)
+INGEST_TASK = "ingest_file"
+
+# 상태 변경 구독자 (이벤트 → 이벤트를 만든 이벤트 루프)
+_subscribers: Dict[asyncio.Event, asyncio.AbstractEventLoop] = {}
+_subscribers_lock = threading.Lock()
+
+
+def subscribe_job_updates() -> asyncio.Event:
+    """
+    이 프로세스에서 작업 상태가 바뀔 때마다 set되는 이벤트를 등록합니다. (실행 중인 이벤트 루프에서 호출)
+    다른 프로세스의 워커가 바꾼 상태는 알림이 오지 않으므로 구독자는 주기적으로도 확인해야 합니다.
+
+    Returns:
+        asyncio.Event (확인 전에 clear하고, 끝나면 unsubscribe_job_updates로 해제)
+    """
+    event = asyncio.Event()
+    with _subscribers_lock:
+        _subscribers[event] = asyncio.get_running_loop()
+    return event
+
+
+def unsubscribe_job_updates(event: asyncio.Event) -> None:
+    """subscribe_job_updates로 등록한 이벤트를 해제합니다."""
+    with _subscribers_lock:
+        _subscribers.pop(event, None)
+
+
+def notify_job_update() -> None:
+    """구독자에게 작업 상태 변경을 알립니다. (백엔드가 상태를 바꾼 뒤 호출, 워커 스레드에서 호출 가능)"""
+    with _subscribers_lock:
+        subscribers = list(_subscribers.items())
+    for event, loop in subscribers:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # 이미 닫힌 이벤트 루프
+            unsubscribe_job_updates(event)
+
+
+class BaseJobQueue:
+    """작업 큐 백엔드 인터페이스"""
+
+    def enqueue(self, task_type: str, payload: Dict[str, Any], max_attempts: int = None) -> str:
+        """작업을 등록하고 작업 ID를 반환합니다."""
+        raise NotImplementedError
+
+    def lease(self, worker_id: str, lease_seconds: float = None) -> Optional[Dict[str, Any]]:
+        """처리할 작업 하나를 리스로 가져옵니다. 없으면 None."""
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float = None) -> bool:
+        """리스를 연장합니다. 리스를 잃었으면 False."""
+        raise NotImplementedError
+
+    def update_progress(self, job_id: str, progress: int, message: str = None,
+                        detail: Dict[str, Any] = None, worker_id: str = None) -> bool:
+        """
+        진행률, 메시지, 단계별 세부 진행(detail)을 기록합니다.
+        worker_id를 주면 그 워커가 리스를 가진 경우에만 기록하고, 리스를 잃었으면 False를 반환합니다.
+        """
+        raise NotImplementedError
+
+    def complete(self, job_id: str, result: Dict[str, Any] = None, worker_id: str = None) -> bool:
+        """
+        작업을 완료 처리합니다.
+        worker_id를 주면 그 워커가 리스를 가진 경우에만 기록하고, 리스를 잃었으면 False를 반환합니다.
+        """
+        raise NotImplementedError
+
+    def fail(self, job_id: str, error: str, retry: bool = True, worker_id: str = None) -> bool:
+        """
+        작업 실패를 기록합니다. 재시도 가능하면 다시 대기열로 보냅니다.
+        worker_id를 주면 그 워커가 리스를 가진 경우에만 기록하고, 리스를 잃었으면 False를 반환합니다.
+        """
+        raise NotImplementedError
+
+    def cancel(self, job_id: str) -> bool:
+        """작업 취소를 요청합니다."""
+        raise NotImplementedError
+
+    def mark_cancelled(self, job_id: str, worker_id: str = None) -> bool:
+        """워커가 취소 요청을 확인하고 작업을 취소 상태로 종료합니다. (worker_id는 complete와 같이 리스 확인)"""
+        raise NotImplementedError
+
+    def is_cancelled(self, job_id: str) -> bool:
+        """취소 요청 여부"""
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태를 조회합니다."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """상태별 작업 수 등 큐 지표를 반환합니다."""
+        raise NotImplementedError
+
+    def purge_finished(self, older_than: float) -> int:
+        """종료된 지 older_than초가 지난 작업을 삭제하고 삭제 건수를 반환합니다."""
+        raise NotImplementedError
+
+
+class SQLiteJobQueue(BaseJobQueue):
+    """SQLite 기반 작업 큐 (같은 호스트의 여러 프로세스/워커가 공유)"""
+
+    def __init__(self, path: str = None):
+        """
+        SQLiteJobQueue 초기화
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+        """
+        self.path = path or config.JOB_QUEUE_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._init_schema()
+        logger.info(f"작업 큐 초기화: sqlite {self.path}")
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 (sqlite3 연결은 스레드 간 공유 불가)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                task_type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress INTEGER NOT NULL DEFAULT 0,
+                message TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                available_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, available_at);
+        """)
+        # 이전 버전에서 만든 DB에 세부 진행 컬럼 추가
+        columns = {row["name"] for row in self._conn().execute("PRAGMA table_info(jobs)")}
+        if "detail" not in columns:
+            self._conn().execute("ALTER TABLE jobs ADD COLUMN detail TEXT")
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"]) if job["payload"] else {}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["detail"] = json.loads(job["detail"]) if job.get("detail") else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def enqueue(self, task_type: str, payload: Dict[str, Any], max_attempts: int = None) -> str:
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO jobs (id, task_type, payload, status, message, max_attempts, available_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, task_type, json.dumps(payload, ensure_ascii=False), QUEUED, "처리 대기 중",
+             max_attempts or config.JOB_MAX_ATTEMPTS, now, now, now)
+        )
+        logger.info(f"작업 등록: {job_id} ({task_type})")
+        return job_id
+
+    def lease(self, worker_id: str, lease_seconds: float = None) -> Optional[Dict[str, Any]]:
+        lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+        conn = self._conn()
+        now = time.time()
+        # BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡아 두 워커가 같은 작업을 가져가지 않도록 함
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 리스가 만료된 작업 중 재시도 횟수를 다 쓴 작업은 실패 처리
+            expired = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, message = ?, lease_owner = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts",
+                (ERROR, "리스 만료 (워커 중단)", "처리 중 워커가 중단되었습니다", now, RUNNING, now)
+            ).rowcount
+            # 취소 요청 후 워커가 중단된 작업은 다시 리스하지 않으므로 여기서 취소로 종료
+            expired += conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, lease_owner = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? AND cancel_requested = 1",
+                (CANCELLED, "작업이 취소되었습니다", now, RUNNING, now)
+            ).rowcount
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE cancel_requested = 0 AND "
+                "((status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?)) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, now, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                if expired:
+                    notify_job_update()
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "message = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now + lease_seconds, "처리 시작", now, row["id"])
+            )
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+            notify_job_update()
+            return self._row_to_job(job)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float = None) -> bool:
+        lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+        now = time.time()
+        cursor = self._conn().execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+            (now + lease_seconds, now, job_id, worker_id, RUNNING)
+        )
+        return cursor.rowcount == 1
+
+    def update_progress(self, job_id: str, progress: int, message: str = None,
+                        detail: Dict[str, Any] = None, worker_id: str = None) -> bool:
+        where, params = self._owner_clause(job_id, worker_id)
+        cursor = self._conn().execute(
+            "UPDATE jobs SET progress = ?, message = COALESCE(?, message), "
+            f"detail = COALESCE(?, detail), updated_at = ? WHERE {where}",
+            (progress, message, json.dumps(detail, ensure_ascii=False) if detail else None, time.time(), *params)
+        )
+        return self._notify_if_changed(cursor)
+
+    @staticmethod
+    def _notify_if_changed(cursor: sqlite3.Cursor) -> bool:
+        """한 건이 바뀌었으면 구독자에게 알리고 True를 반환합니다."""
+        if cursor.rowcount == 1:
+            notify_job_update()
+            return True
+        return False
+
+    @staticmethod
+    def _owner_clause(job_id: str, worker_id: Optional[str]) -> Tuple[str, tuple]:
+        """작업 ID 조건 (worker_id가 있으면 리스 소유자도 확인)"""
+        if worker_id is None:
+            return "id = ?", (job_id,)
+        return "id = ? AND lease_owner = ?", (job_id, worker_id)
+
+    def complete(self, job_id: str, result: Dict[str, Any] = None, worker_id: str = None) -> bool:
+        where, params = self._owner_clause(job_id, worker_id)
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = ?, progress = 100, message = ?, result = ?, lease_owner = NULL, "
+            f"updated_at = ? WHERE {where}",
+            (DONE, "업로드 및 벡터 적재 완료", json.dumps(result or {}, ensure_ascii=False), time.time(), *params)
+        )
+        return self._notify_if_changed(cursor)
+
+    def fail(self, job_id: str, error: str, retry: bool = True, worker_id: str = None) -> bool:
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return False
+        where, params = self._owner_clause(job_id, worker_id)
+        if retry and row["attempts"] < row["max_attempts"]:
+            # 지수 백오프 후 재시도
+            delay = config.JOB_RETRY_BACKOFF * (2 ** (row["attempts"] - 1))
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, message = ?, lease_owner = NULL, available_at = ?, "
+                f"updated_at = ? WHERE {where}",
+                (QUEUED, error, f"재시도 대기 중 ({row['attempts']}/{row['max_attempts']}): {error}",
+                 now + delay, now, *params)
+            )
+            if cursor.rowcount:
+                logger.warning(f"작업 재시도 예약: {job_id} ({delay:.0f}초 후) - {error}")
+        else:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, message = ?, progress = 0, lease_owner = NULL, "
+                f"updated_at = ? WHERE {where}",
+                (ERROR, error, error, now, *params)
+            )
+            if cursor.rowcount:
+                logger.error(f"작업 실패: {job_id} - {error}")
+        return self._notify_if_changed(cursor)
+
+    def cancel(self, job_id: str) -> bool:
+        conn = self._conn()
+        now = time.time()
+        # 대기 중인 작업은 즉시 취소, 실행 중인 작업은 워커가 확인 후 취소
+        cursor = conn.execute(
+            "UPDATE jobs SET status = ?, cancel_requested = 1, message = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (CANCELLED, "작업이 취소되었습니다", now, job_id, QUEUED)
+        )
+        if self._notify_if_changed(cursor):
+            return True
+        cursor = conn.execute(
+            "UPDATE jobs SET cancel_requested = 1, message = ?, updated_at = ? WHERE id = ? AND status = ?",
+            ("취소 요청됨", now, job_id, RUNNING)
+        )
+        return self._notify_if_changed(cursor)
+
+    def mark_cancelled(self, job_id: str, worker_id: str = None) -> bool:
+        where, params = self._owner_clause(job_id, worker_id)
+        cursor = self._conn().execute(
+            f"UPDATE jobs SET status = ?, message = ?, lease_owner = NULL, updated_at = ? WHERE {where}",
+            (CANCELLED, "작업이 취소되었습니다", time.time(), *params)
+        )
+        return self._notify_if_changed(cursor)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        row = self._conn().execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, ERROR, CANCELLED)}
+        for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        oldest = conn.execute("SELECT MIN(created_at) AS t FROM jobs WHERE status = ?", (QUEUED,)).fetchone()["t"]
+        return {
+            "backend": "sqlite",
+            "queue_depth": counts[QUEUED],
+            "running": counts[RUNNING],
+            "counts": counts,
+            "oldest_queued_age": round(time.time() - oldest, 3) if oldest else 0.0
+        }
+
+    def purge_finished(self, older_than: float) -> int:
+        cursor = self._conn().execute(
+            f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED_STATUSES))}) AND updated_at < ?",
+            (*FINISHED_STATUSES, time.time() - older_than)
+        )
+        if cursor.rowcount:
+            logger.info(f"종료된 작업 {cursor.rowcount}건 정리")
+        return cursor.rowcount
+
+
+# ---- 백엔드 등록/생성 ----
+_backends: Dict[str, Callable[[], BaseJobQueue]] = {
+    "sqlite": SQLiteJobQueue,
+}
+_instance: Optional[BaseJobQueue] = None
+_instance_lock = threading.Lock()
+
+
+def register_job_queue_backend(name: str, factory: Callable[[], BaseJobQueue]) -> None:
+    """
+    작업 큐 백엔드를 등록합니다. (예: Redis, PostgreSQL)
+
+    Args:
+        name: JOB_QUEUE_BACKEND 설정에 사용할 이름
+        factory: BaseJobQueue 인스턴스를 만드는 함수
+    """
+    _backends[name] = factory
+
+
+def get_job_queue() -> BaseJobQueue:
+    """설정(JOB_QUEUE_BACKEND)에 따른 프로세스 전역 작업 큐를 반환합니다."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                backend = config.JOB_QUEUE_BACKEND
+                if backend not in _backends:
+                    raise ValueError(f"지원하지 않는 작업 큐 백엔드입니다: {backend}")
+                _instance = _backends[backend]()
+    return _instance
@@ -0,0 +1,175 @@
+"""
+로깅 설정 - 요청 스레드의 로깅 비용과 로그 파일 크기를 줄이는 loguru 구성
+- 콘솔/파일 sink는 enqueue=True: 포맷과 파일 쓰기를 백그라운드 스레드에서 처리
+- 범주별 샘플링: 요청마다 찍히는 INFO/DEBUG 로그(search, qa 등)는 LOG_SAMPLE_RATES 비율만 기록 (WARNING 이상은 항상)
+- 지연 포맷: get_logger(범주)의 메시지는 "{}" 인자로 넘기면 샘플링/레벨을 통과한 경우에만 포맷
+- 크기 제한: 메시지는 LOG_MAX_MESSAGE_CHARS, 긴 필드 값(질문, 추출 텍스트)은 clip()으로 LOG_MAX_FIELD_CHARS까지
+- 적재 로그(category=ingest)는 LOG_INGEST_FILE에 JSON Lines로도 기록 (bind/키워드 인자 필드 포함)
+"""
+
+import os
+import random
+import sys
+import threading
+from typing import Any, Dict
+
+from loguru import logger
+
+from src.config import config
+
+INGEST_CATEGORY = "ingest"
+_LOG_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
+_WARNING_NO = logger.level("WARNING").no
+
+_configured = False
+_configure_lock = threading.Lock()
+_rates_source = None
+_rates: Dict[str, float] = {}
+
+
+def clip(value: Any, limit: int = None) -> str:
+    """
+    로그에 남길 값을 최대 길이로 자릅니다.
+
+    Args:
+        value: 로그 필드 값 (문자열로 변환)
+        limit: 최대 글자 수 (기본: LOG_MAX_FIELD_CHARS, 0이면 자르지 않음)
+
+    Returns:
+        잘린 문자열 (잘렸으면 생략된 글자 수 표시)
+    """
+    text = value if isinstance(value, str) else str(value)
+    limit = config.LOG_MAX_FIELD_CHARS if limit is None else limit
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(+{len(text) - limit}자)"
+
+
+def sample_rate(category: str) -> float:
+    """LOG_SAMPLE_RATES('search=0.1,qa=0.5')에서 범주의 INFO/DEBUG 기록 비율을 반환합니다. (없으면 1.0)"""
+    global _rates_source, _rates
+    if _rates_source != config.LOG_SAMPLE_RATES:
+        rates = {}
+        for item in config.LOG_SAMPLE_RATES.split(","):
+            name, _, value = item.partition("=")
+            if name.strip() and value.strip():
+                try:
+                    rates[name.strip()] = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    logger.warning(f"잘못된 로그 샘플링 비율 무시: {item}")
+        _rates, _rates_source = rates, config.LOG_SAMPLE_RATES
+    return _rates.get(category, 1.0)
+
+
+class CategoryLogger:
+    """범주(category)를 extra에 붙이고 INFO/DEBUG 로그를 샘플링하는 loguru 래퍼"""
+
+    def __init__(self, category: str):
+        """
+        CategoryLogger 초기화
+
+        Args:
+            category: 로그 범주 (LOG_SAMPLE_RATES 키, JSON 로그의 extra.category)
+        """
+        self.category = category
+        self._logger = logger.bind(category=category)
+
+    def sampled(self) -> bool:
+        """이번 INFO/DEBUG 로그를 기록할지 샘플링 비율로 결정합니다."""
+        rate = sample_rate(self.category)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    def log(self, level: str, message: str, *args, **kwargs) -> None:
+        """
+        로그를 기록합니다. 인자는 loguru와 같이 message.format(*args, **kwargs)로 늦게 포맷하고,
+        키워드 인자는 extra 필드로도 남습니다.
+        """
+        if logger.level(level).no < _WARNING_NO and not self.sampled():
+            return
+        self._logger.opt(depth=2).log(level, message, *args, **kwargs)
+
+    def debug(self, message: str, *args, **kwargs) -> None:
+        self.log("DEBUG", message, *args, **kwargs)
+
+    def info(self, message: str, *args, **kwargs) -> None:
+        self.log("INFO", message, *args, **kwargs)
+
+    def warning(self, message: str, *args, **kwargs) -> None:
+        self.log("WARNING", message, *args, **kwargs)
+
+    def error(self, message: str, *args, **kwargs) -> None:
+        self.log("ERROR", message, *args, **kwargs)
+
+
+_category_loggers: Dict[str, CategoryLogger] = {}
+
+
+def get_logger(category: str) -> CategoryLogger:
+    """
+    범주별 로거를 반환합니다.
+
+    Args:
+        category: 로그 범주 (search, qa, embedding, ingest 등)
+
+    Returns:
+        CategoryLogger 인스턴스 (범주별로 공유)
+    """
+    category_logger = _category_loggers.get(category)
+    if category_logger is None:
+        category_logger = _category_loggers.setdefault(category, CategoryLogger(category))
+    return category_logger
+
+
+def _clip_message(record) -> None:
+    """모든 로그 메시지를 LOG_MAX_MESSAGE_CHARS로 제한하는 patcher"""
+    if config.LOG_MAX_MESSAGE_CHARS > 0 and len(record["message"]) > config.LOG_MAX_MESSAGE_CHARS:
+        record["message"] = clip(record["message"], config.LOG_MAX_MESSAGE_CHARS)
+
+
+def _is_ingest(record) -> bool:
+    return record["extra"].get("category") == INGEST_CATEGORY
+
+
+def setup_logging(log_file: str = None, level: str = None, console: bool = True) -> None:
+    """
+    loguru sink를 구성합니다. (프로세스에서 한 번만 적용, API 서버와 적재 워커 시작 시 호출)
+
+    Args:
+        log_file: 로그 파일 경로 (기본: LOG_FILE)
+        level: 최소 로그 레벨 (기본: LOG_LEVEL)
+        console: 표준 에러 출력 sink 사용 여부
+    """
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        log_file = log_file or config.LOG_FILE
+        level = level or config.LOG_LEVEL
+
+        logger.remove()
+        logger.configure(patcher=_clip_message)
+        if console:
+            logger.add(sys.stderr, level=level, enqueue=config.LOG_ENQUEUE)
+        if os.path.dirname(log_file):
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        logger.add(
+            log_file,
+            level=level,
+            rotation=config.LOG_ROTATION,
+            retention=config.LOG_RETENTION,
+            format=_LOG_FORMAT,
+            enqueue=config.LOG_ENQUEUE
+        )
+        if config.LOG_INGEST_FILE:
+            if os.path.dirname(config.LOG_INGEST_FILE):
+                os.makedirs(os.path.dirname(config.LOG_INGEST_FILE), exist_ok=True)
+            logger.add(
+                config.LOG_INGEST_FILE,
+                level=level,
+                filter=_is_ingest,
+                serialize=True,
+                rotation=config.LOG_ROTATION,
+                retention=config.LOG_RETENTION,
+                enqueue=config.LOG_ENQUEUE
+            )
+        _configured = True
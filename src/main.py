@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -11,15 +12,15 @@ from fastapi.openapi.docs import get_swagger_ui_html
 
 from src.config import config
 from src.api.routes import router
+from src.model_residency import model_residency
+from src.health_monitor import get_health_monitor
+from src.upload_storage import UploadSizeLimitMiddleware, parse_size
+from src.metrics import HTTP_REQUEST_SECONDS
+from src.tracing import start_trace
+from src.logging_setup import setup_logging
 
-# 로깅 설정
-logger.add(
-    config.LOG_FILE,
-    level=config.LOG_LEVEL,
-    rotation="10 MB",
-    retention="7 days",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
-)
+# 로깅 설정 (비동기 큐 sink, 범주별 샘플링, 적재 JSON 로그)
+setup_logging()
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -54,6 +55,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 처리 시간 지표와 단계별 트레이스 (경로는 라우트 템플릿으로 기록하여 레이블 수 제한)
+@app.middleware("http")
+async def record_request_metrics(request, call_next):
+    start = time.perf_counter()
+    status = 500
+    with start_trace(f"{request.method} {request.url.path}", **{"http.method": request.method}) as trace:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            # 단계별 소요 시간을 Server-Timing 헤더로 노출 (브라우저 개발자 도구에서 확인 가능)
+            response.headers["Server-Timing"] = trace.server_timing()
+            return response
+        finally:
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            trace.root.name = f"{request.method} {route}"
+            trace.root.set_attribute("http.route", route)
+            trace.root.set_attribute("http.status_code", status)
+            HTTP_REQUEST_SECONDS.labels(
+                method=request.method,
+                route=route,
+                status=str(status)
+            ).observe(time.perf_counter() - start)
+
+# 최대 업로드 크기를 넘는 요청은 본문을 받기 전에 거절
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=parse_size(config.MAX_FILE_SIZE))
+
+
+# API 프로세스 내장 적재 워커 (INGEST_INLINE_WORKER=False면 별도 워커 프로세스로 처리)
+inline_worker = None
 
 # 라우터 등록
 app.include_router(router, prefix="/api/v1", tags=["api"])
@@ -88,11 +118,31 @@ async def startup_event():
     
     logger.info(f"업로드 디렉토리: {config.UPLOAD_DIR}")
     logger.info(f"로그 파일: {config.LOG_FILE}")
+    
+    # 임베딩/LLM 모델 사전 로드 및 주기적 keep-warm (첫 요청의 모델 로딩 지연 방지)
+    if config.MODEL_KEEPWARM_ENABLED:
+        model_residency.start()
+    
+    # 의존 서비스 상태 백그라운드 점검 (/health, /ready는 캐시된 결과로 응답)
+    get_health_monitor().start()
+    
+    # 적재 작업 큐 워커 (재시작 시 미완료 작업은 리스 만료 후 다시 처리됨)
+    global inline_worker
+    if config.INGEST_INLINE_WORKER:
+        from src.ingest_worker import IngestWorker
+        inline_worker = IngestWorker()
+        inline_worker.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 실행"""
     logger.info("애플리케이션 종료")
+    model_residency.stop()
+    get_health_monitor().stop()
+    if inline_worker:
+        inline_worker.stop(timeout=5)
+    # 큐에 남은 로그 기록 완료 대기
+    await logger.complete()
 
 def main():
     """메인 함수"""
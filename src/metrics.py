@@ -0,0 +1,203 @@
+"""
+Prometheus 지표 - 임베딩/Qdrant/LLM/적재 단계별 지연 시간 히스토그램과 카운터
+prometheus_client가 없으면 모든 지표는 아무 일도 하지 않으며 /metrics는 503을 반환합니다.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+try:
+    from prometheus_client import (
+        CollectorRegistry, Counter, Gauge, Histogram,
+        generate_latest, CONTENT_TYPE_LATEST, start_http_server
+    )
+except ImportError:
+    CollectorRegistry = Counter = Gauge = Histogram = None
+    generate_latest = start_http_server = None
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+from loguru import logger
+
+METRICS_AVAILABLE = Histogram is not None
+
+# 지연 시간 버킷 (초): 수 ms 단위의 Qdrant 검색부터 수십 초의 LLM 생성까지
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+TOKENS_PER_SECOND_BUCKETS = (1, 5, 10, 20, 30, 50, 75, 100, 150, 250)
+
+
+class _NoopMetric:
+    """prometheus_client가 없을 때 사용하는 빈 지표"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+
+registry = CollectorRegistry() if METRICS_AVAILABLE else None
+
+
+def _histogram(name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+    if not METRICS_AVAILABLE:
+        return _NoopMetric()
+    return Histogram(name, documentation, labelnames, buckets=buckets, registry=registry)
+
+
+def _counter(name: str, documentation: str, labelnames=()):
+    if not METRICS_AVAILABLE:
+        return _NoopMetric()
+    return Counter(name, documentation, labelnames, registry=registry)
+
+
+def _gauge(name: str, documentation: str, labelnames=()):
+    if not METRICS_AVAILABLE:
+        return _NoopMetric()
+    return Gauge(name, documentation, labelnames, registry=registry)
+
+
+# ---- HTTP ----
+HTTP_REQUEST_SECONDS = _histogram(
+    "rag_http_request_seconds", "API 요청 처리 시간", ("method", "route", "status"))
+
+# ---- 임베딩 ----
+EMBEDDING_REQUEST_SECONDS = _histogram(
+    "rag_embedding_request_seconds", "임베딩 호출 시간 (Ollama HTTP endpoint 또는 onnx)", ("endpoint",))
+EMBEDDING_BATCH_SIZE = _histogram(
+    "rag_embedding_batch_size", "임베딩 호출 1회당 텍스트 수", ("endpoint",), buckets=BATCH_SIZE_BUCKETS)
+EMBEDDING_ERRORS = _counter(
+    "rag_embedding_errors_total", "임베딩 호출 실패 수", ("endpoint",))
+
+# ---- Qdrant ----
+QDRANT_OPERATION_SECONDS = _histogram(
+    "rag_qdrant_operation_seconds", "Qdrant 호출 시간", ("operation",))
+QDRANT_ERRORS = _counter(
+    "rag_qdrant_errors_total", "Qdrant 호출 실패 수", ("operation",))
+QDRANT_POINTS = _counter(
+    "rag_qdrant_points_total", "Qdrant에 저장(upsert)한 포인트 수", ("operation",))
+
+# ---- LLM ----
+LLM_PROMPT_EVAL_SECONDS = _histogram(
+    "rag_llm_prompt_eval_seconds", "LLM 프롬프트 처리 시간 (Ollama prompt_eval_duration)", ("model",))
+LLM_GENERATION_SECONDS = _histogram(
+    "rag_llm_generation_seconds", "LLM 토큰 생성 시간 (Ollama eval_duration)", ("model",))
+LLM_LOAD_SECONDS = _histogram(
+    "rag_llm_load_seconds", "LLM 모델 로드 시간 (Ollama load_duration)", ("model",))
+LLM_TOKENS_PER_SECOND = _histogram(
+    "rag_llm_tokens_per_second", "LLM 생성 속도 (eval_count / eval_duration)", ("model",),
+    buckets=TOKENS_PER_SECOND_BUCKETS)
+LLM_TOKENS = _counter(
+    "rag_llm_tokens_total", "LLM 처리 토큰 수", ("model", "kind"))
+
+# ---- 적재 ----
+INGEST_STAGE_SECONDS = _histogram(
+    "rag_ingest_stage_seconds", "적재 단계별 소요 시간", ("stage",))
+INGEST_ITEMS = _counter(
+    "rag_ingest_items_total", "적재 단계별 처리량 (pages/chunks/points)", ("stage", "unit"))
+INGEST_FILES = _counter(
+    "rag_ingest_files_total", "적재한 파일 수", ("result",))
+
+# ---- 캐시/큐 ----
+CACHE_REQUESTS = _counter(
+    "rag_cache_requests_total", "캐시 조회 수", ("cache", "result"))
+QUEUE_DEPTH = _gauge(
+    "rag_queue_depth", "대기열 길이", ("queue",))
+DEPENDENCY_UP = _gauge(
+    "rag_dependency_up", "의존 서비스 상태 (1=정상)", ("dependency",))
+
+# /metrics 요청 시 값을 채우는 게이지 갱신 함수들
+_gauge_refreshers: List[Tuple[str, Callable[[], None]]] = []
+
+
+@contextmanager
+def observe_seconds(histogram, errors=None, **labels):
+    """
+    블록 실행 시간을 히스토그램에 기록합니다. 예외가 나면 errors 카운터도 증가시킵니다.
+
+    Args:
+        histogram: 시간을 기록할 히스토그램
+        errors: 실패 시 증가시킬 카운터 (선택)
+        **labels: 지표 레이블
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if errors is not None:
+            errors.labels(**labels).inc()
+        raise
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """캐시 적중/실패를 기록합니다."""
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_generation(model: str, stats: Dict[str, float]) -> None:
+    """
+    Ollama 생성 통계(QAService._extract_generation_stats 결과)를 기록합니다.
+
+    Args:
+        model: LLM 모델 이름
+        stats: prompt_eval_seconds, eval_seconds, load_seconds, prompt_eval_count, eval_count 등
+    """
+    if stats.get("prompt_eval_seconds"):
+        LLM_PROMPT_EVAL_SECONDS.labels(model=model).observe(stats["prompt_eval_seconds"])
+    if stats.get("eval_seconds"):
+        LLM_GENERATION_SECONDS.labels(model=model).observe(stats["eval_seconds"])
+    if stats.get("load_seconds"):
+        LLM_LOAD_SECONDS.labels(model=model).observe(stats["load_seconds"])
+    if stats.get("tokens_per_second"):
+        LLM_TOKENS_PER_SECOND.labels(model=model).observe(stats["tokens_per_second"])
+    LLM_TOKENS.labels(model=model, kind="prompt").inc(stats.get("prompt_eval_count", 0))
+    LLM_TOKENS.labels(model=model, kind="completion").inc(stats.get("eval_count", 0))
+
+
+def register_gauge_refresher(name: str, refresher: Callable[[], None]) -> None:
+    """
+    /metrics 요청 시 호출되어 게이지 값을 채우는 함수를 등록합니다. (큐 길이, 의존 서비스 상태 등)
+
+    Args:
+        name: 갱신 함수 이름 (같은 이름은 교체)
+        refresher: 인자 없는 함수
+    """
+    _gauge_refreshers[:] = [(n, f) for n, f in _gauge_refreshers if n != name]
+    _gauge_refreshers.append((name, refresher))
+
+
+def render_latest() -> bytes:
+    """등록된 게이지를 갱신하고 Prometheus 텍스트 형식으로 직렬화합니다."""
+    for name, refresher in _gauge_refreshers:
+        try:
+            refresher()
+        except Exception as e:
+            logger.warning(f"지표 갱신 실패({name}): {e}")
+    return generate_latest(registry)
+
+
+def start_metrics_server(port: int) -> bool:
+    """
+    별도 포트로 /metrics를 노출합니다. (API 서버가 없는 적재 워커 프로세스용)
+
+    Args:
+        port: 포트 번호
+
+    Returns:
+        시작 여부 (prometheus_client 미설치 시 False)
+    """
+    if not METRICS_AVAILABLE:
+        logger.warning("prometheus_client가 설치되어 있지 않아 지표 서버를 시작하지 않습니다")
+        return False
+    start_http_server(port, registry=registry)
+    logger.info(f"지표 서버 시작: :{port}/metrics")
+    return True
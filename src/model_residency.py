@@ -0,0 +1,176 @@
+"""
+모델 상주 관리 - Ollama 임베딩/LLM 모델을 미리 로드하고 메모리에 유지
+첫 요청이나 모델 교체(eviction) 후 요청이 모델 로딩 시간을 떠안지 않도록 합니다.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+import requests
+from loguru import logger
+from src.config import config
+
+
+def _normalize_model_name(name: str) -> str:
+    """태그가 없는 모델명은 Ollama와 같이 ':latest'를 붙여 비교합니다."""
+    return name if ":" in name else f"{name}:latest"
+
+
+class ModelResidencyManager:
+    """Ollama 모델 사전 로드, keep-alive 유지, 로드/언로드 이벤트 추적 클래스"""
+
+    def __init__(self, base_url: str = None, interval: int = None):
+        """
+        ModelResidencyManager 초기화
+
+        Args:
+            base_url: Ollama 서버 URL
+            interval: keep-warm 점검 주기 (초)
+        """
+        self.base_url = base_url or config.get_ollama_url()
+        self.interval = interval or config.MODEL_KEEPWARM_INTERVAL
+        self.models: Dict[str, Dict[str, Any]] = {}
+        # 프로세스 내(ONNX) 임베딩 백엔드를 쓰면 Ollama에 임베딩 모델을 올리지 않음
+        if config.EMBEDDING_BACKEND == "ollama":
+            self.models[config.OLLAMA_EMBEDDING_MODEL] = {"kind": "embedding", "keep_alive": config.OLLAMA_EMBED_KEEP_ALIVE}
+        self.models[config.OLLAMA_LLM_MODEL] = {"kind": "llm", "keep_alive": config.OLLAMA_LLM_KEEP_ALIVE}
+        self.loaded: Dict[str, Dict[str, Any]] = {}
+        self.events: deque = deque(maxlen=200)
+        self.last_check: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _record(self, model: str, event: str, **extra) -> None:
+        with self._lock:
+            self.events.append({"model": model, "event": event, "timestamp": time.time(), **extra})
+        logger.info(f"[모델 상주] {model}: {event} {extra if extra else ''}")
+
+    def load_model(self, model: str) -> bool:
+        """
+        모델을 로드하고 keep_alive를 갱신합니다. (이미 로드된 경우 타이머만 연장)
+
+        Args:
+            model: 모델명
+
+        Returns:
+            로드 성공 여부
+        """
+        spec = self.models[model]
+        start = time.time()
+        try:
+            if spec["kind"] == "embedding":
+                response = requests.post(
+                    f"{self.base_url}/api/embed",
+                    json={"model": model, "input": "warmup", "keep_alive": spec["keep_alive"]},
+                    timeout=300
+                )
+                if response.status_code == 404:
+                    # 구버전 Ollama
+                    response = requests.post(
+                        f"{self.base_url}/api/embeddings",
+                        json={"model": model, "prompt": "warmup", "keep_alive": spec["keep_alive"]},
+                        timeout=300
+                    )
+            else:
+                # prompt 없이 호출하면 생성 없이 모델만 로드
+                response = requests.post(
+                    f"{self.base_url}/api/generate",
+                    json={"model": model, "keep_alive": spec["keep_alive"]},
+                    timeout=300
+                )
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.error(f"[모델 상주] {model} 로드 실패: {e}")
+            self._record(model, "load_failed", error=str(e))
+            return False
+        finally:
+            elapsed = time.time() - start
+            # 수 초 이상 걸렸다면 실제로 디스크에서 모델을 올린 것
+            if elapsed > 1.0:
+                self._record(model, "load_request", seconds=round(elapsed, 3))
+
+    def warm_up(self) -> None:
+        """관리 대상 모델을 모두 미리 로드합니다."""
+        for model in self.models:
+            self.load_model(model)
+        self.check_loaded()
+
+    def check_loaded(self) -> Dict[str, Dict[str, Any]]:
+        """
+        /api/ps로 현재 메모리에 올라온 모델을 조회하고 로드/언로드 이벤트를 기록합니다.
+
+        Returns:
+            로드된 모델명 -> 상태 정보
+        """
+        try:
+            response = requests.get(f"{self.base_url}/api/ps", timeout=10)
+            response.raise_for_status()
+            current = {
+                _normalize_model_name(m.get("name", "")): {
+                    "size_vram": m.get("size_vram"),
+                    "expires_at": m.get("expires_at"),
+                }
+                for m in response.json().get("models", [])
+            }
+        except Exception as e:
+            logger.warning(f"[모델 상주] 로드 상태 조회 실패: {e}")
+            return self.loaded
+
+        with self._lock:
+            previous = set(self.loaded)
+            self.loaded = current
+            self.last_check = time.time()
+        for name in set(current) - previous:
+            self._record(name, "loaded")
+        for name in previous - set(current):
+            self._record(name, "unloaded")
+        return current
+
+    def _run(self) -> None:
+        self.warm_up()
+        while not self._stop.wait(self.interval):
+            loaded = self.check_loaded()
+            for model in self.models:
+                if _normalize_model_name(model) not in loaded:
+                    self._record(model, "evicted")
+                # keep-warm ping: 로드된 모델은 keep_alive 타이머 연장, 내려간 모델은 다시 로드
+                self.load_model(model)
+
+    def start(self) -> None:
+        """백그라운드 스레드에서 사전 로드와 주기적 keep-warm을 시작합니다."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-residency", daemon=True)
+        self._thread.start()
+        logger.info(f"[모델 상주] 관리 시작: {list(self.models)} (주기 {self.interval}초)")
+
+    def stop(self) -> None:
+        """keep-warm 스레드를 중지합니다."""
+        self._stop.set()
+
+    def status(self) -> Dict[str, Any]:
+        """관리 대상 모델의 상주 상태와 최근 이벤트를 반환합니다."""
+        with self._lock:
+            models: List[Dict[str, Any]] = []
+            for model, spec in self.models.items():
+                info = self.loaded.get(_normalize_model_name(model))
+                models.append({
+                    "model": model,
+                    "kind": spec["kind"],
+                    "keep_alive": spec["keep_alive"],
+                    "loaded": info is not None,
+                    **(info or {})
+                })
+            return {
+                "models": models,
+                "last_check": self.last_check,
+                "events": list(self.events)[-50:]
+            }
+
+
+# 전역 모델 상주 관리자 인스턴스
+model_residency = ModelResidencyManager()
@@ -1,35 +1,92 @@
+import bisect
 import os
 import re
-import cv2
-import numpy as np
-from PIL import Image
+import threading
+from typing import Callable, Dict, List, Tuple
 from loguru import logger
 
-try:
-    import pytesseract
-except ImportError:
-    pytesseract = None
-try:
-    import easyocr
-except ImportError:
-    easyocr = None
+# OpenCV/NumPy/PIL과 OCR 엔진(easyocr, pytesseract)은 import 비용이 커서 이미지 처리 시점에 불러옴
+
+# 제목 줄로 볼 패턴 (제1장, 1. / 1.2, Ⅰ. / IV., ■ 글머리, [제목], # 마크다운 제목)
+_HEADING_PATTERN = re.compile(
+    r'^(제\s*\d+\s*[편장절관조]|\d+(\.\d+)*\.?\s|[IVXⅠ-Ⅻ]+\.\s|[■□◆◇▶●○◎]\s*|\[[^\]]{1,40}\]$|#{1,6}\s)'
+)
+_HEADING_MAX_CHARS = 60
+
+
+def detect_headings(text: str) -> List[Tuple[int, str]]:
+    """
+    추출된 텍스트에서 제목으로 보이는 줄을 찾습니다. (번호/글머리 패턴 + 짧은 줄, 문장으로 끝나는 줄 제외)
+
+    Args:
+        text: 추출된 전체 텍스트
+
+    Returns:
+        (텍스트 내 시작 위치, 제목) 리스트 (위치 순)
+    """
+    headings = []
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if (2 <= len(stripped) <= _HEADING_MAX_CHARS and _HEADING_PATTERN.match(stripped)
+                and not stripped.endswith(('.', '다', '요', ','))):
+            headings.append((offset, stripped.lstrip('#').strip()))
+        offset += len(line)
+    return headings
+
 
 # ---- 파일 포맷별 프로세서 ----
 class BaseFileProcessor:
-    def extract_text(self, file_path: str) -> str:
+    def extract_text(self, file_path: str, progress_callback=None) -> str:
+        """progress_callback(완료 페이지 수, 전체 페이지 수)로 페이지 단위 진행을 알립니다."""
         raise NotImplementedError
 
     def extract_chunks(self, file_path: str, department: str = None) -> list:
         raise NotImplementedError
 
+    def section_headings(self, text: str) -> List[Tuple[int, str]]:
+        """extract_text 결과의 (시작 위치, 제목) 리스트. 기본은 줄 패턴으로 추정합니다."""
+        return detect_headings(text)
+
+    def assign_section_titles(self, text: str, chunks: list, filename: str = None) -> list:
+        """
+        extract_text 결과를 나눈 청크마다 앞선 가장 가까운 제목을 section_title로 붙입니다.
+        (이름 있는 벡터 컬렉션의 title 벡터로 임베딩되어 짧은 조회형 질문과 매칭)
+
+        Args:
+            text: extract_text로 추출한 전체 텍스트
+            chunks: text를 순서대로 나눈 청크 리스트 (text 키 필요)
+            filename: 원본 파일명 (제목 앞에 붙일 문서 이름)
+
+        Returns:
+            section_title이 추가된 같은 청크 리스트
+        """
+        headings = self.section_headings(text)
+        offsets = [offset for offset, _ in headings]
+        document = os.path.splitext(os.path.basename(filename))[0] if filename else ""
+        cursor = 0
+        for chunk in chunks:
+            # 청크 앞부분으로 원문 위치를 찾음 (청커가 빈 줄을 합쳐 전체 일치는 보장되지 않음)
+            head = chunk.get('text', '').strip()[:40]
+            position = text.find(head, cursor) if head else -1
+            if position >= 0:
+                cursor = position
+            index = bisect.bisect_right(offsets, cursor) - 1
+            heading = headings[index][1] if index >= 0 else ""
+            chunk['section_title'] = " > ".join(part for part in (document, heading) if part)
+        return chunks
+
 class PDFProcessor(BaseFileProcessor):
-    def extract_text(self, file_path: str) -> str:
+    def extract_text(self, file_path: str, progress_callback=None) -> str:
         import pdfplumber
         text = []
         with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
+            total_pages = len(pdf.pages)
+            for page_no, page in enumerate(pdf.pages, 1):
                 page_text = page.extract_text() or ""
                 text.append(page_text)
+                if progress_callback:
+                    progress_callback(page_no, total_pages)
         return "\n".join(text)
 
     def extract_chunks(self, file_path: str, department: str = None) -> list:
@@ -72,7 +129,7 @@ class PDFProcessor(BaseFileProcessor):
         return chunks
 
 class ExcelProcessor(BaseFileProcessor):
-    def extract_text(self, file_path: str) -> str:
+    def extract_text(self, file_path: str, progress_callback=None) -> str:
         import openpyxl
         wb = openpyxl.load_workbook(file_path, data_only=True)
         text_blocks = []
@@ -137,21 +194,37 @@ class ExcelProcessor(BaseFileProcessor):
                 for k, v in row_dict.items():
                     if v is not None and str(v).strip() != "":
                         meta[k] = v
+                # 시트명 + 행의 첫 값(항목명/질문 등 키 칼럼)을 title 벡터용 제목으로 사용
+                key = next(str(v).strip() for v in row_dict.values() if v is not None and str(v).strip() != "")
                 if text.strip():
-                    chunks.append({"text": text, "metadata": meta})
+                    chunks.append({"text": text, "section_title": f"{sheet.title} > {key}", "metadata": meta})
         return chunks
 
 class PowerPointProcessor(BaseFileProcessor):
-    def extract_text(self, file_path: str) -> str:
+    def extract_text(self, file_path: str, progress_callback=None) -> str:
         from pptx import Presentation
         prs = Presentation(file_path)
         text = []
-        for slide in prs.slides:
+        total_slides = len(prs.slides)
+        # 슬라이드 제목과 반환 텍스트 내 슬라이드 시작 위치 (section_headings에서 사용)
+        self._slide_headings = []
+        offset = 0
+        for slide_no, slide in enumerate(prs.slides, 1):
+            title_shape = slide.shapes.title
+            title = title_shape.text.strip() if title_shape is not None and title_shape.text else ""
+            self._slide_headings.append((offset, title or f"슬라이드 {slide_no}"))
             for shape in slide.shapes:
                 if hasattr(shape, "text"):
                     text.append(shape.text)
+                    offset += len(shape.text) + 1
+            if progress_callback:
+                progress_callback(slide_no, total_slides)
         return "\n".join(text)
 
+    def section_headings(self, text: str) -> List[Tuple[int, str]]:
+        """extract_text에서 기록한 슬라이드 제목 (없으면 줄 패턴으로 추정)"""
+        return getattr(self, "_slide_headings", None) or detect_headings(text)
+
     def extract_chunks(self, file_path: str, department: str = None) -> list:
         from pptx import Presentation
         filename = os.path.basename(file_path)
@@ -179,46 +252,45 @@ class PowerPointProcessor(BaseFileProcessor):
                 "filename": filename,
                 "department": department
             }
-            chunks.append({"text": text, "metadata": meta})
+            section_title = f"{os.path.splitext(filename)[0]} > {title or f'슬라이드 {idx}'}"
+            chunks.append({"text": text, "section_title": section_title, "metadata": meta})
         return chunks
 
+class WordProcessor(BaseFileProcessor):
+    def extract_text(self, file_path: str, progress_callback=None) -> str:
+        """문단은 줄 단위로, 표는 '| 셀 | 셀 |' 줄로 추출합니다. (제목 스타일 문단은 section_headings에 기록)"""
+        try:
+            from docx import Document
+        except ImportError:
+            raise ImportError("python-docx 패키지가 설치되어 있지 않습니다. 'pip install python-docx'로 설치하세요.")
+        document = Document(file_path)
+        text = []
+        self._headings = []
+        offset = 0
+        for paragraph in document.paragraphs:
+            line = paragraph.text
+            style = paragraph.style.name if paragraph.style is not None else ""
+            if line.strip() and style.startswith(("Heading", "Title", "제목")):
+                self._headings.append((offset, line.strip()))
+            text.append(line)
+            offset += len(line) + 1
+        for table in document.tables:
+            for row in table.rows:
+                text.append("| " + " | ".join(cell.text.strip() for cell in row.cells) + " |")
+        if progress_callback:
+            progress_callback(1, 1)
+        return "\n".join(text)
+
+    def section_headings(self, text: str) -> List[Tuple[int, str]]:
+        """extract_text에서 기록한 제목 스타일 문단 (없으면 줄 패턴으로 추정)"""
+        return getattr(self, "_headings", None) or detect_headings(text)
+
 class ImageProcessor(BaseFileProcessor):
-    def extract_text(self, file_path: str) -> str:
-        img = cv2.imread(file_path)
-        img = preprocess_image_for_ocr(img)
-        text = ""
-        if easyocr:
-            try:
-                reader = easyocr.Reader(['ko', 'en'])
-                text = "\n".join([r[1] for r in reader.readtext(img)])
-            except Exception as e:
-                print(f"[easyocr 오류] {e}")
-        if (not text or not text.strip()) and pytesseract:
-            try:
-                from PIL import Image
-                pil_img = Image.fromarray(img)
-                text = pytesseract.image_to_string(pil_img, lang='kor+eng')
-            except Exception as e:
-                print(f"[pytesseract 오류] {e}")
-        return text
+    def extract_text(self, file_path: str, progress_callback=None) -> str:
+        return ocr_image(file_path)
 
     def extract_chunks(self, file_path: str, department: str = None) -> list:
-        img = cv2.imread(file_path)
-        img = preprocess_image_for_ocr(img)
-        text = ""
-        if easyocr:
-            try:
-                reader = easyocr.Reader(['ko', 'en'])
-                text = "\n".join([r[1] for r in reader.readtext(img)])
-            except Exception as e:
-                print(f"[easyocr 오류] {e}")
-        if (not text or not text.strip()) and pytesseract:
-            try:
-                from PIL import Image
-                pil_img = Image.fromarray(img)
-                text = pytesseract.image_to_string(pil_img, lang='kor+eng')
-            except Exception as e:
-                print(f"[pytesseract 오류] {e}")
+        text = ocr_image(file_path)
         paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
         filename = os.path.basename(file_path)
         chunks = []
@@ -231,7 +303,52 @@ class ImageProcessor(BaseFileProcessor):
             chunks.append({"text": para, "metadata": meta})
         return chunks
 
+# easyocr Reader는 모델 로드 비용이 커서 프로세스에서 한 번만 생성
+_easyocr_reader = None
+_easyocr_lock = threading.Lock()
+
+def _get_easyocr_reader():
+    global _easyocr_reader
+    if _easyocr_reader is None:
+        with _easyocr_lock:
+            if _easyocr_reader is None:
+                import easyocr
+                _easyocr_reader = easyocr.Reader(['ko', 'en'])
+    return _easyocr_reader
+
+def ocr_image(file_path: str) -> str:
+    """
+    이미지를 전처리한 뒤 easyocr로 OCR하고, 설치되지 않았거나 결과가 비면 pytesseract로 다시 시도합니다.
+
+    Args:
+        file_path: 이미지 파일 경로
+
+    Returns:
+        인식된 텍스트 (두 엔진 모두 없거나 실패하면 빈 문자열)
+    """
+    import cv2
+    img = preprocess_image_for_ocr(cv2.imread(file_path))
+    text = ""
+    try:
+        text = "\n".join([r[1] for r in _get_easyocr_reader().readtext(img)])
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.error(f"[easyocr 오류] {e}")
+    if not text or not text.strip():
+        try:
+            import pytesseract
+            from PIL import Image
+            text = pytesseract.image_to_string(Image.fromarray(img), lang='kor+eng')
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.error(f"[pytesseract 오류] {e}")
+    return text
+
 def preprocess_image_for_ocr(img):
+    import cv2
+    import numpy as np
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     kernel = np.array([[0, -1, 0], [-1, 5,-1], [0, -1, 0]])
     sharp = cv2.filter2D(gray, -1, kernel)
@@ -241,17 +358,34 @@ def preprocess_image_for_ocr(img):
     proc = cv2.resize(proc, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
     return proc
 
+# 확장자별 프로세서 (무거운 라이브러리는 각 프로세서가 처리 시점에 import)
+_processors: Dict[str, Callable[[], BaseFileProcessor]] = {
+    ".pdf": PDFProcessor,
+    ".docx": WordProcessor,
+    ".xlsx": ExcelProcessor,
+    ".pptx": PowerPointProcessor,
+    ".jpg": ImageProcessor,
+    ".jpeg": ImageProcessor,
+    ".png": ImageProcessor,
+}
+
+# get_processor가 처리할 수 있는 기본 확장자
+SUPPORTED_EXTENSIONS = tuple(_processors)
+
+def register_processor(extensions, factory: Callable[[], BaseFileProcessor]) -> None:
+    """
+    파일 형식 프로세서를 등록합니다. (예: .hwp, .txt)
+
+    Args:
+        extensions: 확장자 또는 확장자 리스트 ('.hwp')
+        factory: 인자 없이 BaseFileProcessor 인스턴스를 만드는 함수나 클래스
+    """
+    for ext in ([extensions] if isinstance(extensions, str) else extensions):
+        _processors[ext.lower()] = factory
+
 def get_processor(file_path: str) -> BaseFileProcessor:
     ext = os.path.splitext(file_path)[-1].lower()
-    if ext == ".pdf":
-        return PDFProcessor()
-    elif ext == ".docx":
-        return WordProcessor()
-    elif ext == ".xlsx":
-        return ExcelProcessor()
-    elif ext == ".pptx":
-        return PowerPointProcessor()
-    elif ext in [".jpg", ".jpeg", ".png"]:
-        return ImageProcessor()
-    else:
+    factory = _processors.get(ext)
+    if factory is None:
         raise ValueError("지원하지 않는 파일 형식입니다.")
+    return factory()
@@ -3,61 +3,222 @@ Q&A 서비스 - RAG (Retrieval-Augmented Generation)
 검색된 관련 문서를 바탕으로 LLM이 답변을 생성하는 서비스
 """
 
+import re
 import requests
 import json
+import threading
+import time
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from loguru import logger
 from src.config import config
 
 from src.search_service import SearchService
 from src.embedding_service import EmbeddingService
-from src.qdrant_manager import QdrantManager
+from src.context_packer import ContextPacker
+from src.conversation_memory import conversation_memory
+from src.metrics import record_generation, record_cache
+from src.tracing import span, traced
+from src.logging_setup import get_logger, clip
+
+# 질문마다 찍히는 로그는 LOG_SAMPLE_RATES의 qa 비율만 기록 (질문 원문은 LOG_MAX_FIELD_CHARS까지)
+qa_log = get_logger("qa")
+
+
+# 모든 요청에서 바이트 단위로 동일한 정적 프롬프트 접두부.
+# 가변 내용(대화 이력, 참고 내용, 질문)은 항상 이 뒤에 붙여야 LLM 프롬프트 캐시가 재사용됩니다.
+STYLE_GUIDE = (
+    "- 답변은 표/리스트/데이터 복사 느낌이 아니라, 실제 상담원이 안내하는 것처럼 자연스럽고 친근하게 작성해 주세요.\n"
+    "- 필요시 예시, 추가 설명도 포함해 주세요.\n"
+    "- 표가 포함된 경우 마크다운 표 형식으로, 리스트는 번호 또는 기호로, 일반 텍스트는 자연스럽게 요약해 주세요.\n"
+    "- 답변에는 반드시 관련 근거(출처, 문서명, 시트명, 행/열, 페이지 등)를 명확히 표기하세요."
+)
+SYSTEM_PROMPT = f"아래 참고 내용을 바탕으로 사용자의 질문에 대해 자연스럽고 친근하게 답변해 주세요.\n{STYLE_GUIDE}\n\n"
+
+ERROR_ANSWER = "죄송합니다. 답변을 생성하는 중 오류가 발생했습니다."
+
+# 세션별 Ollama context(이전 대화까지 처리된 토큰 상태) 캐시 (프로세스 전역, LRU + TTL)
+_session_contexts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_session_lock = threading.Lock()
 
 
 class QAService:
-    def __init__(self):
-        """Q&A 서비스 초기화"""
+    def __init__(self, search_service: SearchService = None, embedding_service: EmbeddingService = None):
+        """
+        Q&A 서비스 초기화
+        
+        Args:
+            search_service: 검색 서비스 인스턴스
+            embedding_service: 임베딩 서비스 인스턴스
+        """
         self.ollama_host = config.OLLAMA_HOST
-        self.llm_model = "gemma3:latest"  # Gemma3 모델 사용
-        self.search_service = SearchService()
-        self.embedding_service = EmbeddingService()
+        self.llm_model = config.OLLAMA_LLM_MODEL  # 기본값: Gemma3 모델
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.search_service = search_service or SearchService(embedding_service=self.embedding_service)
+        self.context_packer = ContextPacker()
+        self.last_generation_stats: Dict[str, Any] = {}
         
         logger.info(f"Q&A 서비스 초기화: {self.llm_model}")
     
-    def generate_answer(self, query: str, context: List[str], max_tokens: int = 500, history: list = None) -> str:
-        """LLM을 사용하여 답변 생성 (이전 대화 history 반영)"""
+    @traced("qa.generate_answer")
+    def generate_answer(self, query: str, context: List[str], max_tokens: int = 500, history: list = None,
+                        session_id: str = None, summary: str = None) -> str:
+        """
+        LLM을 사용하여 답변 생성 (이전 대화 history 반영)
+        
+        session_id가 있고 직전 턴의 Ollama context가 남아 있으면, 대화 전체를 다시
+        보내지 않고 이번 턴의 참고 내용과 질문만 이어서 보냅니다.
+        프롬프트 처리/생성 시간은 self.last_generation_stats에 기록됩니다.
+        """
+        self.last_generation_stats = {}
         try:
-            # 프롬프트 구성
-            prompt = self._build_prompt(query, context, history)
+            cached = self._get_session_context(session_id, history)
+            if session_id:
+                record_cache("llm_session_context", bool(cached))
+            if cached:
+                prompt = self._build_turn_prompt(query, context)
+            else:
+                prompt = self._build_prompt(query, context, history, summary)
+            payload = {
+                "model": self.llm_model,
+                "prompt": prompt,
+                "stream": False,
+                "keep_alive": config.OLLAMA_LLM_KEEP_ALIVE,
+                "options": {
+                    "temperature": 0.7,
+                    "top_p": 0.9,
+                    "max_tokens": max_tokens
+                }
+            }
+            if cached:
+                payload["context"] = cached
             # Ollama API 호출
-            response = requests.post(
-                f"{self.ollama_host}/api/generate",
-                json={
-                    "model": self.llm_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                        "max_tokens": max_tokens
-                    }
-                },
-                timeout=120
-            )
+            with span("llm_generate", model=self.llm_model, context_reused=bool(cached)) as llm_span:
+                response = requests.post(
+                    f"{self.ollama_host}/api/generate",
+                    json=payload,
+                    timeout=120
+                )
             if response.status_code == 200:
                 result = response.json()
                 answer = result.get("response", "").strip()
-                logger.info(f"답변 생성 완료: {len(answer)}자")
+                self.last_generation_stats = self._extract_generation_stats(result, context_reused=bool(cached))
+                if llm_span:
+                    for key in ("prompt_eval_count", "prompt_eval_seconds", "eval_count", "eval_seconds", "load_seconds"):
+                        llm_span.set_attribute(f"llm.{key}", self.last_generation_stats[key])
+                record_generation(self.llm_model, self.last_generation_stats)
+                if session_id and result.get("context"):
+                    self._store_session_context(session_id, result["context"], answer)
+                qa_log.info("답변 생성 완료: {}자, {}", len(answer), self.last_generation_stats)
                 return answer
             else:
                 logger.error(f"LLM API 오류: {response.status_code}")
-                return "죄송합니다. 답변을 생성하는 중 오류가 발생했습니다."
+                return ERROR_ANSWER
         except Exception as e:
             logger.error(f"답변 생성 중 오류: {e}")
-            return "죄송합니다. 답변을 생성하는 중 오류가 발생했습니다."
+            return ERROR_ANSWER
+    
+    @staticmethod
+    def _extract_generation_stats(result: Dict[str, Any], context_reused: bool = False) -> Dict[str, Any]:
+        """Ollama 응답의 나노초 단위 시간 정보를 초 단위 통계로 변환합니다."""
+        def seconds(key: str) -> float:
+            return round(result.get(key, 0) / 1e9, 4)
+        stats = {
+            "prompt_eval_count": result.get("prompt_eval_count", 0),
+            "prompt_eval_seconds": seconds("prompt_eval_duration"),
+            "eval_count": result.get("eval_count", 0),
+            "eval_seconds": seconds("eval_duration"),
+            "load_seconds": seconds("load_duration"),
+            "total_seconds": seconds("total_duration"),
+            "context_reused": context_reused
+        }
+        if stats["eval_seconds"] > 0:
+            stats["tokens_per_second"] = round(stats["eval_count"] / stats["eval_seconds"], 2)
+        return stats
+    
+    @staticmethod
+    def _last_answer(history: list) -> str:
+        """대화 이력에서 마지막 답변 텍스트를 찾습니다."""
+        for turn in reversed(history or []):
+            if not isinstance(turn, dict):
+                continue
+            if turn.get("role") == "assistant":
+                return turn.get("content") or ""
+            answer = turn.get("answer") or turn.get("response") or turn.get("assistant")
+            if answer:
+                return answer
+        return ""
+    
+    def _get_session_context(self, session_id: str, history: list = None) -> Optional[List[int]]:
+        """
+        세션에 저장된 Ollama context를 반환합니다.
+        
+        클라이언트가 보낸 history의 마지막 답변이 서버가 기억하는 직전 답변과
+        다르면(대화가 초기화/변경된 경우) 재사용하지 않습니다.
+        """
+        if not session_id:
+            return None
+        with _session_lock:
+            entry = _session_contexts.get(session_id)
+            if not entry:
+                return None
+            if time.time() - entry["updated_at"] > config.LLM_SESSION_TTL_SECONDS:
+                _session_contexts.pop(session_id, None)
+                return None
+            entry["updated_at"] = time.time()
+            _session_contexts.move_to_end(session_id)
+        if history:
+            last_answer = self._last_answer(history)
+            if not last_answer.startswith(entry["answer"]):
+                return None
+        return entry["context"]
+    
+    @staticmethod
+    def _trim_context(context: List[int]) -> List[int]:
+        """
+        LLM_SESSION_CONTEXT_MAX_TOKENS를 넘은 context를 절반 길이로 줄입니다.
+        
+        Ollama가 num_ctx를 넘을 때 하는 context shift와 같이 앞부분(시스템 프롬프트와 첫 턴)
+        LLM_SESSION_CONTEXT_KEEP_TOKENS개와 가장 최근 토큰만 남기고 가운데의 오래된 대화를 버립니다.
+        """
+        target = config.LLM_SESSION_CONTEXT_MAX_TOKENS // 2
+        keep = min(config.LLM_SESSION_CONTEXT_KEEP_TOKENS, target)
+        recent = context[len(context) - (target - keep):] if target > keep else []
+        return context[:keep] + recent
+    
+    @staticmethod
+    def _store_session_context(session_id: str, context: List[int], answer: str) -> None:
+        """
+        세션의 Ollama context를 저장합니다. (TTL이 지난 세션, 최대 개수 초과 시 오래된 세션 제거)
+        
+        context가 LLM_SESSION_CONTEXT_MAX_TOKENS를 넘으면 버리지 않고 _trim_context로 줄여 저장하므로
+        다음 턴도 context를 이어서 재사용합니다.
+        """
+        if len(context) > config.LLM_SESSION_CONTEXT_MAX_TOKENS:
+            trimmed = QAService._trim_context(context)
+            qa_log.info("세션 context 축소: {} -> {} 토큰", len(context), len(trimmed))
+            context = trimmed
+        now = time.time()
+        with _session_lock:
+            _session_contexts[session_id] = {"context": context, "answer": answer, "updated_at": now}
+            _session_contexts.move_to_end(session_id)
+            # 사용 순서대로 정렬되어 있으므로 앞에서부터 만료된 세션 제거
+            while _session_contexts:
+                oldest_id, oldest = next(iter(_session_contexts.items()))
+                if now - oldest["updated_at"] <= config.LLM_SESSION_TTL_SECONDS:
+                    break
+                _session_contexts.pop(oldest_id)
+            while len(_session_contexts) > config.LLM_SESSION_CACHE_SIZE:
+                _session_contexts.popitem(last=False)
+    
+    @staticmethod
+    def reset_session(session_id: str) -> None:
+        """세션에 저장된 Ollama context를 제거합니다."""
+        with _session_lock:
+            _session_contexts.pop(session_id, None)
     
-    def _build_prompt(self, query: str, context: List[str], history: list = None) -> str:
-        """RAG 프롬프트 구성 - 상황별 최적화 버전 (표/리스트/근거/출처 등)"""
+    def _prepare_context(self, query: str, context: List[str]) -> str:
+        """참고 내용 블록을 표/리스트/텍스트로 구분하고 질문 조건에 맞게 필터링합니다."""
         import re
         filtered_context = []
         context_types = []
@@ -105,48 +266,173 @@ class QAService:
                 if len(filtered_rows) > 1:
                     new_context.append("\n".join(filtered_rows))
             filtered_context = new_context
-        # 상황별 프롬프트 분기 (자연스러운 상담원 스타일 강조)
-        context_text = "\n\n".join(filtered_context)
-        style_guide = (
-            "- 답변은 표/리스트/데이터 복사 느낌이 아니라, 실제 상담원이 안내하는 것처럼 자연스럽고 친근하게 작성해 주세요.\n"
-            "- 필요시 예시, 추가 설명도 포함해 주세요.\n"
-            "- 표가 포함된 경우 마크다운 표 형식으로, 리스트는 번호 또는 기호로, 일반 텍스트는 자연스럽게 요약해 주세요.\n"
-            "- 답변에는 반드시 관련 근거(출처, 문서명, 시트명, 행/열, 페이지 등)를 명확히 표기하세요."
-        )
-        # history(이전 대화)가 있으면 프롬프트 상단에 추가
-        history_text = ""
-        if history and isinstance(history, list) and len(history) > 0:
-            history_lines = []
-            for turn in history:
+        return "\n\n".join(filtered_context)
+    
+    @staticmethod
+    def _format_history(history: list = None, summary: str = None) -> str:
+        """이전 대화(누적 요약 + 최근 턴)를 프롬프트용 텍스트로 변환합니다."""
+        summary_text = f"[대화 요약]\n{summary}\n\n" if summary else ""
+        if not history or not isinstance(history, list):
+            return summary_text
+        history_lines = []
+        for turn in history:
+            if not isinstance(turn, dict):
+                continue
+            if turn.get("role") == "assistant":
+                q, a = "", turn.get("content") or ""
+            else:
                 q = turn.get("question") or turn.get("content") or turn.get("user") or ""
                 a = turn.get("answer") or turn.get("response") or turn.get("assistant") or ""
-                if q:
-                    history_lines.append(f"이전 질문: {q}")
-                if a:
-                    history_lines.append(f"이전 답변: {a}")
-            if history_lines:
-                history_text = "\n".join(history_lines) + "\n"
-        prompt = f"""{history_text}아래 참고 내용을 바탕으로 사용자의 질문에 대해 자연스럽고 친근하게 답변해 주세요.\n{style_guide}\n\n[참고 내용]\n{context_text}\n\n[질문]\n{query}\n[답변]"""
-        return prompt
+            if q:
+                history_lines.append(f"이전 질문: {q}")
+            if a:
+                history_lines.append(f"이전 답변: {a}")
+        if not history_lines:
+            return summary_text
+        return summary_text + "[이전 대화]\n" + "\n".join(history_lines) + "\n\n"
+    
+    def _build_turn_prompt(self, query: str, context: List[str]) -> str:
+        """이번 턴에만 해당하는 가변 프롬프트(참고 내용 + 질문)를 구성합니다."""
+        context_text = self._prepare_context(query, context)
+        return f"[참고 내용]\n{context_text}\n\n[질문]\n{query}\n[답변]"
+    
+    def _build_prompt(self, query: str, context: List[str], history: list = None, summary: str = None) -> str:
+        """
+        RAG 프롬프트 구성 - 상황별 최적화 버전 (표/리스트/근거/출처 등)
+        
+        정적 접두부(SYSTEM_PROMPT) → 이전 대화 → 참고 내용 → 질문 순서로 배치하여
+        턴이 바뀌어도 앞부분이 동일하게 유지되도록 합니다.
+        """
+        return SYSTEM_PROMPT + self._format_history(history, summary) + self._build_turn_prompt(query, context)
+    
+    @traced("qa.retrieve")
+    def retrieve(self, question: str, collection_name: str = None, max_results: int = 5,
+                 document_id: str = None, use_mmr: bool = False, fetch_multiplier: int = None,
+                 score_threshold: float = 0.0, hnsw_ef: int = None) -> Dict[str, Any]:
+        """
+        질문에 대한 컨텍스트 후보를 검색하고 필드/고유값 정확 매칭으로 좁힙니다. (LLM 호출 없음)
+        
+        Args:
+            question: 질문
+            collection_name: 검색할 컬렉션 (None이면 기본 검색 서비스)
+            max_results: 컨텍스트로 사용할 결과 수
+            document_id: 특정 문서로 제한
+            use_mmr: MMR로 중복에 가까운 결과 제거
+            fetch_multiplier: 필터링 전에 받아올 후보 배수 (None이면 설정값)
+            score_threshold: 점수 임계값
+            hnsw_ef: HNSW 탐색 후보 수 (None이면 설정값)
+            
+        Returns:
+            search_results(필터 전 후보), filtered_results(필터 후, 관련도 순), field_filters를 담은 딕셔너리
+        """
+        search_service = self.search_service
+        if collection_name:
+            search_service = SearchService(self.search_service.qdrant_manager.for_collection(collection_name),
+                                           self.embedding_service)
+        multiplier = config.QA_FETCH_MULTIPLIER if fetch_multiplier is None else fetch_multiplier
+        search_results = search_service.search(
+            query=question,
+            limit=max_results * max(multiplier, 1),  # 충분히 넉넉히 받아서 필터링
+            score_threshold=score_threshold,
+            document_id=document_id,
+            use_mmr=use_mmr,  # 중첩 청크로 인한 거의 동일한 컨텍스트 제거
+            hnsw_ef=hnsw_ef
+        )
+        qa_log.info("검색 결과: {}개", len(search_results))
+        if not search_results:
+            qa_log.warning("검색 결과 없음: {}", clip(question))
+            return {"search_results": [], "filtered_results": [], "field_filters": {}}
+        with span("filter"):
+            filtered_results, field_filters = self._filter_exact_matches(question, search_results)
+        return {"search_results": search_results, "filtered_results": filtered_results,
+                "field_filters": field_filters}
+    
+    @staticmethod
+    def _filter_exact_matches(question: str, search_results: List[Dict[str, Any]]):
+        """
+        질문의 '필드명:값' 또는 고유값 패턴과 정확히 일치하는 결과만 남깁니다. (일치 결과가 없으면 전체 유지)
+        
+        Returns:
+            (필터링된 결과 리스트, 필드 필터 딕셔너리)
+        """
+        # 1-1. 쿼리에서 '필드명:값' 패턴 추출 (예: TR명: AB0087R, 담당자: 이민호)
+        field_match = re.findall(r"([\w가-힣]+)\s*[:：]\s*([\w가-힣0-9]+)", question)
+        field_filters = {k.strip(): v.strip() for k, v in field_match} if field_match else {}
+
+        # 1-1b. 쿼리에서 고유값(영문+숫자+영문, 숫자 등) 패턴도 추출 (예: AB0087R)
+        value_patterns = re.findall(r"[A-Z]{2}\d{4,5}[A-Z]", question)  # 예: AB0087R
+        value_patterns += re.findall(r"\d{5,}", question)  # 5자리 이상 숫자도 포함
+        # 중복 제거
+        value_patterns = list(set(value_patterns))
+
+        # 1-2. 동적 필드 매칭 (컬럼명 하드코딩 없이)
+        filtered_results = search_results
+        # 1) 필드명:값 패턴이 있으면 해당 필드 우선
+        if field_filters:
+            def is_exact_match(res):
+                meta = res.get("metadata", {})
+                for k, v in field_filters.items():
+                    if k in meta and str(meta[k]).strip() == v:
+                        continue
+                    elif k in res and str(res[k]).strip() == v:
+                        continue
+                    else:
+                        return False
+                return True
+            exact_matches = [r for r in search_results if is_exact_match(r)]
+            if exact_matches:
+                filtered_results = exact_matches
+            else:
+                filtered_results = search_results
+        # 2) 필드명:값 패턴이 없고, 고유값 패턴이 있으면 모든 필드에 대해 동적 매칭
+        elif value_patterns:
+            def has_value_any_field(res):
+                meta = res.get("metadata", {})
+                for v in value_patterns:
+                    # 메타데이터의 모든 필드에 대해 값이 정확히 일치하는지 검사
+                    if any(str(val).strip() == v for val in meta.values()):
+                        return True
+                    # payload에도 혹시 있을 수 있음
+                    if any(str(val).strip() == v for val in res.values()):
+                        return True
+                return False
+            exact_matches = [r for r in search_results if has_value_any_field(r)]
+            if exact_matches:
+                filtered_results = exact_matches
+            else:
+                filtered_results = search_results
+        return filtered_results, field_filters
     
+    @staticmethod
+    def _source_metadata(result: Dict[str, Any], field_filters: Dict[str, str]) -> Dict[str, Any]:
+        """검색 결과 한 건의 출처 메타데이터(문서/시트/행/페이지/청크 + 질문의 필드 조건)를 추출합니다."""
+        meta_dict = {}
+        for k in ["document_id", "title", "sheet", "row", "page_number", "chunk_index"]:
+            if "metadata" in result and k in result["metadata"]:
+                meta_dict[k] = result["metadata"][k]
+            elif k in result:
+                meta_dict[k] = result[k]
+        # 동적 필드도 근거에 추가
+        if "metadata" in result:
+            for fk in field_filters.keys():
+                if fk in result["metadata"]:
+                    meta_dict[fk] = result["metadata"][fk]
+        return meta_dict
+    
+    @traced("qa.ask_question")
     def ask_question(self, question: str, collection_name: str = "pdf_documents", 
-                    max_results: int = 5, max_tokens: int = 500, document_id: str = None, history=None) -> Dict[str, Any]:
+                    max_results: int = 5, max_tokens: int = 500, document_id: str = None, history=None,
+                    use_mmr: bool = False, session_id: str = None) -> Dict[str, Any]:
         """질문에 대한 답변 생성 (출처/근거 정보 포함)"""
-        import re
         try:
-            logger.info(f"질문 처리 시작: {question}")
-            # 1. 관련 문서 검색
-            search_service = self.search_service
-            if collection_name:
-                search_service = SearchService(QdrantManager(collection_name=collection_name), self.embedding_service)
-            search_results = search_service.search(
-                query=question,
-                limit=max_results * 3,  # 충분히 넉넉히 받아서 필터링
-                document_id=document_id
-            )
-            logger.info(f"검색 결과: {len(search_results)}개")
+            qa_log.info("질문 처리 시작: {}", clip(question))
+            # 1. 관련 문서 검색 및 필드/고유값 정확 매칭 필터링
+            retrieved = self.retrieve(question, collection_name, max_results=max_results,
+                                      document_id=document_id, use_mmr=use_mmr)
+            search_results = retrieved["search_results"]
+            filtered_results = retrieved["filtered_results"]
+            field_filters = retrieved["field_filters"]
             if not search_results:
-                logger.warning(f"검색 결과 없음: {question}")
                 return {
                     "question": question,
                     "answer": "죄송합니다. 관련된 정보를 찾을 수 없습니다.",
@@ -154,74 +440,10 @@ class QAService:
                     "search_results": []
                 }
 
-            # 1-1. 쿼리에서 '필드명:값' 패턴 추출 (예: TR명: AB0087R, 담당자: 이민호)
-            field_match = re.findall(r"([\w가-힣]+)\s*[:：]\s*([\w가-힣0-9]+)", question)
-            field_filters = {k.strip(): v.strip() for k, v in field_match} if field_match else {}
-
-            # 1-1b. 쿼리에서 고유값(영문+숫자+영문, 숫자 등) 패턴도 추출 (예: AB0087R)
-            value_patterns = re.findall(r"[A-Z]{2}\d{4,5}[A-Z]", question)  # 예: AB0087R
-            value_patterns += re.findall(r"\d{5,}", question)  # 5자리 이상 숫자도 포함
-            # 중복 제거
-            value_patterns = list(set(value_patterns))
-
-            # 1-2. 동적 필드 매칭 (컬럼명 하드코딩 없이)
-            filtered_results = search_results
-            # 1) 필드명:값 패턴이 있으면 해당 필드 우선
-            if field_filters:
-                def is_exact_match(res):
-                    meta = res.get("metadata", {})
-                    for k, v in field_filters.items():
-                        if k in meta and str(meta[k]).strip() == v:
-                            continue
-                        elif k in res and str(res[k]).strip() == v:
-                            continue
-                        else:
-                            return False
-                    return True
-                exact_matches = [r for r in search_results if is_exact_match(r)]
-                if exact_matches:
-                    filtered_results = exact_matches
-                else:
-                    filtered_results = search_results
-            # 2) 필드명:값 패턴이 없고, 고유값 패턴이 있으면 모든 필드에 대해 동적 매칭
-            elif value_patterns:
-                def has_value_any_field(res):
-                    meta = res.get("metadata", {})
-                    for v in value_patterns:
-                        # 메타데이터의 모든 필드에 대해 값이 정확히 일치하는지 검사
-                        if any(str(val).strip() == v for val in meta.values()):
-                            return True
-                        # payload에도 혹시 있을 수 있음
-                        if any(str(val).strip() == v for val in res.values()):
-                            return True
-                    return False
-                exact_matches = [r for r in search_results if has_value_any_field(r)]
-                if exact_matches:
-                    filtered_results = exact_matches
-                else:
-                    filtered_results = search_results
-            # 2. 검색된 텍스트 추출 및 출처 메타데이터 수집 (정확 매칭 결과만 context로 사용)
-            context_texts = []
-            sources = []
-            for result in filtered_results[:max_results]:
-                text = result.get("text", "")
-                if text:
-                    context_texts.append(text)
-                    meta_dict = {}
-                    for k in ["document_id", "title", "sheet", "row", "page_number", "chunk_index"]:
-                        if "metadata" in result and k in result["metadata"]:
-                            meta_dict[k] = result["metadata"][k]
-                        elif k in result:
-                            meta_dict[k] = result[k]
-                    # 동적 필드도 근거에 추가
-                    if "metadata" in result:
-                        for fk in field_filters.keys():
-                            if fk in result["metadata"]:
-                                meta_dict[fk] = result["metadata"][fk]
-                    if meta_dict:
-                        sources.append(meta_dict)
+            # 2. 정확 매칭 결과 상위 max_results개만 컨텍스트 후보로 사용
+            candidates = [r for r in filtered_results[:max_results] if r.get("text")]
             # 3. 정확 매칭 결과가 없으면 답변 자체를 정보 없음으로 제한
-            if not context_texts:
+            if not candidates:
                 return {
                     "question": question,
                     "answer": "죄송합니다. 해당 정보를 찾을 수 없습니다.",
@@ -229,14 +451,30 @@ class QAService:
                     "search_results": [],
                     "context_count": 0
                 }
+            # 3-1. 인접 청크 병합/중복 문장 제거 후 토큰 예산 안에서 관련도 순으로 선택
+            with span("pack_context"):
+                packed = self.context_packer.pack(candidates)
+            # 출처는 실제로 프롬프트에 들어간 청크 기준
+            context_results = packed["results"]
+            sources = [self._source_metadata(result, field_filters) for result in context_results]
+            # 3-2. 서버 측 대화 메모리가 있으면 클라이언트 history 대신 사용 (요약 + 최근 턴)
+            summary = None
+            if session_id and conversation_memory.has_session(session_id):
+                memory = conversation_memory.get_history(session_id)
+                history, summary = memory["turns"], memory["summary"]
             # 4. LLM을 사용한 답변 생성
-            answer = self.generate_answer(question, context_texts, max_tokens, history)
+            with conversation_memory.foreground():
+                answer = self.generate_answer(question, packed["texts"], max_tokens, history,
+                                              session_id=session_id, summary=summary)
+            if session_id and answer != ERROR_ANSWER:
+                # 누적된 LLM context는 토큰 한도를 넘으면 줄여서 계속 재사용 (_store_session_context)
+                conversation_memory.add_turn(session_id, question, answer)
             # 5. 답변에 출처 추가 (자연어 근거)
             if sources:
                 readable_sources = []
-                for i, src in enumerate(sources):
+                for result, src in zip(context_results, sources):
                     # 해당 청크의 텍스트 일부 추출
-                    chunk_text = filtered_results[i].get("text", "")
+                    chunk_text = result.get("text", "")
                     chunk_preview = chunk_text.strip().replace("\n", " ")[:80] + ("..." if len(chunk_text) > 80 else "")
                     doc_name = src.get("title") or src.get("document_id", "문서")
                     page = src.get("page_number")
@@ -261,7 +499,10 @@ class QAService:
                 "answer": answer,
                 "sources": sources,
                 "search_results": filtered_results[:max_results],
-                "context_count": len(context_texts)
+                "context_count": len(context_results),
+                "context_stats": packed["stats"],
+                "generation_stats": self.last_generation_stats or None,
+                "session_id": session_id
             }
         except Exception as e:
             logger.error(f"질문 처리 중 오류: {e}")
@@ -273,11 +514,13 @@ class QAService:
                 "error": str(e)
             }
     
-    def ask_with_metadata(self, question: str, collection_name: str = "pdf_documents", max_results: int = 5, max_tokens: int = 500, document_id: str = None) -> Dict[str, Any]:
-        """메타데이터를 포함한 상세한 질문 처리"""
+    def ask_with_metadata(self, question: str, collection_name: str = "pdf_documents", max_results: int = 5, max_tokens: int = 500, document_id: str = None, use_mmr: bool = False,
+                          history=None, session_id: str = None) -> Dict[str, Any]:
+        """메타데이터를 포함한 상세한 질문 처리 (대화 이력/세션은 ask_question과 같이 처리)"""
         try:
             # 기본 질문 처리
-            result = self.ask_question(question, collection_name, max_results=max_results, max_tokens=max_tokens, document_id=document_id)
+            result = self.ask_question(question, collection_name, max_results=max_results, max_tokens=max_tokens, document_id=document_id, history=history,
+                                       use_mmr=use_mmr, session_id=session_id)
             
             # 추가 메타데이터 분석
             if result.get("search_results"):
@@ -1,17 +1,35 @@
     
-from typing import List, Dict, Any, Optional, Tuple
-from qdrant_client import QdrantClient
-from qdrant_client.models import (
-    Distance, VectorParams, PointStruct, 
-    Filter, FieldCondition, MatchValue, Range
-)
+from typing import List, Dict, Any, Optional, Tuple, Union, TYPE_CHECKING
+import numpy as np
 from loguru import logger
 from .config import config
+from .context_packer import estimate_tokens
+from .schema_registry import schema_registry
+from .metrics import QDRANT_OPERATION_SECONDS, QDRANT_ERRORS, QDRANT_POINTS, observe_seconds, record_cache
+from .tracing import traced
+from .similarity import as_matrix
+from .vector_reduction import get_reducer
+from .logging_setup import get_logger
+
+# qdrant_client는 import 비용이 커서(수백 ms) 연결/요청 시점에 불러옴
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import Distance, Filter, SearchParams
+
+# 이름 있는 벡터 컬렉션의 벡터 이름 (본문, 제목/키)과 두 벡터를 합쳐 검색하는 검색 대상 이름
+BODY_VECTOR = "body"
+TITLE_VECTOR = "title"
+FUSED_VECTORS = "fused"
+SEARCH_VECTOR_NAMES = (BODY_VECTOR, TITLE_VECTOR, FUSED_VECTORS)
+
+# 요청마다 찍히는 검색 로그는 LOG_SAMPLE_RATES의 search 비율만 기록
+search_log = get_logger("search")
 
 class QdrantManager:
     """Qdrant 벡터 데이터베이스 관리 클래스"""
     
-    def __init__(self, host: str = None, port: int = None, collection_name: str = None):
+    def __init__(self, host: str = None, port: int = None, collection_name: str = None,
+                 client: "QdrantClient" = None):
         """
         QdrantManager 초기화
         
@@ -19,11 +37,12 @@ class QdrantManager:
             host: Qdrant 호스트
             port: Qdrant 포트
             collection_name: 컬렉션 이름
+            client: 이미 만든 클라이언트 (예: 벤치마크용 QdrantClient(location=":memory:"))
         """
         self.host = host or config.QDRANT_HOST
         self.port = port or config.QDRANT_PORT
         self.collection_name = collection_name or config.QDRANT_COLLECTION_NAME
-        self.client = None
+        self.client = client
         
         logger.info(f"Qdrant 매니저 초기화: {self.host}:{self.port}")
     
@@ -35,6 +54,7 @@ class QdrantManager:
             연결 성공 여부
         """
         try:
+            from qdrant_client import QdrantClient
             self.client = QdrantClient(host=self.host, port=self.port)
             
             # 연결 테스트
@@ -45,13 +65,87 @@ class QdrantManager:
             logger.error(f"Qdrant 연결 실패: {e}")
             return False
     
-    def create_collection(self, vector_size: int = None, distance: Distance = Distance.COSINE) -> bool:
+    def for_collection(self, collection_name: str) -> "QdrantManager":
+        """
+        같은 클라이언트 연결을 공유하는 다른 컬렉션용 매니저를 반환합니다.
+        
+        Args:
+            collection_name: 대상 컬렉션 이름
+            
+        Returns:
+            QdrantManager 인스턴스 (새 연결을 만들지 않음)
+        """
+        if not self.client:
+            self.connect()
+        return QdrantManager(host=self.host, port=self.port, collection_name=collection_name, client=self.client)
+    
+    def list_collections(self) -> List[str]:
+        """
+        Qdrant에 존재하는 모든 컬렉션 이름을 반환합니다.
+        
+        Returns:
+            컬렉션 이름 리스트
+        """
+        if not self.client:
+            if not self.connect():
+                return []
+        try:
+            return [col.name for col in self.client.get_collections().collections]
+        except Exception as e:
+            logger.error(f"컬렉션 목록 조회 실패: {e}")
+            return []
+    
+    def _schema_key(self) -> Tuple[str, int, str]:
+        """스키마 레지스트리 키 (호스트, 포트, 컬렉션 이름)"""
+        return (self.host, self.port, self.collection_name)
+    
+    def get_collection_schema(self) -> Optional[Dict[str, Any]]:
+        """
+        컬렉션 스키마(벡터 크기, 거리, 임베딩 모델)를 반환합니다.
+        캐시에 없으면 Qdrant에서 한 번 조회해 캐시합니다.
+        
+        Returns:
+            스키마 딕셔너리, 컬렉션이 없으면 None
+        """
+        schema = schema_registry.get_collection(self._schema_key())
+        record_cache("collection_schema", schema is not None)
+        if schema is not None:
+            return schema
+        
+        if not self.client:
+            if not self.connect():
+                return None
+        try:
+            col_info = self.client.get_collection(self.collection_name)
+        except Exception as e:
+            if 'not found' in str(e).lower() or '404' in str(e):
+                return None
+            raise
+        
+        vectors = col_info.config.params.vectors
+        if isinstance(vectors, dict):
+            schema = {
+                'named_vectors': {name: params.size for name, params in vectors.items()},
+                'distance': next(iter(vectors.values())).distance.value if vectors else None
+            }
+            if BODY_VECTOR in vectors:
+                schema['vector_size'] = vectors[BODY_VECTOR].size
+        else:
+            schema = {'vector_size': vectors.size, 'distance': vectors.distance.value}
+        return schema_registry.register_collection(self._schema_key(), **schema)
+    
+    def create_collection(self, vector_size: int = None, distance: "Distance" = None,
+                          embedding_model: str = None, vector_reduction: str = None,
+                          named_vectors: bool = None) -> bool:
         """
-        컬렉션을 생성합니다.
+        컬렉션을 생성합니다. (이미 있으면 스키마만 캐시)
         
         Args:
-            vector_size: 벡터 크기
-            distance: 거리 측정 방식
+            vector_size: 벡터 크기 (없으면 임베딩 모델에서 확인, 축소 시 축소 후 크기)
+            distance: 거리 측정 방식 (None이면 코사인)
+            embedding_model: 이 컬렉션에 벡터를 넣는 임베딩 모델명
+            vector_reduction: 저장 벡터에 적용한 차원 축소 태그 (''=없음)
+            named_vectors: body/title 이름 있는 벡터로 만들지 여부 (None이면 NAMED_VECTORS_ENABLED)
             
         Returns:
             생성 성공 여부
@@ -61,48 +155,164 @@ class QdrantManager:
                 return False
         
         try:
-            # 컬렉션이 이미 존재하는지 확인
-            collections = self.client.get_collections()
-            existing_collections = [col.name for col in collections.collections]
-            
-            if self.collection_name in existing_collections:
-                logger.info(f"컬렉션 '{self.collection_name}'이 이미 존재합니다")
+            # 컬렉션이 이미 존재하는지 확인 (캐시 우선)
+            if self.get_collection_schema() is not None:
+                logger.debug(f"컬렉션 '{self.collection_name}'이 이미 존재합니다")
                 return True
             
-            # 벡터 크기 결정 (기본값 또는 임베딩 서비스에서 확인)
+            # 벡터 크기 결정 (임베딩 서비스에서 확인, 결과는 레지스트리에 캐시됨)
             if vector_size is None:
-                # 임베딩 서비스를 통해 차원 확인
-                try:
-                    from src.embedding_service import EmbeddingService
-                    embedding_service = EmbeddingService()
-                    vector_size = embedding_service.get_embedding_dimension()
-                except:
-                    vector_size = 768  # 기본값
+                from src.embedding_service import EmbeddingService
+                embedding_service = EmbeddingService()
+                vector_size = embedding_service.get_embedding_dimension()
+                embedding_model = embedding_model or embedding_service.model_name
+                reducer = get_reducer(config.VECTOR_REDUCTION if vector_reduction is None else vector_reduction)
+                if reducer:
+                    vector_reduction, vector_size = reducer.tag, reducer.output_dim
             
-            # 새 컬렉션 생성
+            # 새 컬렉션 생성 (이름 있는 벡터는 같은 임베딩 공간이므로 크기/거리가 같음)
+            from qdrant_client.models import Distance, VectorParams
+            distance = distance or Distance.COSINE
+            named_vectors = config.NAMED_VECTORS_ENABLED if named_vectors is None else named_vectors
+            vector_params = VectorParams(size=vector_size, distance=distance)
             self.client.create_collection(
                 collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=vector_size,
-                    distance=distance
-                )
+                vectors_config={BODY_VECTOR: vector_params, TITLE_VECTOR: vector_params} if named_vectors
+                else vector_params
             )
+            schema = {
+                'vector_size': vector_size,
+                'distance': distance.value,
+                'embedding_model': embedding_model,
+                'vector_reduction': vector_reduction or ""
+            }
+            if named_vectors:
+                schema['named_vectors'] = {BODY_VECTOR: vector_size, TITLE_VECTOR: vector_size}
+            schema_registry.register_collection(self._schema_key(), **schema)
             
-            logger.info(f"컬렉션 '{self.collection_name}' 생성 완료")
+            logger.info(f"컬렉션 '{self.collection_name}' 생성 완료 ({vector_size}차원"
+                        f"{', 축소 ' + vector_reduction if vector_reduction else ''}"
+                        f"{', 이름 있는 벡터 body/title' if named_vectors else ''})")
             return True
             
         except Exception as e:
             logger.error(f"컬렉션 생성 실패: {e}")
             return False
     
+    def check_vector_schema(self, vector_size: int, embedding_model: str = None) -> bool:
+        """
+        벡터 크기/임베딩 모델이 컬렉션 스키마와 일치하는지 확인합니다.
+        
+        Args:
+            vector_size: 저장하거나 검색할 벡터 크기
+            embedding_model: 벡터를 만든 임베딩 모델명
+            
+        Returns:
+            일치 여부 (스키마를 모르면 True)
+        """
+        schema = schema_registry.get_collection(self._schema_key())
+        if not schema:
+            return True
+        expected = schema.get('vector_size')
+        if expected and expected != vector_size:
+            logger.error(f"벡터 차원 불일치: 컬렉션 '{self.collection_name}'={expected}, 입력={vector_size}")
+            return False
+        known_model = schema.get('embedding_model')
+        if embedding_model and known_model and known_model != embedding_model:
+            logger.error(f"임베딩 모델 불일치: 컬렉션 '{self.collection_name}'={known_model}, 입력={embedding_model}")
+            return False
+        if embedding_model and not known_model:
+            schema_registry.register_collection(self._schema_key(), embedding_model=embedding_model)
+        return True
+    
+    def uses_named_vectors(self) -> bool:
+        """
+        컬렉션이 body/title 이름 있는 벡터를 쓰는지 반환합니다. (캐시 우선)
+        
+        Returns:
+            이름 있는 벡터 사용 여부 (컬렉션이 없으면 새로 만들 때의 설정값 NAMED_VECTORS_ENABLED)
+        """
+        schema = self.get_collection_schema()
+        if schema is None:
+            return config.NAMED_VECTORS_ENABLED
+        return BODY_VECTOR in (schema.get('named_vectors') or {})
+    
+    def get_vector_reduction(self) -> str:
+        """
+        컬렉션 벡터에 적용된 차원 축소 태그를 반환합니다. (캐시 우선)
+        
+        컬렉션이 없으면 새로 만들 때 적용할 설정값(VECTOR_REDUCTION)을 반환하고,
+        있으면 포인트 페이로드에 기록된 태그를 따릅니다.
+        
+        Returns:
+            축소 태그 (''=축소 없음)
+        """
+        schema = self.get_collection_schema()
+        if schema is None:
+            return config.VECTOR_REDUCTION
+        if 'vector_reduction' in schema:
+            return schema['vector_reduction']
+        
+        points, _ = self.client.scroll(
+            collection_name=self.collection_name,
+            limit=1,
+            with_payload=["vector_reduction"],
+            with_vectors=False
+        )
+        if not points:
+            # 빈 컬렉션: 크기가 맞으면 설정값으로 생성된 것으로 보고, 포인트가 생길 때까지 캐시하지 않음
+            reducer = get_reducer(config.VECTOR_REDUCTION)
+            return reducer.tag if reducer and reducer.output_dim == schema.get('vector_size') else ""
+        tag = (points[0].payload or {}).get('vector_reduction', "")
+        schema_registry.register_collection(self._schema_key(), vector_reduction=tag)
+        return tag
+    
+    def prepare_query_vector(self, query_vector: Union[np.ndarray, List[float]]) -> Union[np.ndarray, List[float]]:
+        """
+        쿼리 벡터에 컬렉션과 같은 차원 축소를 적용합니다. (이미 축소된 크기면 그대로 반환)
+        
+        Args:
+            query_vector: 임베딩 모델이 만든 쿼리 벡터
+            
+        Returns:
+            컬렉션 벡터와 같은 공간의 쿼리 벡터
+        """
+        reducer = get_reducer(self.get_vector_reduction())
+        if reducer is None or len(query_vector) == reducer.output_dim:
+            return query_vector
+        return reducer.transform(query_vector)[0]
+    
+    def delete_collection(self) -> bool:
+        """
+        컬렉션을 삭제하고 스키마 캐시를 무효화합니다.
+        
+        Returns:
+            삭제 성공 여부
+        """
+        if not self.client:
+            if not self.connect():
+                return False
+        try:
+            self.client.delete_collection(collection_name=self.collection_name)
+            logger.info(f"컬렉션 '{self.collection_name}' 삭제 완료")
+            return True
+        except Exception as e:
+            logger.error(f"컬렉션 삭제 실패: {e}")
+            return False
+        finally:
+            schema_registry.invalidate_collection(self._schema_key())
+    
     def store_vectors(self, embedded_chunks: List[Dict[str, Any]], 
-                     document_id: str = None) -> bool:
+                     document_id: str = None, batch_size: int = 256,
+                     progress_callback=None) -> bool:
         """
         임베딩된 청크들을 Qdrant에 저장합니다.
         
         Args:
-            embedded_chunks: 임베딩된 청크 리스트
+            embedded_chunks: 임베딩된 청크 리스트 (embedding은 float32 배열 또는 리스트)
             document_id: 문서 ID
+            batch_size: 한 번에 upsert할 포인트 수
+            progress_callback: progress_callback(저장한 포인트 수, 전체 포인트 수) 진행 알림 함수
             
         Returns:
             저장 성공 여부
@@ -116,64 +326,140 @@ class QdrantManager:
                 return False
         
         try:
-            # 컬렉션 생성 확인
-            if not self.create_collection():
-                return False
-            
-            # 포인트 생성
-            points = []
-            import uuid
+            # 임베딩이 없는 청크 제외
+            valid = []
             for i, chunk in enumerate(embedded_chunks):
-                embedding = chunk.get('embedding', [])
-                if not embedding:
+                if len(chunk.get('embedding', ())) == 0:
                     logger.warning(f"청크 {i}에 임베딩이 없습니다")
                     continue
-
-                # 페이로드 구성
-                payload = {
-                    'text': chunk.get('text', ''),
-                    'document_id': document_id or f"doc_{i}",
-                    'chunk_index': chunk.get('chunk_index', i),
-                    'page_number': chunk.get('page_number', 0),
-                    'chunk_size': chunk.get('chunk_size', 0),
-                    'embedding_dimension': chunk.get('embedding_dimension', len(embedding))
-                }
-                # 메타데이터(문서명, 시트명, 행번호 등) 보장
-                if 'metadata' in chunk and isinstance(chunk['metadata'], dict):
-                    for k, v in chunk['metadata'].items():
-                        payload[k] = v
-                # Qdrant가 허용하는 UUID로 point id 생성
-                point_id = str(uuid.uuid4())
-                point = PointStruct(
-                    id=point_id,
-                    vector=embedding,
-                    payload=payload
-                )
-                points.append(point)
+                valid.append((i, chunk))
+            if not valid:
+                logger.warning("임베딩된 청크가 없습니다")
+                return False
             
-            # 벡터 저장
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=points
-            )
+            # 차원 축소 (기존 컬렉션은 만들 때의 축소 방식, 새 컬렉션은 설정값)
+            vectors_matrix = as_matrix([chunk['embedding'] for _, chunk in valid])
+            vector_reduction = self.get_vector_reduction()
+            reducer = get_reducer(vector_reduction)
+            if reducer:
+                vectors_matrix = reducer.transform(vectors_matrix)
+            
+            # 이름 있는 벡터 컬렉션: 제목 임베딩이 없는 청크는 본문 벡터를 title 벡터로 사용
+            named_vectors = self.uses_named_vectors()
+            title_matrix = None
+            if named_vectors:
+                missing = sum(1 for _, chunk in valid if len(chunk.get('title_embedding', ())) == 0)
+                if missing:
+                    logger.warning(f"제목 임베딩이 없는 청크 {missing}개는 본문 벡터를 title 벡터로 저장합니다")
+                if missing < len(valid):
+                    title_matrix = as_matrix([
+                        chunk['title_embedding'] if len(chunk.get('title_embedding', ())) else chunk['embedding']
+                        for _, chunk in valid
+                    ])
+                    if reducer:
+                        title_matrix = reducer.transform(title_matrix)
+                else:
+                    title_matrix = vectors_matrix
             
-            logger.info(f"{len(points)}개의 벡터를 저장했습니다")
+            # 컬렉션 생성 확인 (벡터 크기는 임베딩/축소 결과에서 결정)
+            vector_size = vectors_matrix.shape[1]
+            embedding_model = valid[0][1].get('embedding_model')
+            if not self.create_collection(vector_size=vector_size, embedding_model=embedding_model,
+                                          vector_reduction=vector_reduction, named_vectors=named_vectors):
+                return False
+            if not self.check_vector_schema(vector_size, embedding_model):
+                return False
+            
+            # 벡터 저장 (배치 단위로 나누어 진행 상황 보고)
+            # float32 행렬은 upsert 직전에 배치 단위로만 리스트로 변환해 전체 문서 분량의 float 객체를 만들지 않음
+            import uuid
+            from qdrant_client.models import Batch
+            for start in range(0, len(valid), batch_size):
+                batch = valid[start:start + batch_size]
+                ids, payloads = [], []
+                for i, chunk in batch:
+                    embedding = chunk['embedding']
+                    # 페이로드 구성
+                    payload = {
+                        'text': chunk.get('text', ''),
+                        'document_id': document_id or f"doc_{i}",
+                        'chunk_index': chunk.get('chunk_index', i),
+                        'page_number': chunk.get('page_number', 0),
+                        'chunk_size': chunk.get('chunk_size', 0),
+                        'token_count': chunk.get('token_count') or estimate_tokens(chunk.get('text', '')),
+                        'embedding_dimension': chunk.get('embedding_dimension', len(embedding))
+                    }
+                    # 메타데이터(문서명, 시트명, 행번호 등) 보장
+                    if 'metadata' in chunk and isinstance(chunk['metadata'], dict):
+                        for k, v in chunk['metadata'].items():
+                            payload[k] = v
+                    if chunk.get('section_title'):
+                        payload['section_title'] = chunk['section_title']
+                    if vector_reduction:
+                        payload['vector_reduction'] = vector_reduction
+                    # Qdrant가 허용하는 UUID로 point id 생성
+                    ids.append(str(uuid.uuid4()))
+                    payloads.append(payload)
+                
+                vectors = vectors_matrix[start:start + batch_size].tolist()
+                if named_vectors:
+                    vectors = {BODY_VECTOR: vectors, TITLE_VECTOR: title_matrix[start:start + batch_size].tolist()}
+                with observe_seconds(QDRANT_OPERATION_SECONDS, QDRANT_ERRORS, operation="upsert"):
+                    self.client.upsert(
+                        collection_name=self.collection_name,
+                        points=Batch(ids=ids, vectors=vectors, payloads=payloads)
+                    )
+                QDRANT_POINTS.labels(operation="upsert").inc(len(batch))
+                if progress_callback:
+                    progress_callback(start + len(batch), len(valid))
+            
+            logger.info(f"{len(valid)}개의 벡터를 저장했습니다")
             return True
             
         except Exception as e:
             logger.error(f"벡터 저장 실패: {e}")
+            if 'not found' in str(e).lower():
+                schema_registry.invalidate_collection(self._schema_key())
             return False
     
-    def search_vectors(self, query_vector: List[float], limit: int = 10, 
-                      score_threshold: float = 0.0, filter_condition: Filter = None) -> List[Dict[str, Any]]:
+    def _resolve_vector_name(self, vector_name: str = None) -> Optional[str]:
+        """
+        검색할 이름 있는 벡터를 정합니다.
+        
+        Args:
+            vector_name: body, title, fused (None이면 body)
+            
+        Returns:
+            벡터 이름 (단일 벡터 컬렉션이면 None)
+            
+        Raises:
+            ValueError: 알 수 없는 검색 대상
+        """
+        vector_name = vector_name or BODY_VECTOR
+        if vector_name not in SEARCH_VECTOR_NAMES:
+            raise ValueError(f"알 수 없는 검색 벡터입니다: {vector_name} (가능: {', '.join(SEARCH_VECTOR_NAMES)})")
+        if not self.uses_named_vectors():
+            if vector_name != BODY_VECTOR:
+                search_log.debug("단일 벡터 컬렉션 '{}'은 본문 벡터로 검색합니다 ({} 무시)", self.collection_name, vector_name)
+            return None
+        return vector_name
+    
+    @traced("qdrant_search")
+    def search_vectors(self, query_vector: Union[np.ndarray, List[float]], limit: int = 10, 
+                      score_threshold: float = 0.0, filter_condition: "Filter" = None,
+                      with_vectors: bool = False, hnsw_ef: int = None,
+                      vector_name: str = None) -> List[Dict[str, Any]]:
         """
         벡터 검색을 수행합니다.
         
         Args:
-            query_vector: 검색할 쿼리 벡터
+            query_vector: 검색할 쿼리 벡터 (float32 배열 또는 리스트)
             limit: 반환할 결과 수
             score_threshold: 점수 임계값
             filter_condition: 필터 조건
+            with_vectors: 결과에 저장된 벡터를 포함할지 여부 (MMR 등 후처리용, 검색한 벡터만)
+            hnsw_ef: HNSW 탐색 후보 수 (클수록 정확하고 느림, None이면 설정값)
+            vector_name: 이름 있는 벡터 컬렉션의 검색 대상 (body, title, fused / None이면 body)
             
         Returns:
             검색 결과 리스트
@@ -183,31 +469,205 @@ class QdrantManager:
                 return []
         
         try:
-            search_result = self.client.search(
-                collection_name=self.collection_name,
-                query_vector=query_vector,
-                limit=limit,
-                score_threshold=score_threshold,
-                query_filter=filter_condition
-            )
+            vector_name = self._resolve_vector_name(vector_name)
+        except ValueError as e:
+            logger.error(f"벡터 검색 실패: {e}")
+            return []
+        if vector_name == FUSED_VECTORS:
+            if not with_vectors:
+                # 이미 qdrant_search 구간 안이므로 구간 없는 내부 함수 호출 (Server-Timing 중복 합산 방지)
+                return self._search_fused(query_vector, limit, score_threshold, filter_condition, hnsw_ef)
+            # 후처리용 벡터가 필요하면 본문 벡터 하나로 검색
+            vector_name = BODY_VECTOR
+        
+        try:
+            query_vector = self.prepare_query_vector(query_vector)
+        except Exception as e:
+            logger.error(f"쿼리 벡터 축소 실패: {e}")
+            return []
+        if not self.check_vector_schema(len(query_vector)):
+            return []
+        
+        try:
+            with observe_seconds(QDRANT_OPERATION_SECONDS, QDRANT_ERRORS, operation="search"):
+                search_result = self.client.search(
+                    collection_name=self.collection_name,
+                    query_vector=(vector_name, query_vector) if vector_name else query_vector,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    query_filter=filter_condition,
+                    with_vectors=with_vectors,
+                    search_params=self._search_params(hnsw_ef)
+                )
             
             results = []
             for result in search_result:
-                results.append({
+                item = {
                     'id': result.id,
                     'score': result.score,
                     'payload': result.payload
-                })
+                }
+                if with_vectors:
+                    item['vector'] = result.vector.get(vector_name) if isinstance(result.vector, dict) \
+                        else result.vector
+                results.append(item)
             
-            logger.info(f"검색 완료: {len(results)}개 결과")
+            search_log.info("검색 완료: {}개 결과", len(results))
             return results
             
         except Exception as e:
             logger.error(f"벡터 검색 실패: {e}")
             return []
     
+    @staticmethod
+    def _search_params(hnsw_ef: int = None) -> Optional["SearchParams"]:
+        """hnsw_ef 검색 파라미터 (지정하지 않으면 컬렉션 기본값)"""
+        from qdrant_client.models import SearchParams
+        hnsw_ef = config.QDRANT_SEARCH_HNSW_EF if hnsw_ef is None else hnsw_ef
+        return SearchParams(hnsw_ef=hnsw_ef) if hnsw_ef else None
+    
+    @traced("qdrant_search")
+    def search_fused(self, query_vector: Union[np.ndarray, List[float]], limit: int = 10,
+                     score_threshold: float = 0.0, filter_condition: "Filter" = None,
+                     hnsw_ef: int = None) -> List[Dict[str, Any]]:
+        """
+        body/title 벡터를 한 번의 search_batch 요청으로 함께 검색하고 RRF로 합칩니다.
+        (단일 벡터 컬렉션이면 일반 벡터 검색)
+        
+        Args:
+            query_vector: 검색할 쿼리 벡터
+            limit: 반환할 결과 수
+            score_threshold: 벡터별 원점수 임계값
+            filter_condition: 필터 조건
+            hnsw_ef: HNSW 탐색 후보 수 (None이면 설정값)
+            
+        Returns:
+            검색 결과 리스트 (score는 RRF 점수, vector_scores에 벡터별 원점수)
+        """
+        return self._search_fused(query_vector, limit, score_threshold, filter_condition, hnsw_ef)
+    
+    def _search_fused(self, query_vector: Union[np.ndarray, List[float]], limit: int,
+                      score_threshold: float, filter_condition: "Filter", hnsw_ef: int) -> List[Dict[str, Any]]:
+        return self.search_vectors_batch([{
+            'query_vector': query_vector,
+            'limit': limit,
+            'score_threshold': score_threshold,
+            'filter_condition': filter_condition,
+            'hnsw_ef': hnsw_ef,
+            'vector_name': FUSED_VECTORS
+        }])[0]
+    
+    @staticmethod
+    def _fuse_results(hits_by_vector: Dict[str, list], limit: int) -> List[Dict[str, Any]]:
+        """
+        벡터별 검색 결과를 가중 RRF(sum(weight / (k + 순위)))로 합칩니다.
+        
+        Args:
+            hits_by_vector: 벡터 이름 -> Qdrant 검색 결과 (점수 순)
+            limit: 반환할 결과 수
+            
+        Returns:
+            RRF 점수 순 결과 리스트
+        """
+        weights = {BODY_VECTOR: 1.0, TITLE_VECTOR: config.VECTOR_FUSION_TITLE_WEIGHT}
+        fused: Dict[Any, Dict[str, Any]] = {}
+        for vector_name, hits in hits_by_vector.items():
+            for rank, hit in enumerate(hits, 1):
+                item = fused.setdefault(hit.id, {'id': hit.id, 'score': 0.0, 'payload': hit.payload,
+                                                 'vector_scores': {}})
+                item['score'] += weights.get(vector_name, 1.0) / (config.VECTOR_FUSION_RRF_K + rank)
+                item['vector_scores'][vector_name] = hit.score
+        # RRF 점수가 같으면 벡터별 원점수 최댓값으로 순위 결정
+        ranked = sorted(fused.values(), key=lambda r: (r['score'], max(r['vector_scores'].values())), reverse=True)
+        return ranked[:limit]
+    
+    def search_vectors_batch(self, queries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        여러 벡터 검색을 한 번의 search_batch 요청으로 수행합니다.
+        
+        이름 있는 벡터 컬렉션에서 vector_name이 fused인 쿼리는 body/title 요청 두 개로 나누어
+        같은 배치에 넣고, 결과를 RRF로 합칩니다. (벡터별 후보는 limit x VECTOR_FUSION_FETCH_MULTIPLIER개)
+        
+        search_vectors와 같이 쿼리마다 컬렉션의 차원 축소를 적용하고 스키마(벡터 크기)를 확인하며,
+        검색할 수 없는 쿼리(알 수 없는 벡터 이름, 크기 불일치)는 빈 결과로 두고 나머지만 요청합니다.
+        
+        Args:
+            queries: 검색 조건 리스트. 각 항목은 query_vector, limit,
+                score_threshold, filter_condition, hnsw_ef, vector_name 키를 가집니다.
+            
+        Returns:
+            입력 순서와 같은 검색 결과 리스트의 리스트
+        """
+        if not queries:
+            return []
+        
+        if not self.client:
+            if not self.connect():
+                return [[] for _ in queries]
+        
+        try:
+            from qdrant_client.models import SearchRequest as QdrantSearchRequest, NamedVector
+            requests = []
+            # 쿼리별 (요청 시작 위치, 검색한 벡터 이름 리스트), 검색하지 않는 쿼리는 None
+            layout = []
+            for query in queries:
+                try:
+                    vector_name = self._resolve_vector_name(query.get('vector_name'))
+                    vector = np.asarray(self.prepare_query_vector(query['query_vector']), dtype=np.float32)
+                except Exception as e:
+                    logger.error(f"배치 벡터 검색 쿼리 제외: {e}")
+                    layout.append(None)
+                    continue
+                if not self.check_vector_schema(len(vector)):
+                    layout.append(None)
+                    continue
+                vector = vector.tolist()
+                limit = query.get('limit', 10)
+                if vector_name == FUSED_VECTORS:
+                    names = [BODY_VECTOR, TITLE_VECTOR]
+                    limit *= max(config.VECTOR_FUSION_FETCH_MULTIPLIER, 1)
+                else:
+                    names = [vector_name]
+                layout.append((len(requests), names))
+                for name in names:
+                    requests.append(QdrantSearchRequest(
+                        vector=NamedVector(name=name, vector=vector) if name else vector,
+                        limit=limit,
+                        score_threshold=query.get('score_threshold', 0.0),
+                        filter=query.get('filter_condition'),
+                        params=self._search_params(query.get('hnsw_ef')),
+                        with_payload=True
+                    ))
+            if not requests:
+                return [[] for _ in queries]
+            with observe_seconds(QDRANT_OPERATION_SECONDS, QDRANT_ERRORS, operation="search_batch"):
+                batch_result = self.client.search_batch(
+                    collection_name=self.collection_name,
+                    requests=requests
+                )
+            
+            results = []
+            for query, placement in zip(queries, layout):
+                if placement is None:
+                    results.append([])
+                    continue
+                start, names = placement
+                if len(names) > 1:
+                    hits = dict(zip(names, batch_result[start:start + len(names)]))
+                    results.append(self._fuse_results(hits, query.get('limit', 10)))
+                else:
+                    results.append([{'id': r.id, 'score': r.score, 'payload': r.payload}
+                                    for r in batch_result[start]])
+            search_log.info("배치 검색 완료: {}개 쿼리 (Qdrant 요청 {}개)", len(queries), len(requests))
+            return results
+            
+        except Exception as e:
+            logger.error(f"배치 벡터 검색 실패: {e}")
+            return [[] for _ in queries]
+    
     def search_by_text(self, query_text: str, embedding_service, limit: int = 10, 
-                       score_threshold: float = 0.0, filter_condition: Filter = None) -> List[Dict[str, Any]]:
+                       score_threshold: float = 0.0, filter_condition: "Filter" = None,
+                       hnsw_ef: int = None, vector_name: str = None) -> List[Dict[str, Any]]:
         """
         텍스트로 검색을 수행합니다.
         
@@ -217,6 +677,8 @@ class QdrantManager:
             limit: 반환할 결과 수
             score_threshold: 점수 임계값
             filter_condition: 필터 조건
+            hnsw_ef: HNSW 탐색 후보 수 (None이면 설정값)
+            vector_name: 검색 대상 벡터 (body, title, fused / None이면 SEARCH_VECTOR)
             
         Returns:
             검색 결과 리스트
@@ -225,7 +687,7 @@ class QdrantManager:
             # 텍스트를 벡터로 임베딩
             query_vector = embedding_service.embed_text(query_text)
             
-            if not query_vector:
+            if len(query_vector) == 0:
                 logger.error("쿼리 텍스트 임베딩 실패")
                 return []
             
@@ -234,7 +696,9 @@ class QdrantManager:
                 query_vector=query_vector,
                 limit=limit,
                 score_threshold=score_threshold,
-                filter_condition=filter_condition
+                filter_condition=filter_condition,
+                hnsw_ef=hnsw_ef,
+                vector_name=vector_name or config.SEARCH_VECTOR
             )
             
         except Exception as e:
@@ -296,17 +760,10 @@ class QdrantManager:
 
         try:
             # 1. 해당 document_id의 point id들을 모두 조회
-            filter_condition = Filter(
-                must=[
-                    FieldCondition(
-                        key="document_id",
-                        match=MatchValue(value=document_id)
-                    )
-                ]
-            )
+            filter_condition = self.create_filter(document_id=document_id)
             points, _ = self.client.scroll(
                 collection_name=self.collection_name,
-                filter=filter_condition,
+                scroll_filter=filter_condition,
                 limit=10000
             )
             point_ids = [point.id for point in points]
@@ -360,8 +817,140 @@ class QdrantManager:
                 logger.error(f"문서 목록 조회 실패: {e}")
             return []
     
+    def count_document_points(self, document_id: str) -> int:
+        """
+        문서의 포인트(청크) 수를 반환합니다.
+        
+        Args:
+            document_id: 문서 ID
+            
+        Returns:
+            포인트 수 (컬렉션/문서가 없거나 오류 시 0)
+        """
+        if not self.client:
+            if not self.connect():
+                return 0
+        
+        try:
+            result = self.client.count(
+                collection_name=self.collection_name,
+                count_filter=self.create_filter(document_id=document_id),
+                exact=True
+            )
+            return result.count
+        except Exception as e:
+            if 'not found' not in str(e).lower():
+                logger.error(f"문서 포인트 수 조회 실패: {e}")
+            return 0
+    
+    def get_document_points(self, document_id: str, with_vectors: bool = True,
+                            batch_size: int = 256) -> List[Dict[str, Any]]:
+        """
+        문서의 모든 포인트를 페이지 단위로 조회합니다.
+        
+        Args:
+            document_id: 문서 ID
+            with_vectors: 저장된 벡터 포함 여부
+            batch_size: 한 번에 조회할 포인트 수
+            
+        Returns:
+            id, vector, payload를 담은 포인트 리스트
+        """
+        if not self.client:
+            if not self.connect():
+                return []
+        
+        points = []
+        offset = None
+        try:
+            while True:
+                batch, offset = self.client.scroll(
+                    collection_name=self.collection_name,
+                    scroll_filter=self.create_filter(document_id=document_id),
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=with_vectors
+                )
+                points.extend({"id": p.id, "vector": p.vector, "payload": p.payload} for p in batch)
+                if offset is None:
+                    break
+            return points
+        except Exception as e:
+            logger.error(f"문서 포인트 조회 실패: {e}")
+            return []
+    
+    def copy_document(self, source: "QdrantManager", source_document_id: str, target_document_id: str,
+                      payload_overrides: Dict[str, Any] = None, batch_size: int = 256) -> int:
+        """
+        다른 컬렉션에 저장된 문서의 포인트(벡터 포함)를 이 컬렉션으로 복사합니다. (재임베딩 없음)
+        
+        Args:
+            source: 원본 컬렉션 매니저
+            source_document_id: 원본 문서 ID
+            target_document_id: 복사본 문서 ID
+            payload_overrides: 복사본 페이로드에서 덮어쓸 값 (이미 있는 키만)
+            batch_size: 한 번에 upsert할 포인트 수
+            
+        Returns:
+            복사한 포인트 수 (실패 시 0)
+        """
+        import uuid
+        from qdrant_client.models import PointStruct
+        points = source.get_document_points(source_document_id, with_vectors=True)
+        if not points:
+            return 0
+        if not self.client:
+            if not self.connect():
+                return 0
+        
+        try:
+            source_schema = source.get_collection_schema() or {}
+            first_vector = points[0]["vector"]
+            named_vectors = isinstance(first_vector, dict)
+            vector_size = len(first_vector[BODY_VECTOR] if named_vectors else first_vector)
+            embedding_model = source_schema.get("embedding_model")
+            vector_reduction = points[0]["payload"].get("vector_reduction", "")
+            if self.get_collection_schema() is not None:
+                if self.get_vector_reduction() != vector_reduction:
+                    logger.warning(f"차원 축소 방식이 달라 복사할 수 없습니다: {source.collection_name}="
+                                   f"{vector_reduction or '없음'}, {self.collection_name}={self.get_vector_reduction() or '없음'}")
+                    return 0
+                if self.uses_named_vectors() != named_vectors:
+                    logger.warning(f"벡터 구성(이름 있는 벡터 여부)이 달라 복사할 수 없습니다: "
+                                   f"{source.collection_name} -> {self.collection_name}")
+                    return 0
+            if not self.create_collection(vector_size=vector_size, embedding_model=embedding_model,
+                                          vector_reduction=vector_reduction, named_vectors=named_vectors):
+                return 0
+            if not self.check_vector_schema(vector_size, embedding_model):
+                return 0
+            
+            copies = []
+            for point in points:
+                payload = dict(point["payload"])
+                payload["document_id"] = target_document_id
+                for key, value in (payload_overrides or {}).items():
+                    if key in payload:
+                        payload[key] = value
+                copies.append(PointStruct(id=str(uuid.uuid4()), vector=point["vector"], payload=payload))
+            for start in range(0, len(copies), batch_size):
+                batch = copies[start:start + batch_size]
+                with observe_seconds(QDRANT_OPERATION_SECONDS, QDRANT_ERRORS, operation="upsert"):
+                    self.client.upsert(
+                        collection_name=self.collection_name,
+                        points=batch
+                    )
+                QDRANT_POINTS.labels(operation="copy").inc(len(batch))
+            logger.info(f"문서 복사 완료: {source.collection_name}/{source_document_id} -> "
+                        f"{self.collection_name}/{target_document_id} (포인트 {len(copies)}개)")
+            return len(copies)
+        except Exception as e:
+            logger.error(f"문서 복사 실패: {e}")
+            return 0
+    
     def create_filter(self, document_id: str = None, page_number: int = None, 
-                     chunk_size_range: Tuple[int, int] = None) -> Filter:
+                     chunk_size_range: Tuple[int, int] = None) -> Optional["Filter"]:
         """
         검색 필터를 생성합니다.
         
@@ -371,8 +960,9 @@ class QdrantManager:
             chunk_size_range: 청크 크기 범위 (min, max)
             
         Returns:
-            필터 객체
+            필터 객체 (조건이 없으면 None)
         """
+        from qdrant_client.models import Filter, FieldCondition, MatchValue, Range
         conditions = []
         
         if document_id:
@@ -425,7 +1015,7 @@ class QdrantManager:
             points, _ = self.client.scroll(
                 collection_name=self.collection_name,
                 limit=1,
-                filter=filter_obj
+                scroll_filter=filter_obj
             )
             if points:
                 return points[0].payload.get("metadata", points[0].payload)
@@ -0,0 +1,76 @@
+"""
+스키마 레지스트리 - 컬렉션 존재 여부, 벡터 크기, 임베딩 모델 정보를 프로세스 단위로 캐시
+적재/검색마다 Qdrant 컬렉션 조회나 테스트 임베딩을 반복하지 않도록 합니다.
+"""
+
+import threading
+from typing import Dict, Any, Optional, Tuple
+from loguru import logger
+
+
+class SchemaRegistry:
+    """컬렉션 스키마와 임베딩 차원 캐시 클래스"""
+
+    def __init__(self):
+        self._collections: Dict[Tuple[str, int, str], Dict[str, Any]] = {}
+        self._dimensions: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ---- 컬렉션 스키마 ----
+    def get_collection(self, key: Tuple[str, int, str]) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 컬렉션 스키마를 반환합니다.
+
+        Args:
+            key: (Qdrant 호스트, 포트, 컬렉션 이름)
+
+        Returns:
+            스키마 딕셔너리 (vector_size, distance, embedding_model 등), 없으면 None
+        """
+        with self._lock:
+            schema = self._collections.get(key)
+            if schema is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(schema)
+
+    def register_collection(self, key: Tuple[str, int, str], **schema) -> Dict[str, Any]:
+        """컬렉션 스키마를 등록(또는 갱신)합니다."""
+        with self._lock:
+            current = self._collections.setdefault(key, {})
+            current.update({k: v for k, v in schema.items() if v is not None})
+            return dict(current)
+
+    def invalidate_collection(self, key: Tuple[str, int, str]) -> None:
+        """컬렉션 스키마 캐시를 제거합니다. (컬렉션 삭제/재생성 시)"""
+        with self._lock:
+            if self._collections.pop(key, None) is not None:
+                logger.info(f"스키마 캐시 제거: {key[2]}")
+
+    # ---- 임베딩 차원 ----
+    def get_dimension(self, base_url: str, model_name: str) -> Optional[int]:
+        """캐시된 임베딩 모델 차원을 반환합니다."""
+        with self._lock:
+            return self._dimensions.get((base_url, model_name))
+
+    def set_dimension(self, base_url: str, model_name: str, dimension: int) -> None:
+        """임베딩 모델 차원을 캐시합니다."""
+        with self._lock:
+            self._dimensions[(base_url, model_name)] = dimension
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중 통계"""
+        with self._lock:
+            return {
+                "collections": len(self._collections),
+                "dimensions": len(self._dimensions),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# 전역 스키마 레지스트리 인스턴스
+schema_registry = SchemaRegistry()
@@ -1,10 +1,61 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
+import numpy as np
 from loguru import logger
+from .config import config
 from .qdrant_manager import QdrantManager
 from .embedding_service import EmbeddingService
+from .similarity import l2_normalize, VectorLike, MatrixLike
+from .tracing import traced
+from .logging_setup import get_logger, clip
+
+# 요청마다 찍히는 검색 로그는 LOG_SAMPLE_RATES의 search 비율만 기록
+search_log = get_logger("search")
+
+
+def maximal_marginal_relevance(query_vector: VectorLike, candidate_vectors: MatrixLike,
+                               k: int, lambda_mult: float = 0.5) -> List[int]:
+    """
+    MMR(Maximal Marginal Relevance)로 다양성을 고려한 상위 k개 후보 인덱스를 선택합니다.
+    
+    후보 간 유사도 행렬은 정규화된 벡터의 행렬곱 한 번으로 계산합니다.
+    
+    Args:
+        query_vector: 쿼리 벡터
+        candidate_vectors: 후보 벡터 리스트 또는 (N, 차원) 배열 (검색 점수 순)
+        k: 선택할 개수
+        lambda_mult: 관련성 가중치 (1이면 관련성만, 0이면 다양성만 고려)
+        
+    Returns:
+        선택된 후보 인덱스 리스트 (선택 순서)
+    """
+    if len(candidate_vectors) == 0 or k <= 0:
+        return []
+    
+    # 코사인 유사도 계산을 위해 정규화 (0 벡터는 그대로 둠)
+    candidates = l2_normalize(candidate_vectors)
+    query = l2_normalize(query_vector)[0]
+    
+    query_similarity = candidates @ query
+    pairwise_similarity = candidates @ candidates.T
+    
+    k = min(k, len(candidates))
+    selected = [int(np.argmax(query_similarity))]
+    # 각 후보가 지금까지 선택된 항목들과 가지는 최대 유사도
+    max_redundancy = pairwise_similarity[selected[0]].copy()
+    
+    while len(selected) < k:
+        scores = lambda_mult * query_similarity - (1 - lambda_mult) * max_redundancy
+        scores[selected] = -np.inf
+        next_idx = int(np.argmax(scores))
+        selected.append(next_idx)
+        np.maximum(max_redundancy, pairwise_similarity[next_idx], out=max_redundancy)
+    
+    return selected
 
 class SearchService:
-    def search_hybrid(self, query: str, keyword: str = None, limit: int = 10, score_threshold: float = 0.0, document_id: str = None, page_number: int = None) -> List[Dict[str, Any]]:
+    def search_hybrid(self, query: str, keyword: str = None, limit: int = 10, score_threshold: float = 0.0, document_id: str = None, page_number: int = None, hnsw_ef: int = None) -> List[Dict[str, Any]]:
         """
         벡터+키워드 하이브리드 검색
         Args:
@@ -14,11 +65,12 @@ class SearchService:
             score_threshold: 점수 임계값
             document_id: 특정 문서로 제한
             page_number: 특정 페이지로 제한
+            hnsw_ef: HNSW 탐색 후보 수 (None이면 설정값)
         Returns:
             검색 결과 리스트
         """
         # 1. 벡터 검색
-        vector_results = self.search(query, limit=limit*2, score_threshold=score_threshold, document_id=document_id, page_number=page_number)
+        vector_results = self.search(query, limit=limit*2, score_threshold=score_threshold, document_id=document_id, page_number=page_number, hnsw_ef=hnsw_ef)
         # 2. 키워드 필터링
         if keyword:
             keyword_results = [r for r in vector_results if keyword in r['text']]
@@ -41,8 +93,25 @@ class SearchService:
         
         logger.info("검색 서비스 초기화 완료")
     
+    @staticmethod
+    def _format_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Qdrant 검색 결과를 API 응답 형식으로 변환합니다."""
+        return {
+            'id': result['id'],
+            'score': result['score'],
+            'text': result['payload'].get('text', ''),
+            'document_id': result['payload'].get('document_id', ''),
+            'page_number': result['payload'].get('page_number', 0),
+            'chunk_index': result['payload'].get('chunk_index', 0),
+            'token_count': result['payload'].get('token_count'),
+            'metadata': result['payload'].get('metadata', {})
+        }
+    
+    @traced("search")
     def search(self, query: str, limit: int = 10, score_threshold: float = 0.0, 
-               document_id: str = None, page_number: int = None) -> List[Dict[str, Any]]:
+               document_id: str = None, page_number: int = None,
+               use_mmr: bool = False, mmr_lambda: float = None,
+               hnsw_ef: int = None, vector_name: str = None) -> List[Dict[str, Any]]:
         """
         텍스트 검색을 수행합니다.
         
@@ -52,6 +121,11 @@ class SearchService:
             score_threshold: 점수 임계값
             document_id: 특정 문서로 제한
             page_number: 특정 페이지로 제한
+            use_mmr: MMR로 중복에 가까운 결과를 걸러 다양한 결과를 선택할지 여부
+            mmr_lambda: MMR 관련성 가중치 (None이면 설정값 사용)
+            hnsw_ef: HNSW 탐색 후보 수 (None이면 설정값)
+            vector_name: 이름 있는 벡터 컬렉션의 검색 대상 (body, title, fused / None이면 SEARCH_VECTOR,
+                MMR은 본문 벡터로만 후보를 가져옴)
             
         Returns:
             검색 결과 리스트
@@ -63,36 +137,204 @@ class SearchService:
                 page_number=page_number
             )
             
-            # 텍스트 검색 수행
-            results = self.qdrant_manager.search_by_text(
-                query_text=query,
-                embedding_service=self.embedding_service,
-                limit=limit,
-                score_threshold=score_threshold,
-                filter_condition=filter_condition
-            )
+            if use_mmr:
+                results = self._search_mmr(query, limit, score_threshold, filter_condition, mmr_lambda, hnsw_ef)
+            else:
+                # 텍스트 검색 수행
+                results = self.qdrant_manager.search_by_text(
+                    query_text=query,
+                    embedding_service=self.embedding_service,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    filter_condition=filter_condition,
+                    hnsw_ef=hnsw_ef,
+                    vector_name=vector_name
+                )
             
             # 결과 포맷팅
-            formatted_results = []
-            for result in results:
-                formatted_result = {
-                    'id': result['id'],
-                    'score': result['score'],
-                    'text': result['payload'].get('text', ''),
-                    'document_id': result['payload'].get('document_id', ''),
-                    'page_number': result['payload'].get('page_number', 0),
-                    'chunk_index': result['payload'].get('chunk_index', 0),
-                    'metadata': result['payload'].get('metadata', {})
-                }
-                formatted_results.append(formatted_result)
+            formatted_results = [self._format_result(result) for result in results]
             
-            logger.info(f"검색 완료: '{query}' -> {len(formatted_results)}개 결과")
+            search_log.info("검색 완료: '{}' -> {}개 결과", clip(query), len(formatted_results))
             return formatted_results
             
         except Exception as e:
             logger.error(f"검색 중 오류 발생: {e}")
             return []
     
+    def search_many(self, queries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        여러 검색을 한 번에 수행합니다.
+        
+        모든 쿼리를 한 번의 배치 임베딩 요청으로 벡터화하고,
+        Qdrant search_batch 요청 한 번으로 검색합니다.
+        
+        Args:
+            queries: 검색 조건 리스트. 각 항목은 query 키와 선택적으로
+                limit, score_threshold, document_id, page_number, vector_name 키를 가집니다.
+            
+        Returns:
+            입력 순서와 같은 검색 결과 리스트의 리스트
+        """
+        if not queries:
+            return []
+        
+        try:
+            vectors = self.embedding_service.embed_texts([q.get('query', '') for q in queries])
+            
+            # 임베딩에 실패한 쿼리는 빈 결과로 두고 나머지만 검색
+            batch = []
+            positions = []
+            for i, (query, vector) in enumerate(zip(queries, vectors)):
+                if not vector.any():
+                    logger.warning(f"쿼리 임베딩 실패: '{query.get('query', '')}'")
+                    continue
+                batch.append({
+                    'query_vector': vector,
+                    'limit': query.get('limit', 10),
+                    'score_threshold': query.get('score_threshold', 0.0),
+                    'filter_condition': self.qdrant_manager.create_filter(
+                        document_id=query.get('document_id'),
+                        page_number=query.get('page_number')
+                    ),
+                    'vector_name': query.get('vector_name') or config.SEARCH_VECTOR
+                })
+                positions.append(i)
+            
+            results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+            for i, batch_results in zip(positions, self.qdrant_manager.search_vectors_batch(batch)):
+                results[i] = [self._format_result(result) for result in batch_results]
+            
+            search_log.info("배치 검색 완료: {}개 쿼리", len(queries))
+            return results
+            
+        except Exception as e:
+            logger.error(f"배치 검색 중 오류 발생: {e}")
+            return [[] for _ in queries]
+    
+    def search_collections(self, query: str, collection_names: List[str] = None, limit: int = 10,
+                           score_threshold: float = 0.0, document_id: str = None,
+                           page_number: int = None, normalize: bool = True,
+                           vector_name: str = None) -> List[Dict[str, Any]]:
+        """
+        여러 컬렉션(부서)을 동시에 검색하여 하나의 순위 리스트로 병합합니다.
+        
+        쿼리는 한 번만 임베딩하고, 컬렉션별 검색은 스레드 풀에서 병렬로 수행하므로
+        전체 지연 시간은 가장 느린 컬렉션 하나의 지연 시간에 가깝습니다.
+        
+        Args:
+            query: 검색 쿼리
+            collection_names: 검색할 컬렉션 이름 리스트 (None이면 전체 컬렉션)
+            limit: 반환할 결과 수
+            score_threshold: 점수 임계값 (정규화 전 원점수 기준)
+            document_id: 특정 문서로 제한
+            page_number: 특정 페이지로 제한
+            normalize: 컬렉션별 점수를 0~1로 정규화한 뒤 병합할지 여부
+            vector_name: 이름 있는 벡터 컬렉션의 검색 대상 (body, title, fused / None이면 SEARCH_VECTOR)
+            
+        Returns:
+            검색 결과 리스트 (collection_name, raw_score 포함)
+        """
+        try:
+            if not collection_names:
+                collection_names = self.qdrant_manager.list_collections()
+            if not collection_names:
+                logger.warning("검색할 컬렉션이 없습니다")
+                return []
+            
+            query_vector = self.embedding_service.embed_text(query)
+            if query_vector.size == 0:
+                logger.error("쿼리 텍스트 임베딩 실패")
+                return []
+            
+            filter_condition = self.qdrant_manager.create_filter(
+                document_id=document_id,
+                page_number=page_number
+            )
+            
+            def search_one(collection_name: str) -> List[Dict[str, Any]]:
+                manager = self.qdrant_manager.for_collection(collection_name)
+                return manager.search_vectors(
+                    query_vector=query_vector,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    filter_condition=filter_condition,
+                    vector_name=vector_name or config.SEARCH_VECTOR
+                )
+            
+            workers = max(1, min(config.SEARCH_FANOUT_WORKERS, len(collection_names)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # 요청 트레이스가 작업 스레드에서도 이어지도록 컨텍스트를 복사해 실행
+                futures = [executor.submit(contextvars.copy_context().run, search_one, name)
+                           for name in collection_names]
+                per_collection = [future.result() for future in futures]
+            
+            merged = []
+            for collection_name, results in zip(collection_names, per_collection):
+                if not results:
+                    continue
+                scores = [r['score'] for r in results]
+                low, high = min(scores), max(scores)
+                for result in results:
+                    formatted = self._format_result(result)
+                    formatted['collection_name'] = collection_name
+                    formatted['raw_score'] = result['score']
+                    if normalize:
+                        formatted['score'] = (result['score'] - low) / (high - low) if high > low else 1.0
+                    merged.append(formatted)
+            
+            # 정규화 점수가 같으면 원점수로 순위 결정
+            merged.sort(key=lambda r: (r['score'], r['raw_score']), reverse=True)
+            search_log.info("다중 컬렉션 검색 완료: '{}' {}개 컬렉션 -> {}개 결과",
+                            clip(query), len(collection_names), len(merged[:limit]))
+            return merged[:limit]
+            
+        except Exception as e:
+            logger.error(f"다중 컬렉션 검색 중 오류 발생: {e}")
+            return []
+    
+    def _search_mmr(self, query: str, limit: int, score_threshold: float,
+                    filter_condition, mmr_lambda: float = None, hnsw_ef: int = None) -> List[Dict[str, Any]]:
+        """
+        후보를 넉넉히 가져온 뒤 MMR로 다양한 상위 limit개를 선택합니다.
+        
+        Args:
+            query: 검색 쿼리
+            limit: 반환할 결과 수
+            score_threshold: 점수 임계값
+            filter_condition: 필터 조건
+            mmr_lambda: MMR 관련성 가중치 (None이면 설정값 사용)
+            hnsw_ef: HNSW 탐색 후보 수 (None이면 설정값)
+            
+        Returns:
+            Qdrant 검색 결과 리스트 (MMR 선택 순서)
+        """
+        query_vector = self.embedding_service.embed_text(query)
+        if query_vector.size == 0:
+            logger.error("쿼리 텍스트 임베딩 실패")
+            return []
+        
+        candidates = self.qdrant_manager.search_vectors(
+            query_vector=query_vector,
+            limit=limit * max(config.MMR_FETCH_MULTIPLIER, 1),
+            score_threshold=score_threshold,
+            filter_condition=filter_condition,
+            with_vectors=True,
+            hnsw_ef=hnsw_ef
+        )
+        candidates = [c for c in candidates if c.get('vector')]
+        if len(candidates) <= limit:
+            return candidates
+        
+        # 저장 벡터와 같은 공간에서 비교하도록 컬렉션의 차원 축소를 쿼리에도 적용
+        query_vector = self.qdrant_manager.prepare_query_vector(query_vector)
+        
+        lambda_mult = config.MMR_LAMBDA if mmr_lambda is None else mmr_lambda
+        selected = maximal_marginal_relevance(
+            query_vector, [c['vector'] for c in candidates], limit, lambda_mult
+        )
+        search_log.info("MMR 선택: 후보 {}개 -> {}개", len(candidates), len(selected))
+        return [candidates[i] for i in selected]
+    
     def search_similar(self, text: str, limit: int = 10, score_threshold: float = 0.0) -> List[Dict[str, Any]]:
         """
         유사한 텍스트를 검색합니다.
@@ -197,7 +439,7 @@ class SearchService:
                 if match:
                     filtered_results.append(result)
             
-            logger.info(f"메타데이터 필터링: {len(results)} -> {len(filtered_results)}")
+            search_log.info("메타데이터 필터링: {} -> {}", len(results), len(filtered_results))
             return filtered_results
             
         except Exception as e:
@@ -0,0 +1,66 @@
+"""
+공유 서비스 인스턴스 - API 라우트가 함께 쓰는 임베딩/Qdrant/검색 서비스를 처음 사용할 때 생성
+모듈 import 시점에는 서비스 객체(임베딩 백엔드, Qdrant 클라이언트)를 만들지 않으므로 프로세스 시작이 빠릅니다.
+"""
+
+import threading
+from typing import Any, Callable, Dict
+
+_instances: Dict[str, Any] = {}
+# 팩토리가 다른 getter를 호출하므로(검색 서비스 → Qdrant/임베딩 서비스) 재진입 가능한 락 사용
+_instances_lock = threading.RLock()
+
+
+def _get_or_create(name: str, factory: Callable[[], Any]) -> Any:
+    instance = _instances.get(name)
+    if instance is None:
+        with _instances_lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = factory()
+                _instances[name] = instance
+    return instance
+
+
+def get_embedding_service():
+    """
+    기본 설정의 EmbeddingService를 반환합니다. (처음 호출 시 생성)
+
+    Returns:
+        EmbeddingService 인스턴스
+    """
+    from src.embedding_service import EmbeddingService
+    return _get_or_create("embedding_service", EmbeddingService)
+
+
+def get_qdrant_manager():
+    """
+    기본 컬렉션의 QdrantManager를 반환합니다. (처음 호출 시 생성, 연결은 첫 요청 시)
+
+    Returns:
+        QdrantManager 인스턴스
+    """
+    from src.qdrant_manager import QdrantManager
+    return _get_or_create("qdrant_manager", QdrantManager)
+
+
+def get_search_service():
+    """
+    기본 컬렉션의 SearchService를 반환합니다. (get_qdrant_manager, get_embedding_service 공유)
+
+    Returns:
+        SearchService 인스턴스
+    """
+    from src.search_service import SearchService
+    return _get_or_create("search_service", lambda: SearchService(get_qdrant_manager(), get_embedding_service()))
+
+
+def create_qa_service():
+    """
+    새 QAService를 만듭니다. (요청마다 생성, 검색/임베딩 서비스는 공유 인스턴스 사용)
+
+    Returns:
+        QAService 인스턴스
+    """
+    from src.qa_service import QAService
+    return QAService(search_service=get_search_service(), embedding_service=get_embedding_service())
@@ -0,0 +1,70 @@
+"""
+벡터 유사도 계산 - float32 행렬 연산으로 한 번에 계산 (쿼리 1개 대 N개, N개 대 M개)
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+VectorLike = Union[np.ndarray, Sequence[float]]
+MatrixLike = Union[np.ndarray, Sequence[Sequence[float]]]
+
+
+def as_matrix(vectors: MatrixLike) -> np.ndarray:
+    """
+    벡터 묶음을 (N, 차원) float32 배열로 변환합니다. (이미 float32 배열이면 복사하지 않음)
+
+    Args:
+        vectors: 벡터 리스트, 2차원 배열 또는 1차원 벡터 하나
+
+    Returns:
+        (N, 차원) float32 배열
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    return matrix.reshape(1, -1) if matrix.ndim == 1 else matrix
+
+
+def l2_normalize(vectors: MatrixLike) -> np.ndarray:
+    """
+    각 행을 길이 1로 정규화한 새 배열을 반환합니다. (0 벡터는 0 벡터로 유지)
+
+    Args:
+        vectors: (N, 차원) 벡터 묶음
+
+    Returns:
+        정규화된 (N, 차원) float32 배열
+    """
+    matrix = as_matrix(vectors)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def cosine_similarity(query: VectorLike, candidates: MatrixLike) -> np.ndarray:
+    """
+    쿼리 벡터 하나와 후보 N개의 코사인 유사도를 계산합니다.
+
+    Args:
+        query: 쿼리 벡터
+        candidates: (N, 차원) 후보 벡터 묶음
+
+    Returns:
+        (N,) 유사도 배열 (0 벡터와의 유사도는 0)
+    """
+    return l2_normalize(candidates) @ l2_normalize(query)[0]
+
+
+def pairwise_cosine_similarity(a: MatrixLike, b: Optional[MatrixLike] = None) -> np.ndarray:
+    """
+    두 벡터 묶음의 모든 쌍에 대한 코사인 유사도 행렬을 계산합니다.
+
+    Args:
+        a: (N, 차원) 벡터 묶음
+        b: (M, 차원) 벡터 묶음 (None이면 a 자신과 비교)
+
+    Returns:
+        (N, M) 유사도 행렬
+    """
+    left = l2_normalize(a)
+    right = left if b is None else l2_normalize(b)
+    return left @ right.T
@@ -1,7 +1,7 @@
 from typing import List, Dict, Any
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from loguru import logger
 from .config import config
+from .context_packer import estimate_tokens
 
 class TextChunker:
     """텍스트 청킹 클래스"""
@@ -16,14 +16,20 @@ class TextChunker:
         """
         self.chunk_size = chunk_size or config.CHUNK_SIZE
         self.chunk_overlap = chunk_overlap or config.CHUNK_OVERLAP
-        
-        # RecursiveCharacterTextSplitter 초기화
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", "! ", "? ", " ", ""]
-        )
+        self._text_splitter = None
+    
+    @property
+    def text_splitter(self):
+        """RecursiveCharacterTextSplitter (langchain import 비용이 커서 처음 사용할 때 생성)"""
+        if self._text_splitter is None:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+            self._text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                length_function=len,
+                separators=["\n\n", "\n", ". ", "! ", "? ", " ", ""]
+            )
+        return self._text_splitter
     
     def chunk_text(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -79,7 +85,8 @@ class TextChunker:
                 if chunk.strip():
                     chunks.append({
                         'text': chunk,
-                        'chunk_size': len(chunk)
+                        'chunk_size': len(chunk),
+                        'token_count': estimate_tokens(chunk)
                     })
         return chunks
     
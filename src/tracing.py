@@ -0,0 +1,254 @@
+"""
+요청 단위 경량 트레이싱 - 단계별 구간(span) 시간 측정
+요청마다 트레이스를 하나 만들고, 코드 곳곳의 span()이 현재 트레이스에 구간을 기록합니다.
+결과는 Server-Timing 헤더, 응답의 timings 필드, OTLP/JSON 파일(OpenTelemetry Collector
+otlpjsonfile 수신기 형식)로 내보낼 수 있습니다. 활성 트레이스가 없으면 span()은 아무 일도 하지 않습니다.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+from loguru import logger
+from src.config import config
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """측정 구간 하나"""
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any] = None):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self._start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def end(self) -> None:
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter() - self._start) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def elapsed_ms(self) -> float:
+        return self.duration_ms if self.duration_ms is not None else (time.perf_counter() - self._start) * 1000
+
+
+class Trace:
+    """요청 하나의 구간 모음"""
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self.root = self.add_span(name, None)
+
+    def add_span(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any] = None) -> Span:
+        span = Span(name, parent_id, attributes)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def timings(self) -> List[Dict[str, Any]]:
+        """
+        구간별 시간 정보를 반환합니다. (응답 timings 필드용)
+
+        Returns:
+            name, parent, offset_ms(요청 시작 기준), duration_ms, attributes를 담은 리스트
+        """
+        with self._lock:
+            spans = list(self.spans)
+        names = {s.span_id: s.name for s in spans}
+        return [
+            {
+                "name": s.name,
+                "parent": names.get(s.parent_id),
+                "offset_ms": round((s.start_ns - self.root.start_ns) / 1e6, 3),
+                "duration_ms": round(s.elapsed_ms(), 3),
+                **({"attributes": s.attributes} if s.attributes else {}),
+                **({"error": s.error} if s.error else {})
+            }
+            for s in spans
+        ]
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing 헤더 값을 만듭니다. 같은 이름의 구간은 합산합니다.
+
+        Returns:
+            예: 'total;dur=812.4, embedding;dur=35.2, qdrant_search;dur=6.1, llm_generate;dur=760.3'
+        """
+        totals: Dict[str, float] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            name = "total" if span is self.root else re.sub(r"[^\w\-.]", "_", span.name)
+            totals[name] = totals.get(name, 0.0) + span.elapsed_ms()
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in totals.items())
+
+    def to_otlp(self, service_name: str = "document-rag-api") -> Dict[str, Any]:
+        """OTLP/JSON(ExportTraceServiceRequest) 형식으로 변환합니다."""
+        def attr(key, value):
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [attr("service.name", service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "src.tracing"},
+                    "spans": [
+                        {
+                            "traceId": self.trace_id,
+                            "spanId": s.span_id,
+                            **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                            "name": s.name,
+                            "kind": 2 if s is self.root else 1,  # SERVER / INTERNAL
+                            "startTimeUnixNano": str(s.start_ns),
+                            "endTimeUnixNano": str(s.start_ns + int(s.elapsed_ms() * 1e6)),
+                            "attributes": [attr(k, v) for k, v in s.attributes.items()],
+                            "status": {"code": 2, "message": s.error} if s.error else {"code": 1}
+                        }
+                        for s in spans
+                    ]
+                }]
+            }]
+        }
+
+
+class FileSpanExporter:
+    """트레이스를 OTLP/JSON 한 줄씩 파일에 기록하는 백그라운드 내보내기"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=10000)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            # 내보내기가 밀리면 요청 처리를 막지 않고 버림
+            pass
+
+    def _run(self) -> None:
+        while True:
+            trace = self._queue.get()
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(trace.to_otlp(), ensure_ascii=False) + "\n")
+            except Exception as e:
+                logger.warning(f"트레이스 내보내기 실패: {e}")
+
+
+_exporter: Optional[FileSpanExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def _get_exporter() -> Optional[FileSpanExporter]:
+    global _exporter
+    if not config.TRACE_EXPORT_PATH:
+        return None
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = FileSpanExporter(config.TRACE_EXPORT_PATH)
+    return _exporter
+
+
+def current_trace() -> Optional[Trace]:
+    """현재 요청의 트레이스 (없으면 None)"""
+    return _current_trace.get()
+
+
+@contextmanager
+def start_trace(name: str, **attributes):
+    """
+    새 트레이스를 시작합니다. 블록이 끝나면 루트 구간을 닫고 설정된 경우 파일로 내보냅니다.
+
+    Args:
+        name: 루트 구간 이름 (예: 'POST /api/v1/qa')
+        **attributes: 루트 구간 속성
+    """
+    trace = Trace(name)
+    trace.root.attributes.update(attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(trace.root)
+    try:
+        yield trace
+    finally:
+        trace.root.end()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        exporter = _get_exporter()
+        if exporter:
+            exporter.export(trace)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    현재 트레이스에 구간을 기록합니다. 활성 트레이스가 없으면 아무 일도 하지 않습니다.
+
+    Args:
+        name: 구간 이름 (예: 'embedding', 'qdrant_search', 'llm_generate')
+        **attributes: 구간 속성
+
+    Yields:
+        Span (트레이스가 없으면 None)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get()
+    current = trace.add_span(name, parent.span_id if parent else None, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.error = str(e)
+        raise
+    finally:
+        current.end()
+        _current_span.reset(token)
+
+
+def traced(name: str):
+    """
+    함수 전체를 하나의 구간으로 기록하는 데코레이터
+
+    Args:
+        name: 구간 이름 (예: 'qa.ask_question')
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
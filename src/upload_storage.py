@@ -0,0 +1,169 @@
+"""
+업로드 저장 - 업로드 파일을 고정 크기 청크 단위로 디스크에 복사
+전체 내용을 메모리에 올리지 않고, 복사하면서 SHA-256 해시 계산과 최대 크기 검사를 함께 수행합니다.
+최대 크기는 UploadSizeLimitMiddleware가 본문을 받는 중에 먼저 검사합니다. (Content-Length가 없는 청크 전송 포함)
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+from typing import Dict, Any
+from loguru import logger
+from starlette.responses import JSONResponse
+
+# 한 번에 읽고 쓰는 크기 (1MB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2,
+               "G": 1024 ** 3, "GB": 1024 ** 3}
+
+
+def make_document_id(collection_name: str, filename: str) -> str:
+    """
+    업로드 파일의 document_id를 만듭니다. (적재 시각_컬렉션_파일명)
+    작업 큐에 등록할 때 정해 두면 재시도/재리스 때도 같은 ID로 이전 시도의 포인트를 찾을 수 있습니다.
+
+    Args:
+        collection_name: 적재할 컬렉션 이름 (없으면 'unknown')
+        filename: 원본 파일명
+
+    Returns:
+        document_id (예: 250817173232_인사팀_규정.pdf)
+    """
+    # 년월일시분초(예: 250817173232) 포맷으로 today 생성
+    today = time.strftime('%y%m%d%H%M%S')
+    dept = collection_name if collection_name else 'unknown'
+    base_filename = os.path.basename(filename)
+    return f"{today}_{dept}_{base_filename}"
+
+
+class UploadTooLarge(Exception):
+    """업로드 파일이 최대 크기를 넘음"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"파일 크기가 최대 허용 크기({max_bytes / (1024 * 1024):g}MB)를 초과했습니다.")
+        self.max_bytes = max_bytes
+
+
+def parse_size(value: str) -> int:
+    """
+    '100MB', '100M', '512KB', '1048576' 형식의 크기 문자열을 바이트 수로 변환합니다.
+
+    Args:
+        value: 크기 문자열
+
+    Returns:
+        바이트 수
+
+    Raises:
+        ValueError: 숫자나 단위(B, K/KB, M/MB, G/GB)가 잘못된 경우
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([A-Z]*)\s*", str(value).upper())
+    if not match or match.group(2) not in _SIZE_UNITS:
+        raise ValueError(f"잘못된 크기 형식입니다: {value}")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit])
+
+
+async def save_upload(upload, dest_path: str, max_bytes: int = None,
+                      chunk_size: int = UPLOAD_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    업로드 파일을 청크 단위로 디스크에 복사합니다. 파일 쓰기는 스레드에서 수행하여 이벤트 루프를 막지 않습니다.
+    UploadFile은 Starlette가 멀티파트 본문을 모두 받아 임시 파일로 스풀한 뒤이므로, 수신 중 차단은
+    UploadSizeLimitMiddleware가 담당하고 여기서는 파일 부분의 크기를 다시 확인합니다.
+
+    Args:
+        upload: FastAPI UploadFile
+        dest_path: 저장할 경로
+        max_bytes: 최대 허용 크기 (바이트), 넘으면 복사를 중단하고 부분 파일을 삭제
+        chunk_size: 한 번에 읽고 쓸 크기 (바이트)
+
+    Returns:
+        size(바이트 수)와 sha256(16진수 해시)을 담은 딕셔너리
+
+    Raises:
+        UploadTooLarge: 최대 크기 초과
+    """
+    digest = hashlib.sha256()
+    size = 0
+    out = await asyncio.to_thread(open, dest_path, "wb")
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            digest.update(chunk)
+            await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(out.close)
+        try:
+            os.remove(dest_path)
+        except OSError as e:
+            logger.warning(f"부분 업로드 파일 삭제 실패: {dest_path} - {e}")
+        raise
+    await asyncio.to_thread(out.close)
+    return {"size": size, "sha256": digest.hexdigest()}
+
+
+class UploadSizeLimitMiddleware:
+    """
+    최대 업로드 크기를 넘는 요청 본문을 413으로 거절하는 ASGI 미들웨어
+    - Content-Length가 크면 본문을 받기 전에 거절
+    - Content-Length가 없거나 실제 본문이 더 크면(청크 전송) 받은 바이트를 세다가 한도를 넘는 즉시 거절하고,
+      앱에는 연결 종료(http.disconnect)를 전달해 멀티파트 파싱/스풀을 중단
+    """
+
+    # 멀티파트 경계/헤더 등 파일 외 본문 여유분
+    FORM_OVERHEAD = 64 * 1024
+
+    def __init__(self, app, max_bytes: int, path_prefixes=("/api/v1/upload-file",)):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes = tuple(path_prefixes)
+
+    def _too_large_response(self) -> JSONResponse:
+        return JSONResponse(status_code=413, content={"detail": str(UploadTooLarge(self.max_bytes))})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_bytes + self.FORM_OVERHEAD
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            await self._too_large_response()(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    rejected = True
+                    await self._too_large_response()(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            # 413을 보낸 뒤에는 앱의 응답(연결 종료 처리 등)을 버림
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
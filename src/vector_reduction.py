@@ -0,0 +1,236 @@
+"""
+벡터 차원 축소 - 저장/검색 벡터를 앞쪽 차원만 남기거나(Matryoshka 절단) PCA로 투영하여 메모리와 검색 비용을 줄임
+축소 방식은 태그로 구분하고 컬렉션 포인트 페이로드(vector_reduction)에 기록하므로,
+설정을 바꿔도 기존 컬렉션은 만들 때의 축소 방식으로 계속 검색됩니다.
+
+- ''            : 축소 없음
+- 'mrl256'      : 앞쪽 256차원만 사용 후 재정규화 (Matryoshka 학습 모델용)
+- 'pca256-<해시>': 오프라인으로 학습한 PCA 투영 (VECTOR_REDUCTION_DIR/<태그>.npz)
+
+    python -m src.vector_reduction fit --collection 인사팀 --dimension 256
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+from loguru import logger
+
+from src.config import config
+from src.similarity import as_matrix, l2_normalize, MatrixLike
+
+_TRUNCATION_TAG = re.compile(r"^mrl(\d+)$")
+_PCA_TAG = re.compile(r"^pca(\d+)-([0-9a-f]+)$")
+
+
+class BaseVectorReducer:
+    """벡터 차원 축소 인터페이스"""
+
+    tag: str = ""
+    output_dim: int = 0
+
+    def transform(self, vectors: MatrixLike) -> np.ndarray:
+        """(N, 원본 차원) 벡터를 (N, output_dim) 정규화된 float32 배열로 변환합니다."""
+        raise NotImplementedError
+
+
+class TruncationReducer(BaseVectorReducer):
+    """앞쪽 차원만 남기고 재정규화 (Matryoshka Representation Learning 방식으로 학습된 모델에서 유효)"""
+
+    def __init__(self, dimension: int):
+        """
+        TruncationReducer 초기화
+
+        Args:
+            dimension: 남길 차원 수
+        """
+        if dimension <= 0:
+            raise ValueError(f"잘못된 축소 차원입니다: {dimension}")
+        self.output_dim = dimension
+        self.tag = f"mrl{dimension}"
+
+    def transform(self, vectors: MatrixLike) -> np.ndarray:
+        matrix = as_matrix(vectors)
+        if matrix.shape[1] < self.output_dim:
+            raise ValueError(f"벡터 차원({matrix.shape[1]})이 축소 차원({self.output_dim})보다 작습니다")
+        return l2_normalize(matrix[:, :self.output_dim])
+
+
+class PCAReducer(BaseVectorReducer):
+    """정규화된 벡터를 중심화한 뒤 주성분으로 투영하고 재정규화"""
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, source_model: str = "",
+                 explained_variance: float = None):
+        """
+        PCAReducer 초기화
+
+        Args:
+            mean: (원본 차원,) 학습 벡터 평균
+            components: (축소 차원, 원본 차원) 주성분
+            source_model: 학습에 사용한 벡터의 임베딩 모델명
+            explained_variance: 남긴 주성분의 분산 설명 비율
+        """
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+        self.source_model = source_model
+        self.explained_variance = explained_variance
+        self.output_dim = self.components.shape[0]
+        digest = hashlib.sha1(self.mean.tobytes() + self.components.tobytes()).hexdigest()[:8]
+        self.tag = f"pca{self.output_dim}-{digest}"
+
+    @classmethod
+    def fit(cls, vectors: MatrixLike, dimension: int, source_model: str = "") -> "PCAReducer":
+        """
+        벡터 표본으로 PCA 투영을 학습합니다.
+
+        Args:
+            vectors: (N, 원본 차원) 학습 벡터 (축소하지 않은 원본)
+            dimension: 축소 차원
+            source_model: 임베딩 모델명 (기록용)
+
+        Returns:
+            PCAReducer 인스턴스
+        """
+        matrix = l2_normalize(vectors)
+        if dimension > min(matrix.shape):
+            raise ValueError(f"축소 차원({dimension})은 표본 수와 원본 차원({matrix.shape})보다 클 수 없습니다")
+        mean = matrix.mean(axis=0)
+        _, singular_values, vt = np.linalg.svd(matrix - mean, full_matrices=False)
+        variance = singular_values ** 2
+        explained = float(variance[:dimension].sum() / variance.sum()) if variance.sum() > 0 else 0.0
+        return cls(mean, vt[:dimension], source_model=source_model, explained_variance=round(explained, 4))
+
+    def transform(self, vectors: MatrixLike) -> np.ndarray:
+        return l2_normalize((l2_normalize(vectors) - self.mean) @ self.components.T)
+
+    def save(self, directory: str = None) -> str:
+        """
+        VECTOR_REDUCTION_DIR/<태그>.npz로 저장합니다.
+
+        Returns:
+            저장 경로
+        """
+        directory = directory or config.VECTOR_REDUCTION_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.tag}.npz")
+        np.savez(path, mean=self.mean, components=self.components, source_model=self.source_model,
+                 explained_variance=np.float32(self.explained_variance or 0.0))
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "PCAReducer":
+        """저장된 PCA 투영을 읽습니다."""
+        with np.load(path) as data:
+            return cls(data["mean"], data["components"], source_model=str(data["source_model"]),
+                       explained_variance=float(data["explained_variance"]))
+
+
+_reducers: Dict[str, BaseVectorReducer] = {}
+_reducers_lock = threading.Lock()
+
+
+def get_reducer(tag: str) -> Optional[BaseVectorReducer]:
+    """
+    태그에 해당하는 차원 축소기를 반환합니다. (프로세스 단위로 캐시)
+
+    Args:
+        tag: 축소 태그 ('', 'mrl256', 'pca256-<해시>')
+
+    Returns:
+        축소기, 축소가 없으면 None
+
+    Raises:
+        ValueError: 알 수 없는 태그이거나 PCA 파일 내용이 태그와 다를 때
+        FileNotFoundError: PCA 파일이 없을 때
+    """
+    if not tag:
+        return None
+    reducer = _reducers.get(tag)
+    if reducer is not None:
+        return reducer
+    with _reducers_lock:
+        reducer = _reducers.get(tag)
+        if reducer is None:
+            match = _TRUNCATION_TAG.match(tag)
+            if match:
+                reducer = TruncationReducer(int(match.group(1)))
+            elif _PCA_TAG.match(tag):
+                reducer = PCAReducer.load(os.path.join(config.VECTOR_REDUCTION_DIR, f"{tag}.npz"))
+                if reducer.tag != tag:
+                    raise ValueError(f"PCA 파일 내용이 태그와 다릅니다: {tag} != {reducer.tag}")
+            else:
+                raise ValueError(f"알 수 없는 벡터 축소 태그입니다: {tag}")
+            _reducers[tag] = reducer
+    return reducer
+
+
+def fit_collection(qdrant_manager, dimension: int, sample: int = 20000, seed: int = 0) -> PCAReducer:
+    """
+    컬렉션에 저장된 원본 벡터 표본으로 PCA 투영을 학습하고 저장합니다.
+
+    Args:
+        qdrant_manager: 축소하지 않은 벡터가 저장된 컬렉션의 QdrantManager
+        dimension: 축소 차원
+        sample: 최대 표본 수
+        seed: 표본 추출 seed
+
+    Returns:
+        학습된 PCAReducer (VECTOR_REDUCTION_DIR에 저장됨)
+    """
+    if qdrant_manager.get_vector_reduction():
+        raise ValueError(f"이미 축소된 컬렉션입니다: {qdrant_manager.collection_name}")
+    vectors = []
+    offset = None
+    while len(vectors) < sample * 2:
+        batch, offset = qdrant_manager.client.scroll(
+            collection_name=qdrant_manager.collection_name,
+            limit=1000,
+            offset=offset,
+            with_payload=False,
+            with_vectors=True
+        )
+        for point in batch:
+            # 이름 있는 벡터(body/title)는 같은 임베딩 공간이므로 모두 표본으로 사용
+            vectors.extend(point.vector.values() if isinstance(point.vector, dict) else [point.vector])
+        if offset is None:
+            break
+    if not vectors:
+        raise ValueError(f"학습할 벡터가 없습니다: {qdrant_manager.collection_name}")
+    matrix = as_matrix(vectors)
+    if len(matrix) > sample:
+        matrix = matrix[np.random.default_rng(seed).choice(len(matrix), sample, replace=False)]
+    schema = qdrant_manager.get_collection_schema() or {}
+    reducer = PCAReducer.fit(matrix, dimension, source_model=schema.get("embedding_model") or "")
+    path = reducer.save()
+    logger.info(f"PCA 축소 학습 완료: {reducer.tag} (표본 {len(matrix)}개, 분산 설명 {reducer.explained_variance}) -> {path}")
+    return reducer
+
+
+def main():
+    """차원 축소 관리 명령"""
+    parser = argparse.ArgumentParser(description="벡터 차원 축소(PCA) 학습")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fit = sub.add_parser("fit", help="컬렉션 벡터로 PCA 투영 학습")
+    fit.add_argument("--collection", default=None, help=f"학습할 컬렉션 (기본: {config.QDRANT_COLLECTION_NAME})")
+    fit.add_argument("--dimension", type=int, required=True, help="축소 차원")
+    fit.add_argument("--sample", type=int, default=20000, help="최대 표본 수")
+    args = parser.parse_args()
+
+    from src.qdrant_manager import QdrantManager
+    reducer = fit_collection(QdrantManager(collection_name=args.collection), args.dimension, args.sample)
+    print(json.dumps({
+        "tag": reducer.tag,
+        "dimension": reducer.output_dim,
+        "explained_variance": reducer.explained_variance,
+        "source_model": reducer.source_model,
+        "usage": f"VECTOR_REDUCTION={reducer.tag}"
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
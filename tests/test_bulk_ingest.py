@@ -0,0 +1,97 @@
+import json
+import uuid
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+from src import bulk_ingest
+from src.bulk_ingest import BulkIngestor
+from src.qdrant_manager import QdrantManager
+
+
+def _chunks(count):
+    rng = np.random.default_rng(0)
+    return [{"text": f"청크 {i}", "chunk_index": i, "page_number": 1,
+             "embedding": rng.normal(size=8).astype(np.float32), "embedding_model": "test"} for i in range(count)]
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr("src.qdrant_manager.config.NAMED_VECTORS_ENABLED", False)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_REDUCTION", "")
+    # 스키마 캐시는 프로세스 전역이므로 테스트마다 새 컬렉션 이름 사용
+    return QdrantManager(collection_name=f"test_{uuid.uuid4().hex}", client=QdrantClient(location=":memory:"))
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    root = tmp_path / "docs"
+    root.mkdir()
+    (root / "규정.pdf").write_bytes(b"%PDF-1.4")
+    return root
+
+
+def _write_manifest(root, entry):
+    with open(root / ".ingest_manifest.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"path": "규정.pdf", "size": 8, "mtime": 0, **entry}, ensure_ascii=False) + "\n")
+
+
+def _fake_ingest(calls, result=None):
+    def ingest_file(path, filename, collection_name=None, document_id=None, qdrant_manager=None, **kwargs):
+        calls.append(document_id)
+        qdrant_manager.store_vectors(_chunks(3), document_id)
+        return result or {"document_id": document_id, "chunks_count": 3}
+    return ingest_file
+
+
+def test_resume_deletes_points_from_interrupted_attempt(manager, source_dir, monkeypatch):
+    # 이전 실행이 일부 포인트를 저장한 뒤 중단됨
+    assert manager.store_vectors(_chunks(2), "old")
+    _write_manifest(source_dir, {"document_id": "old", "status": "started"})
+    calls = []
+    monkeypatch.setattr(bulk_ingest, "ingest_file", _fake_ingest(calls))
+
+    stats = BulkIngestor(str(source_dir), qdrant_manager=manager).run()
+
+    assert stats["files_done"] == 1
+    assert manager.count_document_points("old") == 0
+    assert manager.count_document_points(calls[0]) == 3
+    entries = [json.loads(line) for line in open(source_dir / ".ingest_manifest.jsonl", encoding="utf-8")]
+    assert [e["status"] for e in entries[1:]] == ["started", "done"]
+    assert entries[1]["document_id"] == calls[0]
+
+
+def test_resume_keeps_document_reused_by_deduplication(manager, source_dir, monkeypatch):
+    assert manager.store_vectors(_chunks(2), "shared")
+    _write_manifest(source_dir, {"document_id": "shared", "status": "done", "size": -1, "deduplicated": "existing"})
+    monkeypatch.setattr(bulk_ingest, "ingest_file", _fake_ingest([]))
+
+    BulkIngestor(str(source_dir), qdrant_manager=manager).run()
+
+    assert manager.count_document_points("shared") == 2
+
+
+def test_resume_without_collection_ingests(manager, source_dir, monkeypatch):
+    _write_manifest(source_dir, {"document_id": "old", "status": "started"})
+    calls = []
+    monkeypatch.setattr(bulk_ingest, "ingest_file", _fake_ingest(calls))
+
+    stats = BulkIngestor(str(source_dir), qdrant_manager=manager).run()
+
+    assert stats["files_done"] == 1
+    assert len(calls) == 1
+
+
+def test_failed_delete_keeps_previous_document_id(manager, source_dir, monkeypatch):
+    assert manager.store_vectors(_chunks(2), "old")
+    _write_manifest(source_dir, {"document_id": "old", "status": "started"})
+    calls = []
+    monkeypatch.setattr(bulk_ingest, "ingest_file", _fake_ingest(calls))
+    monkeypatch.setattr(QdrantManager, "delete_document", lambda self, document_id: False)
+
+    stats = BulkIngestor(str(source_dir), qdrant_manager=manager).run()
+
+    assert stats["files_failed"] == 1
+    assert calls == []
+    assert bulk_ingest.IngestManifest(str(source_dir / ".ingest_manifest.jsonl")).previous_document_id("규정.pdf") == "old"
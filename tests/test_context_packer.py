@@ -0,0 +1,68 @@
+from src.context_packer import ContextPacker, estimate_tokens
+
+
+def _result(text, document_id="doc", chunk_index=0, score=1.0):
+    return {"text": text, "document_id": document_id, "chunk_index": chunk_index, "score": score}
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("연차 휴가") == 4
+    assert estimate_tokens("a, b") == 3
+
+
+def test_merges_adjacent_chunks_without_repeating_overlap():
+    packer = ContextPacker(token_budget=1000, max_overlap=20)
+    packed = packer.pack([
+        _result("첫 번째 문단입니다. 겹치는 문장", chunk_index=1, score=0.9),
+        _result("겹치는 문장 다음 내용입니다.", chunk_index=2, score=0.8),
+    ])
+
+    assert packed["texts"] == ["첫 번째 문단입니다.\n겹치는 문장 다음 내용입니다."]
+    assert packed["stats"]["chunks_in"] == 2
+    assert packed["stats"]["blocks_out"] == 1
+
+
+def test_drops_sentences_already_in_more_relevant_block():
+    packer = ContextPacker(token_budget=1000)
+    shared = "연차 휴가는 입사 1년 후 15일이 부여됩니다."
+    packed = packer.pack([
+        _result(f"{shared} 미사용 연차는 수당으로 지급합니다.", document_id="a", score=0.9),
+        _result(f"{shared} 병가는 별도 규정을 따릅니다.", document_id="b", score=0.5),
+    ])
+
+    assert packed["texts"][0].count(shared) == 1
+    assert shared not in packed["texts"][1]
+    assert "병가는 별도 규정을 따릅니다." in packed["texts"][1]
+
+
+def test_fills_budget_in_relevance_order():
+    texts = [f"{i}" + "가" * 39 for i in range(5)]
+    blocks = [_result(text, document_id=f"d{i}", score=1.0 - i * 0.1) for i, text in enumerate(texts)]
+    packer = ContextPacker(token_budget=100)
+
+    packed = packer.pack(list(reversed(blocks)))
+
+    assert packed["texts"] == texts[:2]
+    assert packed["stats"]["tokens_after"] == 80
+    assert packed["stats"]["blocks_dropped"] == 3
+
+
+def test_truncates_top_block_when_nothing_fits():
+    packer = ContextPacker(token_budget=10)
+    packed = packer.pack([_result("가나다라마\n바사아자차\n카타파하")])
+
+    assert packed["texts"] == ["가나다라마\n바사아자차"]
+    assert packed["stats"]["tokens_after"] == 10
+
+
+def test_reports_packed_source_results():
+    first = _result("첫 번째 문단입니다.", document_id="a", chunk_index=1, score=0.9)
+    second = _result("두 번째 문단입니다.", document_id="a", chunk_index=2, score=0.8)
+    dropped = _result("가" * 50, document_id="b", score=0.1)
+
+    packed = ContextPacker(token_budget=20).pack([first, second, dropped])
+
+    assert packed["results"] == [first, second]
@@ -0,0 +1,57 @@
+import uuid
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from qdrant_client import QdrantClient
+from starlette.testclient import TestClient
+
+from src import content_registry, services
+from src.api import routes
+from src.content_registry import ContentRegistry
+from src.qdrant_manager import QdrantManager
+
+
+def _chunks(count):
+    rng = np.random.default_rng(0)
+    return [{"text": f"청크 {i}", "chunk_index": i, "page_number": 1,
+             "embedding": rng.normal(size=8).astype(np.float32), "embedding_model": "test"} for i in range(count)]
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.qdrant_manager.config.NAMED_VECTORS_ENABLED", False)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_REDUCTION", "")
+    registry = ContentRegistry(str(tmp_path / "registry.db"))
+    monkeypatch.setattr(content_registry, "_instance", registry)
+    manager = QdrantManager(collection_name=f"test_{uuid.uuid4().hex}", client=QdrantClient(location=":memory:"))
+    monkeypatch.setattr(services, "_instances", {"qdrant_manager": manager})
+    # 스키마 캐시는 프로세스 전역이므로 테스트마다 새 컬렉션 이름 사용
+    suffix = uuid.uuid4().hex[:8]
+    app = FastAPI()
+    app.include_router(routes.router)
+    return TestClient(app), manager, registry, f"a_{suffix}", f"b_{suffix}"
+
+
+def test_delete_without_collection_forgets_only_deleted_collection(setup):
+    client, manager, registry, first, second = setup
+    # 같은 document_id가 첫 컬렉션에는 기록만 남고, 두 번째 컬렉션에 포인트가 있음
+    assert manager.for_collection(first).store_vectors(_chunks(1), "other")
+    assert manager.for_collection(second).store_vectors(_chunks(2), "doc")
+    registry.register("h1", "m", first, "doc", 1)
+    registry.register("h2", "m", second, "doc", 2)
+
+    response = client.delete("/documents/doc")
+
+    assert response.status_code == 200
+    assert manager.for_collection(second).count_document_points("doc") == 0
+    assert manager.for_collection(first).count_document_points("other") == 1
+    assert registry.find("h1", "m") == [{"collection_name": first, "document_id": "doc", "chunks_count": 1}]
+    assert registry.find("h2", "m") == []
+
+
+def test_delete_unknown_document_is_404(setup):
+    client, manager, _, first, _ = setup
+    assert manager.for_collection(first).store_vectors(_chunks(1), "other")
+
+    assert client.delete("/documents/missing").status_code == 404
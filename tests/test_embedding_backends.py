@@ -0,0 +1,135 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from src import embedding_backends
+from src.embedding_backends import OllamaEmbeddingBackend, OnnxEmbeddingBackend, get_embedding_backend
+from src.schema_registry import schema_registry
+
+WORDS = ["[PAD]", "[UNK]", "가", "나", "다", "라"]
+DIM = 4
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None):
+        self.status_code = status_code
+        self.body = body or {}
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """/api/embed가 없는 구버전 Ollama 흉내 (텍스트 길이로 벡터 생성)"""
+    calls = []
+
+    def post(url, json, timeout):
+        calls.append(url)
+        if url.endswith("/api/embed"):
+            return FakeResponse(404)
+        return FakeResponse(body={"embedding": [float(len(json["prompt"])), 1.0, 0.0]})
+
+    monkeypatch.setattr(embedding_backends.requests, "post", post)
+    # 차원 캐시는 (base_url, 모델) 키이므로 테스트마다 새 모델명 사용
+    return OllamaEmbeddingBackend(model_name=f"test-{uuid.uuid4().hex}", base_url="http://ollama"), calls
+
+
+def test_ollama_falls_back_to_single_requests(ollama):
+    backend, calls = ollama
+
+    vectors = backend.embed(["가", "가나다"])
+
+    assert vectors.dtype == np.float32
+    assert vectors[:, 0].tolist() == [1.0, 3.0]
+    assert calls == ["http://ollama/api/embed", "http://ollama/api/embeddings", "http://ollama/api/embeddings"]
+    # 배치 미지원을 확인한 뒤에는 /api/embed를 다시 호출하지 않음
+    backend.embed(["라"])
+    assert calls[-1] == "http://ollama/api/embeddings" and len(calls) == 4
+
+
+def test_ollama_empty_input_keeps_known_dimension(ollama):
+    backend, calls = ollama
+
+    assert backend.embed([]).shape == (0, 0)
+    assert backend._embed_each([]).shape == (0, 0)
+    schema_registry.set_dimension(backend.base_url, backend.model_name, 3)
+    assert backend.embed([]).shape == (0, 3)
+    assert backend._embed_each([]).shape == (0, 3)
+    assert calls == []
+
+
+def test_ollama_batch_count_mismatch_raises(monkeypatch):
+    monkeypatch.setattr(embedding_backends.requests, "post",
+                        lambda url, json, timeout: FakeResponse(body={"embeddings": [[1.0, 0.0]]}))
+    backend = OllamaEmbeddingBackend(model_name="m", base_url="http://ollama")
+
+    with pytest.raises(ValueError):
+        backend.embed(["가", "나"])
+
+
+def test_onnx_backend_rejects_base_url(monkeypatch):
+    monkeypatch.setattr(embedding_backends, "_instances", {})
+
+    with pytest.raises(ValueError):
+        get_embedding_backend("onnx", base_url="http://ollama")
+    assert embedding_backends._instances == {}
+
+
+@pytest.fixture
+def onnx_model(tmp_path):
+    """단어별 고정 벡터를 (배치, 토큰, 차원)으로 출력하는 작은 ONNX 모델과 토크나이저"""
+    onnx = pytest.importorskip("onnx")
+    tokenizers = pytest.importorskip("tokenizers")
+    from onnx import TensorProto, helper
+
+    table = np.zeros((len(WORDS), DIM), dtype=np.float32)
+    table[2:] = np.eye(DIM, dtype=np.float32)
+    table[0] = 100.0    # 패딩 토큰이 풀링에 섞이면 결과가 크게 달라짐
+    graph = helper.make_graph(
+        [helper.make_node("Gather", ["table", "input_ids"], ["last_hidden_state"])],
+        "embedding",
+        [helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "tokens"]),
+         helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "tokens"])],
+        [helper.make_tensor_value_info("last_hidden_state", TensorProto.FLOAT, ["batch", "tokens", DIM])],
+        [helper.make_tensor("table", TensorProto.FLOAT, table.shape, table.flatten())],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    model_path = tmp_path / "model.onnx"
+    onnx.save(model, str(model_path))
+
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.WordLevel(
+        {word: i for i, word in enumerate(WORDS)}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    tokenizer_path = tmp_path / "tokenizer.json"
+    tokenizer.save(str(tokenizer_path))
+    return str(model_path), str(tokenizer_path)
+
+
+def test_onnx_mean_pooling_ignores_padding_and_keeps_order(onnx_model):
+    model_path, tokenizer_path = onnx_model
+    backend = OnnxEmbeddingBackend(model_path=model_path, tokenizer_path=tokenizer_path,
+                                   model_name=f"onnx-{uuid.uuid4().hex}", threads=1, pooling="mean", batch_size=2)
+
+    vectors = backend.embed(["가 나 다", "라", "가 가"])
+
+    half, third = 1 / np.sqrt(2), 1 / np.sqrt(3)
+    assert vectors.shape == (3, DIM)
+    np.testing.assert_allclose(vectors, [[third, third, third, 0], [0, 0, 0, 1], [1, 0, 0, 0]], atol=1e-6)
+    np.testing.assert_allclose(backend.embed_one("가 나"), [half, half, 0, 0], atol=1e-6)
+    assert backend.embed([]).shape == (0, 0)
+    assert backend.base_url.startswith("onnx://")
+
+
+def test_onnx_cls_pooling_uses_first_token(onnx_model):
+    model_path, tokenizer_path = onnx_model
+    backend = OnnxEmbeddingBackend(model_path=model_path, tokenizer_path=tokenizer_path,
+                                   model_name="onnx-cls", threads=1, pooling="cls")
+
+    np.testing.assert_allclose(backend.embed(["나 가", "다"]), [[0, 1, 0, 0], [0, 0, 1, 0]], atol=1e-6)
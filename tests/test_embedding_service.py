@@ -0,0 +1,102 @@
+import uuid
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+from src.embedding_backends import BaseEmbeddingBackend
+from src.embedding_service import EmbeddingService
+from src.qdrant_manager import QdrantManager
+from src.similarity import as_matrix, cosine_similarity, l2_normalize, pairwise_cosine_similarity
+
+DIM = 8
+
+
+class FakeBackend(BaseEmbeddingBackend):
+    """텍스트별로 고정된 벡터를 돌려주고 호출된 배치를 기록하는 백엔드 ('오류'가 들어간 배치는 실패)"""
+
+    def __init__(self):
+        self.model_name = f"fake-{uuid.uuid4().hex}"
+        self.base_url = "fake://"
+        self.batches = []
+
+    def embed(self, texts):
+        self.batches.append(list(texts))
+        if len(texts) > 1 and any("오류" in text for text in texts):
+            raise RuntimeError("배치 실패")
+        if any(text == "오류" for text in texts):
+            raise RuntimeError("청크 실패")
+        seeds = [int.from_bytes(text.encode("utf-8")[:4].ljust(4, b"\0"), "big") for text in texts]
+        return np.stack([np.random.default_rng(seed).normal(size=DIM) for seed in seeds]).astype(np.float32)
+
+
+@pytest.fixture
+def service():
+    return EmbeddingService(backend=FakeBackend())
+
+
+def test_similarity_matches_reference():
+    rng = np.random.default_rng(0)
+    query, candidates = rng.normal(size=DIM), rng.normal(size=(5, DIM))
+    candidates[2] = 0
+
+    expected = [float(c @ query / (np.linalg.norm(c) * np.linalg.norm(query))) if c.any() else 0.0
+                for c in candidates]
+
+    np.testing.assert_allclose(cosine_similarity(query, candidates), expected, atol=1e-6)
+    np.testing.assert_allclose(pairwise_cosine_similarity(candidates)[0], cosine_similarity(candidates[0], candidates),
+                               atol=1e-6)
+    assert l2_normalize(candidates).dtype == np.float32
+    matrix = np.ones((3, DIM), dtype=np.float32)
+    assert as_matrix(matrix) is matrix
+    assert as_matrix([1.0, 2.0]).shape == (1, 2)
+
+
+def test_embed_texts_returns_float32_matrix_in_input_order(service):
+    vectors = service.embed_texts(["가", " ", "나"])
+
+    assert vectors.dtype == np.float32 and vectors.shape == (3, DIM)
+    assert not vectors[1].any()
+    np.testing.assert_array_equal(vectors[2], service.embed_text("나"))
+    assert service.backend.batches[0] == ["가", "나"]
+    assert service.embed_texts(["", " "]).shape == (2, 0)
+    assert service.calculate_similarity(vectors[0], vectors[0]) == pytest.approx(1.0, abs=1e-6)
+
+
+def test_embed_chunks_shares_one_batch_array(service, monkeypatch):
+    monkeypatch.setattr("src.embedding_service.config.EMBEDDING_BATCH_SIZE", 8)
+    monkeypatch.setattr("src.embedding_service.config.NAMED_VECTORS_ENABLED", True)
+    chunks = [{"text": f"본문 {i}", "section_title": "제목 A" if i < 2 else "제목 B"} for i in range(3)]
+
+    embedded = service.embed_chunks(chunks)
+
+    # 본문과 (중복 제거된) 제목을 한 번의 요청으로 임베딩
+    assert service.backend.batches == [["본문 0", "본문 1", "본문 2", "제목 A", "제목 B"]]
+    assert all(c["embedding"].dtype == np.float32 and c["embedding_dimension"] == DIM for c in embedded)
+    assert np.shares_memory(embedded[0]["embedding"], embedded[2]["embedding"].base)
+    np.testing.assert_array_equal(embedded[0]["title_embedding"], embedded[1]["title_embedding"])
+    assert embedded[0]["embedding_model"] == service.model_name
+
+
+def test_embed_chunks_retries_failed_batch_per_chunk(service, monkeypatch):
+    monkeypatch.setattr("src.embedding_service.config.NAMED_VECTORS_ENABLED", False)
+
+    embedded = service.embed_chunks([{"text": "가"}, {"text": "오류"}, {"text": "나"}])
+
+    assert [c["text"] for c in embedded] == ["가", "나"]
+    assert service.backend.batches[1:] == [["가"], ["오류"], ["나"]]
+
+
+def test_float32_embeddings_stored_without_loss(service, monkeypatch):
+    monkeypatch.setattr("src.qdrant_manager.config.NAMED_VECTORS_ENABLED", False)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_REDUCTION", "")
+    monkeypatch.setattr("src.embedding_service.config.NAMED_VECTORS_ENABLED", False)
+    manager = QdrantManager(collection_name=f"test_{uuid.uuid4().hex}", client=QdrantClient(location=":memory:"))
+    embedded = service.embed_chunks([{"text": "가", "chunk_index": 0}, {"text": "나", "chunk_index": 1}])
+
+    assert manager.store_vectors(embedded, "doc1")
+
+    points, _ = manager.client.scroll(manager.collection_name, with_vectors=True)
+    stored = {p.payload["chunk_index"]: np.asarray(p.vector, dtype=np.float32) for p in points}
+    for chunk in embedded:
+        np.testing.assert_allclose(stored[chunk["chunk_index"]], l2_normalize(chunk["embedding"])[0], atol=1e-6)
@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+import pytest
+import requests
+
+from benchmarks.api_load import run_load
+from benchmarks.fake_ollama import FakeOllamaServer, LatencyDistribution, hash_embedding
+from src.embedding_backends import OllamaEmbeddingBackend
+
+
+@pytest.fixture
+def server():
+    with FakeOllamaServer(dimension=16, tokens_per_sec=0, prompt_tokens_per_sec=0, answer_tokens=8) as server:
+        yield server
+
+
+def test_hash_embedding_is_deterministic_and_normalized():
+    first = np.array(hash_embedding("연차 휴가 규정", 32))
+
+    assert first.tolist() == hash_embedding("연차 휴가 규정", 32)
+    assert np.linalg.norm(first) == pytest.approx(1.0, abs=1e-5)
+    # 단어가 겹치는 텍스트가 더 유사
+    overlap = first @ np.array(hash_embedding("휴가 규정 안내", 32))
+    unrelated = first @ np.array(hash_embedding("출장비 정산", 32))
+    assert overlap > unrelated
+
+
+def test_latency_distribution_specs():
+    assert LatencyDistribution("fixed:20").sample() == 20
+    assert str(LatencyDistribution("15")) == "fixed:15"
+    uniform = [LatencyDistribution("uniform:5,10", seed=1).sample() for _ in range(20)]
+    assert all(5 <= value <= 10 for value in uniform)
+    # 같은 seed면 같은 지연 순서
+    a, b = LatencyDistribution("lognormal:20,0.5", seed=3), LatencyDistribution("lognormal:20,0.5", seed=3)
+    assert [a.sample() for _ in range(5)] == [b.sample() for _ in range(5)]
+    assert LatencyDistribution("normal:0,50", seed=0).sample() >= 0
+    with pytest.raises(ValueError):
+        LatencyDistribution("pareto:1")
+
+
+def test_embedding_endpoints_work_with_ollama_backend(server):
+    backend = OllamaEmbeddingBackend(model_name="embed-model", base_url=server.url)
+
+    batch = backend.embed(["연차 휴가", "출장비"])
+    single = backend.embed_one("연차 휴가")
+
+    assert batch.shape == (2, 16)
+    np.testing.assert_allclose(batch[0], single, atol=1e-6)
+    np.testing.assert_allclose(single, hash_embedding("연차 휴가", 16), atol=1e-6)
+    assert server.stats["items"] == 3
+    models = requests.get(f"{server.url}/api/ps", timeout=5).json()["models"]
+    assert [m["name"] for m in models] == ["embed-model"]
+
+
+def test_generate_returns_deterministic_answer_and_context(server):
+    body = {"model": "llm", "prompt": "휴가 규정 알려줘", "stream": False, "options": {"max_tokens": 4}}
+
+    first = requests.post(f"{server.url}/api/generate", json=body, timeout=5).json()
+    again = requests.post(f"{server.url}/api/generate", json=body, timeout=5).json()
+    follow = requests.post(f"{server.url}/api/generate",
+                           json={**body, "prompt": "더", "context": first["context"]}, timeout=5).json()
+    stream = requests.post(f"{server.url}/api/generate", json={**body, "stream": True}, timeout=5)
+
+    assert first["response"] == again["response"] and first["eval_count"] == 4
+    assert first["done"] and first["total_duration"] > 0
+    assert follow["context"][:4] == first["context"]
+    assert follow["prompt_eval_count"] == 1 + len(first["context"])
+    events = [json.loads(line) for line in stream.text.splitlines()]
+    assert [e["done"] for e in events] == [False] * 4 + [True]
+    assert "".join(e["response"] for e in events[:-1]).strip() == first["response"]
+
+
+def test_injected_failures_and_load_generator():
+    with FakeOllamaServer(dimension=8, error_rate=1.0) as server:
+        response = requests.post(f"{server.url}/api/embed", json={"input": ["a"]}, timeout=5)
+        assert response.status_code == 500
+        assert server.stats["errors_injected"] == 1
+
+    with FakeOllamaServer(dimension=8, latency="fixed:1") as server:
+        report = run_load(server.url, "/api/embed", [{"input": ["연차"]}, {"input": ["휴가", "규정"]}],
+                          concurrency=2, duration=0.3, timeout=5)
+
+    assert report["requests"] > 0 and report["errors"] == 0
+    assert report["status_codes"] == {"200": report["requests"]}
+    assert report["latency_ms"]["p50"] >= 1.0
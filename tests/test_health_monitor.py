@@ -0,0 +1,91 @@
+import pytest
+from fastapi import FastAPI
+from qdrant_client import QdrantClient
+from starlette.testclient import TestClient
+
+from src import health_monitor as health_module
+from src.api import routes
+from src.health_monitor import HealthMonitor
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """/api/tags 요청을 기록하고 설정된 모델 목록을 반환"""
+    state = {"calls": 0, "models": ["embed-model:latest"]}
+
+    def get(url, timeout):
+        state["calls"] += 1
+        return FakeResponse({"models": [{"name": name} for name in state["models"]]})
+
+    monkeypatch.setattr(health_module.requests, "get", get)
+    monkeypatch.setattr(health_module.config, "EMBEDDING_BACKEND", "ollama")
+    monkeypatch.setattr(health_module.config, "OLLAMA_EMBEDDING_MODEL", "embed-model")
+    return state
+
+
+@pytest.fixture
+def monitor(ollama, monkeypatch):
+    monitor = HealthMonitor(interval=60)
+    monitor.qdrant_manager.client = QdrantClient(location=":memory:")
+    monkeypatch.setattr(health_module, "_instance", monitor)
+    return monitor
+
+
+def test_check_now_caches_status_and_latency(monitor, ollama):
+    assert not monitor.is_ready() and monitor.last_checked() is None
+
+    monitor.check_now()
+    monitor.check_now()
+
+    snapshot = monitor.snapshot()
+    assert monitor.is_ready()
+    assert {name: dep["status"] for name, dep in snapshot.items()} == {"qdrant": "healthy", "ollama": "healthy"}
+    assert snapshot["ollama"]["checks"] == 2
+    assert snapshot["ollama"]["latency_histogram_ms"]["le_+Inf"] == 2
+    assert ollama["calls"] == 2
+
+
+def test_missing_embedding_model_marks_ollama_unhealthy(monitor, ollama, monkeypatch):
+    ollama["models"] = ["other-model:latest"]
+
+    monitor.check_now()
+    monitor.check_now()
+
+    ollama_status = monitor.snapshot()["ollama"]
+    assert (ollama_status["status"], ollama_status["consecutive_failures"]) == ("unhealthy", 2)
+    assert "embed-model" in ollama_status["last_error"]
+    assert not monitor.is_ready()
+    # 프로세스 내 임베딩 백엔드에서는 서버 응답만 확인
+    monkeypatch.setattr(health_module.config, "EMBEDDING_BACKEND", "onnx")
+    monitor.check_now()
+    assert monitor.get_status("ollama") == "healthy"
+    assert monitor.snapshot()["ollama"]["consecutive_failures"] == 0
+
+
+def test_health_routes_serve_cached_status_without_probing(monitor, ollama):
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+
+    assert client.get("/ready").status_code == 503
+    monitor.check_now()
+    calls = ollama["calls"]
+
+    ready = client.get("/ready")
+    health = client.get("/health").json()
+
+    assert (ready.status_code, ready.json()["ready"]) == (200, True)
+    assert (health["status"], health["qdrant_status"], health["ollama_status"]) == ("healthy", "healthy", "healthy")
+    assert health["details"]["qdrant"]["checks"] == 1
+    assert ollama["calls"] == calls
@@ -0,0 +1,93 @@
+import uuid
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+from src import ingest_worker
+from src.ingest_worker import IngestWorker, JobProgressReporter
+from src.job_queue import SQLiteJobQueue, INGEST_TASK, DONE
+from src.qdrant_manager import QdrantManager
+
+
+def _chunks(count):
+    rng = np.random.default_rng(0)
+    return [{"text": f"청크 {i}", "chunk_index": i, "page_number": 1,
+             "embedding": rng.normal(size=8).astype(np.float32), "embedding_model": "test"} for i in range(count)]
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.job_queue.config.JOB_RETRY_BACKOFF", 0)
+    return SQLiteJobQueue(str(tmp_path / "jobs.db"))
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr("src.qdrant_manager.config.NAMED_VECTORS_ENABLED", False)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_REDUCTION", "")
+    # 스키마 캐시는 프로세스 전역이므로 테스트마다 새 컬렉션 이름 사용
+    return QdrantManager(collection_name=f"test_{uuid.uuid4().hex}", client=QdrantClient(location=":memory:"))
+
+
+def test_retry_replaces_points_from_failed_attempt(queue, manager, monkeypatch):
+    calls = []
+
+    def ingest_file(path, filename, collection_name=None, document_id=None, qdrant_manager=None, **kwargs):
+        calls.append(document_id)
+        if len(calls) == 1:
+            # 일부만 저장한 뒤 실패
+            qdrant_manager.store_vectors(_chunks(2), document_id)
+            raise RuntimeError("Qdrant 연결 끊김")
+        qdrant_manager.store_vectors(_chunks(5)[2:], document_id)
+        return {"document_id": document_id, "chunks_count": 3}
+
+    monkeypatch.setattr(ingest_worker, "ingest_file", ingest_file)
+    job_id = queue.enqueue(INGEST_TASK, {"file_path": "/tmp/x.pdf", "filename": "x.pdf", "document_id": "doc-1"})
+    worker = IngestWorker(job_queue=queue, lease_seconds=30, qdrant_manager=manager)
+
+    assert worker.run_once()
+    assert manager.count_document_points("doc-1") == 2
+    assert worker.run_once()
+
+    assert calls == ["doc-1", "doc-1"]
+    assert queue.get(job_id)["status"] == DONE
+    assert manager.count_document_points("doc-1") == 3
+
+
+def test_reporter_stops_writing_after_lease_lost(queue):
+    job_id = queue.enqueue(INGEST_TASK, {})
+    queue.lease("w1", lease_seconds=30)
+    queue._conn().execute("UPDATE jobs SET lease_expires = 0 WHERE id = ?", (job_id,))
+    queue.lease("w2", lease_seconds=30)
+    queue.update_progress(job_id, 30, "w2 진행", worker_id="w2")
+
+    reporter = JobProgressReporter(queue, job_id, "w1", lease_seconds=30)
+    reporter.set_progress(80, "w1 진행")
+    reporter.set_error("w1 오류")
+
+    assert reporter.lease_lost
+    assert reporter.is_cancelled()
+    job = queue.get(job_id)
+    assert (job["progress"], job["message"]) == (30, "w2 진행")
+
+
+def test_duplicate_upload_file_is_removed(queue, manager, tmp_path, monkeypatch):
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir()
+    monkeypatch.setattr(ingest_worker.config, "UPLOAD_DIR", str(upload_dir))
+    duplicate = upload_dir / "dup.pdf"
+    duplicate.write_bytes(b"%PDF")
+    copied = upload_dir / "copied.pdf"
+    copied.write_bytes(b"%PDF")
+    results = {str(duplicate): {"document_id": "doc1", "chunks_count": 3, "deduplicated": "existing"},
+               str(copied): {"document_id": "doc2", "chunks_count": 3, "deduplicated": "copied"}}
+    monkeypatch.setattr(ingest_worker, "ingest_file", lambda path, *args, **kwargs: results[path])
+    worker = IngestWorker(job_queue=queue, lease_seconds=30, qdrant_manager=manager)
+
+    for path in (duplicate, copied):
+        queue.enqueue(INGEST_TASK, {"file_path": str(path), "filename": path.name, "document_id": "new"})
+        assert worker.run_once()
+
+    assert not duplicate.exists()
+    assert copied.exists()
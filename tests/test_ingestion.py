@@ -0,0 +1,95 @@
+import uuid
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+from src import content_registry
+from src.content_registry import ContentRegistry
+from src.ingestion import ingest_file, _reuse_existing, _NullTracker
+from src.qdrant_manager import QdrantManager
+
+HASH = "a" * 64
+MODEL = "test-model"
+
+
+class FakeEmbeddingService:
+    model_name = MODEL
+
+
+def _chunks(count):
+    rng = np.random.default_rng(0)
+    return [{"text": f"청크 {i}", "chunk_index": i, "page_number": 1, "metadata": {"title": "원본.pdf"},
+             "embedding": rng.normal(size=8).astype(np.float32), "embedding_model": MODEL} for i in range(count)]
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.ingestion.config.CONTENT_DEDUP_ENABLED", True)
+    registry = ContentRegistry(str(tmp_path / "registry.db"))
+    monkeypatch.setattr(content_registry, "_instance", registry)
+    return registry
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr("src.qdrant_manager.config.NAMED_VECTORS_ENABLED", False)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_REDUCTION", "")
+    return QdrantManager(collection_name=f"test_{uuid.uuid4().hex}", client=QdrantClient(location=":memory:"))
+
+
+@pytest.fixture
+def names():
+    # 스키마 캐시는 프로세스 전역이므로 테스트마다 새 컬렉션 이름 사용
+    suffix = uuid.uuid4().hex[:8]
+    return {name: f"{name}_{suffix}" for name in ("인사팀", "재무팀", "총무팀")}
+
+
+def _ingest(manager, collection_name, document_id=None):
+    return ingest_file("/nonexistent/업로드.pdf", "업로드.pdf", collection_name=collection_name,
+                       document_id=document_id, text_chunker=object(), embedding_service=FakeEmbeddingService(),
+                       content_hash=HASH, qdrant_manager=manager)
+
+
+def test_same_collection_duplicate_reuses_existing_document(registry, manager, names):
+    source = manager.for_collection(names["인사팀"])
+    assert source.store_vectors(_chunks(3), "doc1")
+    registry.register(HASH, MODEL, names["인사팀"], "doc1", 3)
+
+    result = _ingest(manager, names["인사팀"], document_id="doc-new")
+
+    assert result["deduplicated"] == "existing"
+    assert result["document_id"] == "doc1"
+    assert source.count_document_points("doc-new") == 0
+    assert registry.stats()["embedding_calls_saved"] == 3
+
+
+def test_other_collection_duplicate_copies_points(registry, manager, names):
+    source = manager.for_collection(names["인사팀"])
+    assert source.store_vectors(_chunks(3), "doc1")
+    registry.register(HASH, MODEL, names["인사팀"], "doc1", 3)
+
+    result = _ingest(manager, names["재무팀"], document_id="doc2")
+
+    target = manager.for_collection(names["재무팀"])
+    assert result["deduplicated"] == "copied"
+    assert (result["document_id"], result["chunks_count"]) == ("doc2", 3)
+    assert target.count_document_points("doc2") == 3
+    assert source.count_document_points("doc1") == 3
+    assert {p["payload"]["document_id"] for p in target.get_document_points("doc2")} == {"doc2"}
+    assert {(e["collection_name"], e["document_id"]) for e in registry.find(HASH, MODEL)} == {
+        (names["인사팀"], "doc1"), (names["재무팀"], "doc2")
+    }
+
+
+def test_stale_registry_entries_are_forgotten(registry, manager, names):
+    # 포인트가 이미 삭제된 문서의 기록 (같은 컬렉션, 다른 컬렉션)
+    manager.for_collection(names["인사팀"]).store_vectors(_chunks(1), "other")
+    registry.register(HASH, MODEL, names["인사팀"], "deleted1", 3)
+    registry.register(HASH, MODEL, names["총무팀"], "deleted2", 3)
+
+    reused = _reuse_existing(HASH, "업로드.pdf", names["인사팀"], "doc-new", MODEL, _NullTracker(), manager)
+
+    assert reused is None
+    assert registry.find(HASH, MODEL) == []
+    assert registry.stats()["dedup_hits"] == 0
@@ -0,0 +1,134 @@
+import time
+
+import pytest
+
+from src.job_queue import SQLiteJobQueue, QUEUED, RUNNING, DONE, ERROR, CANCELLED
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SQLiteJobQueue(str(tmp_path / "jobs.db"))
+
+
+def _expire_lease(queue, job_id):
+    queue._conn().execute("UPDATE jobs SET lease_expires = ? WHERE id = ?", (time.time() - 1, job_id))
+
+
+def test_lease_takes_oldest_queued_job_once(queue):
+    first = queue.enqueue("ingest_file", {"n": 1})
+    queue.enqueue("ingest_file", {"n": 2})
+
+    job = queue.lease("w1", lease_seconds=30)
+
+    assert job["id"] == first
+    assert job["status"] == RUNNING
+    assert job["lease_owner"] == "w1"
+    assert job["attempts"] == 1
+    assert queue.lease("w2", lease_seconds=30)["payload"] == {"n": 2}
+    assert queue.lease("w3", lease_seconds=30) is None
+
+
+def test_complete_by_owner(queue):
+    job_id = queue.enqueue("ingest_file", {})
+    queue.lease("w1", lease_seconds=30)
+
+    assert queue.complete(job_id, {"chunks_count": 3}, worker_id="w1")
+
+    job = queue.get(job_id)
+    assert job["status"] == DONE
+    assert job["result"] == {"chunks_count": 3}
+
+
+def test_stale_worker_cannot_complete_or_requeue_after_lease_taken(queue):
+    job_id = queue.enqueue("ingest_file", {})
+    queue.lease("w1", lease_seconds=30)
+    _expire_lease(queue, job_id)
+    assert queue.lease("w2", lease_seconds=30)["id"] == job_id
+
+    assert not queue.complete(job_id, {}, worker_id="w1")
+    assert not queue.fail(job_id, "boom", worker_id="w1")
+    assert not queue.mark_cancelled(job_id, worker_id="w1")
+    assert queue.update_progress(job_id, 40, "w2 진행", worker_id="w2")
+    assert not queue.update_progress(job_id, 90, "w1 진행", worker_id="w1")
+
+    job = queue.get(job_id)
+    assert job["progress"] == 40
+    assert job["message"] == "w2 진행"
+    assert job["status"] == RUNNING
+    assert job["lease_owner"] == "w2"
+    assert queue.heartbeat(job_id, "w2", lease_seconds=30)
+    assert not queue.heartbeat(job_id, "w1", lease_seconds=30)
+
+
+def test_fail_retries_with_backoff_then_errors(queue, monkeypatch):
+    monkeypatch.setattr("src.job_queue.config.JOB_RETRY_BACKOFF", 0)
+    job_id = queue.enqueue("ingest_file", {}, max_attempts=2)
+
+    queue.lease("w1", lease_seconds=30)
+    assert queue.fail(job_id, "temporary", worker_id="w1")
+    assert queue.get(job_id)["status"] == QUEUED
+
+    queue.lease("w1", lease_seconds=30)
+    assert queue.fail(job_id, "still broken", worker_id="w1")
+    job = queue.get(job_id)
+    assert job["status"] == ERROR
+    assert job["attempts"] == 2
+
+
+def test_fail_without_retry_errors_immediately(queue):
+    job_id = queue.enqueue("ingest_file", {}, max_attempts=3)
+    queue.lease("w1", lease_seconds=30)
+
+    assert queue.fail(job_id, "bad file", retry=False, worker_id="w1")
+    assert queue.get(job_id)["status"] == ERROR
+
+
+def test_expired_lease_with_attempts_exhausted_is_failed(queue):
+    job_id = queue.enqueue("ingest_file", {}, max_attempts=1)
+    queue.lease("w1", lease_seconds=30)
+    _expire_lease(queue, job_id)
+
+    assert queue.lease("w2", lease_seconds=30) is None
+    assert queue.get(job_id)["status"] == ERROR
+
+
+def test_cancel_queued_job_is_immediate(queue):
+    job_id = queue.enqueue("ingest_file", {})
+
+    assert queue.cancel(job_id)
+    assert queue.get(job_id)["status"] == CANCELLED
+    assert queue.lease("w1", lease_seconds=30) is None
+
+
+def test_cancel_running_job_is_finished_by_worker(queue):
+    job_id = queue.enqueue("ingest_file", {})
+    queue.lease("w1", lease_seconds=30)
+
+    assert queue.cancel(job_id)
+    assert queue.is_cancelled(job_id)
+    assert queue.get(job_id)["status"] == RUNNING
+    assert queue.mark_cancelled(job_id, worker_id="w1")
+    assert queue.get(job_id)["status"] == CANCELLED
+
+
+def test_cancel_requested_job_with_dead_worker_is_cancelled_on_lease(queue):
+    job_id = queue.enqueue("ingest_file", {}, max_attempts=3)
+    queue.lease("w1", lease_seconds=30)
+    queue.cancel(job_id)
+    _expire_lease(queue, job_id)
+
+    assert queue.lease("w2", lease_seconds=30) is None
+    job = queue.get(job_id)
+    assert job["status"] == CANCELLED
+    assert job["lease_owner"] is None
+
+
+def test_purge_finished_keeps_active_jobs(queue):
+    done_id = queue.enqueue("ingest_file", {})
+    queued_id = queue.enqueue("ingest_file", {})
+    queue.lease("w1", lease_seconds=30)
+    queue.complete(done_id, {}, worker_id="w1")
+
+    assert queue.purge_finished(older_than=-1) == 1
+    assert queue.get(done_id) is None
+    assert queue.get(queued_id)["status"] == QUEUED
@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from loguru import logger
+
+from src import logging_setup
+from src.logging_setup import CategoryLogger, clip, sample_rate
+
+
+@pytest.fixture
+def messages():
+    records = []
+    handler_id = logger.add(lambda message: records.append(message.record), level="DEBUG")
+    yield records
+    logger.remove(handler_id)
+
+
+def test_clip_limits_field_length(monkeypatch):
+    monkeypatch.setattr(logging_setup.config, "LOG_MAX_FIELD_CHARS", 5)
+
+    assert clip("가나다라마바사") == "가나다라마...(+2자)"
+    assert clip("짧은") == "짧은"
+    assert clip(12345678, limit=0) == "12345678"
+
+
+def test_sample_rates_parsed_from_config(monkeypatch):
+    monkeypatch.setattr(logging_setup.config, "LOG_SAMPLE_RATES", "search=0.1, qa=2,bad=x,=0.5")
+
+    assert sample_rate("search") == 0.1
+    assert sample_rate("qa") == 1.0
+    assert sample_rate("bad") == 1.0
+    assert sample_rate("other") == 1.0
+
+
+def test_sampled_out_logs_skip_formatting(monkeypatch, messages):
+    monkeypatch.setattr(logging_setup.config, "LOG_SAMPLE_RATES", "test_search=0")
+    formatted = []
+
+    class Expensive:
+        def __format__(self, spec):
+            formatted.append(spec)
+            return "값"
+
+    log = CategoryLogger("test_search")
+    log.info("검색 {}", Expensive())
+    log.debug("검색 {}", Expensive())
+    log.warning("경고 {}", Expensive(), query="질문")
+
+    assert [(r["level"].name, r["message"]) for r in messages] == [("WARNING", "경고 값")]
+    assert messages[0]["extra"] == {"category": "test_search", "query": "질문"}
+    assert len(formatted) == 1
+
+
+def test_setup_logging_writes_clipped_text_and_ingest_json(tmp_path):
+    log_file, ingest_file = tmp_path / "app.log", tmp_path / "ingest" / "ingest.jsonl"
+    code = (
+        "from loguru import logger\n"
+        "from src.logging_setup import setup_logging, get_logger\n"
+        "setup_logging(console=False)\n"
+        "setup_logging(console=False)\n"
+        "logger.info('일반 ' + 'x' * 100)\n"
+        "get_logger('ingest').info('적재 완료: {}', '문서.pdf', document_id='doc1', chunks=3)\n"
+        "logger.complete()\n"
+        "logger.remove()\n"
+    )
+    env = {**os.environ, "LOG_FILE": str(log_file), "LOG_INGEST_FILE": str(ingest_file),
+           "LOG_MAX_MESSAGE_CHARS": "20", "LOG_ENQUEUE": "True", "LOG_SAMPLE_RATES": ""}
+    subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True)
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert lines[0].endswith(f"| INFO | 일반 {'x' * 17}...(+83자)")
+    ingest = [json.loads(line)["record"] for line in ingest_file.read_text(encoding="utf-8").splitlines()]
+    assert [r["message"] for r in ingest] == ["적재 완료: 문서.pdf"]
+    assert ingest[0]["extra"] == {"category": "ingest", "document_id": "doc1", "chunks": 3}
@@ -0,0 +1,65 @@
+import pytest
+from starlette.testclient import TestClient
+
+from src import health_monitor, job_queue, metrics
+from src.job_queue import SQLiteJobQueue, INGEST_TASK
+from src.metrics import observe_seconds, record_cache, record_generation
+
+pytestmark = pytest.mark.skipif(not metrics.METRICS_AVAILABLE, reason="prometheus_client 미설치")
+
+
+def _value(name, **labels):
+    return metrics.registry.get_sample_value(name, labels) or 0
+
+
+def test_observe_seconds_counts_errors():
+    before = _value("rag_qdrant_operation_seconds_count", operation="test_op")
+
+    with observe_seconds(metrics.QDRANT_OPERATION_SECONDS, metrics.QDRANT_ERRORS, operation="test_op"):
+        pass
+    with pytest.raises(ValueError):
+        with observe_seconds(metrics.QDRANT_OPERATION_SECONDS, metrics.QDRANT_ERRORS, operation="test_op"):
+            raise ValueError("실패")
+
+    assert _value("rag_qdrant_operation_seconds_count", operation="test_op") - before == 2
+    assert _value("rag_qdrant_errors_total", operation="test_op") == 1
+
+
+def test_record_generation_and_cache():
+    model = "metrics-test-model"
+
+    record_generation(model, {"prompt_eval_seconds": 0.2, "eval_seconds": 1.0, "load_seconds": 0,
+                              "tokens_per_second": 40.0, "prompt_eval_count": 120, "eval_count": 40})
+    record_cache("metrics_test", True)
+    record_cache("metrics_test", False)
+    record_cache("metrics_test", False)
+
+    assert _value("rag_llm_generation_seconds_sum", model=model) == pytest.approx(1.0)
+    assert _value("rag_llm_load_seconds_count", model=model) == 0
+    assert _value("rag_llm_tokens_total", model=model, kind="prompt") == 120
+    assert _value("rag_llm_tokens_total", model=model, kind="completion") == 40
+    assert _value("rag_cache_requests_total", cache="metrics_test", result="miss") == 2
+
+
+def test_metrics_endpoint_exposes_route_templates_and_gauges(tmp_path, monkeypatch):
+    from src.main import app
+
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(job_queue, "_instance", queue)
+    monkeypatch.setattr(health_monitor, "_instance", health_monitor.HealthMonitor(interval=60))
+    queue.enqueue(INGEST_TASK, {})
+    queue.enqueue(INGEST_TASK, {})
+    client = TestClient(app)
+    route = "/api/v1/upload-progress/{task_id}"
+    before = _value("rag_http_request_seconds_count", method="GET", route=route, status="200")
+
+    for task_id in ("a", "b"):
+        assert client.get(f"/api/v1/upload-progress/{task_id}").status_code == 200
+    response = client.get("/api/v1/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    # 경로 파라미터가 아닌 라우트 템플릿으로 기록되어 레이블 수가 늘지 않음
+    assert _value("rag_http_request_seconds_count", method="GET", route=route, status="200") - before == 2
+    assert 'rag_queue_depth{queue="ingest_jobs"} 2.0' in response.text
+    assert 'rag_dependency_up{dependency="qdrant"} 0.0' in response.text
@@ -0,0 +1,79 @@
+import pytest
+
+from src import model_residency as residency_module
+from src.model_residency import ModelResidencyManager
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None):
+        self.status_code = status_code
+        self.body = body or {}
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """/api/embed가 없는 Ollama 흉내: 로드 요청을 기록하고 /api/ps는 loaded 목록을 반환"""
+    state = {"posts": [], "loaded": []}
+
+    def post(url, json, timeout):
+        state["posts"].append((url.rsplit("/", 1)[-1], json))
+        return FakeResponse(404 if url.endswith("/api/embed") else 200)
+
+    def get(url, timeout):
+        return FakeResponse(body={"models": [{"name": name, "size_vram": 1} for name in state["loaded"]]})
+
+    monkeypatch.setattr(residency_module.requests, "post", post)
+    monkeypatch.setattr(residency_module.requests, "get", get)
+    monkeypatch.setattr(residency_module.config, "EMBEDDING_BACKEND", "ollama")
+    monkeypatch.setattr(residency_module.config, "OLLAMA_EMBEDDING_MODEL", "embed-model")
+    monkeypatch.setattr(residency_module.config, "OLLAMA_LLM_MODEL", "llm-model:7b")
+    monkeypatch.setattr(residency_module.config, "OLLAMA_EMBED_KEEP_ALIVE", "-1")
+    monkeypatch.setattr(residency_module.config, "OLLAMA_LLM_KEEP_ALIVE", "30m")
+    return state
+
+
+def test_warm_up_loads_models_with_keep_alive(ollama):
+    manager = ModelResidencyManager(base_url="http://ollama", interval=60)
+    ollama["loaded"] = ["embed-model:latest", "llm-model:7b"]
+
+    manager.warm_up()
+
+    assert ollama["posts"] == [
+        ("embed", {"model": "embed-model", "input": "warmup", "keep_alive": "-1"}),
+        ("embeddings", {"model": "embed-model", "prompt": "warmup", "keep_alive": "-1"}),
+        ("generate", {"model": "llm-model:7b", "keep_alive": "30m"}),
+    ]
+    # 태그 없는 모델명도 ':latest'로 맞춰 로드 상태를 판단
+    assert [(m["model"], m["loaded"]) for m in manager.status()["models"]] == [
+        ("embed-model", True), ("llm-model:7b", True)
+    ]
+
+
+def test_check_loaded_records_load_and_unload_events(ollama):
+    manager = ModelResidencyManager(base_url="http://ollama", interval=60)
+
+    ollama["loaded"] = ["llm-model:7b"]
+    manager.check_loaded()
+    ollama["loaded"] = ["embed-model"]
+    manager.check_loaded()
+
+    events = [(e["model"], e["event"]) for e in manager.status()["events"]]
+    assert events == [("llm-model:7b", "loaded"), ("embed-model:latest", "loaded"), ("llm-model:7b", "unloaded")]
+    assert manager.status()["last_check"] is not None
+
+
+def test_onnx_backend_skips_embedding_model_and_records_failures(ollama, monkeypatch):
+    monkeypatch.setattr(residency_module.config, "EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(residency_module.requests, "post", lambda url, json, timeout: FakeResponse(500))
+    manager = ModelResidencyManager(base_url="http://ollama", interval=60)
+
+    assert list(manager.models) == ["llm-model:7b"]
+    assert manager.load_model("llm-model:7b") is False
+    assert [e["event"] for e in manager.status()["events"]] == ["load_failed"]
@@ -0,0 +1,55 @@
+from src.pdf_processor import BaseFileProcessor, detect_headings
+
+
+SAMPLE = (
+    "제1장 총칙\n"
+    "이 규정은 임직원의 근무 조건을 정한다.\n"
+    "1. 목적\n"
+    "회사는 다음과 같이 운영합니다.\n"
+    "1.2 적용 범위\n"
+    "■ 연차 휴가\n"
+    "[별표 1]\n"
+    "## 부칙\n"
+    "2024년 1월 1일부터 시행한다.\n"
+)
+
+
+def test_detect_headings_patterns_and_offsets():
+    headings = detect_headings(SAMPLE)
+
+    assert [title for _, title in headings] == ["제1장 총칙", "1. 목적", "1.2 적용 범위", "■ 연차 휴가", "[별표 1]", "부칙"]
+    for offset, title in headings:
+        assert SAMPLE[offset:].lstrip("#").lstrip().startswith(title)
+
+
+def test_detect_headings_skips_sentences_and_long_lines():
+    text = (
+        "1. 휴가는 신청 후 사용합니다.\n"       # 문장으로 끝남
+        "2. 연차는 다음과 같다,\n"
+        "3. " + "가" * 70 + "\n"               # 제목으로 보기엔 긴 줄
+        "일반 본문 줄\n"
+    )
+
+    assert detect_headings(text) == []
+
+
+def test_assign_section_titles_uses_nearest_preceding_heading():
+    text = "서문 내용입니다.\n제1장 총칙\n총칙 본문 첫 문단.\n총칙 본문 둘째 문단.\n제2장 휴가\n휴가 본문 문단.\n"
+    chunks = [{"text": "서문 내용입니다."}, {"text": "총칙 본문 첫 문단."},
+              {"text": "총칙 본문 둘째 문단."}, {"text": "휴가 본문 문단."}]
+
+    BaseFileProcessor().assign_section_titles(text, chunks, filename="/tmp/취업규칙.pdf")
+
+    assert [c["section_title"] for c in chunks] == [
+        "취업규칙", "취업규칙 > 제1장 총칙", "취업규칙 > 제1장 총칙", "취업규칙 > 제2장 휴가"
+    ]
+
+
+def test_assign_section_titles_keeps_cursor_for_unmatched_chunk():
+    text = "제1장 총칙\n본문 A\n제2장 휴가\n본문 B\n"
+    # 청커가 공백을 합쳐 원문과 일치하지 않는 청크는 직전 위치의 제목을 유지
+    chunks = [{"text": "본문 A"}, {"text": "원문에 없는 텍스트"}, {"text": "본문 B"}]
+
+    BaseFileProcessor().assign_section_titles(text, chunks)
+
+    assert [c["section_title"] for c in chunks] == ["제1장 총칙", "제1장 총칙", "제2장 휴가"]
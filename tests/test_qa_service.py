@@ -0,0 +1,176 @@
+import pytest
+
+from src import qa_service as qa_module
+from src.conversation_memory import ConversationMemory
+from src.qa_service import QAService
+
+
+class FakeSearchService:
+    def __init__(self, results):
+        self.results = results
+        self.qdrant_manager = None
+
+    def search(self, query, limit, **kwargs):
+        return self.results[:limit]
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+
+def _results(count):
+    return [{"text": f"문서 {i}의 내용입니다. 규정 {i}항을 따릅니다.", "score": 1.0 - i * 0.01,
+             "document_id": f"doc{i}", "chunk_index": 0} for i in range(count)]
+
+
+@pytest.fixture
+def generate_calls(monkeypatch):
+    """Ollama /api/generate 호출을 가로채 요청 payload를 기록하고, 호출마다 context를 늘려 반환"""
+    calls = []
+
+    def fake_post(url, json=None, timeout=None):
+        calls.append(json)
+        context = list(json.get("context") or []) + [len(calls)] * 100
+        return FakeResponse({"response": f"답변 {len(calls)}", "context": context})
+
+    monkeypatch.setattr(qa_module.requests, "post", fake_post)
+    monkeypatch.setattr(qa_module, "conversation_memory", ConversationMemory(window_turns=2))
+    monkeypatch.setattr(ConversationMemory, "_summarize", lambda self, previous, turns: "요약")
+    monkeypatch.setattr(qa_module, "_session_contexts", qa_module.OrderedDict())
+    return calls
+
+
+def _service(results):
+    return QAService(search_service=FakeSearchService(results), embedding_service=object())
+
+
+def test_session_context_reused_after_window_overflow(generate_calls, monkeypatch):
+    monkeypatch.setattr(qa_module.config, "LLM_SESSION_CONTEXT_MAX_TOKENS", 10_000)
+    service = _service(_results(3))
+
+    for turn in range(6):
+        service.ask_question(f"질문 {turn}", collection_name=None, session_id="s1")
+
+    assert "context" not in generate_calls[0]
+    assert all("context" in payload for payload in generate_calls[1:])
+
+
+def test_session_context_trimmed_over_token_limit(generate_calls, monkeypatch):
+    monkeypatch.setattr(qa_module.config, "LLM_SESSION_CONTEXT_MAX_TOKENS", 250)
+    monkeypatch.setattr(qa_module.config, "LLM_SESSION_CONTEXT_KEEP_TOKENS", 50)
+    service = _service(_results(3))
+
+    for turn in range(5):
+        service.ask_question(f"질문 {turn}", collection_name=None, session_id="s1")
+
+    # context 길이 100 -> 200 -> 300 (앞 50 + 최근 75 = 125로 축소) -> 225 -> 325 (다시 축소)
+    assert ["context" in payload for payload in generate_calls] == [False, True, True, True, True]
+    assert generate_calls[3]["context"] == [1] * 50 + [3] * 75
+    assert "[이전 대화]" not in generate_calls[3]["prompt"]
+    assert len(qa_module._session_contexts["s1"]["context"]) == 125
+
+
+def test_session_contexts_expire_and_are_bounded(generate_calls, monkeypatch):
+    monkeypatch.setattr(qa_module.config, "LLM_SESSION_CACHE_SIZE", 2)
+    monkeypatch.setattr(qa_module.config, "LLM_SESSION_TTL_SECONDS", 60)
+    now = [1000.0]
+    monkeypatch.setattr(qa_module.time, "time", lambda: now[0])
+    service = _service(_results(3))
+
+    for session_id in ("a", "b", "c"):
+        service.ask_question("질문", collection_name=None, session_id=session_id)
+    assert list(qa_module._session_contexts) == ["b", "c"]
+
+    now[0] += 30
+    service.ask_question("질문", collection_name=None, session_id="b")
+    now[0] += 45
+    # c는 75초 동안 사용되지 않아 만료, b는 45초 전에 사용
+    service.ask_question("질문", collection_name=None, session_id="d")
+    assert list(qa_module._session_contexts) == ["b", "d"]
+    assert service._get_session_context("c") is None
+    now[0] += 61
+    assert service._get_session_context("b") is None
+    assert "b" not in qa_module._session_contexts
+
+
+def test_ask_with_metadata_uses_session_memory(generate_calls):
+    service = _service(_results(3))
+
+    service.ask_with_metadata("첫 질문", collection_name=None, session_id="s2")
+    result = service.ask_with_metadata("두 번째 질문", collection_name=None, session_id="s2")
+
+    assert result["session_id"] == "s2"
+    assert "context" in generate_calls[1]
+    assert qa_module.conversation_memory.has_session("s2")
+
+
+def test_packer_receives_top_max_results(generate_calls, monkeypatch):
+    service = _service(_results(12))
+    packed_inputs = []
+    original_pack = service.context_packer.pack
+
+    def recording_pack(results):
+        packed_inputs.append(results)
+        return original_pack(results)
+
+    monkeypatch.setattr(service.context_packer, "pack", recording_pack)
+    service.ask_question("질문", collection_name=None, max_results=4)
+
+    assert [r["document_id"] for r in packed_inputs[0]] == ["doc0", "doc1", "doc2", "doc3"]
+
+
+def test_sources_match_packed_context(generate_calls, monkeypatch):
+    service = _service(_results(5))
+    # 예산이 두 청크만 들어갈 만큼이면 출처도 두 개
+    two_chunks = sum(qa_module.ContextPacker._token_count(r) for r in _results(2))
+    monkeypatch.setattr(service.context_packer, "token_budget", two_chunks)
+
+    result = service.ask_question("질문", collection_name=None, max_results=5)
+
+    assert result["context_count"] == 2
+    assert [s["document_id"] for s in result["sources"]] == ["doc0", "doc1"]
+    assert result["context_stats"]["blocks_out"] == 2
+    assert "문서 1의 내용" in generate_calls[0]["prompt"]
+    assert "문서 2의 내용" not in generate_calls[0]["prompt"]
+    assert result["answer"].count("- \"문서") == 2
+
+
+def test_prompts_share_byte_stable_prefix(generate_calls, monkeypatch):
+    monkeypatch.setattr(qa_module.config, "OLLAMA_LLM_KEEP_ALIVE", "30m")
+    service = _service(_results(3))
+
+    service.ask_question("첫 질문", collection_name=None)
+    service.ask_question("다른 질문", collection_name=None,
+                         history=[{"question": "이전", "answer": "이전 답변"}])
+
+    prompts = [payload["prompt"] for payload in generate_calls]
+    assert all(prompt.startswith(qa_module.SYSTEM_PROMPT) for prompt in prompts)
+    # 가변 내용은 모두 정적 접두부 뒤에 위치
+    assert prompts[1].index("[이전 대화]") >= len(qa_module.SYSTEM_PROMPT)
+    assert all(payload["keep_alive"] == "30m" for payload in generate_calls)
+
+
+def test_session_context_sends_only_new_turn(generate_calls):
+    service = _service(_results(3))
+
+    service.ask_question("첫 질문", collection_name=None, session_id="s3")
+    service.ask_question("두 번째 질문", collection_name=None, session_id="s3",
+                         history=[{"question": "첫 질문", "answer": "답변 1"}])
+    # 직전 답변이 다른 대화 이력이 오면 context를 재사용하지 않고 전체 프롬프트를 구성
+    service.generate_answer("새 대화 질문", ["참고 내용"], session_id="s3",
+                            history=[{"question": "다른 질문", "answer": "다른 답변"}])
+
+    assert generate_calls[1]["context"] == [1] * 100
+    assert generate_calls[1]["prompt"].startswith("[참고 내용]")
+    assert "두 번째 질문" in generate_calls[1]["prompt"]
+    assert "context" not in generate_calls[2]
+    assert generate_calls[2]["prompt"].startswith(qa_module.SYSTEM_PROMPT)
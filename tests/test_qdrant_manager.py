@@ -0,0 +1,82 @@
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+from src.qdrant_manager import QdrantManager, BODY_VECTOR, TITLE_VECTOR, FUSED_VECTORS
+from src.tracing import start_trace
+
+
+def _hit(point_id, score):
+    return SimpleNamespace(id=point_id, score=score, payload={"id": point_id})
+
+
+def test_fuse_results_rrf_order_and_scores(monkeypatch):
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_FUSION_RRF_K", 60)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_FUSION_TITLE_WEIGHT", 1.0)
+
+    fused = QdrantManager._fuse_results({
+        BODY_VECTOR: [_hit("a", 0.9), _hit("b", 0.8)],
+        TITLE_VECTOR: [_hit("b", 0.7), _hit("c", 0.6)],
+    }, limit=3)
+
+    assert [r["id"] for r in fused] == ["b", "a", "c"]
+    assert fused[0]["score"] == pytest.approx(1 / 62 + 1 / 61)
+    assert fused[0]["vector_scores"] == {BODY_VECTOR: 0.8, TITLE_VECTOR: 0.7}
+    assert fused[1]["vector_scores"] == {BODY_VECTOR: 0.9}
+
+
+def test_fuse_results_title_weight_and_limit(monkeypatch):
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_FUSION_TITLE_WEIGHT", 3.0)
+
+    fused = QdrantManager._fuse_results({
+        BODY_VECTOR: [_hit("a", 0.9)],
+        TITLE_VECTOR: [_hit("c", 0.6)],
+    }, limit=1)
+
+    assert [r["id"] for r in fused] == ["c"]
+
+
+@pytest.fixture
+def named_manager(monkeypatch):
+    monkeypatch.setattr("src.qdrant_manager.config.NAMED_VECTORS_ENABLED", True)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_REDUCTION", "")
+    # 스키마 캐시는 프로세스 전역이므로 테스트마다 새 컬렉션 이름 사용
+    manager = QdrantManager(collection_name=f"test_{uuid.uuid4().hex}", client=QdrantClient(location=":memory:"))
+    rng = np.random.default_rng(0)
+    chunks = [{
+        "text": f"청크 {i}",
+        "chunk_index": i,
+        "page_number": 1,
+        "section_title": f"문서 > 제목 {i % 2}",
+        "embedding": rng.normal(size=8).astype(np.float32),
+        "title_embedding": rng.normal(size=8).astype(np.float32),
+        "embedding_model": "test"
+    } for i in range(6)]
+    assert manager.store_vectors(chunks, "doc1")
+    return manager
+
+
+def test_named_vector_search_each_vector(named_manager):
+    query = np.ones(8, dtype=np.float32)
+
+    assert named_manager.uses_named_vectors()
+    for vector_name in (BODY_VECTOR, TITLE_VECTOR, FUSED_VECTORS):
+        results = named_manager.search_vectors(query, limit=3, vector_name=vector_name)
+        assert len(results) == 3
+    fused = named_manager.search_vectors(query, limit=3, vector_name=FUSED_VECTORS)
+    assert all("vector_scores" in r for r in fused)
+    assert named_manager.search_vectors(query, limit=3, vector_name="bogus") == []
+
+
+def test_fused_search_records_one_qdrant_search_span(named_manager):
+    query = np.ones(8, dtype=np.float32)
+
+    with start_trace("test") as trace:
+        named_manager.search_vectors(query, limit=3, vector_name=FUSED_VECTORS)
+        named_manager.search_fused(query, limit=3)
+
+    assert [s["name"] for s in trace.timings()].count("qdrant_search") == 2
+    assert trace.server_timing().count("qdrant_search;") == 1
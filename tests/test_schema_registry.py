@@ -0,0 +1,86 @@
+import uuid
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+from src.embedding_backends import BaseEmbeddingBackend
+from src.embedding_service import EmbeddingService
+from src.qdrant_manager import QdrantManager
+from src.schema_registry import schema_registry
+
+
+class CountingBackend(BaseEmbeddingBackend):
+    def __init__(self, dimension):
+        self.model_name = f"model-{uuid.uuid4().hex}"
+        self.base_url = "fake://"
+        self.dimension = dimension
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        return np.ones((len(texts), self.dimension), dtype=np.float32)
+
+
+def _chunks(count, dim=8, model="test"):
+    rng = np.random.default_rng(0)
+    return [{"text": f"청크 {i}", "chunk_index": i, "embedding": rng.normal(size=dim).astype(np.float32),
+             "embedding_model": model} for i in range(count)]
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr("src.qdrant_manager.config.NAMED_VECTORS_ENABLED", False)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_REDUCTION", "")
+    client = QdrantClient(location=":memory:")
+    lookups = []
+    original = client.get_collection
+    client.get_collection = lambda name: lookups.append(name) or original(name)
+    # 스키마 캐시는 프로세스 전역이므로 테스트마다 새 컬렉션 이름 사용
+    manager = QdrantManager(collection_name=f"test_{uuid.uuid4().hex}", client=client)
+    return manager, lookups
+
+
+def test_store_vectors_reuses_cached_collection_schema(manager):
+    manager, lookups = manager
+
+    assert manager.store_vectors(_chunks(2), "doc1")
+    # 컬렉션이 없다는 결과는 캐시하지 않으므로 조회는 첫 적재(생성 전)에서만 발생
+    first_lookups = len(lookups)
+    for document_id in ("doc2", "doc3"):
+        assert manager.store_vectors(_chunks(2), document_id)
+    # 같은 Qdrant/컬렉션을 가리키는 다른 매니저도 캐시를 공유
+    assert manager.for_collection(manager.collection_name).store_vectors(_chunks(2), "doc4")
+
+    assert len(lookups) == first_lookups
+    assert manager.get_collection_schema()["vector_size"] == 8
+    assert manager.client.count(manager.collection_name).count == 8
+
+
+def test_cached_schema_rejects_mismatched_vectors(manager):
+    manager, lookups = manager
+    assert manager.store_vectors(_chunks(2), "doc1")
+
+    assert not manager.store_vectors(_chunks(2, dim=4), "doc2")
+    assert not manager.store_vectors(_chunks(2, model="other"), "doc3")
+    assert manager.client.count(manager.collection_name).count == 2
+
+
+def test_delete_collection_invalidates_schema(manager):
+    manager, lookups = manager
+    assert manager.store_vectors(_chunks(2), "doc1")
+
+    assert manager.delete_collection()
+    assert schema_registry.get_collection(manager._schema_key()) is None
+
+    assert manager.store_vectors(_chunks(2, dim=4), "doc2")
+    assert manager.get_collection_schema()["vector_size"] == 4
+
+
+def test_embedding_dimension_is_probed_once():
+    backend = CountingBackend(dimension=6)
+    first, second = EmbeddingService(backend=backend), EmbeddingService(backend=backend)
+
+    assert first.get_embedding_dimension() == 6
+    assert second.get_embedding_dimension() == 6
+    assert backend.calls == 1
@@ -0,0 +1,199 @@
+import uuid
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+from src import vector_reduction
+from src.qdrant_manager import QdrantManager
+from src.search_service import SearchService, maximal_marginal_relevance
+
+DIM = 8
+
+
+class FakeEmbeddingService:
+    """질문 텍스트별로 고정된 벡터를 돌려주는 임베딩 서비스 ('실패'는 0 벡터)"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_texts(self, texts):
+        return [self.vectors.get(text, np.zeros(DIM, dtype=np.float32)) for text in texts]
+
+    def embed_text(self, text):
+        return self.embed_texts([text])[0]
+
+
+def _chunks(count, document_id_seed=0):
+    rng = np.random.default_rng(document_id_seed)
+    return [{
+        "text": f"청크 {document_id_seed}-{i}",
+        "chunk_index": i,
+        "page_number": i % 2 + 1,
+        "section_title": f"제목 {i}",
+        "embedding": rng.normal(size=DIM).astype(np.float32),
+        "title_embedding": rng.normal(size=DIM).astype(np.float32),
+        "embedding_model": "test"
+    } for i in range(count)]
+
+
+def _manager(monkeypatch, named=False, reduction=""):
+    monkeypatch.setattr("src.qdrant_manager.config.NAMED_VECTORS_ENABLED", named)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_REDUCTION", reduction)
+    monkeypatch.setattr(vector_reduction, "_reducers", {})
+    # 스키마 캐시는 프로세스 전역이므로 테스트마다 새 컬렉션 이름 사용
+    return QdrantManager(collection_name=f"test_{uuid.uuid4().hex}", client=QdrantClient(location=":memory:"))
+
+
+def test_mmr_relevance_only_keeps_score_order():
+    query = np.array([1.0, 0.0])
+    candidates = np.array([[1.0, 0.0], [0.9, 0.1], [0.5, 0.5], [0.0, 1.0]])
+
+    assert maximal_marginal_relevance(query, candidates, k=3, lambda_mult=1.0) == [0, 1, 2]
+
+
+def test_mmr_skips_near_duplicates():
+    query = np.array([1.0, 0.0, 0.0])
+    candidates = [
+        [1.0, 0.0, 0.0],
+        [1.0, 0.01, 0.0],   # 첫 후보와 거의 동일
+        [0.7, 0.0, 0.7],
+    ]
+
+    assert maximal_marginal_relevance(query, candidates, k=2, lambda_mult=0.3) == [0, 2]
+
+
+def test_mmr_matches_reference_loop():
+    rng = np.random.default_rng(0)
+    query = rng.normal(size=16)
+    candidates = rng.normal(size=(30, 16))
+    lambda_mult = 0.6
+
+    # 정규화된 코사인 유사도로 후보마다 다시 계산하는 단순 구현
+    unit = candidates / np.linalg.norm(candidates, axis=1, keepdims=True)
+    q = query / np.linalg.norm(query)
+    expected = [int(np.argmax(unit @ q))]
+    while len(expected) < 10:
+        best, best_score = None, -np.inf
+        for i in range(len(unit)):
+            if i in expected:
+                continue
+            score = lambda_mult * (unit[i] @ q) - (1 - lambda_mult) * max(unit[i] @ unit[j] for j in expected)
+            if score > best_score:
+                best, best_score = i, score
+        expected.append(best)
+
+    assert maximal_marginal_relevance(query, candidates, k=10, lambda_mult=lambda_mult) == expected
+
+
+def test_mmr_edge_cases():
+    query = np.array([1.0, 0.0])
+
+    assert maximal_marginal_relevance(query, [], k=3) == []
+    assert maximal_marginal_relevance(query, [[1.0, 0.0]], k=0) == []
+    assert maximal_marginal_relevance(query, [[1.0, 0.0], [0.0, 1.0]], k=5) == [0, 1]
+    # 0 벡터 후보가 있어도 NaN 없이 선택
+    assert sorted(maximal_marginal_relevance(query, [[0.0, 0.0], [1.0, 0.0]], k=2)) == [0, 1]
+
+
+@pytest.mark.parametrize("named,reduction", [(False, ""), (False, "mrl4"), (True, ""), (True, "mrl4")])
+def test_batch_search_matches_single_search(monkeypatch, named, reduction):
+    manager = _manager(monkeypatch, named=named, reduction=reduction)
+    assert manager.store_vectors(_chunks(10), "doc1")
+    queries = [np.random.default_rng(seed).normal(size=DIM).astype(np.float32) for seed in (1, 2)]
+    vector_name = "fused" if named else None
+
+    batch = manager.search_vectors_batch([
+        {"query_vector": queries[0], "limit": 3, "vector_name": vector_name},
+        {"query_vector": queries[1], "limit": 5},
+    ])
+
+    single = [manager.search_vectors(queries[0], limit=3, vector_name=vector_name),
+              manager.search_vectors(queries[1], limit=5)]
+    assert [[r["id"] for r in results] for results in batch] == [[r["id"] for r in results] for results in single]
+    assert [len(results) for results in batch] == [3, 5]
+
+
+def test_batch_search_skips_invalid_queries_only(monkeypatch):
+    manager = _manager(monkeypatch, reduction="mrl4")
+    assert manager.store_vectors(_chunks(4), "doc1")
+    good = np.ones(DIM, dtype=np.float32)
+
+    results = manager.search_vectors_batch([
+        {"query_vector": np.ones(3, dtype=np.float32), "limit": 2},   # 축소 차원보다 작은 벡터
+        {"query_vector": good, "limit": 2, "vector_name": "bogus"},
+        {"query_vector": good, "limit": 2},
+    ])
+
+    assert [len(r) for r in results] == [0, 0, 2]
+    assert manager.search_vectors_batch([]) == []
+
+
+def test_search_many_per_query_limits_and_filters(monkeypatch):
+    manager = _manager(monkeypatch)
+    assert manager.store_vectors(_chunks(6, 0), "doc1")
+    assert manager.store_vectors(_chunks(6, 1), "doc2")
+    embedding = FakeEmbeddingService({"가": np.ones(DIM, dtype=np.float32), "나": -np.ones(DIM, dtype=np.float32)})
+    service = SearchService(manager, embedding)
+
+    results = service.search_many([
+        {"query": "가", "limit": 2, "document_id": "doc1"},
+        {"query": "실패"},
+        {"query": "나", "limit": 4, "document_id": "doc2", "page_number": 1, "score_threshold": -1.0},
+        {"query": "가", "limit": 5},
+    ])
+
+    assert len(results[0]) == 2 and {r["document_id"] for r in results[0]} == {"doc1"}
+    assert results[1] == []
+    assert len(results[2]) == 3
+    assert {(r["document_id"], r["page_number"]) for r in results[2]} == {("doc2", 1)}
+    assert len(results[3]) == 5
+    assert service.search_many([]) == []
+
+
+def _vector_with_cosine(cosine, axis=1):
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[0], vector[axis] = cosine, np.sqrt(1 - cosine ** 2)
+    return vector
+
+
+def _store(manager, document_id, cosines):
+    chunks = [{"text": f"{document_id}-{c}", "chunk_index": i, "page_number": 1,
+               "embedding": _vector_with_cosine(c, axis=i + 1), "embedding_model": "test"}
+              for i, c in enumerate(cosines)]
+    assert manager.store_vectors(chunks, document_id)
+
+
+@pytest.fixture
+def fanout(monkeypatch):
+    base = _manager(monkeypatch)
+    names = [f"a_{uuid.uuid4().hex[:8]}", f"b_{uuid.uuid4().hex[:8]}", f"empty_{uuid.uuid4().hex[:8]}"]
+    _store(base.for_collection(names[0]), "docA", [0.9, 0.5, 0.1])
+    # 결과가 하나뿐이면 최고점 = 최저점 (정규화 분모 0)
+    _store(base.for_collection(names[1]), "docB", [0.3])
+    query = np.zeros(DIM, dtype=np.float32)
+    query[0] = 1.0
+    service = SearchService(base, FakeEmbeddingService({"질문": query}))
+    return service, names
+
+
+def test_search_collections_normalizes_and_tags_results(fanout):
+    service, (first, second, empty) = fanout
+
+    results = service.search_collections("질문", collection_names=[first, second, empty], limit=10)
+
+    assert [(r["document_id"], r["collection_name"]) for r in results] == [
+        ("docA", first), ("docB", second), ("docA", first), ("docA", first)
+    ]
+    assert [r["score"] for r in results] == pytest.approx([1.0, 1.0, 0.5, 0.0], abs=1e-3)
+    assert [r["raw_score"] for r in results] == pytest.approx([0.9, 0.3, 0.5, 0.1], abs=1e-3)
+
+
+def test_search_collections_raw_scores_and_limit(fanout):
+    service, (first, second, empty) = fanout
+
+    results = service.search_collections("질문", collection_names=[first, second, empty], limit=3, normalize=False)
+
+    assert [r["collection_name"] for r in results] == [first, first, second]
+    assert [r["score"] for r in results] == pytest.approx([0.9, 0.5, 0.3], abs=1e-3)
+    assert service.search_collections("질문", collection_names=[empty]) == []
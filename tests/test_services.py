@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+import threading
+
+from src import services
+
+
+def test_importing_app_does_not_build_services_or_load_heavy_modules():
+    code = (
+        "import json, sys, src.main, src.health_monitor, src.services;"
+        "print(json.dumps({'modules': sorted(sys.modules), 'health': src.health_monitor._instance is None,"
+        " 'services': sorted(src.services._instances)}))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    state = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    heavy = {"cv2", "PIL", "langchain_text_splitters", "qdrant_client", "onnxruntime",
+             "src.qa_service", "src.ingestion", "src.search_service", "src.embedding_service"}
+    assert heavy.isdisjoint(state["modules"])
+    assert state["health"]
+    assert state["services"] == []
+
+
+def test_shared_services_are_created_once(monkeypatch):
+    monkeypatch.setattr(services, "_instances", {})
+    created = []
+
+    def build():
+        created.append(1)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(services._get_or_create("x", build)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_search_service_shares_qdrant_and_embedding_services(monkeypatch):
+    monkeypatch.setattr(services, "_instances", {})
+
+    search_service = services.get_search_service()
+
+    assert search_service is services.get_search_service()
+    assert search_service.qdrant_manager is services.get_qdrant_manager()
+    assert search_service.embedding_service is services.get_embedding_service()
+    assert services.create_qa_service().search_service is search_service
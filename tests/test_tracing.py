@@ -0,0 +1,127 @@
+import json
+import time
+import uuid
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from starlette.testclient import TestClient
+
+from src import qa_service as qa_module
+from src import tracing
+from src.api import routes
+from src.qa_service import QAService
+from src.qdrant_manager import QdrantManager
+from src.search_service import SearchService
+from src.tracing import start_trace, span, traced, current_trace
+
+DIM = 8
+
+
+def test_spans_nest_and_record_errors():
+    @traced("outer")
+    def outer():
+        with span("inner", step=1):
+            pass
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("실패")
+
+    with start_trace("GET /test") as trace:
+        outer()
+        assert current_trace() is trace
+    assert current_trace() is None
+
+    timings = {t["name"]: t for t in trace.timings()}
+    assert timings["outer"]["parent"] == "GET /test"
+    assert timings["inner"]["parent"] == "outer" and timings["inner"]["attributes"] == {"step": 1}
+    assert timings["failing"]["error"] == "실패"
+    assert all(t["duration_ms"] >= 0 and t["offset_ms"] >= 0 for t in timings.values())
+
+
+def test_span_without_trace_is_noop():
+    with span("orphan") as current:
+        assert current is None
+
+
+def test_server_timing_sums_spans_and_sanitizes_names():
+    with start_trace("root") as trace:
+        for _ in range(2):
+            with span("qdrant search"):
+                time.sleep(0.001)
+
+    header = trace.server_timing()
+    names = [entry.split(";")[0] for entry in header.split(", ")]
+    assert names == ["total", "qdrant_search"]
+    assert float(header.split("qdrant_search;dur=")[1]) >= 2.0
+
+
+def test_traces_exported_as_otlp_json(tmp_path, monkeypatch):
+    path = tmp_path / "traces" / "spans.jsonl"
+    monkeypatch.setattr(tracing.config, "TRACE_EXPORT_PATH", str(path))
+    monkeypatch.setattr(tracing, "_exporter", None)
+
+    with start_trace("POST /qa", **{"http.method": "POST"}):
+        with span("llm_generate"):
+            pass
+    deadline = time.time() + 5
+    while not path.exists() and time.time() < deadline:
+        time.sleep(0.01)
+
+    exported = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+    spans = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [(s["name"], s["kind"]) for s in spans] == [("POST /qa", 2), ("llm_generate", 1)]
+    assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+    assert spans[0]["attributes"] == [{"key": "http.method", "value": {"stringValue": "POST"}}]
+
+
+class FakeEmbeddingService:
+    model_name = "test"
+
+    def embed_text(self, text):
+        return np.ones(DIM, dtype=np.float32)
+
+    def embed_texts(self, texts):
+        return np.ones((len(texts), DIM), dtype=np.float32)
+
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {"response": "연 15일입니다.", "eval_count": 5, "eval_duration": 10 ** 8}
+
+
+@pytest.fixture
+def qa_client(monkeypatch):
+    from src.main import app
+
+    monkeypatch.setattr("src.qdrant_manager.config.NAMED_VECTORS_ENABLED", False)
+    monkeypatch.setattr("src.qdrant_manager.config.VECTOR_REDUCTION", "")
+    # 스키마 캐시는 프로세스 전역이므로 테스트마다 새 컬렉션 이름 사용
+    manager = QdrantManager(collection_name=f"test_{uuid.uuid4().hex}", client=QdrantClient(location=":memory:"))
+    assert manager.store_vectors([{"text": "휴가 규정은 연 15일입니다.", "chunk_index": 0, "page_number": 1,
+                                   "embedding": np.ones(DIM, dtype=np.float32), "embedding_model": "test"}], "doc1")
+    embedding_service = FakeEmbeddingService()
+    service = QAService(search_service=SearchService(manager, embedding_service), embedding_service=embedding_service)
+    monkeypatch.setattr(routes, "create_qa_service", lambda: service)
+    monkeypatch.setattr(qa_module.requests, "post", lambda url, json=None, timeout=None: FakeResponse())
+    return TestClient(app), manager.collection_name
+
+
+def test_qa_request_returns_server_timing_and_timings(qa_client):
+    client, collection_name = qa_client
+    question = {"question": "휴가는 며칠인가요?", "collection_name": collection_name}
+
+    response = client.post("/api/v1/qa", json={**question, "include_timings": True})
+    plain = client.post("/api/v1/qa", json=question)
+
+    assert response.json()["answer"].startswith("연 15일입니다.")
+    names = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert names[0] == "total"
+    assert {"qa.retrieve", "qdrant_search", "pack_context", "llm_generate"} <= set(names)
+    timings = {t["name"]: t for t in response.json()["timings"]}
+    assert timings["POST /api/v1/qa"]["parent"] is None
+    assert timings["llm_generate"]["attributes"]["llm.eval_count"] == 5
+    assert plain.json()["timings"] is None
+    assert "llm_generate" in plain.headers["Server-Timing"]
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from src import job_queue
+from src.api import routes, upload_progress
+from src.job_queue import SQLiteJobQueue, INGEST_TASK, subscribe_job_updates, unsubscribe_job_updates
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(job_queue, "_instance", queue)
+    return queue
+
+
+def test_get_progress_reads_job_queue(queue):
+    job_id = queue.enqueue(INGEST_TASK, {})
+    queue.lease("w1", lease_seconds=30)
+    queue.update_progress(job_id, 40, "임베딩 중", detail={"stage": "embed"}, worker_id="w1")
+
+    status = upload_progress.get_progress(job_id)
+
+    assert (status["status"], status["progress"], status["message"]) == ("processing", 40, "임베딩 중")
+    assert status["detail"] == {"stage": "embed"}
+    assert upload_progress.get_progress("missing")["status"] == "unknown"
+
+
+def test_subscribers_are_woken_by_worker_thread_updates(queue):
+    job_id = queue.enqueue(INGEST_TASK, {})
+    queue.lease("w1", lease_seconds=30)
+
+    async def wait_for_update():
+        updated = subscribe_job_updates()
+        try:
+            threading.Timer(0.05, queue.update_progress, (job_id, 10, "진행", None, "w1")).start()
+            await asyncio.wait_for(updated.wait(), timeout=2)
+        finally:
+            unsubscribe_job_updates(updated)
+
+    asyncio.run(wait_for_update())
+    assert job_queue._subscribers == {}
+
+
+def test_event_stream_pushes_updates_without_polling(queue, monkeypatch):
+    # 다시 확인 주기를 길게 두어 알림으로만 진행되는지 확인
+    monkeypatch.setattr(routes.config, "PROGRESS_STREAM_INTERVAL", 30)
+    polls = []
+    original = routes.get_progress
+    monkeypatch.setattr(routes, "get_progress", lambda task_id: polls.append(task_id) or original(task_id))
+    job_id = queue.enqueue(INGEST_TASK, {})
+    queue.lease("w1", lease_seconds=30)
+
+    def work():
+        for value in (30, 60):
+            time.sleep(0.1)
+            queue.update_progress(job_id, value, f"{value}%", worker_id="w1")
+        time.sleep(0.1)
+        queue.complete(job_id, {"chunks_count": 1}, worker_id="w1")
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    started = time.time()
+    threading.Thread(target=work, daemon=True).start()
+    with TestClient(app).stream("GET", f"/upload-progress/{job_id}/events") as response:
+        body = "".join(response.iter_text())
+
+    events = [json.loads(line[len("data: "):]) for line in body.splitlines()
+              if line.startswith("data: ") and line != "data: {}"]
+    assert [e["progress"] for e in events] == [0, 30, 60, 100]
+    assert events[-1]["status"] == "done"
+    assert body.rstrip().endswith("event: end\ndata: {}")
+    assert time.time() - started < 10
+    # 상태가 바뀐 횟수만큼만 조회 (조회 중 도착한 알림으로 한 번 더 조회할 수는 있음)
+    assert len(polls) <= 5
@@ -0,0 +1,88 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from starlette.datastructures import UploadFile as StarletteUploadFile
+from starlette.testclient import TestClient
+
+from src.upload_storage import UploadSizeLimitMiddleware, UploadTooLarge, parse_size, save_upload
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1048576", 1048576),
+    ("512B", 512),
+    ("10K", 10 * 1024),
+    ("10KB", 10 * 1024),
+    ("100M", 100 * 1024 ** 2),
+    ("100MB", 100 * 1024 ** 2),
+    (" 1.5 gb ", int(1.5 * 1024 ** 3)),
+])
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "MB", "10TB", "10 MiB", "ten", "-1MB"])
+def test_parse_size_rejects_unknown_format(value):
+    with pytest.raises(ValueError):
+        parse_size(value)
+
+
+def test_save_upload_hashes_and_limits(tmp_path):
+    data = b"x" * 3000
+    upload = StarletteUploadFile(io.BytesIO(data), filename="a.txt")
+    info = asyncio.run(save_upload(upload, str(tmp_path / "a.txt"), max_bytes=5000, chunk_size=1024))
+    assert info == {"size": 3000, "sha256": hashlib.sha256(data).hexdigest()}
+
+    upload = StarletteUploadFile(io.BytesIO(data), filename="b.txt")
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(save_upload(upload, str(tmp_path / "b.txt"), max_bytes=2000, chunk_size=1024))
+    assert not (tmp_path / "b.txt").exists()
+
+
+def _client(max_bytes):
+    app = FastAPI()
+
+    @app.post("/api/v1/upload-file")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=max_bytes)
+    return TestClient(app)
+
+
+def _multipart(size):
+    boundary = "testboundary"
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.bin\"\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n").encode()
+    return boundary, head + b"a" * size + f"\r\n--{boundary}--\r\n".encode()
+
+
+def _chunked(body, chunk_size=16 * 1024):
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
+
+
+def test_middleware_allows_small_upload():
+    response = _client(max_bytes=1024).post("/api/v1/upload-file", files={"file": ("a.bin", b"a" * 100)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_middleware_rejects_large_content_length():
+    limit = 1024
+    payload = b"a" * (limit + UploadSizeLimitMiddleware.FORM_OVERHEAD + 1)
+    response = _client(max_bytes=limit).post("/api/v1/upload-file", files={"file": ("a.bin", payload)})
+    assert response.status_code == 413
+
+
+def test_middleware_rejects_large_chunked_upload_without_content_length():
+    limit = 1024
+    boundary, body = _multipart(limit + UploadSizeLimitMiddleware.FORM_OVERHEAD + 1)
+    response = _client(max_bytes=limit).post(
+        "/api/v1/upload-file",
+        content=_chunked(body),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    )
+    assert response.status_code == 413
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src import vector_reduction
+from src.vector_reduction import PCAReducer, TruncationReducer, get_reducer
+
+
+def _unit_norms(matrix):
+    return np.linalg.norm(matrix, axis=1)
+
+
+def test_truncation_keeps_leading_dimensions_and_renormalizes():
+    reducer = TruncationReducer(2)
+    reduced = reducer.transform([[3.0, 4.0, 12.0], [0.0, 2.0, 1.0]])
+
+    assert reducer.tag == "mrl2"
+    assert reduced.dtype == np.float32
+    assert reduced.shape == (2, 2)
+    np.testing.assert_allclose(reduced, [[0.6, 0.8], [0.0, 1.0]], atol=1e-6)
+
+
+def test_truncation_rejects_invalid_dimensions():
+    with pytest.raises(ValueError):
+        TruncationReducer(0)
+    with pytest.raises(ValueError):
+        TruncationReducer(4).transform([[1.0, 0.0]])
+
+
+def test_pca_fit_transform_and_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    # 앞쪽 3차원에 분산이 몰린 표본
+    vectors = rng.normal(size=(200, 16)) * np.r_[np.full(3, 10.0), np.full(13, 0.1)]
+    reducer = PCAReducer.fit(vectors, 3, source_model="test")
+
+    reduced = reducer.transform(vectors[:5])
+    assert reduced.shape == (5, 3)
+    np.testing.assert_allclose(_unit_norms(reduced), 1.0, atol=1e-5)
+    assert reducer.explained_variance > 0.9
+    assert reducer.tag.startswith("pca3-")
+
+    loaded = PCAReducer.load(reducer.save(str(tmp_path)))
+    assert loaded.tag == reducer.tag
+    assert loaded.source_model == "test"
+    np.testing.assert_allclose(loaded.transform(vectors[:5]), reduced, atol=1e-6)
+
+
+def test_pca_fit_rejects_dimension_larger_than_sample():
+    with pytest.raises(ValueError):
+        PCAReducer.fit(np.eye(4), 5)
+
+
+def test_get_reducer_by_tag(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_reduction, "_reducers", {})
+    monkeypatch.setattr(vector_reduction.config, "VECTOR_REDUCTION_DIR", str(tmp_path))
+    pca = PCAReducer.fit(np.random.default_rng(1).normal(size=(20, 8)), 2)
+    pca.save(str(tmp_path))
+
+    assert get_reducer("") is None
+    assert isinstance(get_reducer("mrl4"), TruncationReducer)
+    assert get_reducer("mrl4") is get_reducer("mrl4")
+    assert get_reducer(pca.tag).tag == pca.tag
+    with pytest.raises(ValueError):
+        get_reducer("bogus")
+    with pytest.raises(FileNotFoundError):
+        get_reducer("pca2-00000000")